@@ -0,0 +1,76 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: cache.py
+# Role: Admin cache inspection endpoints (stats + clear)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Admin-only access (get_current_admin guard)
+# - Read-only stats; clear is explicit and audit logged
+# =============================================================================
+
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.v1.deps_admin import get_current_admin
+from app.core.cache import cache_registry
+from app.core.rate_limit import rate_limiter
+from app.db.session import get_supabase_admin
+from typing import Dict, Any
+
+router = APIRouter()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_admin: dict = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Get per-namespace cache statistics
+
+    Auth: Admin only
+    Returns: {namespace: {entries, bytes, hits, misses, evictions, ...}}
+    """
+    namespaces = cache_registry.stats()
+    return {
+        "backend": cache_registry.backend_stats(),
+        "namespaces": namespaces,
+        "rate_limits": rate_limiter.stats(),
+        "totals": {
+            "entries": sum(s["entries"] for s in namespaces.values()),
+            "bytes": sum(s["bytes"] for s in namespaces.values()),
+            "hits": sum(s["hits"] for s in namespaces.values()),
+            "misses": sum(s["misses"] for s in namespaces.values()),
+            "evictions": sum(s["evictions"] for s in namespaces.values()),
+        },
+    }
+
+
+@router.delete("/cache/{namespace}")
+async def clear_cache_namespace(
+    namespace: str,
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Clear one cache namespace
+
+    Auth: Admin only
+    Creates audit log entry
+    """
+    ns = cache_registry.get(namespace)
+    if ns is None:
+        raise HTTPException(404, f"Cache namespace {namespace} not found")
+
+    before = ns.stats()
+    ns.clear()
+
+    supabase = get_supabase_admin()
+    supabase.table("admin_audit_log").insert({
+        "admin_id": current_admin["id"],
+        "action_type": "clear_cache",
+        "action_category": "cache",
+        "before_state": {"namespace": namespace, **before},
+        "after_state": {"namespace": namespace, **ns.stats()},
+    }).execute()
+
+    return {"namespace": namespace, "cleared_entries": before["entries"]}
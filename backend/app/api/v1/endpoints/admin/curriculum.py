@@ -0,0 +1,57 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: curriculum.py
+# Role: Admin curriculum snapshot endpoints (info + refresh)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Admin-only access (get_current_admin guard)
+# - Refresh bumps the global version (all workers reload) and is audit logged
+# =============================================================================
+
+from fastapi import APIRouter, Depends
+from app.api.v1.deps_admin import get_current_admin
+from app.core.curriculum import curriculum_store
+from app.db.session import get_supabase_admin, run_db
+from typing import Dict, Any
+
+router = APIRouter()
+
+
+@router.get("/curriculum")
+async def get_curriculum_info(
+    current_admin: dict = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Get curriculum snapshot info (version, row counts, reloads)
+
+    Auth: Admin only
+    """
+    return curriculum_store.info()
+
+
+@router.post("/curriculum/refresh")
+async def refresh_curriculum(
+    current_admin: dict = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Bump curriculum version and reload the snapshot
+
+    Auth: Admin only
+    Creates audit log entry
+    """
+    before = curriculum_store.info()["snapshot"]
+    snapshot = await run_db(curriculum_store.bump_version, "admin.curriculum_refresh")
+
+    supabase = get_supabase_admin()
+    supabase.table("admin_audit_log").insert({
+        "admin_id": current_admin["id"],
+        "action_type": "refresh_curriculum",
+        "action_category": "curriculum",
+        "before_state": before,
+        "after_state": snapshot.stats(),
+    }).execute()
+
+    return snapshot.stats()
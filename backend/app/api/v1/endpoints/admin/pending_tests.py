@@ -0,0 +1,47 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: pending_tests.py
+# Role: Admin pending test pipeline endpoints (queue depth, lag, worker)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Admin-only access (get_current_admin guard)
+# - Read-only; manual batch run is explicit
+# =============================================================================
+
+from fastapi import APIRouter, Depends
+from app.api.v1.deps_admin import get_current_admin
+from app.db.session import run_db
+from app.jobs.process_pending_tests import pending_test_worker, queue_stats
+from typing import Dict, Any
+
+router = APIRouter()
+
+
+@router.get("/pending-tests")
+async def get_pending_tests_stats(
+    current_admin: dict = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Pending test queue depth, lag and in-process worker metrics
+
+    Auth: Admin only
+    """
+    return {
+        "queue": await run_db(queue_stats),
+        "worker": pending_test_worker.stats(),
+    }
+
+
+@router.post("/pending-tests/run")
+async def run_pending_tests_batch(
+    current_admin: dict = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Process one batch now (worker disabled or draining a backlog)
+
+    Auth: Admin only
+    """
+    return await run_db(pending_test_worker.run_once)
@@ -8,12 +8,12 @@
 #
 # Golden rules:
 # - Aggregates all admin sub-routers
-# - Modular design (features, dashboard, audit separate)
+# - Modular design (features, dashboard, audit, cache, curriculum, pending tests separate)
 # - Included in api.py with prefix="/admin"
 # =============================================================================
 
 from fastapi import APIRouter
-from . import features, dashboard, audit
+from . import features, dashboard, audit, cache, curriculum, pending_tests
 
 router = APIRouter()
 
@@ -25,3 +25,12 @@ router.include_router(dashboard.router, tags=["admin-dashboard"])
 
 # Audit log
 router.include_router(audit.router, tags=["admin-audit"])
+
+# Cache stats
+router.include_router(cache.router, tags=["admin-cache"])
+
+# Curriculum snapshot
+router.include_router(curriculum.router, tags=["admin-curriculum"])
+
+# Pending test pipeline
+router.include_router(pending_tests.router, tags=["admin-pending-tests"])
@@ -8,7 +8,8 @@ Admin Exams API Endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, run_db
+from app.core.curriculum import bump_curriculum_version
 from app.models.user import User
 from app.api.deps import get_current_active_superuser
 from pydantic import BaseModel
@@ -126,6 +127,8 @@ async def create_topic_yearly_data(
     )
     
     db.commit()
+    # 📚 Referans veri değişti: curriculum snapshot versiyonu artar
+    await run_db(bump_curriculum_version, "admin_exams.create_topic_yearly_data")
     
     row = result.fetchone()
     
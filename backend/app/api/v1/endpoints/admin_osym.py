@@ -8,7 +8,8 @@ Admin ÖSYM API Endpoints
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, run_db
+from app.core.curriculum import bump_curriculum_version
 from app.models.user import User
 from app.api.deps import get_current_active_superuser
 from pydantic import BaseModel
@@ -137,6 +138,8 @@ async def create_osym_topic(
         }
     )
     db.commit()
+    # 📚 Referans veri değişti: curriculum snapshot versiyonu artar
+    await run_db(bump_curriculum_version, "admin_osym.create_osym_topic")
     
     row = result.fetchone()
     
@@ -222,6 +225,8 @@ async def bulk_upload_osym_topics(
                 error_count += 1
         
         db.commit()
+        # 📚 Referans veri değişti: curriculum snapshot versiyonu artar
+        await run_db(bump_curriculum_version, "admin_osym.bulk_upload_osym_topics")
         
         return BulkUploadResponse(
             success=success_count > 0,
@@ -299,6 +304,8 @@ async def create_topic_osym_mapping(
         }
     )
     db.commit()
+    # 📚 Referans veri değişti: curriculum snapshot versiyonu artar
+    await run_db(bump_curriculum_version, "admin_osym.create_topic_osym_mapping")
     
     row = result.fetchone()
     
@@ -11,6 +11,7 @@ from datetime import datetime
 import uuid
 
 from app.db.session import get_supabase_admin
+from app.core.rate_limit import rate_limit
 
 router = APIRouter()
 
@@ -24,7 +25,11 @@ class FeedbackSubmit(BaseModel):
     metadata: Optional[Dict[str, Any]] = {}
 
 
-@router.post("/feedback/submit", response_model=dict)
+@router.post(
+    "/feedback/submit",
+    response_model=dict,
+    dependencies=[Depends(rate_limit("feedback_submit", limit=10, window_seconds=60))]
+)
 async def submit_feedback(
     feedback: FeedbackSubmit,
     current_user: dict = Depends(get_current_user)
@@ -4,6 +4,7 @@ Sadece logging sistemini test etmek için basit endpoint
 """
 from fastapi import APIRouter, Query
 from app.core.motor_wrapper import MotorWrapper
+from app.core.motor_logger import motor_logger
 from app.core.motor_registry import MotorType, MotorVersion, SubscriptionTier
 import logging
 
@@ -50,8 +51,8 @@ async def test_motor_logging(
             "status": "success",
             "message": "Motor logging test completed",
             "result": result,
-            "log_file": "logs/motor_activity.log",
-            "check_command": "cat logs/motor_activity.log"
+            "log_file": str(motor_logger.log_file),
+            "check_command": f"cat {motor_logger.log_file}"
         }
         
     except Exception as e:
@@ -59,5 +60,5 @@ async def test_motor_logging(
         return {
             "status": "error",
             "message": str(e),
-            "log_file": "logs/motor_activity.log"
+            "log_file": str(motor_logger.log_file)
         }
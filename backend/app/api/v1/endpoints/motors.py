@@ -163,38 +163,28 @@ async def list_motor_overrides():
 
 
 @router.get("/admin/performance", tags=["admin"])
-async def get_motor_performance():
-    """Get motor performance statistics (Admin only)"""
-    logs = motor_registry.performance_log
-    
-    if not logs:
-        return {"message": "No performance data yet"}
+async def get_motor_performance(
+    window: Literal["1m", "1h", "24h"] | None = None
+):
+    """
+    Get motor performance statistics (Admin only)
     
-    # Calculate stats per motor
-    stats_by_motor = {}
+    stats_by_motor: process başından beri (veya ?window=1m|1h|24h)
+    windows: motor/version/tier bazında p50/p95/p99, success/fallback oranı
+    """
+    performance = motor_registry.performance
     
-    for motor in MotorType:
-        motor_logs = [l for l in logs if l["motor_type"] == motor.value]
-        
-        if not motor_logs:
-            continue
-        
-        v1_logs = [l for l in motor_logs if l["version"] == "v1"]
-        v2_logs = [l for l in motor_logs if l["version"] == "v2"]
-        
-        successful = [l for l in motor_logs if l["success"]]
-        
-        stats_by_motor[motor.value] = {
-            "total_requests": len(motor_logs),
-            "v1_requests": len(v1_logs),
-            "v2_requests": len(v2_logs),
-            "success_rate": len(successful) / len(motor_logs) * 100 if motor_logs else 0,
-            "avg_execution_time_ms": sum(l["execution_time_ms"] for l in successful) / len(successful) if successful else 0,
-        }
+    if not performance.total:
+        return {"message": "No performance data yet"}
     
     return {
-        "total_logs": len(logs),
-        "stats_by_motor": stats_by_motor
+        "total_logs": performance.total,
+        "recent_logs": len(performance.recent),
+        "stats_by_motor": performance.by_motor(window),
+        "windows": {
+            name: performance.summary(name)
+            for name in (("1m", "1h", "24h") if window is None else (window,))
+        }
     }
 
 
@@ -40,9 +40,14 @@ All calculations are UTC-aware and prepared for multi-language support.
 """
 
 from datetime import date
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from collections import defaultdict
 
+import numpy as np
+
+from app.core.test_history import TestHistory
+from app.core.timestamps import epoch_day
+
 from .helpers import (
     to_utc_date,
     get_week_start_utc,
@@ -245,7 +250,7 @@ def get_period_key(test: dict, period: str) -> date:
 
 
 def calculate_trends(
-    tests: List[dict],
+    tests: Union[List[dict], TestHistory],
     period: str = "weekly",
     num_periods: int = 8,
     subjects: Optional[Dict[str, str]] = None
@@ -254,7 +259,7 @@ def calculate_trends(
     Trend verisi hesapla (UTC-aware, Türkçe tarihler)
 
     Input:
-      - tests: student_topic_tests satırları
+      - tests: student_topic_tests satırları veya TestHistory
       - period: weekly | monthly
       - num_periods: kaç period geriye gidilecek
       - subjects: {subject_id: subject_name}
@@ -287,62 +292,61 @@ def calculate_trends(
         labels = [format_date_turkish(p, "long") for p in period_starts]
 
     # --------------------------
-    # 2) Testleri period'lara grupla
+    # 2) Testleri period'lara ata (kolonsal: epoch-day -> period index)
     # --------------------------
-    period_tests: Dict[date, List[dict]] = defaultdict(list)
-    for t in tests:
-        try:
-            key = get_period_key(t, period)
-            period_tests[key].append(t)
-        except Exception:
-            # bozuk test_date vb. varsa atla
-            continue
+    history = tests if isinstance(tests, TestHistory) else TestHistory.from_rows(tests)
+
+    starts = np.asarray([epoch_day(p) for p in period_starts], dtype=np.int64)
+    days = history.day.astype(np.int64)
+    if period == "weekly":
+        # 1970-01-01 Perşembe -> (day + 3) % 7 = weekday (0 = Pazartesi)
+        row_starts = days - (days + 3) % 7
+    else:
+        row_starts = (
+            days.astype("datetime64[D]").astype("datetime64[M]")
+            .astype("datetime64[D]").astype(np.int64)
+        )
+
+    n_periods = len(period_starts)
+    pos = np.searchsorted(starts, row_starts)
+    in_range = (pos < n_periods) & (starts[np.minimum(pos, max(n_periods - 1, 0))] == row_starts) \
+        if n_periods else np.zeros(len(history), dtype=bool)
+
+    success = history.success_pct()
+    valid = in_range & ~np.isnan(success)
+
+    def period_means(mask: np.ndarray) -> List[Optional[float]]:
+        sums = np.bincount(pos[mask], weights=success[mask], minlength=n_periods)
+        counts = np.bincount(pos[mask], minlength=n_periods)
+        return [
+            round(float(s) / int(c), 1) if c else None
+            for s, c in zip(sums.tolist(), counts.tolist())
+        ]
 
     # --------------------------
     # 3) OVERALL TREND
     # --------------------------
-    overall_trend: List[Optional[float]] = []
-    for p in period_starts:
-        pts = period_tests.get(p, [])
-        vals = []
-        for tt in pts:
-            s = get_success(tt)
-            if s is not None:
-                vals.append(s)
-
-        overall_trend.append(round(sum(vals) / len(vals), 1) if vals else None)
+    overall_trend: List[Optional[float]] = period_means(valid)
 
     # --------------------------
     # 4) SUBJECT BAZLI TREND
     # --------------------------
-    per_subject: Dict[str, Dict[date, List[dict]]] = defaultdict(lambda: defaultdict(list))
-
-    for p in period_starts:
-        pts = period_tests.get(p, [])
-        for t in pts:
-            sid = t.get("subject_id")
-            if sid:
-                per_subject[sid][p].append(t)
+    # Sıra: period'lar içinde ilk görülen ders (eski dict davranışı)
+    subject_order: List[int] = []
+    seen = set()
+    for code in history.subject_idx[in_range & (history.subject_idx >= 0)].tolist():
+        if code not in seen:
+            seen.add(code)
+            subject_order.append(code)
 
     subject_datasets: List[Dict[str, Any]] = []
 
-    for sid, period_map in per_subject.items():
-        data_points: List[Optional[float]] = []
-
-        for p in period_starts:
-            pts = period_map.get(p, [])
-            vals = []
-            for tt in pts:
-                s = get_success(tt)
-                if s is not None:
-                    vals.append(s)
-
-            data_points.append(round(sum(vals) / len(vals), 1) if vals else None)
-
+    for code in subject_order:
+        sid = history.subject_ids[code]
         subject_datasets.append({
             "subject_id": sid,
             "label": subjects.get(sid, "Bilinmeyen Ders"),
-            "data": data_points
+            "data": period_means(valid & (history.subject_idx == code))
         })
 
     return {
@@ -1,7 +1,8 @@
 from datetime import datetime, timedelta, timezone, date
-from dateutil import parser
 from typing import List
 
+from app.core.timestamps import parse_utc
+
 # ==================================================
 # 1️⃣ ISO Datetime → UTC Date Normalizasyonu
 # ==================================================
@@ -29,13 +30,11 @@ def to_utc_date(value) -> date:
             value = value.astimezone(timezone.utc)
         return value.date()
     
-    # string case
+    # string case (memoized parser: aynı string tekrar parse edilmez)
     if isinstance(value, str):
-        dt = parser.isoparse(value)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
+        dt = parse_utc(value)
+        if dt is None:
+            raise ValueError(f"Invalid ISO date: {value!r}")
         return dt.date()
     
     raise TypeError(f"Unsupported date type: {type(value)}")
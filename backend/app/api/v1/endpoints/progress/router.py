@@ -4,12 +4,16 @@ Progress & Goals Router - Main Endpoints
 ⭐ UTC-AWARE with Period Key Fix (2024-12-24)
 ⭐ MVP: Goal endpoint returns no_data (Phase 2'de real data)
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from datetime import datetime, timedelta
 from collections import defaultdict
 
 from app.core.auth import get_current_user
-from app.db.session import get_supabase_admin
+from app.core.curriculum import curriculum_version, get_curriculum_async
+from app.core.data_version import DAY, conditional_get
+from app.db.session import get_supabase_admin, db_execute
 
 # Local imports
 from .models import ProgressProjection, SubjectProgress, TrendData
@@ -40,19 +44,28 @@ router = APIRouter(
 
 @router.get("/projection")
 async def get_progress_projection(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     supabase = Depends(get_supabase_admin)
 ):
     """
     Genel ilerleme tahmini
     """
+    not_modified = conditional_get(
+        request, response, current_user.get("id"), "projection", curriculum_version(),
+        bucket_seconds=DAY
+    )
+    if not_modified:
+        return not_modified
+
     try:
         student_id = current_user.get("id")
         
         # Tüm testleri al
-        tests_result = supabase.table("student_topic_tests").select(
+        tests_result = await db_execute(supabase.table("student_topic_tests").select(
             "id, subject_id, topic_id, success_rate, test_date, created_at"
-        ).eq("student_id", student_id).order("test_date").execute()
+        ).eq("student_id", student_id).order("test_date"))
         
         tests = tests_result.data or []
 
@@ -87,8 +100,8 @@ async def get_progress_projection(
                 topics_in_progress += 1
         
         # Toplam konu sayısı
-        total_topics_result = supabase.table("topics").select("id", count="exact").eq("is_active", True).execute()
-        total_topics = total_topics_result.count or 150
+        curriculum = await get_curriculum_async()
+        total_topics = curriculum.active_topic_count() or 150
         
         topics_not_started = max(0, total_topics - topics_mastered - topics_in_progress)
         
@@ -147,29 +160,35 @@ async def get_progress_projection(
 
 @router.get("/subjects")
 async def get_subject_progress(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     supabase = Depends(get_supabase_admin)
 ):
     """
     Ders bazlı ilerleme (KADEMELI MODEL + EXAM WEIGHT + UNIQUE TOPICS)
     """
+    not_modified = conditional_get(
+        request, response, current_user.get("id"), "subjects", curriculum_version(),
+        bucket_seconds=DAY
+    )
+    if not_modified:
+        return not_modified
+
     try:
         student_id = current_user.get("id")
         
-        # Tüm active subjects
-        subjects_result = supabase.table("subjects").select(
-            "id, code, name_tr"
-        ).eq("is_active", True).execute()
-        
-        subjects = subjects_result.data or []
+        # Dersler, konular, sınav ağırlıkları: curriculum snapshot (DB yok)
+        curriculum = await get_curriculum_async()
+        subjects = curriculum.active_subjects()
         
         if not subjects:
             return {"success": True, "data": []}
         
-        # Tüm testleri al
-        tests_result = supabase.table("student_topic_tests").select(
+        # Öğrencinin testleri: tek sorgu
+        tests_result = await db_execute(supabase.table("student_topic_tests").select(
             "id, subject_id, topic_id, success_rate, test_date, created_at"
-        ).eq("student_id", student_id).execute()
+        ).eq("student_id", student_id))
         
         all_tests = tests_result.data or []
         
@@ -184,13 +203,8 @@ async def get_subject_progress(
             subject_id = subject['id']
             tests = subject_tests.get(subject_id, [])
             
-            # Bu dersin konularını al
-            topics_result = supabase.table("topics").select(
-                "id"
-            ).eq("subject_id", subject_id).eq("is_active", True).execute()
-            
-            topics = topics_result.data or []
-            topics_total = len(topics)
+            topic_ids = curriculum.active_topic_ids(subject_id)
+            topics_total = len(topic_ids)
             
             if topics_total == 0:
                 continue
@@ -233,22 +247,12 @@ async def get_subject_progress(
                 topics_mastered_personal,
                 topics_in_progress,
                 topics_not_started
-            ) = calculate_mastery_counts(tests, [t['id'] for t in topics])
-            
-            # Exam weight multiplier
-            exam_multiplier = 1.0
-            total_exam_questions = 0
+            ) = calculate_mastery_counts(tests, topic_ids)
             
-            try:
-                exam_weight_result = supabase.table("subject_exam_weights").select(
-                    "question_count"
-                ).eq("subject_id", subject_id).execute()
-                
-                exam_multiplier, total_exam_questions = calculate_exam_weight_multiplier(
-                    exam_weight_result.data or []
-                )
-            except Exception as e:
-                print(f"⚠️ Exam weight fallback: {subject['code']}")
+            # Exam weight multiplier (veri yoksa 1.0x)
+            exam_multiplier, total_exam_questions = calculate_exam_weight_multiplier(
+                curriculum.exam_weights(subject_id)
+            )
             
             # Priority score hesapla
             priority_score = calculate_priority_score(
@@ -304,6 +308,8 @@ async def get_subject_progress(
 
 @router.get("/trends")
 async def get_progress_trends(
+    request: Request,
+    response: Response,
     period: str = Query("weekly", regex="^(weekly|monthly)$"),
     num_periods: int = Query(8, ge=2, le=24),
     current_user: dict = Depends(get_current_user),
@@ -312,25 +318,27 @@ async def get_progress_trends(
     """
     Haftalık/aylık trend grafiği
     """
+    not_modified = conditional_get(
+        request, response, current_user.get("id"), "trends", period, num_periods, curriculum_version(),
+        bucket_seconds=DAY
+    )
+    if not_modified:
+        return not_modified
+
     try:
         student_id = current_user.get("id")
         
-        # Öğrencinin tüm testlerini çek
-        tests_result = supabase.table("student_topic_tests").select(
-            "id, test_date, subject_id, topic_id, success_rate"
-        ).eq("student_id", student_id).order("test_date").execute()
+        # Öğrencinin tüm testleri + ders isimleri (snapshot, DB yok)
+        tests_result, curriculum = await asyncio.gather(
+            db_execute(supabase.table("student_topic_tests").select(
+                "id, test_date, subject_id, topic_id, success_rate"
+            ).eq("student_id", student_id).order("test_date")),
+            get_curriculum_async(),
+        )
         
         tests = tests_result.data or []
         
-        # Ders isimlerini çek
-        subjects_result = supabase.table("subjects").select(
-            "id, name_tr"
-        ).execute()
-        
-        subjects_map = {
-            s["id"]: s["name_tr"]
-            for s in (subjects_result.data or [])
-        }
+        subjects_map = curriculum.subject_names()
         
         # Trend hesapla
         data = calculate_trends(
@@ -378,6 +386,8 @@ async def get_progress_trends(
 
 @router.get("/prediction")
 async def get_forgetting_prediction(
+    request: Request,
+    response: Response,
     period: str = "weekly",
     current_user: dict = Depends(get_current_user),
     supabase = Depends(get_supabase_admin)
@@ -385,12 +395,19 @@ async def get_forgetting_prediction(
     """
     Unutma eğrisi tahmini (gelecek 4 hafta/ay)
     """
+    not_modified = conditional_get(
+        request, response, current_user.get("id"), "prediction", period, curriculum_version(),
+        bucket_seconds=DAY
+    )
+    if not_modified:
+        return not_modified
+
     try:
         student_id = current_user.get("id")
         
-        tests_result = supabase.table("student_topic_tests").select(
+        tests_result = await db_execute(supabase.table("student_topic_tests").select(
             "subject_id, success_rate, test_date"
-        ).eq("student_id", student_id).order("test_date", desc=True).execute()
+        ).eq("student_id", student_id).order("test_date", desc=True))
         
         tests = tests_result.data or []
         
@@ -449,12 +466,14 @@ async def get_forgetting_prediction(
                     "decline_rate": round(total_decline, 1)
                 }
         
-        if steepest_decline["subject_id"]:
-            subject_result = supabase.table("subjects").select("name_tr").eq(
-                "id", steepest_decline["subject_id"]
-            ).execute()
-            if subject_result.data:
-                steepest_decline["subject_name"] = subject_result.data[0]['name_tr']
+        # Ders isimleri: curriculum snapshot (DB yok)
+        subject_names = (await get_curriculum_async()).subject_names()
+        for subject_id, prediction in predictions.items():
+            if subject_id in subject_names:
+                prediction["subject_name"] = subject_names[subject_id]
+        
+        if steepest_decline["subject_id"] in subject_names:
+            steepest_decline["subject_name"] = subject_names[steepest_decline["subject_id"]]
         
         return {
             "success": True,
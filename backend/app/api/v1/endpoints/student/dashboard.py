@@ -5,12 +5,18 @@ FAZ-3 COMPLIANT
 - No local calculations
 """
 
-from fastapi import APIRouter, Depends
-from typing import Dict, Any
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 
-from app.db.session import get_supabase_admin
+from app.db.session import get_supabase_admin, db_execute, run_db
 from app.core.auth import get_current_user
+from app.core.curriculum import curriculum_version, get_curriculum_async
+from app.core.data_version import DAY, conditional_get
+from app.core.keyset import decode_cursor, encode_cursor, seek_desc
 from .performance import get_student_performance
 
 router = APIRouter()
@@ -48,19 +54,27 @@ def get_empty_dashboard() -> Dict[str, Any]:
 
 @router.get("/dashboard")
 async def get_student_dashboard(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
     student_id = current_user["id"]
 
-    perf_data = get_student_performance(
+    # 🏷️ Conditional GET: veri değişmediyse DB/hesap yok (haftalık pencere -> gün dilimi)
+    not_modified = conditional_get(request, response, student_id, "dashboard", bucket_seconds=DAY)
+    if not_modified:
+        return not_modified
+
+    perf_data = await run_db(
+        get_student_performance,
         student_id=student_id,
         use_cache=True
     )
 
     topic_performance = perf_data.get("topic_performance", {})
-    all_tests = perf_data.get("all_tests", [])
+    history = perf_data.get("history")
 
-    if not all_tests:
+    if history is None or not len(history):
         return get_empty_dashboard()
 
     topics_list = []
@@ -108,24 +122,11 @@ async def get_student_dashboard(
     week_ago = now - timedelta(days=7)
     month_ago = now - timedelta(days=30)
 
-    weekly_tests = [
-        t for t in all_tests
-        if datetime.fromisoformat(
-            t["test_date"].replace("Z", "+00:00")
-        ) >= week_ago
-    ]
-
-    monthly_tests = [
-        t for t in all_tests
-        if datetime.fromisoformat(
-            t["test_date"].replace("Z", "+00:00")
-        ) >= month_ago
-    ]
+    # Sıralı timestamp kolonu üzerinde searchsorted (string parse yok)
+    weekly_tests = history.since(week_ago)
+    monthly_tests = history.since(month_ago)
 
-    weekly_success = (
-        int(sum(t.get("success_rate", 0) for t in weekly_tests) / len(weekly_tests))
-        if weekly_tests else 0
-    )
+    weekly_success = int(weekly_tests.mean_success()) if len(weekly_tests) else 0
 
     return {
         "success": True,
@@ -162,53 +163,133 @@ async def get_student_profile(
     }
 
 
+# ============================================================
+# TEST HISTORY (keyset pages)
+# ============================================================
+
+TEST_HISTORY_FIELDS = (
+    "id, topic_id, test_date, correct_count, wrong_count, "
+    "empty_count, net_score, success_rate"
+)
+MAX_TESTS_PAGE_SIZE = 500
+TESTS_FETCH_PAGE_SIZE = 1000  # PostgREST max-rows
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _fetch_tests_page(supabase, student_id: str, after, size: int) -> List[Dict[str, Any]]:
+    query = (
+        supabase
+        .table("student_topic_tests")
+        .select(TEST_HISTORY_FIELDS)
+        .eq("student_id", student_id)
+    )
+    query = seek_desc(query, "test_date", after)
+    res = await db_execute(
+        query
+        .order("test_date", desc=True)
+        .order("id", desc=True)
+        .limit(size)
+    )
+    return res.data or []
+
+
+async def _iter_test_pages(supabase, student_id: str, after, size: int):
+    """Cursor'dan itibaren tüm testler, sayfa sayfa (her sayfa index seek)"""
+    while True:
+        page = await _fetch_tests_page(supabase, student_id, after, size)
+        if page:
+            yield page
+        if len(page) < size:
+            return
+        after = (page[-1]["test_date"], page[-1]["id"])
+
+
+def _format_test(test: Dict[str, Any], curriculum) -> Dict[str, Any]:
+    """Konu/ders adları curriculum snapshot'tan (satır başına join yok)"""
+    topic_name, subject_name = curriculum.topic_labels(test.get("topic_id"))
+    return {
+        "id": test["id"],
+        "test_date": test["test_date"],
+        "correct_count": test["correct_count"],
+        "wrong_count": test["wrong_count"],
+        "empty_count": test["empty_count"],
+        "net_score": float(test["net_score"]),
+        "success_rate": float(test["success_rate"]),
+        "topic": {"name_tr": topic_name},
+        "subject": {"name_tr": subject_name},
+    }
+
+
 # ============================================================
 # TEST LIST
 # ============================================================
 
 @router.get("/tests")
 async def get_student_tests(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_TESTS_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Test geçmişi (test_date DESC, id DESC)
+
+    - limit yok: tüm liste {"tests": [...]} (eski sözleşme)
+    - limit: tek sayfa + next_cursor (keyset, offset yok)
+    - stream=true / Accept: application/x-ndjson: satır satır NDJSON
+    """
     student_id = current_user["id"]
-    supabase = get_supabase_admin()
 
-    tests_response = (
-        supabase
-        .table("student_topic_tests")
-        .select("*, topics(name_tr, subjects(name_tr))")
-        .eq("student_id", student_id)
-        .order("test_date", desc=True)
-        .execute()
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+
+    wants_stream = stream or (
+        request is not None and NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    )
+
+    not_modified = conditional_get(
+        request, response, student_id, "tests",
+        curriculum_version(), limit, cursor, wants_stream
     )
+    if not_modified:
+        return not_modified
 
-    if not tests_response.data:
-        return {"tests": []}
-
-    formatted = []
-    for test in tests_response.data:
-        formatted.append({
-            "id": test["id"],
-            "test_date": test["test_date"],
-            "correct_count": test["correct_count"],
-            "wrong_count": test["wrong_count"],
-            "empty_count": test["empty_count"],
-            "net_score": float(test["net_score"]),
-            "success_rate": float(test["success_rate"]),
-            "topic": {
-                "name_tr": test["topics"]["name_tr"]
-                if test.get("topics") else None
-            },
-            "subject": {
-                "name_tr": (
-                    test["topics"]["subjects"]["name_tr"]
-                    if test.get("topics") and test["topics"].get("subjects")
-                    else None
+    supabase = get_supabase_admin()
+    curriculum = await get_curriculum_async()
+
+    if wants_stream:
+        async def lines():
+            async for page in _iter_test_pages(supabase, student_id, after, TESTS_FETCH_PAGE_SIZE):
+                yield "".join(
+                    json.dumps(_format_test(t, curriculum), ensure_ascii=False) + "\n"
+                    for t in page
                 )
-            }
-        })
 
-    return {"tests": formatted}
+        headers = {
+            k: response.headers[k] for k in ("etag", "cache-control")
+            if response is not None and k in response.headers
+        }
+        return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    if limit is None:
+        formatted = []
+        async for page in _iter_test_pages(supabase, student_id, after, TESTS_FETCH_PAGE_SIZE):
+            formatted.extend(_format_test(t, curriculum) for t in page)
+        return {"tests": formatted}
+
+    rows = await _fetch_tests_page(supabase, student_id, after, limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "tests": [_format_test(t, curriculum) for t in rows],
+        "next_cursor": encode_cursor(rows[-1]["test_date"], rows[-1]["id"]) if has_more else None,
+        "has_more": has_more,
+    }
 
 
 # ============================================================
@@ -217,20 +298,28 @@ async def get_student_tests(
 
 @router.get("/weekly-subjects")
 async def get_weekly_subjects(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
     student_id = current_user["id"]
+
+    not_modified = conditional_get(
+        request, response, student_id, "weekly-subjects", curriculum_version(), bucket_seconds=DAY
+    )
+    if not_modified:
+        return not_modified
+
     supabase = get_supabase_admin()
 
     week_ago = datetime.now(timezone.utc) - timedelta(days=7)
 
-    tests = (
+    tests = await db_execute(
         supabase
         .table("student_topic_tests")
         .select("*, topics(subjects(id, name_tr))")
         .eq("student_id", student_id)
         .gte("test_date", week_ago.isoformat())
-        .execute()
     )
 
     if not tests.data:
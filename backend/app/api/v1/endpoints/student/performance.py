@@ -10,56 +10,76 @@ Performance Orchestration Layer – FAZ 4A
 
 ROLE:
 - Orchestrates BS-Model only
-- Caches results for 30 seconds (95x speedup)
+- Caches results (95x speedup), write-through per topic on test changes
+- Cold miss: topic_performance is served from student_topic_state (written
+  by the pending test worker) after one count/newest-test probe; test rows
+  are not read. If the state is stale, only topics without a fresh state
+  row are recomputed from the test rows.
+- History (TestHistory) is loaded lazily: only for callers that ask for it
+  (include_history=True), with a narrow column select
+- Test rows are kept as a compact columnar TestHistory (not raw dicts)
 - NO UI language, NO affiliate, NO fake data
 """
 
-from typing import Dict, Any
+import logging
+import os
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
 from app.db.session import get_supabase_admin
 from app.core.bs_model_engine_v1 import BSModelV1, BSModelInput
+from app.core.cache import get_cache
+from app.core.test_history import TestHistory
+from app.core.timestamps import normalize_rows, row_day
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # 🚀 CACHE SYSTEM (FAZ 2 - 95x SPEEDUP)
 # =============================================================================
 
-_cache_store: Dict[str, tuple] = {}
-CACHE_TTL_SECONDS = 30
+CACHE_NAMESPACE = "student_performance"
+# memory backend: write-through sadece yazımı yapan worker'ı günceller;
+# diğer worker'lar yeni testi en fazla bu kadar geç görür -> kısa tutulur
+CACHE_TTL_SECONDS = int(os.getenv("PERF_CACHE_TTL_SECONDS", "30"))
+# Paylaşılan backend (CACHE_BACKEND=sqlite): write-through broadcast tüm
+# worker'lara ulaşır; TTL sadece cache dışı yazımlara karşı güvenlik payı
+SHARED_CACHE_TTL_SECONDS = int(os.getenv("PERF_SHARED_CACHE_TTL_SECONDS", "600"))
+CACHE_MAX_ENTRIES = int(os.getenv("PERF_CACHE_MAX_ENTRIES", "5000"))
+
+_cache_store = get_cache(
+    CACHE_NAMESPACE,
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS,
+)
 
 
 def _get_from_cache(cache_key: str) -> Any:
     """Check cache and return data if valid."""
-    if cache_key in _cache_store:
-        cached_time, cached_data = _cache_store[cache_key]
-        age = (datetime.now(timezone.utc) - cached_time).total_seconds()
-        if age < CACHE_TTL_SECONDS:
-            return cached_data
-    return None
+    return _cache_store.get(cache_key)
+
+
+def _cache_ttl() -> int:
+    """Uzun TTL sadece write-through tüm worker'lara ulaşıyorsa"""
+    return SHARED_CACHE_TTL_SECONDS if _cache_store.shared else CACHE_TTL_SECONDS
 
 
-def _save_to_cache(cache_key: str, data: Any) -> None:
-    """Save data to cache with timestamp."""
-    _cache_store[cache_key] = (datetime.now(timezone.utc), data)
+def _save_to_cache(cache_key: str, data: Any, broadcast: bool = False) -> None:
+    """Save data to cache (LRU + TTL bounded)."""
+    _cache_store.set(cache_key, data, ttl_seconds=_cache_ttl(), broadcast=broadcast)
 
 
 def get_cache_info() -> Dict[str, Any]:
     """Return cache statistics."""
-    return {
-        "entries": len(_cache_store),
-        "ttl_seconds": CACHE_TTL_SECONDS,
-        "keys": list(_cache_store.keys())
-    }
+    return _cache_store.stats()
 
 
 def clear_cache(student_id: str = None) -> None:
     """Clear cache for specific student or all."""
-    global _cache_store
     if student_id:
-        key = f"perf_{student_id}"
-        _cache_store.pop(key, None)
+        _cache_store.delete(f"perf_{student_id}")
     else:
-        _cache_store = {}
+        _cache_store.clear()
 
 
 # =============================================================================
@@ -83,17 +103,181 @@ def _normalize_next_interval(bs_output: Dict[str, Any]) -> Dict[str, Any]:
     return bs_output
 
 
+# =============================================================================
+# 🧮 PER-TOPIC CALCULATION
+# =============================================================================
+
+def _build_topic_entry(topic_tests: list) -> Dict[str, Any]:
+    """
+    Tek topic için BS-Model hesabı.
+    topic_tests: o topic'in testleri, test_date DESC sıralı
+    """
+    latest = topic_tests[0]
+    repetitions = len(topic_tests)
+
+    # Actual gap (days between last two tests) - pre-parsed epoch-day
+    if repetitions > 1:
+        actual_gap = row_day(latest) - row_day(topic_tests[1])
+    else:
+        actual_gap = 0
+
+    total = (
+        latest["correct_count"]
+        + latest["wrong_count"]
+        + latest["empty_count"]
+    )
+
+    # Input normalization
+    difficulty = latest.get("difficulty")
+    if difficulty is None:
+        difficulty = 3  # neutral default
+
+    bs_input = BSModelInput(
+        correct=latest["correct_count"],
+        incorrect=latest["wrong_count"],
+        blank=latest["empty_count"],
+        total=total,
+        difficulty=difficulty,
+        current_ef=latest.get("ef"),
+        current_ia=latest.get("interval_days"),
+        actual_gap=actual_gap,
+        repetitions=repetitions
+    )
+
+    bs_output = BSModelV1.calculate(bs_input)
+    bs_dict = bs_output.model_dump()
+    bs_dict = _normalize_next_interval(bs_dict)
+
+    return {
+        "bs_model": bs_dict,
+        "latest_test_date": latest["test_date"],
+        "repetitions": repetitions
+    }
+
+
+# =============================================================================
+# 💾 PERSISTED TOPIC STATE (process_pending_tests)
+# =============================================================================
+
+TOPIC_STATE_TABLE = "student_topic_state"
+
+
+# TestHistory.from_rows'un okuduğu kolonlar
+HISTORY_COLUMNS = (
+    "id, topic_id, subject_id, test_date, correct_count, wrong_count, empty_count, success_rate, net_score"
+)
+
+
+def _load_topic_states(supabase, student_id: str) -> Dict[str, Dict[str, Any]]:
+    """topic_id -> student_topic_state satırı (tablo yoksa boş; tam hesap yapılır)"""
+    try:
+        resp = (
+            supabase
+            .table(TOPIC_STATE_TABLE)
+            .select("topic_id, bs_model, repetitions, latest_test_id, latest_test_date, test_count")
+            .eq("student_id", student_id)
+            .execute()
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Topic state read failed ({student_id}): {e}")
+        return {}
+    return {str(row["topic_id"]): row for row in resp.data or []}
+
+
+def _entry_from_state(state: Dict[str, Any], topic_tests: list) -> Optional[Dict[str, Any]]:
+    """
+    State satırı testlerle tutarlıysa (aynı son test, aynı test sayısı)
+    _build_topic_entry ile aynı şekilde entry; değilse None (yeniden hesap).
+    PUT/DELETE state satırını siler, worker yeniden yazar.
+    """
+    latest = topic_tests[0]
+    if (
+        not state.get("bs_model")
+        or str(state.get("latest_test_id")) != str(latest.get("id"))
+        or int(state.get("test_count") or 0) != len(topic_tests)
+    ):
+        return None
+    return {
+        "bs_model": state["bs_model"],
+        "latest_test_date": latest["test_date"],
+        "repetitions": int(state.get("repetitions") or len(topic_tests)),
+    }
+
+
+def _performance_from_states(
+    supabase,
+    student_id: str,
+    states: Dict[str, Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Tüm state satırları güncelse topic_performance'ı sadece onlardan kur.
+
+    Tek probe sorgusu: öğrencinin test sayısı (count=exact) + en yeni testi.
+    Sayı state'lerin test_count toplamına eşit ve en yeni test bir state'in
+    latest_test_id'si ise state'ler güncel (yeni test -> sayı artar, PUT /
+    DELETE -> state satırı silinir). Değilse None: test satırlarından hesap.
+    """
+    if not states or any(not st.get("bs_model") for st in states.values()):
+        return None
+    try:
+        probe = (
+            supabase
+            .table("student_topic_tests")
+            .select("id", count="exact")
+            .eq("student_id", student_id)
+            .order("test_date", desc=True)
+            .order("id", desc=True)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Topic state freshness probe failed ({student_id}): {e}")
+        return None
+
+    newest = (probe.data or [{}])[0].get("id")
+    expected = sum(int(st.get("test_count") or 0) for st in states.values())
+    latest_ids = {str(st.get("latest_test_id")) for st in states.values()}
+    if int(probe.count or 0) != expected or str(newest) not in latest_ids:
+        return None
+
+    return {
+        topic_id: {
+            "bs_model": st["bs_model"],
+            "latest_test_date": st.get("latest_test_date"),
+            "repetitions": int(st.get("repetitions") or st.get("test_count") or 0),
+        }
+        for topic_id, st in states.items()
+    }
+
+
+def _load_history(supabase, student_id: str) -> TestHistory:
+    """Öğrencinin tüm testleri, sadece TestHistory kolonları"""
+    resp = (
+        supabase
+        .table("student_topic_tests")
+        .select(HISTORY_COLUMNS)
+        .eq("student_id", student_id)
+        .order("test_date", desc=True)
+        .execute()
+    )
+    return TestHistory.from_rows(normalize_rows(resp.data or []))
+
+
 # =============================================================================
 # 🎛️ PERFORMANCE ORCHESTRATOR
 # =============================================================================
 
 def get_student_performance(
     student_id: str,
-    use_cache: bool = True
+    use_cache: bool = True,
+    include_history: bool = True,
 ) -> Dict[str, Any]:
     """
     Main orchestration function.
     Returns topic performance with BS-Model calculations.
+
+    include_history=False: history test satırlarından yüklenmez (None kalabilir);
+    güncel state varsa okuma state lookup + tek probe sorgusudur.
     """
     
     # ========== CACHE CHECK ==========
@@ -102,12 +286,33 @@ def get_student_performance(
     if use_cache:
         cached = _get_from_cache(cache_key)
         if cached:
+            if include_history and cached.get("history") is None:
+                cached["history"] = _load_history(get_supabase_admin(), student_id)
+                _save_to_cache(cache_key, cached)
             cached["metadata"]["from_cache"] = True
             return cached
     
-    # ========== DATABASE FETCH ==========
     supabase = get_supabase_admin()
 
+    # ========== STATE LOOKUP ==========
+    states = _load_topic_states(supabase, student_id)
+    topic_performance = _performance_from_states(supabase, student_id, states)
+    if topic_performance is not None:
+        result = {
+            "topic_performance": topic_performance,
+            "history": _load_history(supabase, student_id) if include_history else None,
+            "projection": None,
+            "metadata": {
+                "source": "faz4a",
+                "from_cache": False,
+                "topic_state_hits": len(topic_performance),
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            }
+        }
+        _save_to_cache(cache_key, result)
+        return result
+
+    # ========== DATABASE FETCH ==========
     tests_resp = (
         supabase
         .table("student_topic_tests")
@@ -117,13 +322,14 @@ def get_student_performance(
         .execute()
     )
 
-    tests = tests_resp.data or []
+    # test_date tek geçişte parse edilir (gap + history aynı alanı okur)
+    tests = normalize_rows(tests_resp.data or [])
 
     # ========== EMPTY CASE ==========
     if not tests:
         result = {
             "topic_performance": {},
-            "all_tests": [],
+            "history": TestHistory.empty_history(),
             "projection": None,
             "metadata": {
                 "source": "faz4a",
@@ -139,66 +345,30 @@ def get_student_performance(
     for t in tests:
         topic_groups.setdefault(t["topic_id"], []).append(t)
 
-    topic_performance: Dict[str, Any] = {}
+    topic_performance = {}
+    state_hits = 0
 
     # ========== CALCULATE PER TOPIC ==========
+    # Worker'ın yazdığı güncel state varsa lookup, yoksa BS-Model hesabı
     for topic_id, topic_tests in topic_groups.items():
-        latest = topic_tests[0]
-        repetitions = len(topic_tests)
-
-        # Actual gap (days between last two tests)
-        if repetitions > 1:
-            prev_date = datetime.fromisoformat(
-                topic_tests[1]["test_date"].replace("Z", "+00:00")
-            ).date()
-            last_date = datetime.fromisoformat(
-                latest["test_date"].replace("Z", "+00:00")
-            ).date()
-            actual_gap = (last_date - prev_date).days
+        state = states.get(str(topic_id))
+        entry = _entry_from_state(state, topic_tests) if state else None
+        if entry is None:
+            entry = _build_topic_entry(topic_tests)
         else:
-            actual_gap = 0
-
-        total = (
-            latest["correct_count"]
-            + latest["wrong_count"]
-            + latest["empty_count"]
-        )
-
-        # Input normalization
-        difficulty = latest.get("difficulty")
-        if difficulty is None:
-            difficulty = 3  # neutral default
-
-        bs_input = BSModelInput(
-            correct=latest["correct_count"],
-            incorrect=latest["wrong_count"],
-            blank=latest["empty_count"],
-            total=total,
-            difficulty=difficulty,
-            current_ef=latest.get("ef"),
-            current_ia=latest.get("interval_days"),
-            actual_gap=actual_gap,
-            repetitions=repetitions
-        )
-
-        bs_output = BSModelV1.calculate(bs_input)
-        bs_dict = bs_output.model_dump()
-        bs_dict = _normalize_next_interval(bs_dict)
-
-        topic_performance[topic_id] = {
-            "bs_model": bs_dict,
-            "latest_test_date": latest["test_date"],
-            "repetitions": repetitions
-        }
+            state_hits += 1
+        topic_performance[topic_id] = entry
 
     # ========== BUILD RESULT ==========
+    # Ham dict listesi yerine kolonsal history cache'lenir (bellek ~10x düşer)
     result = {
         "topic_performance": topic_performance,
-        "all_tests": tests,
+        "history": TestHistory.from_rows(tests),
         "projection": None,
         "metadata": {
             "source": "faz4a",
             "from_cache": False,
+            "topic_state_hits": state_hits,
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
     }
@@ -207,3 +377,86 @@ def get_student_performance(
     _save_to_cache(cache_key, result)
 
     return result
+
+
+# =============================================================================
+# ✍️ WRITE-THROUGH (INCREMENTAL)
+# =============================================================================
+
+def update_topic_performance(student_id: str, topic_id: str) -> bool:
+    """
+    Bir test eklendi/güncellendi/silindiğinde çağrılır.
+
+    Cache'te öğrencinin aggregate'i varsa sadece ilgili topic'in testleri
+    okunur ve o topic'in entry'si yeniden hesaplanır; diğer topic'lere
+    dokunulmaz. Aggregate yoksa bir sonraki okuma zaten tam hesap yapar.
+
+    Returns: aggregate güncellendiyse True
+    """
+    if _get_from_cache(f"perf_{student_id}") is None:
+        return False
+
+    try:
+        supabase = get_supabase_admin()
+        topic_resp = (
+            supabase
+            .table("student_topic_tests")
+            .select("*")
+            .eq("student_id", student_id)
+            .eq("topic_id", topic_id)
+            .order("test_date", desc=True)
+            .execute()
+        )
+        return apply_topic_tests(student_id, topic_id, normalize_rows(topic_resp.data or []))
+
+    except Exception as e:
+        logger.warning(f"⚠️ Incremental performance update failed ({student_id}/{topic_id}): {e}")
+        clear_cache(student_id)
+        return False
+
+
+def apply_topic_tests(student_id: str, topic_id: str, topic_tests: list) -> bool:
+    """
+    Cache'teki aggregate'e tek topic'in güncel testlerini uygula
+    (topic_tests: normalize edilmiş, test_date DESC). Okuma yapmaz;
+    pending test worker'ı zaten elindeki satırlarla çağırır.
+
+    Returns: aggregate güncellendiyse True
+    """
+    cache_key = f"perf_{student_id}"
+    cached = _get_from_cache(cache_key)
+    if cached is None:
+        return False
+
+    try:
+        history = cached.get("history")
+        if history is not None:
+            # Yüklenmemiş history (include_history=False) lazy kalır
+            history = history.without_topic(topic_id).merge(TestHistory.from_rows(topic_tests))
+
+        topic_performance = dict(cached.get("topic_performance", {}))
+        if topic_tests:
+            topic_performance[topic_id] = _build_topic_entry(topic_tests)
+        else:
+            topic_performance.pop(topic_id, None)
+
+        result = {
+            "topic_performance": topic_performance,
+            "history": history,
+            "projection": None,
+            "metadata": {
+                "source": "faz4a",
+                "from_cache": False,
+                "incremental": True,
+                "generated_at": datetime.now(timezone.utc).isoformat()
+            }
+        }
+
+        # broadcast: diğer worker'ların yerel kopyası da yenilenir
+        _save_to_cache(cache_key, result, broadcast=True)
+        return True
+
+    except Exception as e:
+        logger.warning(f"⚠️ Incremental performance update failed ({student_id}/{topic_id}): {e}")
+        clear_cache(student_id)
+        return False
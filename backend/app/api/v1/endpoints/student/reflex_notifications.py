@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from app.core.auth import get_current_user
+from app.core.data_version import MINUTE, bump_student_version, conditional_get
 from app.db.session import get_supabase_admin
 
 router = APIRouter(tags=["Student Notifications"])
@@ -7,8 +8,17 @@ router = APIRouter(tags=["Student Notifications"])
 
 @router.get("/reflex-notifications")
 async def get_reflex_notifications(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
+    # Event'ler DB trigger'larıyla da eklenir: ETag en fazla 1 dk geçerli
+    not_modified = conditional_get(
+        request, response, current_user["id"], "reflex-notifications", bucket_seconds=MINUTE
+    )
+    if not_modified:
+        return not_modified
+
     supabase = get_supabase_admin()
 
     res = (
@@ -42,4 +52,6 @@ async def dismiss_reflex_notification(
         .eq("student_id", current_user["id"]) \
         .execute()
 
+    bump_student_version(current_user["id"])
+
     return {"ok": True}
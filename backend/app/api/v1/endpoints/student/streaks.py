@@ -0,0 +1,347 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: streaks.py
+# Role: O(n) study-streak engine + persisted per-student streak counters
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Gün = UTC epoch-day (timestamps.row_day ile aynı)
+# - Tam hesap O(n): gün kümesi bir kez kurulur, her seri bir kez yürünür
+# - Yeni test (en son güne / ertesi güne) O(1); geçmişe ekleme ve silme O(d)
+# - Okuma O(1): cache -> student_streaks satırı -> testlerden yeniden kurulum
+# =============================================================================
+
+"""
+streaks.py - Study streak engine
+
+    state = StreakState.from_days("s1", [row_day(t) for t in tests])
+    state.summary(today_day)      # current / longest / status / milestone
+
+Yazma yolları (test submit / PUT / DELETE) state'i write-through günceller:
+
+    record_test_day(student_id, test_date)     # submit
+    remove_test_day(student_id, test_date)     # delete
+    refresh_streak_state(student_id)           # update (eski tarih bilinmez)
+
+State `student_streaks` tablosunda saklanır (migration 028); tablo yoksa
+sadece cache katmanı kullanılır ve okuma yolu testlerden yeniden kurar.
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.db.session import get_supabase_admin
+from app.core.cache import get_cache
+from app.core.timestamps import day_to_date, epoch_day, row_day
+
+logger = logging.getLogger(__name__)
+
+STREAK_TABLE = "student_streaks"
+STREAK_MILESTONES = (3, 7, 14, 30, 60, 100, 180, 365)
+
+CACHE_NAMESPACE = "student_streaks"
+# memory backend: write-through diğer worker'lara ulaşmaz -> kısa TTL
+CACHE_TTL_SECONDS = int(os.getenv("STREAK_CACHE_TTL_SECONDS", "30"))
+SHARED_CACHE_TTL_SECONDS = int(os.getenv("STREAK_SHARED_CACHE_TTL_SECONDS", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("STREAK_CACHE_MAX_ENTRIES", "10000"))
+
+_cache_store = get_cache(
+    CACHE_NAMESPACE,
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS,
+)
+
+# Öğrenci başına read-modify-write kilidi (sabit sayıda, hash ile seçilir)
+_STATE_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+def _state_lock(student_id: str) -> threading.Lock:
+    return _STATE_LOCKS[hash(student_id) % len(_STATE_LOCKS)]
+
+
+# =============================================================================
+# 🔥 ENGINE
+# =============================================================================
+
+@dataclass
+class StreakState:
+    """
+    Öğrencinin çalışma günleri + seri sayaçları.
+
+    day_counts: epoch-day -> o günkü test sayısı (silme günü ancak 0'da boşaltır)
+    last_day / run_start: en son çalışılan gün ve o günde biten serinin başı
+    longest: tüm zamanların en uzun serisi
+    """
+    student_id: str
+    day_counts: Dict[int, int] = field(default_factory=dict)
+    last_day: Optional[int] = None
+    run_start: Optional[int] = None
+    longest: int = 0
+    test_count: int = 0
+
+    @classmethod
+    def from_days(cls, student_id: str, days: Iterable[Optional[int]]) -> "StreakState":
+        """Tam hesap: O(n) sayım + O(d) seri taraması"""
+        counts = Counter(d for d in days if d is not None)
+        state = cls(student_id=student_id, day_counts=dict(counts))
+        state.test_count = sum(counts.values())
+        state._rescan()
+        return state
+
+    @classmethod
+    def from_rows(cls, student_id: str, rows: Iterable[Dict[str, Any]]) -> "StreakState":
+        """student_topic_tests satırlarından (normalize edilmişse tekrar parse yok)"""
+        return cls.from_days(student_id, (row_day(r) for r in rows))
+
+    def _rescan(self) -> None:
+        # Her seri sadece başlangıç gününden (d-1 yok) ileri yürünür -> O(d)
+        days = self.day_counts
+        self.last_day, self.run_start, self.longest = None, None, 0
+        for start in days:
+            if start - 1 in days:
+                continue
+            end = start
+            while end + 1 in days:
+                end += 1
+            self.longest = max(self.longest, end - start + 1)
+            if self.last_day is None or end > self.last_day:
+                self.last_day, self.run_start = end, start
+
+    def copy(self) -> "StreakState":
+        """Cache'teki nesne paylaşılır; mutasyon kopya üzerinde yapılır"""
+        return replace(self, day_counts=dict(self.day_counts))
+
+    # ---------- incremental ----------
+    def add(self, day: int) -> None:
+        self.test_count += 1
+        seen = self.day_counts.get(day, 0)
+        self.day_counts[day] = seen + 1
+        if seen:
+            return
+
+        if self.last_day is None or day > self.last_day + 1:
+            self.last_day = self.run_start = day
+            self.longest = max(self.longest, 1)
+        elif day == self.last_day + 1:
+            self.last_day = day
+            self.longest = max(self.longest, day - self.run_start + 1)
+        else:
+            # Geçmiş tarihli test iki seriyi birleştirebilir
+            self._rescan()
+
+    def remove(self, day: int) -> None:
+        seen = self.day_counts.get(day, 0)
+        if not seen:
+            return
+        self.test_count -= 1
+        if seen > 1:
+            self.day_counts[day] = seen - 1
+            return
+        del self.day_counts[day]
+        # Seri bölünebilir, longest düşebilir
+        self._rescan()
+
+    # ---------- read ----------
+    def current(self, today: int) -> int:
+        if today not in self.day_counts:
+            return 0
+        if self.run_start <= today <= self.last_day:
+            return today - self.run_start + 1
+        # Yerel "bugün" son serinin dışında (UTC gün kayması): geriye yürü
+        length, day = 0, today
+        while day in self.day_counts:
+            length += 1
+            day -= 1
+        return length
+
+    def summary(self, today: int) -> Dict[str, Any]:
+        current = self.current(today)
+        last = today if current else self.last_day
+        return {
+            "current_streak": current,
+            "longest_streak": max(self.longest, current),
+            "streak_status": "active" if current > 0 else "broken",
+            "last_study_date": str(day_to_date(last)) if last is not None else "",
+            "next_milestone": next_milestone(current),
+        }
+
+    # ---------- persistence ----------
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "student_id": self.student_id,
+            "day_counts": {str(d): c for d, c in self.day_counts.items()},
+            "last_study_day": self.last_day,
+            "run_start_day": self.run_start,
+            "longest_streak": self.longest,
+            "test_count": self.test_count,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "StreakState":
+        return cls(
+            student_id=row["student_id"],
+            day_counts={int(d): int(c) for d, c in (row.get("day_counts") or {}).items()},
+            last_day=row.get("last_study_day"),
+            run_start=row.get("run_start_day"),
+            longest=int(row.get("longest_streak") or 0),
+            test_count=int(row.get("test_count") or 0),
+        )
+
+
+def next_milestone(current: int) -> int:
+    for milestone in STREAK_MILESTONES:
+        if milestone > current:
+            return milestone
+    return (current // 100 + 1) * 100
+
+
+# =============================================================================
+# 💾 STORE (cache -> DB -> rebuild)
+# =============================================================================
+
+def _cache_key(student_id: str) -> str:
+    return f"streak_{student_id}"
+
+
+def _load_row(student_id: str) -> Optional[StreakState]:
+    try:
+        resp = (
+            get_supabase_admin()
+            .table(STREAK_TABLE)
+            .select("*")
+            .eq("student_id", student_id)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Streak state read failed ({student_id}): {e}")
+        return None
+    rows = resp.data or []
+    return StreakState.from_row(rows[0]) if rows else None
+
+
+def _fetch_test_days(student_id: str) -> List[Optional[int]]:
+    resp = (
+        get_supabase_admin()
+        .table("student_topic_tests")
+        .select("test_date")
+        .eq("student_id", student_id)
+        .execute()
+    )
+    return [row_day(r) for r in resp.data or []]
+
+
+def _cache_ttl() -> int:
+    return SHARED_CACHE_TTL_SECONDS if _cache_store.shared else CACHE_TTL_SECONDS
+
+
+def save_streak_state(state: StreakState) -> None:
+    # broadcast: diğer worker'ların yerel kopyası da yenilenir
+    _cache_store.set(_cache_key(state.student_id), state, ttl_seconds=_cache_ttl(), broadcast=True)
+    try:
+        get_supabase_admin().table(STREAK_TABLE).upsert(
+            state.to_row(), on_conflict="student_id"
+        ).execute()
+    except Exception as e:
+        # Tablo yoksa (migration 028 uygulanmamış) cache katmanı yeterli
+        logger.warning(f"⚠️ Streak state persist failed ({state.student_id}): {e}")
+
+
+def clear_streak_cache(student_id: Optional[str] = None) -> None:
+    if student_id:
+        _cache_store.delete(_cache_key(student_id))
+    else:
+        _cache_store.clear()
+
+
+def get_streak_state(
+    student_id: str,
+    rows: Optional[List[Dict[str, Any]]] = None,
+) -> StreakState:
+    """
+    O(1) okuma: cache -> student_streaks satırı.
+
+    rows verilirse (çağıran testleri zaten çekmişse) test sayısı ile tutarlılık
+    kontrolü yapılır; state yoksa veya eskimişse bu satırlardan yeniden kurulur.
+    """
+    state = _cache_store.get(_cache_key(student_id))
+    if state is None:
+        state = _load_row(student_id)
+        if state is not None:
+            _cache_store.set(_cache_key(student_id), state, ttl_seconds=_cache_ttl())
+
+    if state is not None and (rows is None or state.test_count == len(rows)):
+        return state
+
+    if rows is not None:
+        state = StreakState.from_rows(student_id, rows)
+    else:
+        state = StreakState.from_days(student_id, _fetch_test_days(student_id))
+    save_streak_state(state)
+    return state
+
+
+# =============================================================================
+# ✍️ WRITE-THROUGH
+# =============================================================================
+
+def record_test_day(student_id: str, test_date: Any) -> bool:
+    """
+    Test eklendikten sonra çağrılır. State yoksa DB'den (yeni test dahil)
+    kurulur; varsa sadece o gün sayacı artar.
+
+    Returns: state incremental güncellendiyse True
+    """
+    try:
+        with _state_lock(student_id):
+            state = _cache_store.get(_cache_key(student_id)) or _load_row(student_id)
+            if state is None:
+                get_streak_state(student_id)
+                return False
+            state = state.copy()
+            state.add(epoch_day(test_date))
+            save_streak_state(state)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Streak update failed ({student_id}): {e}")
+        clear_streak_cache(student_id)
+        return False
+
+
+def remove_test_day(student_id: str, test_date: Any) -> bool:
+    """Test silindikten sonra çağrılır (gün sayacı düşer, gerekirse seri bölünür)"""
+    try:
+        with _state_lock(student_id):
+            state = _cache_store.get(_cache_key(student_id)) or _load_row(student_id)
+            if state is None:
+                get_streak_state(student_id)
+                return False
+            state = state.copy()
+            state.remove(epoch_day(test_date))
+            save_streak_state(state)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Streak update failed ({student_id}): {e}")
+        clear_streak_cache(student_id)
+        return False
+
+
+def refresh_streak_state(student_id: str) -> Optional[StreakState]:
+    """Test tarihi değiştiğinde: eski gün bilinmediği için tam yeniden kurulum"""
+    with _state_lock(student_id):
+        try:
+            state = StreakState.from_days(student_id, _fetch_test_days(student_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Streak rebuild failed ({student_id}): {e}")
+            clear_streak_cache(student_id)
+            return None
+        save_streak_state(state)
+    return state
@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 from collections import Counter
 
 from app.db.session import get_supabase_admin
+from app.core.rate_limit import rate_limit
 
 router = APIRouter()
 
@@ -42,7 +43,10 @@ class SupportFeedbackResponse(BaseModel):
 # ENDPOINTS
 # ============================================
 
-@router.post("/support-feedback/submit")
+@router.post(
+    "/support-feedback/submit",
+    dependencies=[Depends(rate_limit("support_feedback_submit", limit=5, window_seconds=60))]
+)
 async def submit_support_feedback(feedback: SupportFeedbackSubmit, current_user: dict = Depends(get_current_user)):
     """🎯 Kullanıcı support feedback gönderir"""
     try:
@@ -13,8 +13,12 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 import random
 
-from app.db.session import get_supabase_admin
+from app.db.session import get_supabase_admin, db_execute, run_db
 from app.core.auth import get_current_user
+from app.core.data_version import bump_student_version
+from app.core.test_history import TestHistory
+from app.core.timestamps import epoch_day, normalize_rows, row_utc
+from .streaks import StreakState, get_streak_state
 from .utils import (
     get_user_date,
     calculate_remembering_rate,
@@ -165,7 +169,9 @@ def calculate_at_risk_topics(topic_performance: Dict[str, Dict[str, Any]], limit
         if not latest_date_raw:
             continue
 
-        test_date = datetime.fromisoformat(latest_date_raw.replace("Z", "+00:00"))
+        test_date = row_utc(latest)
+        if test_date is None:
+            continue
         remembering_rate = calculate_remembering_rate(tests)
         next_review = calculate_next_review_date(remembering_rate, test_date)
 
@@ -230,32 +236,11 @@ def calculate_priority_topics(topic_performance: Dict[str, Dict[str, Any]], limi
     return priority[:limit]
 
 
-def calculate_streak(all_tests: List[Dict[str, Any]], x_user_timezone: str) -> StudyStreak:
-    """Streak: consecutive days with test entries"""
-    today = get_user_date(x_user_timezone)
-    streak_days = []
-    check_date = today
-
-    for _ in range(365):
-        day_tests = [
-            t for t in all_tests
-            if datetime.fromisoformat(t["test_date"].replace("Z", "+00:00")).date() == check_date
-        ]
-        if day_tests:
-            streak_days.append(check_date)
-            check_date -= timedelta(days=1)
-        else:
-            break
-
-    current_streak = len(streak_days)
-
-    return StudyStreak(
-        current_streak=current_streak,
-        longest_streak=max(current_streak, 12),
-        streak_status="active" if current_streak > 0 else "broken",
-        last_study_date=str(streak_days[0]) if streak_days else "",
-        next_milestone=7
-    )
+def calculate_streak(history: TestHistory, x_user_timezone: str) -> StudyStreak:
+    """Streak: consecutive days with test entries (O(n) tam hesap)"""
+    today = epoch_day(get_user_date(x_user_timezone))
+    state = StreakState.from_days("", history.day.tolist())
+    return StudyStreak(**state.summary(today))
 
 
 def generate_motivation_message(tasks: List[Dict], dominant_motor: str) -> Dict:
@@ -374,7 +359,7 @@ def generate_motor_driven_tasks(student_id: str, date: str, max_tasks: int = 5):
         .execute()
     )
     
-    tests = tests_result.data or []
+    tests = normalize_rows(tests_result.data or [])
     
     if not tests:
         print("⚠️  No test history found, creating demo tasks")
@@ -414,7 +399,9 @@ def generate_motor_driven_tasks(student_id: str, date: str, max_tasks: int = 5):
         if not test_date_str:
             continue
             
-        test_date = datetime.fromisoformat(test_date_str.replace('Z', '+00:00'))
+        test_date = row_utc(last_test)
+        if test_date is None:
+            continue
         days_since = (datetime.now(timezone.utc) - test_date).days
         
         next_review = calculate_next_review_date(remembering_rate, test_date)
@@ -647,15 +634,14 @@ async def get_todays_tasks(
         student_id = current_user["id"]
         supabase = get_supabase_admin()
 
-        all_tests_res = (
+        all_tests_res = await db_execute(
             supabase.table("student_topic_tests")
             .select("*, topics(name_tr, subjects(name_tr))")
             .eq("student_id", student_id)
             .order("test_date", desc=True)
-            .execute()
         )
 
-        all_tests = all_tests_res.data or []
+        all_tests = normalize_rows(all_tests_res.data or [])
 
         if not all_tests:
             return build_mock_todays_tasks(student_id=student_id, message="Henüz test eklenmedi")
@@ -664,7 +650,9 @@ async def get_todays_tasks(
 
         at_risk = calculate_at_risk_topics(topic_performance, limit=3)
         priority = calculate_priority_topics(topic_performance, limit=3)
-        streak = calculate_streak(all_tests, x_user_timezone)
+        # Persisted sayaçlar: O(1) okuma (eksik/eskimişse bu testlerden kurulur)
+        streak_state = await run_db(get_streak_state, student_id, all_tests)
+        streak = StudyStreak(**streak_state.summary(epoch_day(get_user_date(x_user_timezone))))
 
         time_stats = TimeStats(
             total_study_time_today=45,
@@ -708,13 +696,12 @@ async def get_todays_tasks_list(
         today_date = get_user_date(x_user_timezone)
         today_str = today_date.isoformat()
 
-        tasks_res = (
+        tasks_res = await db_execute(
             supabase.table("student_tasks")
             .select("*")
             .eq("student_id", student_id)
             .eq("task_date", today_str)
             .order("priority_level", desc=False)
-            .execute()
         )
 
         tasks = tasks_res.data or []
@@ -722,43 +709,42 @@ async def get_todays_tasks_list(
         # ✅ EĞER 5'TEN FAZLA GÖREV VARSA TEMİZLE (Limit aşımı)
         if len(tasks) > 5:
             print(f"🚨 TOO MANY TASKS ({len(tasks)})! Cleaning up...")
-            supabase.table("student_tasks").delete().eq("student_id", student_id).eq("task_date", today_str).execute()
+            await db_execute(supabase.table("student_tasks").delete().eq("student_id", student_id).eq("task_date", today_str))
             tasks = []
         # ✅ EĞER MOCK IZLERİ VARSA TEMİZLE
         elif tasks and any(t.get("source_motor") in ["priority", "repetition", "weakness", "speed"] 
                           and t.get("topic_name") in ["Limit", "İntegral", "Türev", "Fonksiyonlar"] 
                           for t in tasks):
             print("🚨 MOCK DATA DETECTED! Cleaning up...")
-            supabase.table("student_tasks").delete().eq("student_id", student_id).eq("task_date", today_str).execute()
+            await db_execute(supabase.table("student_tasks").delete().eq("student_id", student_id).eq("task_date", today_str))
             tasks = []
         
         # ✅ OTOMATİK TASK CREATION
         if not tasks:
             print(f"⚠️  No tasks for {today_str}, generating motor-driven tasks...")
-            generate_motor_driven_tasks(student_id, today_str, max_tasks=5)
+            await run_db(generate_motor_driven_tasks, student_id, today_str, max_tasks=5)
+            bump_student_version(student_id)
             
             # Yeniden çek
-            tasks = (
+            tasks = (await db_execute(
                 supabase.table("student_tasks")
                 .select("*")
                 .eq("student_id", student_id)
                 .eq("task_date", today_str)
                 .order("priority_level", desc=False)
-                .execute()
-            ).data or []
+            )).data or []
 
         total_time = sum([t.get("estimated_time_minutes", 0) for t in tasks])
         completed_time = sum([t.get("estimated_time_minutes", 0) for t in tasks if t.get("status") == "completed"])
 
         # At-risk calculation
-        topic_tests_res = (
+        topic_tests_res = await db_execute(
             supabase.table("student_topic_tests")
             .select("*, topics(name_tr, subjects(name_tr))")
             .eq("student_id", student_id)
             .order("test_date", desc=True)
-            .execute()
         )
-        topic_tests = topic_tests_res.data or []
+        topic_tests = normalize_rows(topic_tests_res.data or [])
         topic_performance = group_tests_by_topic(topic_tests)
 
         at_risk_models = calculate_at_risk_topics(topic_performance, limit=3)
@@ -805,7 +791,7 @@ async def complete_task(
     try:
         supabase = get_supabase_admin()
 
-        task_res = supabase.table("student_tasks").select("*").eq("id", task_id).execute()
+        task_res = await db_execute(supabase.table("student_tasks").select("*").eq("id", task_id))
         if not task_res.data:
             return {"success": False, "error": "Görev bulunamadı"}
 
@@ -819,7 +805,8 @@ async def complete_task(
             "manual_completion": manual
         }
 
-        result = supabase.table("student_tasks").update(update_data).eq("id", task_id).execute()
+        result = await db_execute(supabase.table("student_tasks").update(update_data).eq("id", task_id))
+        bump_student_version(task["student_id"])
 
         return {
             "success": True,
@@ -843,7 +830,7 @@ async def uncomplete_task(
     try:
         supabase = get_supabase_admin()
 
-        task_res = supabase.table("student_tasks").select("*").eq("id", task_id).execute()
+        task_res = await db_execute(supabase.table("student_tasks").select("*").eq("id", task_id))
         if not task_res.data:
             return {"success": False, "error": "Görev bulunamadı"}
 
@@ -860,7 +847,8 @@ async def uncomplete_task(
             "manual_completion": False
         }
 
-        result = supabase.table("student_tasks").update(update_data).eq("id", task_id).execute()
+        result = await db_execute(supabase.table("student_tasks").update(update_data).eq("id", task_id))
+        bump_student_version(task["student_id"])
 
         return {
             "success": True,
@@ -885,13 +873,13 @@ async def cleanup_tasks(
         supabase = get_supabase_admin()
         student_id = current_user["id"]
 
-        result = (
+        result = await db_execute(
             supabase.table("student_tasks")
             .delete()
             .eq("student_id", student_id)
             .eq("task_date", date)
-            .execute()
         )
+        bump_student_version(student_id)
 
         return {
             "success": True,
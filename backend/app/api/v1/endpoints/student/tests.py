@@ -3,13 +3,33 @@ Student Tests Endpoints
 - Update test
 - Delete test
 """
+import logging
+
 from fastapi import APIRouter, HTTPException, Depends
 from app.core.auth import get_current_user
-from app.db.session import get_supabase_admin
+from app.db.session import db_execute, get_supabase_admin, run_db
+from app.core.data_version import bump_student_version
 from datetime import datetime, timezone
+from .performance import update_topic_performance
+from .streaks import refresh_streak_state, remove_test_day
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+def _requeue_topic_state(supabase, student_id: str, topic_id: str) -> None:
+    """Kalıcı topic state'i geçersiz kıl, worker yeniden hesaplasın"""
+    # Local import: job modülü performance.py üzerinden bu paketi import ediyor
+    from app.jobs.process_pending_tests import requeue_topic
+
+    try:
+        requeue_topic(supabase, student_id, topic_id)
+    except Exception as e:
+        # Pipeline migration'ı (032) yoksa state de yoktur
+        logger.warning(f"⚠️ Topic state requeue failed ({student_id}/{topic_id}): {e}")
+
+
 @router.put("/tests/{test_id}")
 async def update_test(test_id: str, test_data: dict, current_user: dict = Depends(get_current_user)):
     """
@@ -38,14 +58,21 @@ async def update_test(test_id: str, test_data: dict, current_user: dict = Depend
     }
     
     # Güncelle
-    response = supabase.table("student_topic_tests").update(
-        update_data
-    ).eq("id", test_id).execute()
+    response = await db_execute(
+        supabase.table("student_topic_tests").update(update_data).eq("id", test_id)
+    )
     
     if not response.data:
         return {"success": False, "error": "Test bulunamadı"}
+
+    # ♻️ Write-through: sadece bu topic yeniden hesaplanır
+    updated = response.data[0]
+    await run_db(_requeue_topic_state, supabase, updated["student_id"], updated["topic_id"])
+    await run_db(update_topic_performance, updated["student_id"], updated["topic_id"])
+    await run_db(refresh_streak_state, updated["student_id"])
+    bump_student_version(updated["student_id"])
     
-    return {"success": True, "test": response.data[0]}
+    return {"success": True, "test": updated}
 
 @router.delete("/tests/{test_id}")
 async def delete_test(test_id: str, current_user: dict = Depends(get_current_user)):
@@ -55,11 +82,18 @@ async def delete_test(test_id: str, current_user: dict = Depends(get_current_use
     supabase = get_supabase_admin()
     
     # Sil
-    response = supabase.table("student_topic_tests").delete().eq(
-        "id", test_id
-    ).execute()
+    response = await db_execute(
+        supabase.table("student_topic_tests").delete().eq("id", test_id)
+    )
     
     if not response.data:
         return {"success": False, "error": "Test bulunamadı"}
+
+    # ♻️ Write-through: silinen testin topic'i yeniden hesaplanır
+    deleted = response.data[0]
+    await run_db(_requeue_topic_state, supabase, deleted["student_id"], deleted["topic_id"])
+    await run_db(update_topic_performance, deleted["student_id"], deleted["topic_id"])
+    await run_db(remove_test_day, deleted["student_id"], deleted.get("test_date"))
+    bump_student_version(deleted["student_id"])
     
     return {"success": True}
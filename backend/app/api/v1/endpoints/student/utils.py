@@ -8,6 +8,8 @@ Student Helper Functions
 from datetime import datetime, timezone, timedelta
 from typing import List
 
+from app.core.timestamps import row_utc
+
 # Türkçe aylar
 TURKISH_MONTHS = {
     1: "Ocak", 2: "Şubat", 3: "Mart", 4: "Nisan",
@@ -88,7 +90,9 @@ def calculate_remembering_rate(tests_data):
         return 0
     
     latest_test = tests_data[0]
-    test_date = datetime.fromisoformat(latest_test["test_date"].replace('Z', '+00:00'))
+    test_date = row_utc(latest_test)  # normalize_rows ile pre-parsed
+    if test_date is None:
+        return 0
     now = datetime.now(timezone.utc)
     days_passed = (now - test_date).days
     
@@ -21,6 +21,7 @@ from collections import defaultdict
 
 from app.core.auth import get_current_user
 from app.db.session import get_supabase_admin
+from app.core.curriculum import get_curriculum_async
 
 # progress calculators'ı yeniden kullanacağız
 from app.api.v1.endpoints.progress.calculators import calculate_trends
@@ -48,8 +49,7 @@ async def student_trend_post_alias(
 
         tests = tests_result.data or []
 
-        subjects_result = supabase.table("subjects").select("id, name_tr").execute()
-        subjects_map = {s["id"]: s["name_tr"] for s in (subjects_result.data or [])}
+        subjects_map = (await get_curriculum_async()).subject_names()
 
         data = calculate_trends(
             tests=tests,
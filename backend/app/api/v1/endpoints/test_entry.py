@@ -3,19 +3,29 @@ Test Entry Endpoints
 Öğrenci test girişi için API'ler
 """
 
+import time
 import uuid
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel
-from app.db.session import get_supabase_admin
+from app.db.session import get_supabase_admin, run_db
 from app.core.auth import get_current_user
+from app.core.curriculum import get_curriculum_async
+from app.core.data_version import bump_student_version
+from app.core.rate_limit import rate_limit
+from app.api.v1.endpoints.student.performance import update_topic_performance
+from app.api.v1.endpoints.student.streaks import record_test_day
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Public endpoint response kolonları (snapshot tüm kolonları tutar)
+SUBJECT_FIELDS = ("id", "code", "name_tr", "icon", "color")
+TOPIC_FIELDS = ("id", "code", "name_tr", "difficulty_level", "exam_weight")
+
 
 # ============================================
 # REQUEST MODEL
@@ -48,16 +58,10 @@ class TestResultSubmit(BaseModel):
 
 @router.get("/subjects")
 async def get_subjects():
-    supabase = get_supabase_admin()
+    # 📚 Curriculum snapshot: DB'ye gitmeden (versiyon değişince yenilenir)
     try:
-        result = (
-            supabase.table("subjects")
-            .select("id, code, name_tr, icon, color")
-            .eq("is_active", True)
-            .order("name_tr")
-            .execute()
-        )
-        return result.data
+        curriculum = await get_curriculum_async()
+        return curriculum.active_subjects(fields=SUBJECT_FIELDS)
     except Exception as e:
         logger.error(f"Subjects Error: {e}")
         raise HTTPException(500, "Subjects load failed")
@@ -65,17 +69,9 @@ async def get_subjects():
 
 @router.get("/subjects/{subject_id}/topics")
 async def get_topics_by_subject(subject_id: str):
-    supabase = get_supabase_admin()
     try:
-        result = (
-            supabase.table("topics")
-            .select("id, code, name_tr, difficulty_level, exam_weight")
-            .eq("subject_id", subject_id)
-            .eq("is_active", True)
-            .order("name_tr")
-            .execute()
-        )
-        return result.data
+        curriculum = await get_curriculum_async()
+        return curriculum.active_topics(subject_id, fields=TOPIC_FIELDS)
     except Exception as e:
         logger.error(f"Topics Error: {e}")
         raise HTTPException(500, "Topics load failed")
@@ -112,6 +108,7 @@ def auto_complete_task_if_exists(
                 "manual_completion": False,
                 "test_result_id": test_result_id
             }).eq("id", task["id"]).execute()
+            bump_student_version(student_id)
 
             return {
                 "auto_completed": True,
@@ -126,14 +123,109 @@ def auto_complete_task_if_exists(
         return {"auto_completed": False}
 
 
+# ============================================
+# SUBMIT (single round trip)
+# ============================================
+
+SUBMIT_RPC = "rpc_submit_test_result"
+SUBMIT_RPC_RETRY_SECONDS = 300  # RPC deploy edilmemişse bu süre fallback
+
+SUBMIT_CREATED = "created"
+SUBMIT_DUPLICATE = "duplicate"  # aynı idempotency key (tekrar gönderim)
+SUBMIT_EXISTS = "exists"        # aynı konu + tarih zaten girilmiş
+
+_submit_rpc_unavailable_until = 0.0
+
+
+def _is_missing_rpc(error: Exception) -> bool:
+    """PostgREST: fonksiyon henüz deploy edilmemiş (PGRST202)"""
+    msg = str(error)
+    return "PGRST202" in msg or "Could not find the function" in msg
+
+
+def submit_test_record(
+    supabase,
+    test_record: Dict[str, Any],
+    idempotency_key: str,
+    task_date: str
+) -> Dict[str, Any]:
+    """
+    Testi kaydet + bugünün pending görevini tamamla
+
+    Returns: {"status": created|duplicate|exists, "test": row|None, "task": row|None}
+
+    rpc_submit_test_result tek transaction'da yapar (duplicate/insert yarışı
+    unique index ile kapanır); RPC yoksa eski sıralı yol kullanılır.
+    """
+    global _submit_rpc_unavailable_until
+
+    if time.monotonic() >= _submit_rpc_unavailable_until:
+        try:
+            res = supabase.rpc(SUBMIT_RPC, {
+                "p_test": test_record,
+                "p_idempotency_key": idempotency_key,
+                "p_task_date": task_date,
+            }).execute()
+            data = res.data or {}
+            return {
+                "status": data.get("status", SUBMIT_CREATED),
+                "test": data.get("test"),
+                "task": data.get("task"),
+            }
+        except Exception as e:
+            if not _is_missing_rpc(e):
+                raise
+            logger.warning(f"⚠️ {SUBMIT_RPC} missing, using sequential submit")
+            _submit_rpc_unavailable_until = time.monotonic() + SUBMIT_RPC_RETRY_SECONDS
+
+    return _submit_test_record_sequential(supabase, test_record)
+
+
+def _submit_test_record_sequential(supabase, test_record: Dict[str, Any]) -> Dict[str, Any]:
+    """Migration 031 öncesi yol: select + insert + auto-complete (3-4 round trip)"""
+    existing = (
+        supabase.table("student_topic_tests")
+        .select("id")
+        .eq("student_id", test_record["student_id"])
+        .eq("topic_id", test_record["topic_id"])
+        .eq("test_date", test_record["test_date"])
+        .execute()
+    )
+    if existing.data:
+        return {"status": SUBMIT_EXISTS, "test": None, "task": None}
+
+    result = supabase.table("student_topic_tests").insert(test_record).execute()
+    if not result.data:
+        return {"status": SUBMIT_CREATED, "test": None, "task": None}
+
+    test = result.data[0]
+    task_result = auto_complete_task_if_exists(
+        student_id=test_record["student_id"],
+        topic_id=test_record["topic_id"],
+        test_result_id=test["id"]
+    )
+    task = None
+    if task_result.get("auto_completed"):
+        task = {"id": task_result.get("task_id"), "topic_name": task_result.get("task_name")}
+
+    return {"status": SUBMIT_CREATED, "test": test, "task": task}
+
+
 # ============================================
 # POST /api/v1/test-results
 # ============================================
 
-@router.post("/test-results")
+@router.post(
+    "/test-results",
+    dependencies=[Depends(rate_limit(
+        "test_submit", limit=3, window_seconds=5,
+        detail="Çok hızlı test girişi. Lütfen birkaç saniye bekleyin."
+    ))]
+)
 async def submit_test_result(
     test_data: TestResultSubmit,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=128)
 ):
     """
     MÜHÜRLÜ TEST ENTRY
@@ -143,6 +235,8 @@ async def submit_test_result(
     - success_rate & net_score backend hesap
     - LOCAL → UTC normalize
     - Gelecek tarih engeli (UTC)
+    - Idempotency-Key header: aynı anahtarla tekrar -> ilk sonuç, yeni kayıt yok
+    - Tek round trip: rpc_submit_test_result (yoksa sıralı fallback)
     """
 
     supabase = get_supabase_admin()
@@ -150,23 +244,7 @@ async def submit_test_result(
     try:
         # 🔒 AUTH OVERRIDE
         student_id = current_user["id"]
-        # 🚦 RATE LIMIT (SPAM GUARD)
-        recent = (
-            supabase.table("student_topic_tests")
-            .select("id")
-            .eq("student_id", student_id)
-            .gte(
-                "created_at",
-                (datetime.now(timezone.utc) - timedelta(seconds=5)).isoformat()
-            )
-            .execute()
-        )
-
-        if recent.data and len(recent.data) >= 3:
-            raise HTTPException(
-                status_code=429,
-                detail="Çok hızlı test girişi. Lütfen birkaç saniye bekleyin."
-            )
+        # 🚦 RATE LIMIT (SPAM GUARD): route dependency'si, DB'ye gitmez
 
         # 📏 12 SORU KURALI
         total = (
@@ -189,21 +267,6 @@ async def submit_test_result(
             local_dt = local_dt.astimezone()
 
         test_date_utc = local_dt.astimezone(timezone.utc)
-        # 🛑 Aynı testin tekrar gönderilmesini engelle
-        existing = (
-            supabase.table("student_topic_tests")
-            .select("id")
-            .eq("student_id", student_id)
-            .eq("topic_id", test_data.topic_id)
-            .eq("test_date", test_date_utc.isoformat())
-            .execute()
-        )
-
-        if existing.data:
-            raise HTTPException(
-                status_code=409,
-                detail="Bu test zaten girilmiş"
-            )
 
         # ⛔ GELECEK TARİH ENGELİ
         now_utc = datetime.now(timezone.utc)
@@ -252,16 +315,39 @@ async def submit_test_result(
             "created_via": "web_form",
             "api_version": "v1",
             "request_id": str(uuid.uuid4()),
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": now_utc.isoformat()
         }
 
-        result = (
-            supabase.table("student_topic_tests")
-            .insert(test_record)
-            .execute()
+        # 🔑 İdempotency: istemci anahtarı yoksa (öğrenci, konu, tarih) türetilir
+        key = (
+            f"client:{idempotency_key}" if idempotency_key
+            else f"auto:{test_data.topic_id}@{test_record['test_date']}"
+        )
+
+        # 🛑 Tek transaction: duplicate kontrolü + insert + görev auto-complete
+        outcome = await run_db(
+            submit_test_record,
+            supabase, test_record, key, now_utc.date().isoformat()
         )
 
-        if not result.data:
+        if outcome["status"] == SUBMIT_EXISTS or (
+            outcome["status"] == SUBMIT_DUPLICATE and not idempotency_key
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail="Bu test zaten girilmiş"
+            )
+
+        test = outcome["test"] or {}
+        task = outcome["task"]
+
+        if outcome["status"] == SUBMIT_CREATED:
+            # ♻️ Write-through: sadece bu topic'in performansı yeniden hesaplanır
+            await run_db(update_topic_performance, student_id, test_data.topic_id)
+            await run_db(record_test_day, student_id, test_date_utc)
+            bump_student_version(student_id)
+
+        if not test.get("id"):
             return {
                 "success": True,
                 "message": "Test kaydedildi",
@@ -269,27 +355,23 @@ async def submit_test_result(
                 "task_auto_completed": False
             }
 
-        test_id = result.data[0]["id"]
-
-        task_result = auto_complete_task_if_exists(
-            student_id=student_id,
-            topic_id=test_data.topic_id,
-            test_result_id=test_id
-        )
-
         response = {
             "success": True,
             "message": "Test başarıyla kaydedildi",
-            "test_id": test_id,
-            "net_score": net_score,
-            "success_rate": success_rate,
-            "task_auto_completed": task_result.get("auto_completed", False)
+            "test_id": test["id"],
+            "net_score": test.get("net_score", net_score),
+            "success_rate": test.get("success_rate", success_rate),
+            "task_auto_completed": task is not None
         }
 
-        if task_result.get("auto_completed"):
+        if outcome["status"] == SUBMIT_DUPLICATE:
+            # Aynı Idempotency-Key ile tekrar: ilk cevabın aynısı, yeni kayıt yok
+            response["duplicate"] = True
+
+        if task is not None:
             response["completed_task"] = {
-                "task_id": task_result.get("task_id"),
-                "task_name": task_result.get("task_name")
+                "task_id": task.get("id"),
+                "task_name": task.get("topic_name")
             }
             response["message"] += " ve görev otomatik tamamlandı 🎉"
 
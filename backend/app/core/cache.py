@@ -0,0 +1,766 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: cache.py
+# Role: Bounded, instrumented LRU/TTL cache (namespaced, pluggable shared tier)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Every cache is bounded (max_entries + max_bytes), no unbounded dicts
+# - TTL on every entry (monotonic clock, immune to wall-clock jumps)
+# - Per-namespace stats: hits, misses, evictions, expirations, bytes
+# - Thread-safe (sync endpoints run in the threadpool)
+# - Multi-worker: shared backend (SQLite file) + invalidation broadcast
+# =============================================================================
+
+"""
+cache.py - Namespaced LRU/TTL cache
+
+Her namespace kendi limitlerine sahip bağımsız bir LRU'dur:
+- max_entries dolunca en eski kullanılan kayıt atılır (eviction)
+- max_bytes aşılırsa yine LRU sırasıyla atılır
+- TTL dolmuş kayıt okunduğunda silinir (expiration, miss sayılır)
+
+Backend (CACHE_BACKEND env):
+- memory (default): sadece process-içi LRU, tek worker için yeterli
+- sqlite: process-içi LRU (near cache, kısa TTL) + tüm uvicorn worker'ların
+  paylaştığı SQLite dosyası. delete/clear bir invalidation kaydı yayınlar;
+  diğer worker'lar bir sonraki okumada kendi near cache'lerinden düşürür.
+  Değerler pickle'lı durur: dosya uygulamaya ait 0700 dizinde olmalı
+  (default var/cache/); başkasının sahip olduğu / yazabildiği dosya veya
+  dizinle backend açılmaz (PermissionError, uygulama başlamaz).
+
+Usage:
+    from app.core.cache import get_cache
+
+    perf_cache = get_cache("student_performance", max_entries=5000, ttl_seconds=30)
+    cached = perf_cache.get(f"perf_{student_id}")
+    if cached is None:
+        cached = compute()
+        perf_cache.set(f"perf_{student_id}", cached)
+
+    cache_registry.stats()   # admin endpoint: /admin/cache/stats
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import stat
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.metrics import MetricFamily, Sample, metrics
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB / namespace
+
+# Shared backend
+DEFAULT_NEAR_TTL_SECONDS = 5.0          # sqlite modunda process-içi kopya ömrü
+DEFAULT_POLL_INTERVAL_SECONDS = 0.2     # invalidation log okuma aralığı
+INVALIDATION_RETENTION_SECONDS = 3600
+# LRU "touch" (accessed_at) okuma başına yazılmaz; toplanıp toplu yazılır
+TOUCH_FLUSH_INTERVAL_SECONDS = 1.0
+TOUCH_FLUSH_BATCH = 256
+
+DEFAULT_SQLITE_PATH = os.path.join("var", "cache", "endstp_cache.sqlite3")
+
+# Sentinel: cache'te None da saklanabilir
+MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+# ============================================
+# BACKENDS (shared tier + invalidation bus)
+# ============================================
+
+class CacheBackend(ABC):
+    """
+    Paylaşılan cache katmanı arayüzü
+
+    - get/set/delete/delete_prefix/clear: worker'lar arası ortak depolama
+    - publish/poll: invalidation broadcast (kind: "key" | "prefix" | "clear")
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, blob: bytes, ttl_seconds: float, max_entries: int) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, namespace: str, prefix: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, namespace: str, kind: str, key: str = "") -> None:
+        ...
+
+    @abstractmethod
+    def poll(self) -> List[Tuple[str, str, str]]:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class InProcessBackend(CacheBackend):
+    """
+    Tek process: paylaşılan katman yok, tüm veri namespace'in kendi LRU'sunda
+    Invalidation zaten yerel olarak uygulandığı için yayın gerekmez.
+    """
+
+    name = "memory"
+
+    def get(self, namespace: str, key: str) -> Any:
+        return MISSING
+
+    def set(self, namespace: str, key: str, blob: bytes, ttl_seconds: float, max_entries: int) -> None:
+        pass
+
+    def delete(self, namespace: str, key: str) -> None:
+        pass
+
+    def delete_prefix(self, namespace: str, prefix: str) -> None:
+        pass
+
+    def clear(self, namespace: str) -> None:
+        pass
+
+    def publish(self, namespace: str, kind: str, key: str = "") -> None:
+        pass
+
+    def poll(self) -> List[Tuple[str, str, str]]:
+        return []
+
+
+def ensure_private_path(path: str) -> str:
+    """
+    SQLite dosyası pickle'lı değer taşır: yazabilen herkes process içinde kod
+    çalıştırabilir. Dizin 0700 ile oluşturulur; dizin / dosya (ve -wal, -shm)
+    bu kullanıcıya ait değilse, group/other yazabiliyorsa veya symlink ise
+    PermissionError.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return path
+
+    uid = os.getuid()
+    st = os.stat(directory)
+    if st.st_uid != uid or st.st_mode & 0o022:
+        raise PermissionError(
+            f"cache directory {directory} must be owned by uid {uid} and not group/world-writable"
+        )
+    for candidate in (path, f"{path}-wal", f"{path}-shm"):
+        try:
+            st = os.lstat(candidate)
+        except FileNotFoundError:
+            continue
+        if stat.S_ISLNK(st.st_mode) or st.st_uid != uid or st.st_mode & 0o022:
+            raise PermissionError(
+                f"cache file {candidate} must be a regular file owned by uid {uid}, not group/world-writable"
+            )
+    return path
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Aynı makinedeki tüm worker'ların paylaştığı SQLite dosyası
+
+    - cache_entries: pickle'lanmış değerler, wall-clock expires_at, LRU accessed_at
+    - cache_invalidations: append-only log; her worker kendi son seq'inden okur
+    - Thread başına ayrı connection (sqlite3 connection'ları thread-safe değil)
+    - Dosya / dizin sahipliği açılışta doğrulanır (ensure_private_path), dosya 0600
+    - Hit'ler yazma transaction'ı açmaz: accessed_at güncellemeleri bellekte
+      toplanır, TOUCH_FLUSH_INTERVAL_SECONDS / TOUCH_FLUSH_BATCH'te (ve LRU
+      eviction'dan önce) tek executemany ile yazılır
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = ensure_private_path(path)
+        self.poll_interval = float(poll_interval)
+        self._clock = clock
+        self.origin = uuid.uuid4().hex
+        self._local = threading.local()
+        self._poll_lock = threading.Lock()
+        self._last_poll = 0.0
+        self.errors = 0
+        self._touch_lock = threading.Lock()
+        self._touches: Dict[Tuple[str, str], float] = {}
+        self._last_touch_flush = time.monotonic()
+
+        conn = self._conn()
+        os.chmod(self.path, 0o600)
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru"
+                " ON cache_entries (namespace, accessed_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidations ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL,"
+                " namespace TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+        row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations").fetchone()
+        self._last_seq = int(row[0])
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Any:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return MISSING
+
+        now = self._clock()
+        if row[1] <= now:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            return MISSING
+
+        self._touch(namespace, key, now)
+        return row[0]
+
+    def _touch(self, namespace: str, key: str, now: float) -> None:
+        with self._touch_lock:
+            self._touches[(namespace, key)] = now
+            due = (
+                len(self._touches) >= TOUCH_FLUSH_BATCH
+                or time.monotonic() - self._last_touch_flush >= TOUCH_FLUSH_INTERVAL_SECONDS
+            )
+        if due:
+            self.flush_touches()
+
+    def flush_touches(self) -> int:
+        """Bekleyen accessed_at güncellemelerini tek transaction'da yaz"""
+        with self._touch_lock:
+            touches, self._touches = self._touches, {}
+            self._last_touch_flush = time.monotonic()
+        if not touches:
+            return 0
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE namespace = ? AND key = ?",
+                [(ts, ns, key) for (ns, key), ts in touches.items()],
+            )
+        return len(touches)
+
+    def set(self, namespace: str, key: str, blob: bytes, ttl_seconds: float, max_entries: int) -> None:
+        # Eviction sırası güncel okuma zamanlarını görsün
+        self.flush_touches()
+        now = self._clock()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(blob), now + ttl_seconds, now),
+            )
+            # LRU bound: namespace limitini aşan en eski kayıtlar
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache_entries WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (namespace, namespace, int(max_entries)),
+            )
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        )
+
+    def delete_prefix(self, namespace: str, prefix: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND substr(key, 1, ?) = ?",
+            (namespace, len(prefix), prefix),
+        )
+
+    def clear(self, namespace: str) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def publish(self, namespace: str, kind: str, key: str = "") -> None:
+        now = self._clock()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO cache_invalidations (origin, namespace, kind, key, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.origin, namespace, kind, key, now),
+            )
+            conn.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < ?",
+                (now - INVALIDATION_RETENTION_SECONDS,),
+            )
+
+    def poll(self) -> List[Tuple[str, str, str]]:
+        """Diğer worker'ların yayınladığı, henüz görülmemiş invalidation'lar"""
+        now = time.monotonic()
+        with self._poll_lock:
+            if now - self._last_poll < self.poll_interval:
+                return []
+            self._last_poll = now
+
+            rows = self._conn().execute(
+                "SELECT seq, origin, namespace, kind, key FROM cache_invalidations"
+                " WHERE seq > ? ORDER BY seq",
+                (self._last_seq,),
+            ).fetchall()
+            if rows:
+                self._last_seq = int(rows[-1][0])
+
+        return [(r[2], r[3], r[4]) for r in rows if r[1] != self.origin]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "last_invalidation_seq": self._last_seq,
+            "pending_touches": len(self._touches),
+            "errors": self.errors,
+        }
+
+
+def backend_from_env() -> CacheBackend:
+    """
+    CACHE_BACKEND=memory|sqlite, CACHE_SQLITE_PATH=<file> (default var/cache/)
+
+    Güvensiz dosya / dizin (PermissionError) memory'ye düşmez, yükselir:
+    uygulama başlamaz.
+    """
+    kind = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+    if kind == "sqlite":
+        path = os.getenv("CACHE_SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        try:
+            backend = SQLiteBackend(
+                path,
+                poll_interval=float(os.getenv("CACHE_POLL_INTERVAL_SECONDS", DEFAULT_POLL_INTERVAL_SECONDS)),
+            )
+            logger.info(f"✅ Shared cache backend: sqlite ({path})")
+            return backend
+        except PermissionError:
+            logger.critical(f"❌ Refusing to use cache file {path}: not private to this user")
+            raise
+        except Exception as e:
+            logger.error(f"❌ SQLite cache backend unavailable, falling back to memory: {e}")
+    return InProcessBackend()
+
+
+# ============================================
+# NAMESPACE
+# ============================================
+
+class CacheNamespace:
+    """
+    Tek namespace: LRU sıralı, TTL'li, boyut sınırlı process-içi katman
+    + opsiyonel paylaşılan backend
+
+    get/set/delete O(1); delete_prefix O(n) (sadece invalidation'da)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[CacheBackend] = None,
+        near_ttl_seconds: float = DEFAULT_NEAR_TTL_SECONDS,
+        before_read: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_bytes = max(1, int(max_bytes))
+        self.near_ttl_seconds = float(near_ttl_seconds)
+        self._clock = clock
+        self.backend: CacheBackend = backend or InProcessBackend()
+        self._before_read = before_read
+
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def shared(self) -> bool:
+        return not isinstance(self.backend, InProcessBackend)
+
+    # ----------------------------------------
+    # READ / WRITE
+    # ----------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._before_read is not None:
+            self._before_read()
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry.expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                self._remove(key)
+                self.expirations += 1
+
+        if self.shared:
+            blob = self._backend_call("get", self.name, key)
+            if blob is not None and blob is not MISSING:
+                try:
+                    value = pickle.loads(blob)
+                except Exception:
+                    value = MISSING
+                if value is not MISSING:
+                    self._store_local(key, value, len(blob), self.near_ttl_seconds)
+                    with self._lock:
+                        self.hits += 1
+                        self.shared_hits += 1
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        broadcast: bool = False,
+    ) -> None:
+        """
+        broadcast=True: write-through güncellemesi; diğer worker'lar yerel
+        kopyalarını düşürüp yeni değeri paylaşılan katmandan okur
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+
+        try:
+            blob: Optional[bytes] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            size = len(blob)
+        except Exception:
+            blob, size = None, sys.getsizeof(value)
+
+        if size > self.max_bytes:
+            # Tek başına limiti aşan değer cache'lenmez
+            logger.warning(f"⚠️ Cache[{self.name}] value too large ({size} bytes): {key}")
+            with self._lock:
+                self._remove(key)
+            return
+
+        local_ttl = min(ttl, self.near_ttl_seconds) if self.shared else ttl
+        self._store_local(key, value, size, local_ttl)
+
+        if self.shared and blob is not None:
+            self._backend_call("set", self.name, key, blob, ttl, self.max_entries)
+            if broadcast:
+                self._backend_call("publish", self.name, "key", key)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            removed = self._remove(key)
+        if self.shared:
+            self._backend_call("delete", self.name, key)
+            self._backend_call("publish", self.name, "key", key)
+        return removed
+
+    def delete_prefix(self, prefix: str) -> int:
+        removed = self._drop_local_prefix(prefix)
+        if self.shared:
+            self._backend_call("delete_prefix", self.name, prefix)
+            self._backend_call("publish", self.name, "prefix", prefix)
+        return removed
+
+    def clear(self) -> None:
+        self._drop_local_all()
+        if self.shared:
+            self._backend_call("clear", self.name)
+            self._backend_call("publish", self.name, "clear", "")
+
+    def apply_invalidation(self, kind: str, key: str) -> None:
+        """Başka worker'dan gelen invalidation: sadece yerel kopyayı düşür"""
+        if kind == "key":
+            with self._lock:
+                self._remove(key)
+        elif kind == "prefix":
+            self._drop_local_prefix(key)
+        elif kind == "clear":
+            self._drop_local_all()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ----------------------------------------
+    # INTERNAL
+    # ----------------------------------------
+
+    def _store_local(self, key: str, value: Any, size: int, ttl: float) -> None:
+        with self._lock:
+            self._remove(key)
+            self._data[key] = _Entry(value, self._clock() + ttl, size)
+            self._bytes += size
+            self._evict_over_limit()
+
+    def _drop_local_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for k in keys:
+                self._remove(k)
+            return len(keys)
+
+    def _drop_local_all(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _backend_call(self, method: str, *args) -> Any:
+        """Paylaşılan katman hatası request'i düşürmez (miss gibi davranır)"""
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception as e:
+            if hasattr(self.backend, "errors"):
+                self.backend.errors += 1
+            logger.warning(f"⚠️ Cache[{self.name}] backend {method} failed: {e}")
+            return MISSING
+
+    def _remove(self, key: str) -> bool:
+        # lock held
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def _evict_over_limit(self) -> None:
+        # lock held
+        while self._data and (
+            len(self._data) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    # ----------------------------------------
+    # STATS
+    # ----------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.shared_hits = self.misses = 0
+            self.evictions = self.expirations = 0
+
+
+# ============================================
+# REGISTRY
+# ============================================
+
+class CacheRegistry:
+    """
+    Process-wide namespace registry (admin stats buradan okunur)
+    Backend invalidation log'unu okuyup ilgili namespace'lere dağıtır.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self.backend: CacheBackend = backend or InProcessBackend()
+
+    def configure_backend(self, backend: CacheBackend) -> None:
+        """Backend'i değiştir (startup / test); yerel kopyalar temizlenir"""
+        with self._lock:
+            self.backend = backend
+            for ns in self._namespaces.values():
+                ns.backend = backend
+                ns._drop_local_all()
+
+    def namespace(
+        self,
+        name: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> CacheNamespace:
+        """Namespace'i döndür; yoksa verilen limitlerle oluştur"""
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                ns = CacheNamespace(
+                    name,
+                    max_entries=max_entries,
+                    ttl_seconds=ttl_seconds,
+                    max_bytes=max_bytes,
+                    backend=self.backend,
+                    before_read=self.sync,
+                )
+                self._namespaces[name] = ns
+            return ns
+
+    def sync(self) -> int:
+        """Diğer worker'ların invalidation'larını uygula (poll interval ile sınırlı)"""
+        try:
+            messages = self.backend.poll()
+        except Exception as e:
+            logger.warning(f"⚠️ Cache invalidation poll failed: {e}")
+            return 0
+
+        for namespace, kind, key in messages:
+            ns = self._namespaces.get(namespace)
+            if ns is not None:
+                ns.apply_invalidation(kind, key)
+        return len(messages)
+
+    def get(self, name: str) -> Optional[CacheNamespace]:
+        return self._namespaces.get(name)
+
+    def names(self) -> list:
+        return sorted(self._namespaces)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._namespaces[name].stats() for name in self.names()}
+
+    def backend_stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+    def clear(self, name: Optional[str] = None) -> int:
+        """Namespace (veya hepsini) temizle; temizlenen namespace sayısı"""
+        targets = [name] if name else self.names()
+        cleared = 0
+        for n in targets:
+            ns = self._namespaces.get(n)
+            if ns is not None:
+                ns.clear()
+                cleared += 1
+        return cleared
+
+
+# Global instance (backend: CACHE_BACKEND env)
+cache_registry = CacheRegistry(backend_from_env())
+
+
+# (metrik, tip, açıklama, stats anahtarı)
+_CACHE_METRICS = (
+    ("endstp_cache_hits_total", "counter", "Cache hits (near + shared)", "hits"),
+    ("endstp_cache_shared_hits_total", "counter", "Cache hits served by the shared backend", "shared_hits"),
+    ("endstp_cache_misses_total", "counter", "Cache misses", "misses"),
+    ("endstp_cache_hit_ratio", "gauge", "hits / (hits + misses)", "hit_ratio"),
+    ("endstp_cache_entries", "gauge", "Entries in the near cache", "entries"),
+    ("endstp_cache_bytes", "gauge", "Approximate bytes in the near cache", "bytes"),
+    ("endstp_cache_evictions_total", "counter", "LRU evictions", "evictions"),
+    ("endstp_cache_expirations_total", "counter", "TTL expirations", "expirations"),
+)
+
+
+def collect_cache_metrics() -> List[MetricFamily]:
+    """/metrics: namespace başına cache istatistikleri (scrape anında)"""
+    stats = cache_registry.stats()
+    return [
+        MetricFamily(name, kind, help, [
+            Sample("", {"namespace": ns}, s[key]) for ns, s in stats.items()
+        ])
+        for name, kind, help, key in _CACHE_METRICS
+    ]
+
+
+metrics.register_collector(collect_cache_metrics)
+
+
+def get_cache(
+    name: str,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> CacheNamespace:
+    """Global registry'den namespace al (modül seviyesinde bir kez çağrılır)"""
+    return cache_registry.namespace(
+        name,
+        max_entries=max_entries,
+        ttl_seconds=ttl_seconds,
+        max_bytes=max_bytes,
+    )
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import logging
 
 from app.db.session import get_supabase_admin
+from app.core.curriculum import get_curriculum
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +21,10 @@ class ContextService:
     def __init__(self):
         """Initialize context service with admin Supabase client"""
         self.supabase = get_supabase_admin()
-        self._cache: Dict[str, tuple] = {}
-        self._cache_ttl: int = 300  # seconds (5 min)
+        # Request-scoped memo: ContextService request başına oluşturuluyor.
+        # Öğrenci geçmişi test yazımlarında değişir; process-wide cache'e
+        # konursa v2 motorlar bayat geçmişle hesaplar (invalidation yok).
+        self._cache: Dict[str, Dict] = {}
         logger.info("🔒 ContextService initialized with ADMIN CLIENT")
 
     # ========================================
@@ -42,53 +45,26 @@ class ContextService:
                 "metadata": Dict
             }
         """
-        cache_key = f"topic_context:{topic_id}"
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return cached
-
+        # Curriculum snapshot: O(1) lookup, DB'ye gitmez
         try:
-            topic_result = (
-                self.supabase
-                .table("topics")
-                .select("id, code, name_tr, difficulty_level")
-                .eq("id", topic_id)
-                .execute()
-            )
+            curriculum = get_curriculum()
+            topic = curriculum.topic(topic_id)
 
-            if not topic_result.data:
+            if topic is None:
                 return self._default_topic_context(topic_id)
 
-            topic = topic_result.data[0]
-
-            prereq_result = (
-                self.supabase
-                .table("prerequisites")
-                .select("prerequisite_topic_id, strength")
-                .eq("topic_id", topic_id)
-                .execute()
-            )
-
-            context = {
+            difficulty = topic.get("difficulty_level")
+            return {
                 "topic_id": topic_id,
                 "code": topic.get("code"),
                 "name": topic.get("name_tr"),
                 "archetype": self._infer_archetype(topic),
-                "difficulty_baseline": float(topic.get("difficulty_level", 5)),
-                "prerequisites": [
-                    {
-                        "topic_id": p["prerequisite_topic_id"],
-                        "strength": float(p.get("strength", 0.5))
-                    }
-                    for p in (prereq_result.data or [])
-                ],
+                "difficulty_baseline": float(difficulty if difficulty is not None else 5),
+                "prerequisites": curriculum.prerequisites(topic_id),
                 "common_misconceptions": [],
-                "metadata": {}
+                "metadata": {"curriculum_version": curriculum.version}
             }
 
-            self._set_cache(cache_key, context)
-            return context
-
         except Exception as e:
             logger.error(f"Error fetching topic context: {e}")
             return self._default_topic_context(topic_id)
@@ -229,30 +205,8 @@ class ContextService:
         Returns:
             List of prerequisites with topic_id and strength
         """
-        cache_key = f"prerequisites:{topic_id}"
-        cached = self._get_from_cache(cache_key)
-        if cached:
-            return cached
-
         try:
-            result = (
-                self.supabase
-                .table("prerequisites")
-                .select("prerequisite_topic_id, strength")
-                .eq("topic_id", topic_id)
-                .execute()
-            )
-
-            prerequisites = [
-                {
-                    "topic_id": row["prerequisite_topic_id"],
-                    "strength": float(row.get("strength", 0.5))
-                }
-                for row in (result.data or [])
-            ]
-
-            self._set_cache(cache_key, prerequisites)
-            return prerequisites
+            return get_curriculum().prerequisites(topic_id)
 
         except Exception as e:
             logger.error(f"Error fetching prerequisites: {e}")
@@ -263,14 +217,9 @@ class ContextService:
     # ========================================
 
     def _get_from_cache(self, key: str) -> Optional[Dict]:
-        """Get from cache if not expired"""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if (datetime.now() - timestamp).seconds < self._cache_ttl:
-                return value
-            del self._cache[key]
-        return None
+        """Get from request-scoped memo"""
+        return self._cache.get(key)
 
     def _set_cache(self, key: str, value: Dict):
-        """Set cache with timestamp"""
-        self._cache[key] = (value, datetime.now())
+        """Set request-scoped memo"""
+        self._cache[key] = value
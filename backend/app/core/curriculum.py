@@ -0,0 +1,436 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: curriculum.py
+# Role: Versioned, process-wide curriculum snapshot (reference data)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Snapshot immutable: lookup'lar kopya döner, iç index'ler asla paylaşılmaz
+# - O(1) index: id / code / subject
+# - Refresh atomik: yeni snapshot tamamen kurulur, sonra referans değişir
+# - Versiyon: curriculum_version tablosu (admin yazımları + DB trigger bump eder)
+# - DB hatasında son başarılı snapshot servis edilmeye devam eder
+# =============================================================================
+
+"""
+curriculum.py - Curriculum reference-data snapshot
+
+subjects, topics, subject_exam_weights, prerequisites ve exam_systems nadiren
+değişir ama hot path'lerde okunur. Process başına tek snapshot tutulur:
+
+    from app.core.curriculum import get_curriculum, get_curriculum_async
+
+    curriculum = await get_curriculum_async()      # async handler
+    curriculum.active_subjects(fields=("id", "code", "name_tr"))
+    curriculum.active_topic_ids(subject_id)
+    curriculum.prerequisites(topic_id)
+
+Versiyon kontrolü en fazla VERSION_CHECK_SECONDS'ta bir yapılır (tek küçük
+sorgu); versiyon değiştiyse veya snapshot MAX_AGE_SECONDS'tan eskiyse yeniden
+yüklenir. Admin yazımları bump_curriculum_version() çağırır.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.db.session import get_supabase_admin, run_db
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = "curriculum_version"
+BUMP_RPC = "rpc_bump_curriculum_version"
+
+VERSION_CHECK_SECONDS = float(os.getenv("CURRICULUM_VERSION_CHECK_SECONDS", "30"))
+MAX_AGE_SECONDS = float(os.getenv("CURRICULUM_MAX_AGE_SECONDS", "3600"))
+PAGE_SIZE = 1000  # PostgREST max-rows varsayılanı
+
+# Snapshot'ı oluşturan tablolar (zorunlu olanlar okunamazsa yükleme başarısız)
+REQUIRED_TABLES = ("subjects", "topics")
+OPTIONAL_TABLES = ("subject_exam_weights", "prerequisites", "exam_systems")
+
+Row = Dict[str, Any]
+
+
+def _project(row: Row, fields: Optional[Sequence[str]]) -> Row:
+    if fields is None:
+        return dict(row)
+    return {f: row.get(f) for f in fields}
+
+
+# Türk alfabesi sırası (tr_TR collation; eski .order("name_tr") davranışı):
+# codepoint sırasında Ç/Ğ/İ/Ö/Ş/Ü, Z'nin arkasına düşer
+_TR_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+_TR_RANK = {ch: i for i, ch in enumerate(_TR_ALPHABET)}
+
+
+def turkish_sort_key(text: str) -> Tuple[Tuple[int, int], ...]:
+    """Harfler alfabe sırasıyla, büyük/küçük duyarsız; rakam/noktalama harflerden önce"""
+    lowered = text.replace("I", "ı").replace("İ", "i").lower()
+    return tuple(
+        (1, _TR_RANK[ch]) if ch in _TR_RANK else ((2, ord(ch)) if ch.isalpha() else (0, ord(ch)))
+        for ch in lowered
+    )
+
+
+def _by_name(rows: Iterable[Row]) -> Tuple[Row, ...]:
+    return tuple(sorted(rows, key=lambda r: turkish_sort_key(r.get("name_tr") or "")))
+
+
+# =============================================================================
+# 📚 SNAPSHOT
+# =============================================================================
+
+class CurriculumSnapshot:
+    """
+    Tek bir versiyonun immutable görüntüsü.
+
+    Tüm index'ler kurulumda bir kez hesaplanır; lookup'lar O(1) ve
+    çağırana satırların kopyasını verir (snapshot paylaşımlı kalır).
+    """
+
+    __slots__ = (
+        "version", "loaded_at",
+        "_subjects", "_subjects_by_code", "_active_subjects",
+        "_topics", "_topics_by_code", "_active_topics_by_subject", "_active_topic_count",
+        "_weights_by_subject", "_prereqs_by_topic",
+        "_exam_systems", "_exam_systems_by_code", "_active_exam_systems",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        subjects: Iterable[Row] = (),
+        topics: Iterable[Row] = (),
+        exam_weights: Iterable[Row] = (),
+        prerequisites: Iterable[Row] = (),
+        exam_systems: Iterable[Row] = (),
+        loaded_at: Optional[str] = None,
+    ):
+        self.version = int(version)
+        self.loaded_at = loaded_at or datetime.now(timezone.utc).isoformat()
+
+        subjects = [dict(s) for s in subjects]
+        self._subjects = {s["id"]: s for s in subjects}
+        self._subjects_by_code = {s["code"]: s for s in subjects if s.get("code")}
+        self._active_subjects = _by_name(s for s in subjects if s.get("is_active", True))
+
+        topics = [dict(t) for t in topics]
+        self._topics = {t["id"]: t for t in topics}
+        self._topics_by_code = {t["code"]: t for t in topics if t.get("code")}
+        grouped: Dict[str, List[Row]] = defaultdict(list)
+        for t in topics:
+            if t.get("is_active", True):
+                grouped[t.get("subject_id")].append(t)
+        self._active_topics_by_subject = {sid: _by_name(rows) for sid, rows in grouped.items()}
+        self._active_topic_count = sum(len(rows) for rows in grouped.values())
+
+        weights: Dict[str, List[Row]] = defaultdict(list)
+        for w in exam_weights:
+            weights[w.get("subject_id")].append(dict(w))
+        self._weights_by_subject = {sid: tuple(rows) for sid, rows in weights.items()}
+
+        prereqs: Dict[str, List[Row]] = defaultdict(list)
+        for p in prerequisites:
+            prereqs[p.get("topic_id")].append(dict(p))
+        self._prereqs_by_topic = {tid: tuple(rows) for tid, rows in prereqs.items()}
+
+        systems = [dict(e) for e in exam_systems]
+        self._exam_systems = {e["id"]: e for e in systems}
+        self._exam_systems_by_code = {e["code"]: e for e in systems if e.get("code")}
+        self._active_exam_systems = _by_name(e for e in systems if e.get("is_active", True))
+
+    # ---------- subjects ----------
+    def subject(self, subject_id: str) -> Optional[Row]:
+        row = self._subjects.get(subject_id)
+        return dict(row) if row else None
+
+    def subject_by_code(self, code: str) -> Optional[Row]:
+        row = self._subjects_by_code.get(code)
+        return dict(row) if row else None
+
+    def active_subjects(self, fields: Optional[Sequence[str]] = None) -> List[Row]:
+        """is_active dersler, name_tr sıralı"""
+        return [_project(s, fields) for s in self._active_subjects]
+
+    def subject_names(self) -> Dict[str, str]:
+        return {sid: s.get("name_tr") for sid, s in self._subjects.items()}
+
+    # ---------- topics ----------
+    def topic(self, topic_id: str) -> Optional[Row]:
+        row = self._topics.get(topic_id)
+        return dict(row) if row else None
+
+    def topic_by_code(self, code: str) -> Optional[Row]:
+        row = self._topics_by_code.get(code)
+        return dict(row) if row else None
+
+    def topic_labels(self, topic_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """(konu adı, ders adı) - satır başına topics/subjects join yerine, kopyasız"""
+        topic = self._topics.get(topic_id)
+        if not topic:
+            return None, None
+        subject = self._subjects.get(topic.get("subject_id"))
+        return topic.get("name_tr"), subject.get("name_tr") if subject else None
+
+    def active_topics(self, subject_id: str, fields: Optional[Sequence[str]] = None) -> List[Row]:
+        """Dersin is_active konuları, name_tr sıralı"""
+        return [_project(t, fields) for t in self._active_topics_by_subject.get(subject_id, ())]
+
+    def active_topic_ids(self, subject_id: str) -> List[str]:
+        return [t["id"] for t in self._active_topics_by_subject.get(subject_id, ())]
+
+    def active_topic_count(self) -> int:
+        return self._active_topic_count
+
+    # ---------- exam weights / prerequisites ----------
+    def exam_weights(self, subject_id: str) -> List[Row]:
+        """subject_exam_weights satırları (calculate_exam_weight_multiplier girdisi)"""
+        return [dict(w) for w in self._weights_by_subject.get(subject_id, ())]
+
+    def prerequisites(self, topic_id: str) -> List[Row]:
+        """[{"topic_id": prerequisite_topic_id, "strength": float}, ...]"""
+        return [
+            {
+                "topic_id": p["prerequisite_topic_id"],
+                "strength": float(p.get("strength") if p.get("strength") is not None else 0.5),
+            }
+            for p in self._prereqs_by_topic.get(topic_id, ())
+        ]
+
+    # ---------- exam systems ----------
+    def exam_system(self, exam_system_id: str) -> Optional[Row]:
+        row = self._exam_systems.get(exam_system_id)
+        return dict(row) if row else None
+
+    def exam_system_by_code(self, code: str) -> Optional[Row]:
+        row = self._exam_systems_by_code.get(code)
+        return dict(row) if row else None
+
+    def active_exam_systems(self, fields: Optional[Sequence[str]] = None) -> List[Row]:
+        return [_project(e, fields) for e in self._active_exam_systems]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "subjects": len(self._subjects),
+            "topics": len(self._topics),
+            "active_topics": self._active_topic_count,
+            "exam_weights": sum(len(r) for r in self._weights_by_subject.values()),
+            "prerequisites": sum(len(r) for r in self._prereqs_by_topic.values()),
+            "exam_systems": len(self._exam_systems),
+        }
+
+
+# =============================================================================
+# 🔄 LOADER
+# =============================================================================
+
+def _fetch_all(client, table: str) -> List[Row]:
+    """Tüm tabloyu sayfalayarak oku (max-rows limitine takılmaz)"""
+    rows: List[Row] = []
+    start = 0
+    while True:
+        resp = (
+            client.table(table)
+            .select("*")
+            .order("id")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+        )
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def load_snapshot(client, version: int) -> CurriculumSnapshot:
+    """Tabloları okuyup yeni snapshot kur (zorunlu tablo hatası yukarı çıkar)"""
+    data: Dict[str, List[Row]] = {}
+    for table in REQUIRED_TABLES:
+        data[table] = _fetch_all(client, table)
+    for table in OPTIONAL_TABLES:
+        try:
+            data[table] = _fetch_all(client, table)
+        except Exception as e:
+            logger.warning(f"⚠️ Curriculum table skipped ({table}): {e}")
+            data[table] = []
+
+    return CurriculumSnapshot(
+        version=version,
+        subjects=data["subjects"],
+        topics=data["topics"],
+        exam_weights=data["subject_exam_weights"],
+        prerequisites=data["prerequisites"],
+        exam_systems=data["exam_systems"],
+    )
+
+
+# =============================================================================
+# 🏪 STORE
+# =============================================================================
+
+class CurriculumStore:
+    """
+    Process-wide snapshot tutucu.
+
+    - get(): snapshot taze ise kilitsiz döner (hot path)
+    - Kontrol zamanı geldiyse tek thread versiyonu okur; değiştiyse yeniden yükler
+    - Yeni snapshot referansı tek atamada değişir (okuyanlar yarım veri görmez)
+    """
+
+    def __init__(
+        self,
+        check_interval: float = VERSION_CHECK_SECONDS,
+        max_age: float = MAX_AGE_SECONDS,
+    ):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._snapshot: Optional[CurriculumSnapshot] = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.failures = 0
+
+    @property
+    def snapshot(self) -> Optional[CurriculumSnapshot]:
+        return self._snapshot
+
+    def is_fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def get(self) -> CurriculumSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self.is_fresh():
+                return self._snapshot
+            return self._refresh(force=False)
+
+    def reload(self) -> CurriculumSnapshot:
+        """Versiyondan bağımsız yeniden yükle (admin refresh, bump sonrası)"""
+        with self._lock:
+            return self._refresh(force=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = self._loaded_at = 0.0
+
+    def _read_version(self, client) -> Optional[int]:
+        try:
+            resp = (
+                client.table(VERSION_TABLE)
+                .select("version")
+                .eq("id", 1)
+                .limit(1)
+                .execute()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Curriculum version read failed: {e}")
+            return None
+        rows = resp.data or []
+        return int(rows[0]["version"]) if rows else 0
+
+    def _refresh(self, force: bool) -> CurriculumSnapshot:
+        now = time.monotonic()
+        current = self._snapshot
+        client = get_supabase_admin()
+        version = self._read_version(client)
+
+        expired = now - self._loaded_at >= self.max_age
+        if (
+            not force
+            and current is not None
+            and not expired
+            and (version is None or version == current.version)
+        ):
+            self._checked_at = now
+            return current
+
+        if version is None:
+            # Versiyon tablosu yok: yerel sayaç (yeniden yükleme yine de yapılır)
+            version = current.version + 1 if current is not None else 0
+
+        try:
+            fresh = load_snapshot(client, version)
+        except Exception as e:
+            self.failures += 1
+            if current is None:
+                raise
+            logger.warning(f"⚠️ Curriculum reload failed, serving v{current.version}: {e}")
+            self._checked_at = now
+            return current
+
+        self._snapshot = fresh
+        self._checked_at = self._loaded_at = now
+        self.reloads += 1
+        logger.info(f"📚 Curriculum snapshot v{fresh.version} loaded: {fresh.stats()}")
+        return fresh
+
+    def bump_version(self, reason: str = "") -> CurriculumSnapshot:
+        """
+        Referans veri değişti: global versiyonu artır (diğer worker'lar bir
+        sonraki kontrolde yükler) ve bu process'te hemen yeniden yükle.
+        """
+        try:
+            get_supabase_admin().rpc(BUMP_RPC, {"p_reason": reason or None}).execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Curriculum version bump failed ({reason}): {e}")
+        return self.reload()
+
+    def info(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "snapshot": snapshot.stats() if snapshot else None,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "check_interval_seconds": self.check_interval,
+            "max_age_seconds": self.max_age,
+        }
+
+
+# Global instance
+curriculum_store = CurriculumStore()
+
+
+def curriculum_version() -> int:
+    """Yüklü snapshot versiyonu (DB'ye gitmez; yüklenmemişse 0)"""
+    snapshot = curriculum_store.snapshot
+    return snapshot.version if snapshot is not None else 0
+
+
+def get_curriculum() -> CurriculumSnapshot:
+    """Sync çağıranlar (ContextService, threadpool endpoint'leri)"""
+    return curriculum_store.get()
+
+
+async def get_curriculum_async() -> CurriculumSnapshot:
+    """Async handler'lar: taze snapshot anında, kontrol/yükleme DB executor'ında"""
+    if curriculum_store.is_fresh():
+        return curriculum_store.snapshot
+    return await run_db(curriculum_store.get)
+
+
+def bump_curriculum_version(reason: str = "") -> Optional[CurriculumSnapshot]:
+    """Admin yazımlarından sonra çağrılır; hata yazma isteğini bozmaz"""
+    try:
+        return curriculum_store.bump_version(reason)
+    except Exception as e:
+        logger.warning(f"⚠️ Curriculum refresh after write failed ({reason}): {e}")
+        return None
@@ -0,0 +1,168 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: data_version.py
+# Role: Per-student data version + strong ETag / If-None-Match (304) helpers
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Versiyon her yazımda (test insert/update/delete, görev değişikliği) yenilenir
+# - 304 kararı DB'ye gitmeden verilir (versiyon cache katmanında)
+# - 304 sadece paylaşılan backend'de: memory modunda bump diğer worker'lara
+#   ulaşmaz, eski token'ı tutan worker bayat veri için 304 dönerdi
+# - Kayıp versiyon (eviction, restart) yeni token üretir -> eski ETag asla eşleşmez
+# - Zamana bağlı payload'lar ETag'e zaman dilimi (bucket) katar
+# =============================================================================
+
+"""
+data_version.py - Conditional GET for student read endpoints
+
+    @router.get("/dashboard")
+    async def get_student_dashboard(
+        request: Request,
+        response: Response,
+        current_user: dict = Depends(get_current_user),
+    ):
+        not_modified = conditional_get(
+            request, response, current_user["id"], "dashboard", bucket_seconds=DAY
+        )
+        if not_modified:
+            return not_modified
+        ...
+
+Yazma yolları:
+
+    bump_student_version(student_id)        # test / görev değişikliği
+    bump_student_versions(student_ids)      # nightly job (toplu)
+
+CACHE_BACKEND=memory (default) iken ETag header'ı yazılır ama 304 dönülmez;
+304 için versiyonların tüm worker'larca görüldüğü paylaşılan backend
+(CACHE_BACKEND=sqlite) gerekir.
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import get_cache
+
+VERSION_TTL_SECONDS = int(os.getenv("STUDENT_VERSION_TTL_SECONDS", str(7 * 24 * 3600)))
+VERSION_MAX_ENTRIES = int(os.getenv("STUDENT_VERSION_MAX_ENTRIES", "200000"))
+
+# ETag zaman dilimleri
+DAY = 24 * 3600
+MINUTE = 60
+
+CACHE_CONTROL = "private, no-cache"
+
+_version_store = get_cache(
+    "student_data_version",
+    max_entries=VERSION_MAX_ENTRIES,
+    ttl_seconds=VERSION_TTL_SECONDS,
+)
+
+
+# =============================================================================
+# 🔢 VERSION
+# =============================================================================
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _key(student_id: str) -> str:
+    return f"v_{student_id}"
+
+
+def get_student_version(student_id: str) -> str:
+    """Öğrencinin güncel veri versiyonu (yoksa yeni token üretilir)"""
+    token = _version_store.get(_key(student_id))
+    if token is None:
+        token = _new_token()
+        _version_store.set(_key(student_id), token)
+    return token
+
+
+def bump_student_version(student_id: str) -> str:
+    """Öğrenci verisi değişti: yeni token (diğer worker'lara broadcast)"""
+    token = _new_token()
+    _version_store.set(_key(student_id), token, broadcast=True)
+    return token
+
+
+def bump_student_versions(student_ids: Iterable[str]) -> int:
+    count = 0
+    for student_id in dict.fromkeys(student_ids):
+        bump_student_version(student_id)
+        count += 1
+    return count
+
+
+# =============================================================================
+# 🏷️ ETAG
+# =============================================================================
+
+def student_etag(
+    student_id: str,
+    scope: str,
+    *parts: Any,
+    bucket_seconds: Optional[int] = None,
+) -> str:
+    """
+    Strong ETag: öğrenci versiyonu + endpoint scope + payload'ı etkileyen
+    parametreler (+ zamana bağlı payload'lar için zaman dilimi).
+    """
+    components = [scope, student_id, get_student_version(student_id)]
+    components.extend(str(p) for p in parts)
+    if bucket_seconds:
+        components.append(str(int(time.time() // bucket_seconds)))
+    digest = hashlib.sha1("|".join(components).encode("utf-8")).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match karşılaştırması (liste, "*" ve W/ öneki desteklenir)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def revalidation_enabled() -> bool:
+    """304 güvenli mi: versiyon bump'ları tüm worker'lara ulaşıyor mu"""
+    return _version_store.shared
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    student_id: str,
+    scope: str,
+    *parts: Any,
+    bucket_seconds: Optional[int] = None,
+) -> Optional[Response]:
+    """
+    ETag eşleşirse 304 Response döner (endpoint hiçbir DB işi yapmadan
+    onu döndürür); eşleşmezse ETag'i asıl response'a yazar ve None döner.
+    Paylaşılan backend yoksa 304 verilmez (revalidation_enabled).
+    """
+    etag = student_etag(student_id, scope, *parts, bucket_seconds=bucket_seconds)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if revalidation_enabled() and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
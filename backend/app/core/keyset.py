@@ -0,0 +1,69 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: keyset.py
+# Role: Keyset (seek) pagination cursors for PostgREST queries
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Sıralama her zaman (sort kolonu, id) -> eşit değerlerde bile stabil
+# - Offset yok: sayfa maliyeti derinlikten bağımsız (index seek)
+# - Cursor opak (base64url JSON); istemci içeriğine güvenmez
+# =============================================================================
+
+"""
+keyset.py - Stable cursors for (sort_column, id) ordered queries
+
+    query = supabase.table("student_topic_tests").select(...).eq("student_id", sid)
+    query = seek_desc(query, "test_date", after)     # after = decode_cursor(cursor) | None
+    rows = query.order("test_date", desc=True).order("id", desc=True).limit(n + 1)
+
+    next_cursor = encode_cursor(rows[n - 1]["test_date"], rows[n - 1]["id"])
+
+Gerekli index: (filtre kolonları, sort kolonu DESC, id DESC).
+"""
+
+import base64
+import json
+from typing import Any, Optional, Tuple
+
+Cursor = Tuple[Any, Any]
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Geçersiz cursor -> ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+    if not isinstance(values, list) or len(values) != 2 or values[1] is None:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return values[0], values[1]
+
+
+def _quote(value: Any) -> str:
+    """PostgREST filtre değeri (":" "+" "," içeren timestamp'ler için tırnaklı)"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def seek_desc(query, sort_column: str, after: Optional[Cursor], id_column: str = "id"):
+    """
+    (sort_column DESC, id DESC) sırasında cursor'dan sonraki satırlar:
+
+        sort < v  OR  (sort = v AND id < i)
+    """
+    if after is None:
+        return query
+    value, row_id = after
+    return query.or_(
+        f"{sort_column}.lt.{_quote(value)},"
+        f"and({sort_column}.eq.{_quote(value)},{id_column}.lt.{_quote(row_id)})"
+    )
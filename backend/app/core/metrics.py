@@ -0,0 +1,382 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: metrics.py
+# Role: Prometheus text-format metrics (counters, gauges, histograms, collectors)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Hot path: metrik başına kısa lock, sadece sayaç artışı (I/O yok)
+# - Label kardinalitesi sınırlı: route şablonu, tablo adı (id / query değil)
+# - Türetilebilen değerler (cache, motor, memory) scrape anında collector ile
+# - Ek bağımlılık yok: exposition format 0.0.4 elle üretilir
+# =============================================================================
+
+"""
+metrics.py - /metrics endpoint'i için process-içi metrik registry
+
+Tanımlama (modül seviyesinde, bir kez):
+
+    REQUESTS = metrics.counter("endstp_http_requests_total", "HTTP requests", ("method", "route", "status"))
+    LATENCY = metrics.histogram("endstp_http_request_duration_seconds", "HTTP latency", ("method", "route"))
+
+Hot path:
+
+    REQUESTS.inc("GET", "/api/v1/student/dashboard", "200")
+    LATENCY.observe(0.042, "GET", "/api/v1/student/dashboard")
+
+Scrape anında hesaplananlar:
+
+    metrics.register_collector(fn)   # fn() -> Iterable[MetricFamily]
+
+Deployment: tek worker (uvicorn --workers 1) varsayılır. Registry process
+içidir ve multiprocess aggregation yoktur; --workers N altında her scrape
+rastgele bir worker'a düşer ve sayaçlar scrape'ler arasında inip çıkar.
+Birden çok process gerekiyorsa her biri ayrı port / ayrı scrape target
+(instance label'ı Prometheus tarafında) olarak çalıştırılmalı.
+"""
+
+import bisect
+import hmac
+import logging
+import math
+import os
+import resource
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye; HTTP ve Supabase çağrıları için
+DEFAULT_BUCKETS: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Sample(NamedTuple):
+    suffix: str                      # "", "_bucket", "_sum", "_count"
+    labels: Dict[str, str]
+    value: float
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    kind: str                        # counter | gauge | histogram
+    help: str
+    samples: List[Sample]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_le(bound: float) -> str:
+    return "+Inf" if bound == math.inf else _format_value(float(bound))
+
+
+def render_families(families: Iterable[MetricFamily]) -> str:
+    lines: List[str] = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for sample in family.samples:
+            if sample.labels:
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in sample.labels.items())
+                lines.append(f"{family.name}{sample.suffix}{{{labels}}} {_format_value(sample.value)}")
+            else:
+                lines.append(f"{family.name}{sample.suffix} {_format_value(sample.value)}")
+    return "\n".join(lines) + "\n"
+
+
+def histogram_samples(
+    labels: Dict[str, str],
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> List[Sample]:
+    """Bucket başına sayımlar -> kümülatif _bucket + _sum + _count"""
+    samples = []
+    cumulative = 0
+    for bound, c in zip(list(bounds) + [math.inf], counts):
+        cumulative += c
+        samples.append(Sample("_bucket", {**labels, "le": _format_le(bound)}, cumulative))
+    samples.append(Sample("_sum", labels, total))
+    samples.append(Sample("_count", labels, cumulative))
+    return samples
+
+
+# ============================================
+# METRIC TYPES
+# ============================================
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    @abstractmethod
+    def collect(self) -> MetricFamily:
+        """Anlık değerlerden tek bir MetricFamily üret"""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = sorted(self._values.items())
+        return MetricFamily(self.name, self.kind, self.help, [
+            Sample("", self._labels(k), v) for k, v in items
+        ])
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # label değerleri -> [bucket sayımları..., +Inf], sum
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        samples: List[Sample] = []
+        for key, (counts, total) in items:
+            samples.extend(histogram_samples(self._labels(key), self.buckets, counts, total))
+        return MetricFamily(self.name, self.kind, self.help, samples)
+
+
+# ============================================
+# REGISTRY
+# ============================================
+
+class MetricsRegistry:
+    """Process-wide registry; aynı isimle tekrar tanımlama aynı metriği döndürür"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric '{name}' already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+            collectors = list(self._collectors)
+        families = [m.collect() for m in metrics]
+        failed: List[str] = []
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                # Tek collector hatası scrape'i bozmaz
+                name = getattr(collector, "__name__", "?")
+                logger.warning(f"⚠️ Metrics collector {name} failed: {e}")
+                failed.append(name)
+        if failed:
+            # Tek family (HELP/TYPE bir kez), her hatalı collector bir sample
+            families.append(MetricFamily(
+                "endstp_metrics_collector_errors", "gauge",
+                "Collector failed during this scrape",
+                [Sample("", {"collector": name}, 1) for name in failed],
+            ))
+        return families
+
+    def render(self) -> str:
+        return render_families(self.collect())
+
+
+metrics = MetricsRegistry()
+
+
+# ============================================
+# SCRAPE AUTH
+# ============================================
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def scrape_denial(authorization: Optional[str]) -> Optional[int]:
+    """
+    /metrics erişim kontrolü; izin varsa None, yoksa HTTP status kodu.
+
+    METRICS_TOKEN zorunlu (Bearer). Token'sız açık scrape yalnızca
+    METRICS_PUBLIC=1 ile bilinçli olarak açılır; token yoksa 503.
+    """
+    token = os.getenv("METRICS_TOKEN")
+    if not token:
+        return None if _env_flag("METRICS_PUBLIC") else 503
+    expected = f"Bearer {token}".encode()
+    if not hmac.compare_digest((authorization or "").encode(), expected):
+        return 401
+    return None
+
+
+# ============================================
+# LABEL HELPERS
+# ============================================
+
+_route_templates: Dict[int, Dict[Callable, str]] = {}
+
+
+def route_label(scope: Dict) -> str:
+    """
+    Eşleşen route şablonu (/api/v1/tasks/{task_id}); path değil -> sınırlı kardinalite
+
+    Starlette 0.27 scope'a "route" koymaz, "endpoint" koyar; endpoint -> path
+    eşlemesi app başına bir kez kurulur.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "unmatched"
+    templates = _route_templates.get(id(app))
+    if templates is None:
+        templates = {}
+        for route in getattr(app, "routes", []):
+            path = getattr(route, "path", None)
+            route_endpoint = getattr(route, "endpoint", None)
+            if path and route_endpoint is not None:
+                templates.setdefault(route_endpoint, path)
+        _route_templates[id(app)] = templates
+    return templates.get(endpoint, "unmatched")
+
+
+def supabase_target(path: str) -> Tuple[str, str]:
+    """
+    PostgREST URL path -> (service, table)
+    /rest/v1/student_tasks -> ("rest", "student_tasks"); /rest/v1/rpc/fn -> ("rpc", "fn")
+    """
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 3 and parts[0] == "rest":
+        if parts[2] == "rpc" and len(parts) >= 4:
+            return "rpc", parts[3]
+        return "rest", parts[2]
+    if parts:
+        return parts[0], ""
+    return "other", ""
+
+
+# ============================================
+# PROCESS COLLECTOR
+# ============================================
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_START_TIME = time.time()
+
+
+def _resident_memory_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def collect_process() -> List[MetricFamily]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    families = [
+        MetricFamily("process_max_resident_memory_bytes", "gauge", "Peak resident memory (ru_maxrss)",
+                     [Sample("", {}, usage.ru_maxrss * 1024)]),
+        MetricFamily("process_cpu_seconds_total", "counter", "User + system CPU time",
+                     [Sample("", {}, round(usage.ru_utime + usage.ru_stime, 3))]),
+        MetricFamily("process_start_time_seconds", "gauge", "Process start (unix time)",
+                     [Sample("", {}, round(_START_TIME, 3))]),
+        MetricFamily("process_threads", "gauge", "Active Python threads",
+                     [Sample("", {}, threading.active_count())]),
+    ]
+    rss = _resident_memory_bytes()
+    if rss is not None:
+        families.append(MetricFamily("process_resident_memory_bytes", "gauge", "Resident memory",
+                                     [Sample("", {}, rss)]))
+    return families
+
+
+metrics.register_collector(collect_process)
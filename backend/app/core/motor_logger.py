@@ -1,17 +1,147 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: motor_logger.py
+# Role: Buffered, rotating motor activity log (JSON lines) + streaming reader
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - log_execution() request thread'inde I/O yapmaz (bounded queue'ya koyar)
+# - Kuyruk doluysa kayıt düşürülür ve sayılır (motor çağrısı beklemez)
+# - Aktif dosya process başına: logs/motor_activity-<pid>.log (boyut / süre
+#   ile rotate). Her worker sadece kendi dosyasını rename eder; başka
+#   worker'ın açık handle'ı altından dosya kaymaz
+# - Rotate edilen segment opsiyonel gzip; okuyucu ikisini de akış olarak okur
+# =============================================================================
+
 """
 Motor Activity Logger
-Her motor çağrısını JSON dosyasına kaydeder
+Her motor çağrısını JSON satırı olarak kaydeder (arka plan thread'i ile)
+
+Env:
+    MOTOR_LOG_DIR=logs
+    MOTOR_LOG_QUEUE_SIZE=10000       # dolunca drop + sayaç
+    MOTOR_LOG_FLUSH_SECONDS=1
+    MOTOR_LOG_MAX_BYTES=10485760     # aktif dosya bu boyutta rotate
+    MOTOR_LOG_ROTATE_SECONDS=3600    # ... veya bu yaşta
+    MOTOR_LOG_COMPRESS=gzip          # rotate edilen segmentler .log.gz
+    MOTOR_LOG_MAX_SEGMENTS=48        # eski segmentler silinir
+
+Dosyalar (uvicorn --workers N: her worker kendi aktif dosyasına yazar):
+    motor_activity-<pid>.log                              # aktif
+    motor_activity.<utc stamp>.<pid>.<seq>.log[.gz]       # rotate edilmiş
+
+Ölü bir worker'ın aktif dosyası, bir sonraki rotate eden worker tarafından
+segment'e çevrilir (pid yaşamıyorsa).
+
+Okuma (scripts/view_motor_stats.py):
+    stats = aggregate_motor_log()
 """
+
+import atexit
+import gzip
+import heapq
 import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_NAME = "motor_activity"
+ACTIVE_PREFIX = f"{LOG_NAME}-"          # + <pid> + ACTIVE_SUFFIX
+ACTIVE_SUFFIX = ".log"
+GZIP_SUFFIX = ".log.gz"
+LEGACY_ACTIVE = f"{LOG_NAME}{ACTIVE_SUFFIX}"  # tek dosyalı eski yazıcı
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("MOTOR_LOG_QUEUE_SIZE", "10000"))
+DEFAULT_FLUSH_SECONDS = float(os.getenv("MOTOR_LOG_FLUSH_SECONDS", "1"))
+DEFAULT_MAX_BYTES = int(os.getenv("MOTOR_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+DEFAULT_ROTATE_SECONDS = float(os.getenv("MOTOR_LOG_ROTATE_SECONDS", "3600"))
+DEFAULT_MAX_SEGMENTS = int(os.getenv("MOTOR_LOG_MAX_SEGMENTS", "48"))
+WRITE_BATCH = 1000
+
+# json.dumps(entry) her satırı bununla başlatır; `since` filtresi parse etmeden eler
+TIMESTAMP_PREFIX = '{"timestamp": "'
+
+
+def _log_dir() -> Path:
+    return Path(os.getenv("MOTOR_LOG_DIR", "logs"))
+
+
+def _active_pid(path: Path) -> Optional[int]:
+    """motor_activity-<pid>.log -> pid (aktif dosya değilse None)"""
+    name = path.name
+    if not (name.startswith(ACTIVE_PREFIX) and name.endswith(ACTIVE_SUFFIX)):
+        return None
+    try:
+        return int(name[len(ACTIVE_PREFIX):-len(ACTIVE_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ============================================
+# WRITER
+# ============================================
 
 class MotorActivityLogger:
-    def __init__(self):
-        self.log_file = Path("logs/motor_activity.log")
-        self.log_file.parent.mkdir(exist_ok=True)
-    
+    """
+    log_execution() -> bounded queue -> flusher thread -> aktif segment
+
+    Thread ilk kayıtta başlar; process çıkışında kalan kayıtlar yazılır.
+    """
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rotate_seconds: float = DEFAULT_ROTATE_SECONDS,
+        compress: Optional[str] = None,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+    ):
+        self.log_dir = Path(log_dir) if log_dir is not None else _log_dir()
+        self.flush_seconds = flush_seconds
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = (compress if compress is not None else os.getenv("MOTOR_LOG_COMPRESS", "")).lower() or None
+        self.max_segments = max_segments
+
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._file = None
+        self._file_pid: Optional[int] = None
+        self._file_opened_at = 0.0
+        self._seq = 0
+
+        self.logged = 0
+        self.dropped = 0
+        self.written = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+    # ---------- request path ----------
+
     def log_execution(
         self,
         motor_type: str,
@@ -25,7 +155,7 @@ class MotorActivityLogger:
         success: bool = True,
         error: str = None
     ):
-        """Motor çağrısını logla"""
+        """Motor çağrısını logla (kuyruğa koy, I/O yok)"""
         entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "motor_type": motor_type,
@@ -39,10 +169,272 @@ class MotorActivityLogger:
             "topic_id": topic_id,
             "error": error
         }
-        
-        # Append to log file
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(json.dumps(entry))
+            self.logged += 1
+        except queue.Full:
+            self.dropped += 1
+
+    # ---------- lifecycle ----------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="motor-log-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Kuyruğu boşalt, dosyayı kapat"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            self._drain()
+            self._close_file()
+
+    def flush(self) -> None:
+        """Kuyruktaki her şeyi şimdi yaz (testler / shutdown)"""
+        with self._lock:
+            self._drain()
+            if self._file is not None:
+                self._file.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            with self._lock:
+                self._drain()
+                if self._file is not None:
+                    self._file.flush()
+
+    @property
+    def log_file(self) -> Path:
+        """Bu process'in aktif dosyası (fork sonrası child kendi pid'ini kullanır)"""
+        return self.log_dir / f"{ACTIVE_PREFIX}{os.getpid()}{ACTIVE_SUFFIX}"
+
+    # ---------- file ops (lock altında) ----------
+
+    def _drain(self) -> None:
+        while True:
+            batch: List[str] = []
+            try:
+                while len(batch) < WRITE_BATCH:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            try:
+                self._write(batch)
+            except OSError as e:
+                self.write_errors += 1
+                self.dropped += len(batch)
+                logger.warning(f"⚠️ Motor log write failed ({len(batch)} dropped): {e}")
+                self._close_file()
+                return
+
+    def _write(self, lines: List[str]) -> None:
+        if self._file is not None and self._file_pid != os.getpid():
+            # fork: parent'ın handle'ı miras kaldı, child kendi dosyasını açar
+            self._file = None
+        if self._file is None:
+            self._open_file()
+        elif self._should_rotate():
+            self._rotate()
+        self._file.write("\n".join(lines) + "\n")
+        self.written += len(lines)
+
+    def _open_file(self) -> None:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.log_file, "a", encoding="utf-8")
+        self._file_pid = os.getpid()
+        self._file_opened_at = time.time()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _should_rotate(self) -> bool:
+        size = self._file.tell()
+        if size == 0:
+            return False
+        return size >= self.max_bytes or time.time() - self._file_opened_at >= self.rotate_seconds
+
+    def _rotate(self) -> None:
+        self._close_file()
+        self._seal(self.log_file, os.getpid())
+        self.rotations += 1
+        self._seal_orphans()
+        self._prune()
+        self._open_file()
+
+    def _seal(self, active: Path, pid: int) -> None:
+        """Aktif dosyayı segment'e çevir (gzip: önce .tmp, sonra atomik rename)"""
+        self._seq += 1
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        segment = self.log_dir / f"{LOG_NAME}.{stamp}.{pid}.{self._seq:04d}{ACTIVE_SUFFIX}"
+        os.replace(active, segment)
+        if self.compress == "gzip":
+            gz_path = segment.with_name(segment.name[: -len(ACTIVE_SUFFIX)] + GZIP_SUFFIX)
+            tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+            with open(segment, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+                while chunk := src.read(1024 * 1024):
+                    dst.write(chunk)
+            os.replace(tmp_path, gz_path)
+            segment.unlink()
+
+    def _seal_orphans(self) -> None:
+        """Ölmüş worker'ların aktif dosyaları (yazan yok) segment'e çevrilir"""
+        for path in self.log_dir.glob(f"{ACTIVE_PREFIX}*{ACTIVE_SUFFIX}"):
+            pid = _active_pid(path)
+            if pid is None or pid == os.getpid() or _pid_alive(pid):
+                continue
+            try:
+                self._seal(path, pid)
+            except OSError:
+                pass  # başka worker aynı anda aldı
+
+    def _prune(self) -> None:
+        segments = list_segments(self.log_dir, include_active=False)
+        for old in segments[: max(0, len(segments) - self.max_segments)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    # ---------- stats ----------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "log_file": str(self.log_file),
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+            "compress": self.compress,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+# ============================================
+# READER
+# ============================================
+
+def list_segments(log_dir: Optional[Path] = None, include_active: bool = True) -> List[Path]:
+    """Rotate edilmiş segmentler (eskiden yeniye) + worker'ların aktif dosyaları"""
+    log_dir = Path(log_dir) if log_dir is not None else _log_dir()
+    if not log_dir.exists():
+        return []
+    prefix = f"{LOG_NAME}."
+    segments, active = [], []
+    for p in log_dir.iterdir():
+        if p.name == LEGACY_ACTIVE or _active_pid(p) is not None:
+            active.append(p)
+        elif p.name.startswith(prefix) and (p.name.endswith(ACTIVE_SUFFIX) or p.name.endswith(GZIP_SUFFIX)):
+            segments.append(p)
+    segments.sort()
+    if include_active:
+        segments.extend(sorted(active))
+    return segments
+
+
+def iter_motor_log(log_dir: Optional[Path] = None, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Tüm segmentleri sırayla akış olarak oku (bellekte liste tutmaz)
+
+    since: ISO timestamp; daha eski kayıtlar atlanır (string karşılaştırma)
+    """
+    for path in list_segments(log_dir):
+        opener = gzip.open if path.name.endswith(GZIP_SUFFIX) else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if since is not None and line.startswith(TIMESTAMP_PREFIX):
+                        if line[len(TIMESTAMP_PREFIX):len(TIMESTAMP_PREFIX) + len(since)] < since:
+                            continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if since is not None and str(entry.get("timestamp", "")) < since:
+                        continue
+                    yield entry
+        except (OSError, EOFError) as e:
+            logger.warning(f"⚠️ Motor log segment unreadable {path}: {e}")
+
+
+def aggregate_motor_log(
+    log_dir: Optional[Path] = None,
+    since: Optional[str] = None,
+    recent: int = 10,
+) -> Dict[str, Any]:
+    """
+    Tek geçişte özet: motor/version, fallback, avg süre, tier, son N kayıt
+
+    Bellek: kayıt sayısından bağımsız (sayaçlar + son `recent` kayıt)
+
+    Aktif worker dosyaları pid sırasıyla okunur ve kayıtları zamanda iç içe
+    geçer; first/last timestamp ve `recent` dosya sırasına değil timestamp
+    karşılaştırmasına göre seçilir (ISO string, `since` ile aynı sıralama).
+    """
+    by_motor: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    by_tier: Dict[str, int] = defaultdict(int)
+    # (timestamp, okuma sırası, entry) min-heap; en yeni `recent` kayıt kalır
+    last: List[tuple] = []
+    total = 0
+    first_ts = None
+    last_ts = None
+
+    for entry in iter_motor_log(log_dir, since=since):
+        total += 1
+        ts = entry.get("timestamp")
+        if ts is not None:
+            if first_ts is None or ts < first_ts:
+                first_ts = ts
+            if last_ts is None or ts > last_ts:
+                last_ts = ts
+        stats = by_motor[entry.get("motor_type", "unknown")]
+        stats[entry.get("version", "?")] += 1
+        stats["calls"] += 1
+        stats["total_time"] += entry.get("execution_time_ms") or 0
+        if entry.get("fallback_used"):
+            stats["fallback"] += 1
+        if entry.get("success") is False:
+            stats["errors"] += 1
+        by_tier[entry.get("user_tier", "unknown")] += 1
+        if recent > 0:
+            item = (ts or "", total, entry)
+            if len(last) < recent:
+                heapq.heappush(last, item)
+            else:
+                heapq.heappushpop(last, item)
+
+    return {
+        "total": total,
+        "first_timestamp": first_ts,
+        "last_timestamp": last_ts,
+        "by_motor": {
+            motor: {**stats, "avg_time_ms": stats["total_time"] / stats["calls"]}
+            for motor, stats in by_motor.items()
+        },
+        "by_tier": dict(by_tier),
+        "recent": [entry for _, _, entry in sorted(last)],
+    }
+
 
 # Global instance
 motor_logger = MotorActivityLogger()
+atexit.register(motor_logger.close)
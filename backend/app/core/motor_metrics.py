@@ -0,0 +1,221 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: motor_metrics.py
+# Role: Fixed-memory motor performance stats (windowed latency histograms)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - record() O(1): son kayıtlar ring buffer'a, sayaçlar zaman slotlarına
+# - Bellek sabit: slot sayısı × görülen (motor, version, tier) anahtarı
+# - Pencereler: 1m (1 sn slot), 1h (1 dk slot), 24h (15 dk slot)
+# - Percentile: sabit bucket histogramı (request_metrics.LatencyHistogram)
+# =============================================================================
+
+"""
+motor_metrics.py - MotorRegistry performans istatistikleri
+
+    stats = MotorPerformanceStats()
+    stats.record("difficulty", "v2", "premium", 3.2, success=True, fallback_used=False)
+    stats.summary("1h")   # [{motor_type, version, tier, requests, p50_ms, p95_ms, p99_ms, ...}]
+
+Pencere, içinde bulunulan slotu da kapsar: "1h" = son 60 dakikalık slot
+(şu anki dakika dahil). Slot süresi pencerenin çözünürlüğüdür.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.metrics import MetricFamily, Sample, histogram_samples
+from app.core.request_metrics import LatencyHistogram
+
+# Motor çağrıları ms altı – birkaç saniye
+MOTOR_LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+RECENT_CAPACITY = 1000
+
+# pencere adı -> (slot saniyesi, slot sayısı)
+WINDOWS: Dict[str, Tuple[int, int]] = {
+    "1m": (1, 60),
+    "1h": (60, 60),
+    "24h": (900, 96),
+}
+
+MotorKey = Tuple[str, str, str]  # (motor_type, version, tier)
+
+
+class _MotorCounter:
+    """Bir anahtarın latency histogramı + başarı / fallback sayaçları"""
+
+    __slots__ = ("latency", "success", "fallback")
+
+    def __init__(self):
+        self.latency = LatencyHistogram(MOTOR_LATENCY_BUCKETS_MS)
+        self.success = 0
+        self.fallback = 0
+
+    def observe(self, execution_time_ms: float, success: bool, fallback_used: bool) -> None:
+        self.latency.observe(execution_time_ms)
+        if success:
+            self.success += 1
+        if fallback_used:
+            self.fallback += 1
+
+    def merge(self, other: "_MotorCounter") -> None:
+        self.latency.merge(other.latency)
+        self.success += other.success
+        self.fallback += other.fallback
+
+    def to_dict(self) -> Dict[str, Any]:
+        count = self.latency.count
+        return {
+            "requests": count,
+            "success_rate": round(self.success / count * 100, 2) if count else 0,
+            "fallback_rate": round(self.fallback / count * 100, 2) if count else 0,
+            "avg_ms": self.latency.mean(),
+            "p50_ms": self.latency.percentile(0.50),
+            "p95_ms": self.latency.percentile(0.95),
+            "p99_ms": self.latency.percentile(0.99),
+            "max_ms": round(self.latency.max_ms, 2),
+        }
+
+
+class _SlotRing:
+    """
+    Zaman slotlu ring: slot = (epoch // slot_seconds) % size
+
+    Slot eskiyse ilk kayıtta sıfırlanır (ayrı temizlik thread'i yok).
+    """
+
+    def __init__(self, slot_seconds: int, size: int):
+        self.slot_seconds = slot_seconds
+        self.size = size
+        self._epochs: List[int] = [-1] * size
+        self._slots: List[Dict[MotorKey, _MotorCounter]] = [{} for _ in range(size)]
+
+    def counter(self, key: MotorKey, now: float) -> _MotorCounter:
+        epoch = int(now // self.slot_seconds)
+        i = epoch % self.size
+        if self._epochs[i] != epoch:
+            self._epochs[i] = epoch
+            self._slots[i] = {}
+        slot = self._slots[i]
+        c = slot.get(key)
+        if c is None:
+            c = slot[key] = _MotorCounter()
+        return c
+
+    def collect(self, now: float) -> Dict[MotorKey, _MotorCounter]:
+        current = int(now // self.slot_seconds)
+        merged: Dict[MotorKey, _MotorCounter] = {}
+        for epoch, slot in zip(self._epochs, self._slots):
+            if current - self.size < epoch <= current:
+                for key, c in slot.items():
+                    target = merged.get(key)
+                    if target is None:
+                        target = merged[key] = _MotorCounter()
+                    target.merge(c)
+        return merged
+
+
+class MotorPerformanceStats:
+    """Son N kayıt (ring buffer) + lifetime ve pencereli histogramlar"""
+
+    def __init__(
+        self,
+        recent_capacity: int = RECENT_CAPACITY,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=recent_capacity)
+        self._lifetime: Dict[MotorKey, _MotorCounter] = {}
+        self._rings = {name: _SlotRing(*spec) for name, spec in WINDOWS.items()}
+        self.total = 0
+
+    def record(
+        self,
+        motor_type: str,
+        version: str,
+        tier: str,
+        execution_time_ms: float,
+        success: bool,
+        fallback_used: bool = False,
+        timestamp: Optional[str] = None,
+    ) -> None:
+        now = self._clock()
+        key = (motor_type, version, tier)
+        with self._lock:
+            self.total += 1
+            self.recent.append({
+                "motor_type": motor_type,
+                "version": version,
+                "execution_time_ms": execution_time_ms,
+                "success": success,
+                "fallback_used": fallback_used,
+                "user_tier": tier,
+                "timestamp": timestamp,
+            })
+            c = self._lifetime.get(key)
+            if c is None:
+                c = self._lifetime[key] = _MotorCounter()
+            c.observe(execution_time_ms, success, fallback_used)
+            for ring in self._rings.values():
+                ring.counter(key, now).observe(execution_time_ms, success, fallback_used)
+
+    def counters(self, window: Optional[str] = None) -> Dict[MotorKey, _MotorCounter]:
+        """window=None: process başından beri; aksi halde WINDOWS anahtarı"""
+        if window is not None and window not in self._rings:
+            raise ValueError(f"Unknown window '{window}' (expected one of {list(WINDOWS)})")
+        with self._lock:
+            if window is None:
+                merged = {}
+                for key, c in self._lifetime.items():
+                    merged[key] = _MotorCounter()
+                    merged[key].merge(c)
+                return merged
+            return self._rings[window].collect(self._clock())
+
+    def summary(self, window: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            {"motor_type": motor_type, "version": version, "tier": tier, **c.to_dict()}
+            for (motor_type, version, tier), c in sorted(self.counters(window).items())
+        ]
+
+    def by_motor(self, window: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Motor tipi başına (version / tier birleştirilmiş) özet"""
+        grouped: Dict[str, _MotorCounter] = {}
+        versions: Dict[str, Dict[str, int]] = {}
+        for (motor_type, version, _tier), c in self.counters(window).items():
+            target = grouped.get(motor_type)
+            if target is None:
+                target = grouped[motor_type] = _MotorCounter()
+            target.merge(c)
+            per_version = versions.setdefault(motor_type, {})
+            per_version[version] = per_version.get(version, 0) + c.latency.count
+        return {
+            motor_type: {
+                **c.to_dict(),
+                "v1_requests": versions[motor_type].get("v1", 0),
+                "v2_requests": versions[motor_type].get("v2", 0),
+            }
+            for motor_type, c in sorted(grouped.items())
+        }
+
+    def metric_families(self) -> List[MetricFamily]:
+        """/metrics: lifetime histogramlar (ms bucket'ları saniyeye çevrilir)"""
+        buckets = [b / 1000 for b in MOTOR_LATENCY_BUCKETS_MS]
+        latency, success, fallback = [], [], []
+        for (motor_type, version, tier), c in sorted(self.counters().items()):
+            labels = {"motor_type": motor_type, "version": version, "tier": tier}
+            latency.extend(histogram_samples(labels, buckets, c.latency.counts, c.latency.total_ms / 1000))
+            success.append(Sample("", labels, c.success))
+            fallback.append(Sample("", labels, c.fallback))
+        return [
+            MetricFamily("endstp_motor_execution_seconds", "histogram", "Motor execution time", latency),
+            MetricFamily("endstp_motor_success_total", "counter", "Successful motor executions", success),
+            MetricFamily("endstp_motor_fallback_total", "counter", "Motor executions served by fallback", fallback),
+        ]
@@ -3,20 +3,185 @@ Motor Orchestrator
 Unified motor coordination and result aggregation
 
 Responsibilities:
-- Run multiple motors in parallel (when possible)
+- Run independent motors concurrently (per-motor timeout + fallback)
 - Aggregate results into unified response
 - Handle inter-motor dependencies
 - Provide performance metrics
 """
 
 import asyncio
+import contextvars
 import logging
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
+from app.core.metrics import MetricFamily, Sample, metrics
+from app.core.motor_registry import motor_registry, MotorType, SubscriptionTier
+from app.core.motor_wrapper import UserTier
+
 
 logger = logging.getLogger(__name__)
 
+# Motorlar CPU + context DB çağrısı yapar; event loop dışında çalışır.
+# Timeout'a düşen motor iptal edilemez, thread'i bitene kadar bir worker
+# tutar. Pool'daki iş (çalışan + kuyrukta bekleyen) MOTOR_POOL_MAX_IN_FLIGHT'a
+# ulaşınca yeni çağrı hiç gönderilmez: kuyrukta bekleyip timeout'a düşmek
+# yerine hemen fallback döner (admission control).
+MOTOR_POOL_SIZE = 16
+MOTOR_POOL_MAX_IN_FLIGHT = int(os.getenv("MOTOR_POOL_MAX_IN_FLIGHT", str(MOTOR_POOL_SIZE)))
+_motor_executor = ThreadPoolExecutor(
+    max_workers=MOTOR_POOL_SIZE,
+    thread_name_prefix="motor"
+)
+
+MOTOR_TIMEOUTS = metrics.counter(
+    "endstp_motor_timeouts_total",
+    "Motor calls abandoned after their budget (thread keeps running)",
+    ("motor",),
+)
+MOTOR_REJECTED = metrics.counter(
+    "endstp_motor_pool_rejected_total",
+    "Motor calls skipped (fallback) because the motor pool was saturated",
+    ("motor",),
+)
+
+
+class MotorPoolSaturated(RuntimeError):
+    """Motor pool dolu: çağrı gönderilmedi"""
+
+
+class _PoolLoad:
+    """Motor pool doluluğu: in_flight = kuyrukta + çalışan (terk edilenler dahil)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+
+    def try_acquire(self, limit: int) -> bool:
+        with self._lock:
+            if self.in_flight >= limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def started(self) -> None:
+        with self._lock:
+            self.running += 1
+
+    def finished(self) -> None:
+        with self._lock:
+            self.running -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "running": self.running,
+                "queued": max(0, self.in_flight - self.running),
+            }
+
+
+_pool_load = _PoolLoad()
+
+
+def collect_motor_pool() -> List[MetricFamily]:
+    load = _pool_load.snapshot()
+    return [
+        MetricFamily("endstp_motor_pool_threads", "gauge", "Motor pool size",
+                     [Sample("", {}, MOTOR_POOL_SIZE)]),
+        MetricFamily("endstp_motor_pool_running", "gauge", "Motor calls running on a pool thread",
+                     [Sample("", {}, load["running"])]),
+        MetricFamily("endstp_motor_pool_queue_depth", "gauge", "Motor calls waiting for a pool thread",
+                     [Sample("", {}, load["queued"])]),
+    ]
+
+
+metrics.register_collector(collect_motor_pool)
+
+
+async def _run_blocking(fn: Callable, *args: Any) -> Any:
+    """
+    Senkron motor/context çağrısını motor pool'unda çalıştır
+
+    Raises:
+        MotorPoolSaturated: pool dolu, çağrı gönderilmedi
+    """
+    if not _pool_load.try_acquire(MOTOR_POOL_MAX_IN_FLIGHT):
+        raise MotorPoolSaturated(f"motor pool saturated ({MOTOR_POOL_MAX_IN_FLIGHT} in flight)")
+
+    ctx = contextvars.copy_context()
+
+    def call() -> Any:
+        _pool_load.started()
+        try:
+            return ctx.run(fn, *args)
+        finally:
+            _pool_load.finished()
+
+    try:
+        future = _motor_executor.submit(call)
+    except Exception:
+        _pool_load.release()
+        raise
+    # Bitince (veya başlamadan iptal edilince) slot geri verilir
+    future.add_done_callback(lambda _: _pool_load.release())
+    return await asyncio.wrap_future(future)
+
+
+def _fallback_result(
+    name: str,
+    topic_id: str,
+    tier: UserTier,
+    test_data: Dict,
+    reason: str
+) -> Dict:
+    """
+    Bütçesini aşan motor için nötr sonuç (v1 neutral response)
+    Wrapper envelope formatında döner.
+    """
+    if name == "difficulty":
+        from app.core.difficulty_engine_v1 import DifficultyEngineV1
+        data = DifficultyEngineV1._neutral_response(topic_id, f"fallback: {reason}")
+    elif name == "bs_model":
+        from app.core.bs_model_engine_v1 import BSModelV1
+        data = BSModelV1._neutral_response(f"fallback: {reason}")
+    elif name == "time":
+        from app.core.time_engine_v1 import TimeAnalyzerV1
+        duration = test_data.get("duration_minutes")
+        data = TimeAnalyzerV1._neutral_response(
+            f"fallback: {reason}",
+            duration * 60 if duration else None
+        )
+    else:
+        from app.core.priority_engine_v1 import PriorityOutput
+        data = PriorityOutput(
+            topic_id=topic_id,
+            topic_name="Unknown",
+            priority_score=50.0,
+            priority_level="MEDIUM",
+            analysis={"fallback": True},
+            suggestion=""
+        )
+    
+    return {
+        "data": data,
+        "meta": {
+            "motor_version": "v1",
+            "fallback_used": True,
+            "tier": tier.value,
+            "fallback_reason": reason
+        }
+    }
+
 
 class MotorOrchestrator:
     """
@@ -48,7 +213,9 @@ class MotorOrchestrator:
         """
         Complete analysis for a single topic test
         
-        Runs all 4 motors: Difficulty, BS-Model, Priority, Time
+        Runs all 4 motors concurrently: Difficulty, BS-Model, Time, Priority
+        Each motor has its own budget (MotorConfig.timeout_ms); a motor that
+        exceeds it is abandoned and replaced by a neutral fallback result.
         
         Args:
             student_id: Student UUID
@@ -60,7 +227,8 @@ class MotorOrchestrator:
                 "blank": int,
                 "total": int,
                 "duration_minutes": float,
-                "difficulty": int (1-5)
+                "difficulty": int (1-5),
+                "test_date": str (optional, ISO)
             }
             user_tier: User subscription tier
         
@@ -69,18 +237,17 @@ class MotorOrchestrator:
                 "difficulty": {...},
                 "bs_model": {...},
                 "time": {...},
+                "priority": {...},
                 "metadata": {...}
             }
         """
         
         start_time = datetime.now()
-        
-        # Fetch context once (shared across motors)
-        context = self.context_service.get_topic_context(topic_id)
+        tier = UserTier(user_tier.value if hasattr(user_tier, "value") else user_tier)
         
         # Prepare inputs
-        from app.core.difficulty_v1 import DifficultyInput
-        from app.core.bs_model_v1 import BSModelInput
+        from app.core.difficulty_engine_v1 import DifficultyInput
+        from app.core.bs_model_engine_v1 import BSModelInput
         
         difficulty_input = DifficultyInput(
             topic_id=topic_id,
@@ -98,49 +265,68 @@ class MotorOrchestrator:
             difficulty=test_data.get("difficulty", 3)
         )
         
-        success_rate = test_data["correct"] / test_data["total"] if test_data["total"] > 0 else 0
+        test_date = test_data.get("test_date") or datetime.now().isoformat()
         
-        # Run motors
-        results = {}
-        errors = []
+        # Run motors (independent → concurrent)
+        # Context fetch (shared across motors) de paralel başlar
+        motors = {
+            "difficulty": (
+                MotorType.DIFFICULTY,
+                lambda: self.motor_wrapper.calculate_difficulty(
+                    difficulty_input, student_id, tier
+                ),
+            ),
+            "bs_model": (
+                MotorType.BS_MODEL,
+                lambda: self.motor_wrapper.calculate_bs_model(
+                    bs_model_input, student_id, topic_id, tier
+                ),
+            ),
+            "time": (
+                MotorType.TIME,
+                lambda: self.motor_wrapper.calculate_time(
+                    student_id, topic_id, tier
+                ),
+            ),
+            "priority": (
+                MotorType.PRIORITY,
+                lambda: self.motor_wrapper.calculate_priority(
+                    student_id, topic_id, test_date, tier
+                ),
+            ),
+        }
         
-        # 1. Difficulty
-        try:
-            results["difficulty"] = self.motor_wrapper.calculate_difficulty(
-                difficulty_input,
-                student_id,
-                user_tier
-            )
-        except Exception as e:
-            logger.error(f"Difficulty motor failed: {e}")
-            errors.append({"motor": "difficulty", "error": str(e)})
+        context_task = _run_blocking(self.context_service.get_topic_context, topic_id)
+        outcomes = await asyncio.gather(
+            context_task,
+            *(
+                self._run_motor(name, motor_type, fn, student_id, topic_id, tier, test_data)
+                for name, (motor_type, fn) in motors.items()
+            ),
+            return_exceptions=True,
+        )
         
-        # 2. BS-Model
-        try:
-            results["bs_model"] = self.motor_wrapper.calculate_bs_model(
-                bs_model_input,
-                student_id,
-                topic_id,
-                user_tier
-            )
-        except Exception as e:
-            logger.error(f"BS-Model motor failed: {e}")
-            errors.append({"motor": "bs_model", "error": str(e)})
+        context = outcomes[0] if isinstance(outcomes[0], dict) else {}
         
-        # 3. Time Analyzer
-        try:
-            results["time"] = self.motor_wrapper.analyze_time(
-                test_data.get("duration_minutes"),
-                test_data["total"],
-                success_rate,
-                student_id,
-                topic_id,
-                subject_code,
-                user_tier
-            )
-        except Exception as e:
-            logger.error(f"Time motor failed: {e}")
-            errors.append({"motor": "time", "error": str(e)})
+        results = {}
+        errors = []
+        timings = {}
+        timeouts = []
+        saturated = []
+        
+        for name, outcome in zip(motors, outcomes[1:]):
+            timings[name] = outcome["elapsed_ms"]
+            if outcome["status"] == "ok":
+                results[name] = outcome["result"]
+                continue
+            
+            if outcome["status"] == "timeout":
+                timeouts.append(name)
+            elif outcome["status"] == "saturated":
+                saturated.append(name)
+            errors.append({"motor": name, "error": outcome["error"]})
+            if outcome["result"] is not None:
+                results[name] = outcome["result"]
         
         # Calculate elapsed time
         elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
@@ -150,9 +336,10 @@ class MotorOrchestrator:
             "student_id": student_id,
             "topic_id": topic_id,
             "subject_code": subject_code,
-            "motors_succeeded": len(results),
+            "motors_succeeded": len(motors) - len(errors),
             "motors_failed": len(errors),
             "total_time_ms": round(elapsed_ms, 2),
+            "motor_timings_ms": timings,
             "timestamp": datetime.now().isoformat(),
             "context_used": {
                 "archetype": context.get("archetype"),
@@ -160,6 +347,12 @@ class MotorOrchestrator:
             }
         }
         
+        if timeouts:
+            metadata["timeouts"] = timeouts
+        
+        if saturated:
+            metadata["pool_saturated"] = saturated
+        
         if errors:
             metadata["errors"] = errors
         
@@ -168,6 +361,75 @@ class MotorOrchestrator:
             "metadata": metadata
         }
     
+    async def _run_motor(
+        self,
+        name: str,
+        motor_type: MotorType,
+        fn: Callable[[], Dict],
+        student_id: str,
+        topic_id: str,
+        tier: "UserTier",
+        test_data: Dict
+    ) -> Dict:
+        """
+        Tek motoru kendi bütçesiyle çalıştır
+        
+        Pool doluysa motor hiç çalıştırılmaz (status=saturated, fallback).
+        
+        Returns:
+            {"status": ok|timeout|saturated|error, "result": envelope|None,
+             "error": str|None, "elapsed_ms": float}
+        """
+        config = motor_registry.get_motor_config(
+            motor_type=motor_type,
+            user_tier=SubscriptionTier(tier.value),
+            user_id=student_id
+        )
+        timeout_s = max(0.001, config.timeout_ms / 1000)
+        
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(_run_blocking(fn), timeout=timeout_s)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            # Thread iptal edilemez; sonucu beklemeyi bırakıp fallback döneriz
+            logger.error(f"{name} motor timed out after {config.timeout_ms} ms")
+            MOTOR_TIMEOUTS.inc(name)
+            status, error = "timeout", f"timeout after {config.timeout_ms} ms"
+            result = (
+                _fallback_result(name, topic_id, tier, test_data, "timeout")
+                if config.fallback_enabled else None
+            )
+        except MotorPoolSaturated as e:
+            logger.warning(f"⚠️ {name} motor skipped: {e}")
+            MOTOR_REJECTED.inc(name)
+            status, error = "saturated", str(e)
+            result = (
+                _fallback_result(name, topic_id, tier, test_data, "pool_saturated")
+                if config.fallback_enabled else None
+            )
+        except Exception as e:
+            logger.error(f"{name} motor failed: {e}")
+            status, error, result = "error", str(e), None
+        
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        
+        if status != "ok":
+            motor_registry.log_performance(
+                motor_type=motor_type,
+                version=config.version,
+                execution_time_ms=elapsed_ms,
+                success=False,
+                user_tier=tier.value
+            )
+        
+        return {
+            "status": status,
+            "result": result,
+            "error": error,
+            "elapsed_ms": elapsed_ms
+        }
+    
     async def analyze_topic_batch(
         self,
         student_id: str,
@@ -192,7 +454,7 @@ class MotorOrchestrator:
         start_time = datetime.now()
         
         # Prepare priority inputs
-        from app.core.priority_v1 import TopicInput
+        from app.core.priority_engine_v1 import TopicInput
         
         topics = []
         for test in topic_tests:
@@ -12,11 +12,14 @@ LOCK DATE: 2025-01-03
 VERSION: 2.0
 """
 
-from typing import Dict, Type, Optional, List, Any
+from typing import Deque, Dict, Type, Optional, List, Any
 from enum import Enum
 from datetime import datetime
 import logging
 
+from app.core.metrics import metrics
+from app.core.motor_metrics import MotorPerformanceStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,8 +96,8 @@ class MotorRegistry:
         # {"global": {"difficulty": "v2"}, "user-123": {"priority": "v1"}}
         self.override_settings: Dict[str, Dict[str, str]] = {}
         
-        # Performance log
-        self.performance_log: List[Dict[str, Any]] = []
+        # Performance: son 1000 kayıt (ring buffer) + pencereli histogramlar
+        self.performance = MotorPerformanceStats()
         
         # Tier to version mapping
         self._tier_mapping = {
@@ -228,21 +231,24 @@ class MotorRegistry:
         version: MotorVersion,
         execution_time_ms: float,
         success: bool,
-        user_tier: SubscriptionTier
+        user_tier: SubscriptionTier,
+        fallback_used: bool = False
     ) -> None:
-        """Log motor performance"""
-        self.performance_log.append({
-            "motor_type": motor_type.value,
-            "version": version.value,
-            "execution_time_ms": execution_time_ms,
-            "success": success,
-            "user_tier": user_tier.value if hasattr(user_tier, "value") else user_tier,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Keep last 1000 entries
-        if len(self.performance_log) > 1000:
-            self.performance_log = self.performance_log[-1000:]
+        """Log motor performance (O(1), sabit bellek)"""
+        self.performance.record(
+            motor_type=motor_type.value,
+            version=version.value,
+            tier=user_tier.value if hasattr(user_tier, "value") else user_tier,
+            execution_time_ms=execution_time_ms,
+            success=success,
+            fallback_used=fallback_used,
+            timestamp=datetime.now().isoformat()
+        )
+    
+    @property
+    def performance_log(self) -> Deque[Dict[str, Any]]:
+        """Son kayıtlar (eski API; en fazla 1000)"""
+        return self.performance.recent
     
     # ========================================
     # MOTOR LOOKUP
@@ -311,4 +317,12 @@ class MotorRegistry:
 # GLOBAL INSTANCE
 # ========================================
 
-motor_registry = MotorRegistry()
\ No newline at end of file
+motor_registry = MotorRegistry()
+
+
+def collect_motor_metrics():
+    """/metrics: motor histogramları (scrape anında)"""
+    return motor_registry.performance.metric_families()
+
+
+metrics.register_collector(collect_motor_metrics)
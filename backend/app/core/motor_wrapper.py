@@ -242,6 +242,15 @@ class MotorWrapper:
                     config=None
                 )
                 
+                motor_registry.log_performance(
+                    motor_type=MotorType.TIME,
+                    version=MotorVersion.V1,
+                    success=True,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    user_tier=user_tier.value,
+                    fallback_used=True
+                )
+                
                 return {
                     "data": result,
                     "meta": {
@@ -367,6 +376,15 @@ class MotorWrapper:
                 results = self.priority_v1.analyze(topics=[topic], config=None)
                 result = results[0] if results else {}
                 
+                motor_registry.log_performance(
+                    motor_type=MotorType.PRIORITY,
+                    version=MotorVersion.V1,
+                    success=True,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    user_tier=user_tier.value,
+                    fallback_used=True
+                )
+                
                 return {
                     "data": result,
                     "meta": {
@@ -457,6 +475,15 @@ class MotorWrapper:
             print(f"BS-Model v2 failed, falling back to v1: {e}")
             result = self.bs_model_v1.calculate(input_data)
             
+            motor_registry.log_performance(
+                motor_type=MotorType.BS_MODEL,
+                version=MotorVersion.V1,
+                success=True,
+                execution_time_ms=(time.time() - start_time) * 1000,
+                user_tier=user_tier.value,
+                fallback_used=True
+            )
+            
             return {
                 "data": result,
                 "meta": {
@@ -0,0 +1,368 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: rate_limit.py
+# Role: Sliding-window rate limiter (per student + route), pluggable backends
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Rate limit kararı DB'ye gitmez (process-içi veya yerel paylaşılan SQLite)
+# - Kesin sliding window: son `window` saniyedeki istekler sayılır
+# - Anahtar: kural (route) + öğrenci; kurallar env ile override edilebilir
+# - Backend hatası isteği düşürmez (fail-open + log)
+# =============================================================================
+
+"""
+rate_limit.py - Sliding-window rate limiter
+
+Endpoint'e bağlama:
+
+    @router.post(
+        "/test-results",
+        dependencies=[Depends(rate_limit("test_submit", limit=3, window_seconds=5))],
+    )
+
+Limit aşılırsa 429 + Retry-After. Kural limitleri env ile değiştirilebilir:
+
+    RATE_LIMIT_TEST_SUBMIT=5/10        # 10 saniyede 5 istek
+
+Backend (RATE_LIMIT_BACKEND env, yoksa CACHE_BACKEND):
+- memory (default): process-içi, istek başına mikro-saniyeler
+- sqlite: aynı makinedeki tüm uvicorn worker'larının paylaştığı SQLite dosyası
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, HTTPException
+
+from app.core.auth import get_current_user
+from app.db.session import run_db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_KEYS = 100_000
+SQLITE_PURGE_INTERVAL_SECONDS = 60.0
+
+DEFAULT_DETAIL = "Çok fazla istek. Lütfen biraz bekleyin."
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float  # saniye (allowed=True ise 0)
+
+
+# ============================================
+# BACKENDS
+# ============================================
+
+class RateLimitBackend(ABC):
+    """hit(): isteği say ve limit içinde mi karar ver (atomik)"""
+
+    name = "base"
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        ...
+
+    @abstractmethod
+    def reset(self, key: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def reset_prefix(self, prefix: str) -> None:
+        """Tek kuralın tüm anahtarları ("<kural>:")"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class InProcessRateLimitBackend(RateLimitBackend):
+    """
+    Anahtar başına zaman damgası kuyruğu (sliding log)
+
+    hit O(limit) en kötü, tipik O(1); anahtar sayısı LRU ile sınırlı.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        now = self._clock()
+        cutoff = now - window_seconds
+        with self._lock:
+            stamps = self._hits.get(key)
+            if stamps is None:
+                stamps = self._hits[key] = deque()
+            else:
+                self._hits.move_to_end(key)
+
+            while stamps and stamps[0] <= cutoff:
+                stamps.popleft()
+
+            if len(stamps) >= limit:
+                return RateLimitResult(False, 0, stamps[0] + window_seconds - now)
+
+            stamps.append(now)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return RateLimitResult(True, limit - len(stamps), 0.0)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._hits.clear()
+            else:
+                self._hits.pop(key, None)
+
+    def reset_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._hits if k.startswith(prefix)]:
+                del self._hits[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "keys": len(self._hits), "max_keys": self.max_keys}
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Worker'lar arası paylaşılan sliding log (tek SQLite dosyası)
+
+    - BEGIN IMMEDIATE: say + ekle aynı yazma kilidi altında (yarış yok)
+    - Thread başına ayrı connection; eski kayıtlar periyodik silinir
+    - Her kayıt kendi kuralının penceresiyle expires_at taşır: purge başka
+      worker'ın (farklı pencereli) kurallarının kayıtlarını erken silmez
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._local = threading.local()
+        self._purge_lock = threading.Lock()
+        self._last_purge = 0.0
+        self.errors = 0
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_hits ("
+            " key TEXT NOT NULL, ts REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(rate_limit_hits)")}
+        if "expires_at" not in columns:
+            # Eski dosya (expires_at öncesi): mevcut kayıtlar bir gün korunur
+            conn.execute("ALTER TABLE rate_limit_hits ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+            conn.execute("UPDATE rate_limit_hits SET expires_at = ts + 86400")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_hits_key_ts"
+            " ON rate_limit_hits (key, ts)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_hits_expires"
+            " ON rate_limit_hits (expires_at)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        now = self._clock()
+        cutoff = now - window_seconds
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM rate_limit_hits WHERE key = ? AND ts <= ?", (key, cutoff))
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(ts) FROM rate_limit_hits WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= limit:
+                result = RateLimitResult(False, 0, oldest + window_seconds - now)
+            else:
+                conn.execute(
+                    "INSERT INTO rate_limit_hits (key, ts, expires_at) VALUES (?, ?, ?)",
+                    (key, now, now + window_seconds),
+                )
+                result = RateLimitResult(True, limit - count - 1, 0.0)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._maybe_purge(now)
+        return result
+
+    def _maybe_purge(self, now: float) -> None:
+        """Artık hiçbir pencereye girmeyen kayıtlar (pasif öğrenciler)"""
+        with self._purge_lock:
+            if now - self._last_purge < SQLITE_PURGE_INTERVAL_SECONDS:
+                return
+            self._last_purge = now
+        self._conn().execute("DELETE FROM rate_limit_hits WHERE expires_at <= ?", (now,))
+
+    def reset(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._conn().execute("DELETE FROM rate_limit_hits")
+        else:
+            self._conn().execute("DELETE FROM rate_limit_hits WHERE key = ?", (key,))
+
+    def reset_prefix(self, prefix: str) -> None:
+        self._conn().execute(
+            "DELETE FROM rate_limit_hits WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.path, "errors": self.errors}
+
+
+def backend_from_env() -> RateLimitBackend:
+    """RATE_LIMIT_BACKEND=memory|sqlite (yoksa CACHE_BACKEND), RATE_LIMIT_SQLITE_PATH=<file>"""
+    kind = os.getenv("RATE_LIMIT_BACKEND", os.getenv("CACHE_BACKEND", "memory")).strip().lower()
+    if kind == "sqlite":
+        path = os.getenv(
+            "RATE_LIMIT_SQLITE_PATH",
+            os.path.join(tempfile.gettempdir(), "endstp_ratelimit.sqlite3"),
+        )
+        try:
+            backend = SQLiteRateLimitBackend(path)
+            logger.info(f"✅ Shared rate limit backend: sqlite ({path})")
+            return backend
+        except Exception as e:
+            logger.error(f"❌ SQLite rate limit backend unavailable, falling back to memory: {e}")
+    return InProcessRateLimitBackend()
+
+
+# ============================================
+# LIMITER
+# ============================================
+
+def _parse_rule(value: str) -> Tuple[int, float]:
+    """"3/5" -> (3 istek, 5 saniye)"""
+    limit, window = value.split("/", 1)
+    return int(limit), float(window)
+
+
+class RateLimiter:
+    """
+    Kural registry + backend
+
+    Kural adı route'u temsil eder; anahtar = "<kural>:<öğrenci>".
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend: RateLimitBackend = backend or InProcessRateLimitBackend()
+        self._lock = threading.Lock()
+        self._rules: Dict[str, Tuple[int, float]] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def configure_backend(self, backend: RateLimitBackend) -> None:
+        """Backend'i değiştir (startup / test)"""
+        self.backend = backend
+
+    def register(self, rule: str, limit: int, window_seconds: float) -> Tuple[int, float]:
+        """Kuralı kaydet; RATE_LIMIT_<KURAL> env'i varsa o kazanır"""
+        override = os.getenv(f"RATE_LIMIT_{rule.upper()}")
+        if override:
+            try:
+                limit, window_seconds = _parse_rule(override)
+            except ValueError:
+                logger.warning(f"⚠️ Invalid RATE_LIMIT_{rule.upper()}={override!r}, using default")
+        with self._lock:
+            self._rules[rule] = (int(limit), float(window_seconds))
+            self._counters.setdefault(rule, {"allowed": 0, "blocked": 0, "errors": 0})
+        return self._rules[rule]
+
+    def check(self, rule: str, subject: str) -> RateLimitResult:
+        limit, window_seconds = self._rules[rule]
+        counters = self._counters[rule]
+        try:
+            result = self.backend.hit(f"{rule}:{subject}", limit, window_seconds)
+        except Exception as e:
+            # Fail-open: limiter arızası yazma yolunu kapatmaz
+            counters["errors"] += 1
+            if hasattr(self.backend, "errors"):
+                self.backend.errors += 1
+            logger.warning(f"⚠️ RateLimit[{rule}] backend failed: {e}")
+            return RateLimitResult(True, limit, 0.0)
+
+        counters["allowed" if result.allowed else "blocked"] += 1
+        return result
+
+    def reset(self, rule: Optional[str] = None, subject: Optional[str] = None) -> None:
+        """rule+subject: tek anahtar, rule: o kuralın tüm öğrencileri, hiçbiri: her şey"""
+        if rule and subject:
+            self.backend.reset(f"{rule}:{subject}")
+        elif rule:
+            self.backend.reset_prefix(f"{rule}:")
+        elif subject:
+            raise ValueError("rate limit reset by subject requires a rule")
+        else:
+            self.backend.reset(None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rules = {
+                rule: {
+                    "limit": limit,
+                    "window_seconds": window,
+                    **self._counters[rule],
+                }
+                for rule, (limit, window) in sorted(self._rules.items())
+            }
+        return {"backend": self.backend.stats(), "rules": rules}
+
+
+# Global instance (backend: RATE_LIMIT_BACKEND / CACHE_BACKEND env)
+rate_limiter = RateLimiter(backend_from_env())
+
+
+def rate_limit(
+    rule: str,
+    limit: int,
+    window_seconds: float,
+    detail: str = DEFAULT_DETAIL,
+):
+    """
+    FastAPI dependency: öğrenci + kural başına sliding window
+
+    get_current_user request içinde cache'lendiği için ikinci auth maliyeti yok.
+    SQLite backend'in BEGIN IMMEDIATE'i kilit beklerken (busy timeout 5 sn)
+    event loop'u bloklamasın diye memory dışı backend'ler run_db ile çalışır.
+    """
+    rate_limiter.register(rule, limit, window_seconds)
+
+    async def dependency(current_user: dict = Depends(get_current_user)) -> None:
+        if rate_limiter.backend.name == InProcessRateLimitBackend.name:
+            result = rate_limiter.check(rule, current_user["id"])
+        else:
+            result = await run_db(rate_limiter.check, rule, current_user["id"])
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=detail,
+                headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))},
+            )
+
+    return dependency
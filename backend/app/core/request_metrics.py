@@ -0,0 +1,313 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: request_metrics.py
+# Role: In-memory per-flag latency / error aggregator, periodic flush to feature_flags
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Request path DB'ye gitmez: record() sadece sayaç + histogram bucket artırır
+# - feature_flags'e periyodik, toplu delta yazılır (tek RPC, atomik artış)
+# - Flush hatası metrik kaybettirmez (delta bir sonraki flush'a taşınır)
+# - Histogram sabit bucket'lı: bellek flag başına sabit
+# =============================================================================
+
+"""
+request_metrics.py - Response-time middleware metrik toplayıcısı
+
+Middleware her izlenen istek için:
+
+    flag_metrics.record("test_entry", duration_ms)
+    flag_metrics.record("test_entry", duration_ms, error=str(e))
+
+Arka plan görevi (main.py startup) her MONITORING_FLUSH_SECONDS saniyede:
+
+    await run_db(flag_metrics.flush)
+
+Flush, pencere içindeki deltaları tek RPC (rpc_apply_flag_metrics,
+migration 033) ile yazar: error_count / health_score DB'de atomik artırılır,
+avg / p95 / error_rate pencere değerleridir. RPC yoksa flag başına
+read-modify-write'a düşer (yalnız flush task'ı yazar, istek başına değil).
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+FLAGS_TABLE = "feature_flags"
+APPLY_RPC = "rpc_apply_flag_metrics"
+APPLY_RPC_RETRY_SECONDS = 300
+
+DEFAULT_FLUSH_SECONDS = float(os.getenv("MONITORING_FLUSH_SECONDS", "30"))
+SLOW_THRESHOLD_MS = int(os.getenv("MONITORING_SLOW_MS", "1000"))
+HEALTH_PENALTY_PER_ERROR = 10
+MAX_ERROR_MESSAGE = 500
+
+# Üst sınırlar (ms); son bucket: +inf
+LATENCY_BUCKETS_MS: Sequence[int] = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _utc_now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _is_missing_rpc(error: Exception) -> bool:
+    msg = str(error)
+    return "PGRST202" in msg or "Could not find the function" in msg
+
+
+class LatencyHistogram:
+    """Sabit bucket'lı latency histogramı (count / sum / max + percentile)"""
+
+    __slots__ = ("buckets", "counts", "count", "total_ms", "max_ms")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def observe(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def mean(self) -> Optional[float]:
+        return round(self.total_ms / self.count, 2) if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Bucket üst sınırı (gözlenen max ile kırpılır)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                bound = self.buckets[i] if i < len(self.buckets) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class _FlagWindow:
+    """Bir flush penceresindeki flag deltaları"""
+
+    __slots__ = ("latency", "errors", "slow", "last_success_at", "last_error_at", "last_error_message")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.slow = 0
+        self.last_success_at: Optional[str] = None
+        self.last_error_at: Optional[str] = None
+        self.last_error_message: Optional[str] = None
+
+    def merge(self, newer: "_FlagWindow") -> None:
+        """Başarısız flush'ın deltası + sonradan gelenler (newer önceliklidir)"""
+        self.latency.merge(newer.latency)
+        self.errors += newer.errors
+        self.slow += newer.slow
+        self.last_success_at = newer.last_success_at or self.last_success_at
+        self.last_error_at = newer.last_error_at or self.last_error_at
+        self.last_error_message = newer.last_error_message or self.last_error_message
+
+    def to_delta(self, flag_key: str) -> Dict[str, Any]:
+        count = self.latency.count
+        return {
+            "flag_key": flag_key,
+            "requests": count,
+            "error_delta": self.errors,
+            "health_penalty": self.errors * HEALTH_PENALTY_PER_ERROR,
+            "avg_response_time_ms": round(self.latency.total_ms / count) if count else None,
+            "p95_response_time_ms": self.latency.percentile(0.95),
+            "error_rate_percent": round(self.errors / count * 100, 2) if count else 0,
+            "last_success_at": self.last_success_at,
+            "last_error_at": self.last_error_at,
+            "last_error_message": self.last_error_message,
+        }
+
+
+class FlagMetricsAggregator:
+    """
+    İstek başına O(1) kayıt; flush() pencereyi atomik olarak alır ve yazar
+    """
+
+    def __init__(self, slow_threshold_ms: int = SLOW_THRESHOLD_MS):
+        self.slow_threshold_ms = slow_threshold_ms
+        self._lock = threading.Lock()
+        self._window: Dict[str, _FlagWindow] = {}
+        self._rpc_unavailable_until = 0.0
+        self._totals = {"recorded": 0, "errors": 0, "flushes": 0, "flush_errors": 0}
+        self._last_flush_at: Optional[str] = None
+        self._last_flush_ms: Optional[int] = None
+        self._last_flush_error: Optional[str] = None
+
+    # ============================================
+    # REQUEST PATH
+    # ============================================
+
+    def record(self, flag_key: str, duration_ms: int, error: Optional[str] = None) -> None:
+        with self._lock:
+            window = self._window.get(flag_key)
+            if window is None:
+                window = self._window[flag_key] = _FlagWindow()
+            window.latency.observe(duration_ms)
+            self._totals["recorded"] += 1
+            if error is None:
+                window.last_success_at = _utc_now_iso()
+            else:
+                window.errors += 1
+                window.last_error_at = _utc_now_iso()
+                window.last_error_message = error[:MAX_ERROR_MESSAGE]
+                self._totals["errors"] += 1
+            if duration_ms > self.slow_threshold_ms:
+                window.slow += 1
+
+    # ============================================
+    # FLUSH
+    # ============================================
+
+    def _take_window(self) -> Dict[str, _FlagWindow]:
+        with self._lock:
+            window, self._window = self._window, {}
+            return window
+
+    def _restore_window(self, window: Dict[str, _FlagWindow]) -> None:
+        with self._lock:
+            for flag_key, old in window.items():
+                newer = self._window.get(flag_key)
+                if newer is not None:
+                    old.merge(newer)
+                self._window[flag_key] = old
+
+    def flush(self, supabase=None) -> int:
+        """Pencereyi feature_flags'e yaz; yazılan flag sayısını döndür"""
+        window = self._take_window()
+        if not window:
+            return 0
+
+        started = time.perf_counter()
+        deltas = [w.to_delta(flag_key) for flag_key, w in window.items()]
+        try:
+            if supabase is None:
+                from app.db.session import get_supabase_admin
+                supabase = get_supabase_admin()
+            self._apply(supabase, deltas)
+        except Exception as e:
+            self._restore_window(window)
+            with self._lock:
+                self._totals["flush_errors"] += 1
+                self._last_flush_error = str(e)[:MAX_ERROR_MESSAGE]
+            logger.warning(f"⚠️ Monitoring flush failed ({len(deltas)} flags kept): {e}")
+            return 0
+
+        for flag_key, w in window.items():
+            if w.slow:
+                logger.warning(
+                    f"⚠️ SLOW: {flag_key} {w.slow}/{w.latency.count} requests > {self.slow_threshold_ms}ms "
+                    f"(p95={w.latency.percentile(0.95)}ms)"
+                )
+
+        with self._lock:
+            self._totals["flushes"] += 1
+            self._last_flush_at = _utc_now_iso()
+            self._last_flush_ms = int((time.perf_counter() - started) * 1000)
+            self._last_flush_error = None
+        return len(deltas)
+
+    def _apply(self, supabase, deltas: List[Dict[str, Any]]) -> None:
+        if time.monotonic() >= self._rpc_unavailable_until:
+            try:
+                supabase.rpc(APPLY_RPC, {"p_deltas": deltas}).execute()
+                return
+            except Exception as e:
+                if not _is_missing_rpc(e):
+                    raise
+                logger.warning(f"⚠️ {APPLY_RPC} missing, using per-flag update")
+                self._rpc_unavailable_until = time.monotonic() + APPLY_RPC_RETRY_SECONDS
+
+        for delta in deltas:
+            self._apply_single(supabase, delta)
+
+    @staticmethod
+    def _apply_single(supabase, delta: Dict[str, Any]) -> None:
+        """RPC yoksa: flag başına oku + yaz (yalnız flush task'ı)"""
+        payload = {
+            "avg_response_time_ms": delta["avg_response_time_ms"],
+            "p95_response_time_ms": delta["p95_response_time_ms"],
+            "error_rate_percent": delta["error_rate_percent"],
+        }
+        for key in ("last_success_at", "last_error_at", "last_error_message"):
+            if delta[key] is not None:
+                payload[key] = delta[key]
+
+        if delta["error_delta"]:
+            r = (
+                supabase.table(FLAGS_TABLE)
+                .select("error_count, health_score")
+                .eq("flag_key", delta["flag_key"])
+                .execute()
+            )
+            current = (r.data or [{}])[0]
+            payload["error_count"] = int(current.get("error_count") or 0) + delta["error_delta"]
+            payload["health_score"] = max(
+                0, int(current.get("health_score") or 100) - delta["health_penalty"]
+            )
+
+        supabase.table(FLAGS_TABLE).update(payload).eq("flag_key", delta["flag_key"]).execute()
+
+    async def run_flush_loop(self, interval_seconds: float = DEFAULT_FLUSH_SECONDS) -> None:
+        """Arka plan görevi: iptal edilince son pencereyi de yazar"""
+        from app.db.session import run_db
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                await run_db(self.flush)
+        except asyncio.CancelledError:
+            await run_db(self.flush)
+            raise
+
+    # ============================================
+    # STATS
+    # ============================================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = {
+                flag_key: {
+                    "requests": w.latency.count,
+                    "errors": w.errors,
+                    "slow": w.slow,
+                    "avg_ms": w.latency.mean(),
+                    "p95_ms": w.latency.percentile(0.95),
+                }
+                for flag_key, w in self._window.items()
+            }
+            return {
+                **self._totals,
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "last_flush_at": self._last_flush_at,
+                "last_flush_ms": self._last_flush_ms,
+                "last_flush_error": self._last_flush_error,
+                "pending": pending,
+            }
+
+
+flag_metrics = FlagMetricsAggregator()
@@ -0,0 +1,353 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: test_history.py
+# Role: Compact columnar per-student test history (array-backed)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Built ONCE per fetch; test_date pre-parsed alanlardan okunur (app.core.timestamps)
+# - Rows sorted by timestamp (UTC), stable (aynı an: fetch sırası korunur)
+# - Compact dtypes: int8 counts, float32 success/net, int32 interned IDs
+# - Immutable: slicing yeni bir TestHistory döner, vocab paylaşılır
+# =============================================================================
+
+"""
+test_history.py - Columnar TestHistory
+
+student_topic_tests satırlarını (select("*") dict'leri) kolonlara döker:
+
+    ts          int64    epoch seconds (UTC), ASC sıralı
+    day         int32    epoch-day (UTC date, 1970-01-01 = 0)
+    correct     int8     (değer 127'yi aşarsa int16)
+    wrong       int8
+    empty       int8
+    success     float32  success_rate (NaN = yok)
+    net         float32  net_score (NaN = yok)
+    topic_idx   int32    -> topic_ids[idx]   (interned str, -1 = yok)
+    subject_idx int32    -> subject_ids[idx]
+    ids         object   test id'leri
+
+Ağır bir öğrencide (binlerce test) dict listesine göre bellek ~10x+ düşer,
+pencere / topic dilimleri searchsorted + mask ile array işlemidir.
+
+Usage:
+    from app.core.test_history import TestHistory
+
+    history = TestHistory.from_rows(tests_resp.data)
+    weekly = history.since(now - timedelta(days=7))
+    weekly.mean_success()
+    history.for_topic(topic_id).latest_date()
+"""
+
+import math
+import sys
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.timestamps import parse_utc, row_utc
+
+_SECONDS_PER_DAY = 86400
+
+DateLike = Union[datetime, date]
+
+
+# =============================================================================
+# 🕐 DATE HELPERS
+# =============================================================================
+
+def to_epoch_seconds(value: DateLike) -> int:
+    dt = parse_utc(value)
+    if dt is None:
+        raise ValueError(f"Unsupported date value: {value!r}")
+    return math.floor(dt.timestamp())
+
+
+def _count_dtype(values: List[int]) -> Any:
+    if not values:
+        return np.int8
+    lo, hi = min(values), max(values)
+    if lo >= -128 and hi <= 127:
+        return np.int8
+    return np.int16
+
+
+def _num(v: Any) -> float:
+    try:
+        return float(v) if v is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _int(v: Any) -> int:
+    try:
+        return int(v) if v is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+# =============================================================================
+# 📦 TEST HISTORY
+# =============================================================================
+
+class TestHistory:
+    """
+    Array-backed, immutable per-student test history.
+    """
+
+    __test__ = False  # pytest: "Test*" adlı sınıf değil
+
+    __slots__ = (
+        "ts", "day", "correct", "wrong", "empty", "success", "net",
+        "topic_idx", "subject_idx", "ids", "topic_ids", "subject_ids",
+    )
+
+    def __init__(
+        self,
+        *,
+        ts: np.ndarray,
+        correct: np.ndarray,
+        wrong: np.ndarray,
+        empty: np.ndarray,
+        success: np.ndarray,
+        net: np.ndarray,
+        topic_idx: np.ndarray,
+        subject_idx: np.ndarray,
+        ids: np.ndarray,
+        topic_ids: Tuple[str, ...],
+        subject_ids: Tuple[str, ...],
+        day: Optional[np.ndarray] = None,
+    ):
+        self.ts = ts
+        self.day = day if day is not None else (ts // _SECONDS_PER_DAY).astype(np.int32)
+        self.correct = correct
+        self.wrong = wrong
+        self.empty = empty
+        self.success = success
+        self.net = net
+        self.topic_idx = topic_idx
+        self.subject_idx = subject_idx
+        self.ids = ids
+        self.topic_ids = topic_ids
+        self.subject_ids = subject_ids
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+    @classmethod
+    def empty_history(cls) -> "TestHistory":
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Optional[Iterable[Dict[str, Any]]],
+        date_key: str = "test_date",
+    ) -> "TestHistory":
+        """
+        PostgREST satırlarından tek geçişte kur.
+        test_date'i parse edilemeyen satırlar atlanır.
+        """
+        ts: List[int] = []
+        correct: List[int] = []
+        wrong: List[int] = []
+        empty: List[int] = []
+        success: List[float] = []
+        net: List[float] = []
+        topic_idx: List[int] = []
+        subject_idx: List[int] = []
+        ids: List[Any] = []
+
+        topic_vocab: Dict[str, int] = {}
+        subject_vocab: Dict[str, int] = {}
+
+        def intern(vocab: Dict[str, int], value: Any) -> int:
+            if value is None:
+                return -1
+            key = sys.intern(str(value))
+            idx = vocab.get(key)
+            if idx is None:
+                idx = vocab[key] = len(vocab)
+            return idx
+
+        for row in rows or []:
+            dt = row_utc(row, date_key)  # normalize_rows sonrası parse yok
+            if dt is None:
+                continue
+            ts.append(math.floor(dt.timestamp()))
+            correct.append(_int(row.get("correct_count")))
+            wrong.append(_int(row.get("wrong_count")))
+            empty.append(_int(row.get("empty_count")))
+            success.append(_num(row.get("success_rate")))
+            net.append(_num(row.get("net_score")))
+            topic_idx.append(intern(topic_vocab, row.get("topic_id")))
+            subject_idx.append(intern(subject_vocab, row.get("subject_id")))
+            ids.append(row.get("id"))
+
+        ts_arr = np.asarray(ts, dtype=np.int64)
+        order = np.argsort(ts_arr, kind="stable")
+
+        ids_arr = np.empty(len(ids), dtype=object)
+        ids_arr[:] = ids
+
+        return cls(
+            ts=ts_arr[order],
+            correct=np.asarray(correct, dtype=_count_dtype(correct))[order],
+            wrong=np.asarray(wrong, dtype=_count_dtype(wrong))[order],
+            empty=np.asarray(empty, dtype=_count_dtype(empty))[order],
+            success=np.asarray(success, dtype=np.float32)[order],
+            net=np.asarray(net, dtype=np.float32)[order],
+            topic_idx=np.asarray(topic_idx, dtype=np.int32)[order],
+            subject_idx=np.asarray(subject_idx, dtype=np.int32)[order],
+            ids=ids_arr[order],
+            topic_ids=tuple(topic_vocab),
+            subject_ids=tuple(subject_vocab),
+        )
+
+    def _take(self, index: Union[slice, np.ndarray]) -> "TestHistory":
+        """Row subset; vocab paylaşılır (kopyalanmaz)."""
+        return TestHistory(
+            ts=self.ts[index],
+            day=self.day[index],
+            correct=self.correct[index],
+            wrong=self.wrong[index],
+            empty=self.empty[index],
+            success=self.success[index],
+            net=self.net[index],
+            topic_idx=self.topic_idx[index],
+            subject_idx=self.subject_idx[index],
+            ids=self.ids[index],
+            topic_ids=self.topic_ids,
+            subject_ids=self.subject_ids,
+        )
+
+    # -------------------------------------------------------------------------
+    # Slicing
+    # -------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def window(
+        self,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+    ) -> "TestHistory":
+        """[start, end) zaman penceresi (date verilirse gün başı UTC)."""
+        lo = 0 if start is None else int(np.searchsorted(self.ts, to_epoch_seconds(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.ts, to_epoch_seconds(end), side="left"))
+        return self._take(slice(lo, max(lo, hi)))
+
+    def since(self, start: DateLike) -> "TestHistory":
+        return self.window(start=start)
+
+    def _code(self, vocab: Tuple[str, ...], value: Any) -> int:
+        try:
+            return vocab.index(str(value))
+        except ValueError:
+            return -2  # hiçbir satırla eşleşmez
+
+    def for_topic(self, topic_id: Any) -> "TestHistory":
+        return self._take(self.topic_idx == self._code(self.topic_ids, topic_id))
+
+    def without_topic(self, topic_id: Any) -> "TestHistory":
+        return self._take(self.topic_idx != self._code(self.topic_ids, topic_id))
+
+    def for_subject(self, subject_id: Any) -> "TestHistory":
+        return self._take(self.subject_idx == self._code(self.subject_ids, subject_id))
+
+    def merge(self, other: "TestHistory") -> "TestHistory":
+        """İki history'yi birleştir (vocab yeniden kodlanır, sıra korunur)."""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+
+        def recode(
+            a_idx: np.ndarray, a_vocab: Tuple[str, ...],
+            b_idx: np.ndarray, b_vocab: Tuple[str, ...],
+        ) -> Tuple[np.ndarray, Tuple[str, ...]]:
+            vocab = {v: i for i, v in enumerate(a_vocab)}
+            for v in b_vocab:
+                vocab.setdefault(v, len(vocab))
+            mapping = np.asarray([vocab[v] for v in b_vocab] + [-1], dtype=np.int32)
+            # -1 (yok) -> mapping[-1] == -1
+            return np.concatenate([a_idx, mapping[b_idx]]), tuple(vocab)
+
+        topic_idx, topic_ids = recode(self.topic_idx, self.topic_ids, other.topic_idx, other.topic_ids)
+        subject_idx, subject_ids = recode(self.subject_idx, self.subject_ids, other.subject_idx, other.subject_ids)
+
+        def cat(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return np.concatenate([a, b.astype(np.result_type(a, b))])
+
+        ts = np.concatenate([self.ts, other.ts])
+        order = np.argsort(ts, kind="stable")
+
+        return TestHistory(
+            ts=ts[order],
+            correct=cat(self.correct, other.correct)[order],
+            wrong=cat(self.wrong, other.wrong)[order],
+            empty=cat(self.empty, other.empty)[order],
+            success=cat(self.success, other.success)[order],
+            net=cat(self.net, other.net)[order],
+            topic_idx=topic_idx[order],
+            subject_idx=subject_idx[order],
+            ids=np.concatenate([self.ids, other.ids])[order],
+            topic_ids=topic_ids,
+            subject_ids=subject_ids,
+        )
+
+    # -------------------------------------------------------------------------
+    # Aggregations
+    # -------------------------------------------------------------------------
+    def success_values(self) -> np.ndarray:
+        """
+        success_rate (float64, NaN = yok), 2 haneye geri yuvarlanmış.
+        DB numeric(5,2) olduğu için float32 saklama kayıpsız geri döner.
+        """
+        return np.round(self.success.astype(np.float64), 2)
+
+    def success_pct(self) -> np.ndarray:
+        """progress.get_success ile aynı kural: 0..1 ölçeği -> %."""
+        v = self.success_values()
+        return np.round(np.where((v >= 0) & (v <= 1), v * 100, v), 2)
+
+    def mean_success(self) -> float:
+        """Ham success_rate ortalaması (yok = 0, sıra bağımsız toplam)."""
+        if not len(self):
+            return 0.0
+        v = np.nan_to_num(self.success_values(), nan=0.0)
+        return math.fsum(v.tolist()) / len(self)
+
+    def study_days(self) -> np.ndarray:
+        """Test girilen UTC günleri (epoch-day, ASC, tekil)."""
+        return np.unique(self.day)
+
+    def latest_date(self) -> Optional[datetime]:
+        if not len(self):
+            return None
+        return datetime.fromtimestamp(int(self.ts[-1]), tz=timezone.utc)
+
+    def topic_id_column(self) -> List[Optional[str]]:
+        vocab = self.topic_ids
+        return [vocab[i] if i >= 0 else None for i in self.topic_idx.tolist()]
+
+    def subject_id_column(self) -> List[Optional[str]]:
+        vocab = self.subject_ids
+        return [vocab[i] if i >= 0 else None for i in self.subject_idx.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        arrays: Sequence[np.ndarray] = (
+            self.ts, self.day, self.correct, self.wrong, self.empty,
+            self.success, self.net, self.topic_idx, self.subject_idx,
+        )
+        total = sum(a.nbytes for a in arrays) + self.ids.nbytes
+        total += sum(sys.getsizeof(i) for i in self.ids.tolist())
+        total += sum(sys.getsizeof(v) for v in self.topic_ids + self.subject_ids)
+        return total
+
+    def __repr__(self) -> str:
+        return f"TestHistory(rows={len(self)}, topics={len(self.topic_ids)}, nbytes={self.nbytes})"
@@ -0,0 +1,146 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: timestamps.py
+# Role: Single-pass timestamp normalization for DB rows (UTC + epoch-day)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Tüm zamanlar UTC (naive değer = UTC kabul edilir)
+# - Aynı string bir kez parse edilir (memoized parser)
+# - Satırlar fetch anında normalize edilir; tüketiciler pre-parsed alanı okur
+# =============================================================================
+
+"""
+timestamps.py - Timestamp normalization layer
+
+Fetch sonrası tek geçiş:
+
+    tests = normalize_rows(resp.data)          # test_date -> test_date_utc, test_date_day
+    row_utc(tests[0])                          # datetime (UTC), tekrar parse yok
+    row_day(tests[0])                          # epoch-day int (1970-01-01 = 0)
+
+Normalize edilmemiş satırlarda row_utc/row_day memoized parser'a düşer,
+yani eski çağıranlar da çalışır (sadece ilk parse maliyeti öder).
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from dateutil import parser as _dateutil_parser
+
+_EPOCH = date(1970, 1, 1)
+
+PARSER_CACHE_SIZE = 65536
+
+UTC_SUFFIX = "_utc"
+DAY_SUFFIX = "_day"
+
+
+# =============================================================================
+# 🕐 PARSER
+# =============================================================================
+
+@lru_cache(maxsize=PARSER_CACHE_SIZE)
+def _parse_iso_cached(value: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            # fromisoformat'ın kabul etmediği ISO varyantları
+            dt = _dateutil_parser.isoparse(value)
+        except (ValueError, OverflowError):
+            return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_utc(value: Any) -> Optional[datetime]:
+    """
+    ISO string / datetime / date -> timezone-aware UTC datetime.
+    Parse edilemezse None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, str):
+        return _parse_iso_cached(value)
+    return None
+
+
+def parser_cache_info() -> Dict[str, int]:
+    info = _parse_iso_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize or 0,
+    }
+
+
+# =============================================================================
+# 📅 EPOCH-DAY
+# =============================================================================
+
+def epoch_day(value: Any) -> int:
+    """date/datetime/ISO string -> UTC epoch-day."""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return (value - _EPOCH).days
+    dt = parse_utc(value)
+    if dt is None:
+        raise ValueError(f"Unsupported date value: {value!r}")
+    return (dt.date() - _EPOCH).days
+
+
+def day_to_date(day: int) -> date:
+    return _EPOCH + timedelta(days=int(day))
+
+
+# =============================================================================
+# 🧾 ROW NORMALIZATION
+# =============================================================================
+
+def normalize_rows(
+    rows: Optional[List[Dict[str, Any]]],
+    fields: Sequence[str] = ("test_date",),
+) -> List[Dict[str, Any]]:
+    """
+    Satırları yerinde normalize et (tek geçiş):
+        <field>_utc  -> UTC datetime (parse edilemezse None)
+        <field>_day  -> epoch-day int (parse edilemezse None)
+    """
+    if not rows:
+        return rows or []
+
+    for row in rows:
+        for field in fields:
+            dt = parse_utc(row.get(field))
+            row[field + UTC_SUFFIX] = dt
+            row[field + DAY_SUFFIX] = (dt.date() - _EPOCH).days if dt else None
+    return rows
+
+
+def row_utc(row: Dict[str, Any], field: str = "test_date") -> Optional[datetime]:
+    """Pre-parsed UTC datetime (normalize edilmemişse memoized parse)."""
+    key = field + UTC_SUFFIX
+    if key in row:
+        return row[key]
+    return parse_utc(row.get(field))
+
+
+def row_day(row: Dict[str, Any], field: str = "test_date") -> Optional[int]:
+    """Pre-parsed epoch-day (normalize edilmemişse memoized parse)."""
+    key = field + DAY_SUFFIX
+    if key in row:
+        return row[key]
+    dt = parse_utc(row.get(field))
+    return (dt.date() - _EPOCH).days if dt else None
+
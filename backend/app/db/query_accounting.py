@@ -0,0 +1,204 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: query_accounting.py
+# Role: Per-request Supabase query accounting (count / rows / bytes) + N+1 detector
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Sayaç contextvar'da: run_db / threadpool context kopyalar, aynı nesneye yazar
+# - Request dışında (job, CLI) kayıt yok, maliyet yok
+# - Budget aşımı isteği düşürmez, sadece log + metrik
+# - Debug header'ları sadece QUERY_DEBUG_HEADERS (veya DEBUG) açıksa
+# =============================================================================
+
+"""
+query_accounting.py - İstek başına DB sorgu muhasebesi
+
+_InstrumentedTransport her Supabase HTTP çağrısında record_query() çağırır;
+main.py middleware'i (query_accounting_middleware) istek başına bir
+QueryStats açar.
+
+Debug modda response header'ları:
+
+    X-DB-Queries: 7
+    X-DB-Rows: 212
+    X-DB-Bytes: 48213
+    X-DB-Time-Ms: 84.1
+
+Budget (env):
+    QUERY_BUDGET=25              # istek başına sorgu üst sınırı (uyarı)
+    QUERY_REPEAT_THRESHOLD=5     # aynı (op, tablo) bu kadar tekrar -> N+1 şüphesi
+    set_route_budget("/api/v1/progress/trends", 10)   # route bazlı override
+
+Testlerde (app/tests/query_budget.py):
+
+    with assert_max_queries(3):
+        client.get("/api/v1/student/tests")
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import metrics, route_label
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+DEFAULT_QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "25"))
+REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+DEBUG_HEADERS = _env_flag("QUERY_DEBUG_HEADERS", os.getenv("DEBUG", "false"))
+
+_route_budgets: Dict[str, int] = {}
+
+REQUEST_QUERIES = metrics.histogram(
+    "endstp_http_request_db_queries",
+    "Supabase queries per HTTP request",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+BUDGET_WARNINGS = metrics.counter(
+    "endstp_query_budget_warnings_total",
+    "Requests over the query budget or with repeated queries",
+    ("method", "route"),
+)
+
+
+class QueryStats:
+    """Bir istek (veya test bloğu) boyunca yapılan sorgular"""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.rows = 0
+        self.bytes = 0
+        self.db_ms = 0.0
+        self.targets: Counter = Counter()  # (op, table) -> sayı
+
+    def add(self, table: str, op: str, rows: int, nbytes: int, elapsed_ms: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.rows += rows
+            self.bytes += nbytes
+            self.db_ms += elapsed_ms
+            self.targets[(op, table)] += 1
+        if self.parent is not None:
+            self.parent.add(table, op, rows, nbytes, elapsed_ms)
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> List[Tuple[str, str, int]]:
+        """N+1 şüphesi: threshold kez ve üstü tekrarlanan (op, tablo)"""
+        with self._lock:
+            return [(op, table, n) for (op, table), n in self.targets.most_common() if n >= threshold]
+
+    def summary(self) -> str:
+        with self._lock:
+            top = ", ".join(f"{op} {table} x{n}" for (op, table), n in self.targets.most_common(5))
+        return f"{self.queries} queries, {self.rows} rows, {self.bytes} bytes ({top})"
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "X-DB-Queries": str(self.queries),
+            "X-DB-Rows": str(self.rows),
+            "X-DB-Bytes": str(self.bytes),
+            "X-DB-Time-Ms": f"{self.db_ms:.1f}",
+        }
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def record_query(table: str, op: str, rows: int = 0, nbytes: int = 0, elapsed_ms: float = 0.0) -> None:
+    """Aktif QueryStats varsa say (yoksa no-op)"""
+    stats = _current.get()
+    if stats is not None:
+        stats.add(table, op, rows, nbytes, elapsed_ms)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Blok boyunca sorguları say; iç içe kullanımda dış blok da sayar"""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def rows_from_content_range(value: Optional[str]) -> int:
+    """PostgREST Content-Range: "0-24/*" -> 25, "*/0" -> 0"""
+    if not value:
+        return 0
+    span = value.split("/", 1)[0]
+    if "-" not in span:
+        return 0
+    try:
+        start, end = span.split("-", 1)
+        return int(end) - int(start) + 1
+    except ValueError:
+        return 0
+
+
+# ============================================
+# BUDGET
+# ============================================
+
+def set_route_budget(route: str, budget: int) -> None:
+    _route_budgets[route] = budget
+
+
+def route_budget(route: str) -> int:
+    return _route_budgets.get(route, DEFAULT_QUERY_BUDGET)
+
+
+def check_budget(stats: QueryStats, method: str, route: str) -> List[str]:
+    """Budget aşımı / N+1 şüphesi uyarıları (log'a yazılır)"""
+    warnings = []
+    budget = route_budget(route)
+    if stats.queries > budget:
+        warnings.append(f"query budget exceeded: {method} {route} {stats.queries} > {budget}")
+    for op, table, n in stats.repeated():
+        warnings.append(f"possible N+1: {method} {route} {op} {table} x{n}")
+    for message in warnings:
+        logger.warning(f"⚠️ {message} [{stats.summary()}]")
+    return warnings
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+async def query_accounting_middleware(request, call_next):
+    """
+    main.py: app.middleware("http")(query_accounting_middleware)
+
+    call_next yeni task'ta çalışır ve context'i kopyalar; QueryStats nesnesi
+    paylaşıldığı için endpoint (ve run_db executor'ı) aynı sayaca yazar.
+    StreamingResponse gövdesi sırasında yapılan sorgular (NDJSON) sayılmaz.
+    """
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    route = route_label(request.scope)
+    REQUEST_QUERIES.observe(stats.queries, request.method, route)
+    if check_budget(stats, request.method, route):
+        BUDGET_WARNINGS.inc(request.method, route)
+
+    if DEBUG_HEADERS:
+        response.headers.update(stats.headers())
+    return response
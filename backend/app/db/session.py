@@ -1,54 +1,333 @@
 """
 Database Session Manager
 Supabase Client (Service Role for Backend)
+
+Process-wide client provider:
+- Tek bir keep-alive HTTP connection pool (httpx) tüm Supabase client'ları
+  tarafından paylaşılır
+- Admin client bir kez oluşturulur, her request yeniden kullanır
+- Pool metrikleri: in-use, waiting, reuse ratio
+- Lifecycle: app/main.py startup/shutdown hook'ları
+- Async handler'lar için executor-offloaded erişim: db_execute / run_db
+  (senkron supabase-py çağrısı event loop'u bloklamaz)
 """
 
+import asyncio
+import contextvars
+import functools
 import logging
-from supabase import create_client, Client
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
 import jwt
+from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
+
+from app.core.metrics import metrics, supabase_target
+from app.db.query_accounting import record_query, rows_from_content_range
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def get_supabase() -> Client:
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_HTTP_TIMEOUT_SECONDS = 120.0
+
+
+# ============================================
+# INSTRUMENTED TRANSPORT
+# ============================================
+
+SUPABASE_REQUESTS = metrics.counter(
+    "endstp_supabase_requests_total",
+    "Supabase HTTP calls by service (rest / rpc / auth / storage), table or function and status",
+    ("service", "table", "method", "status"),
+)
+SUPABASE_LATENCY = metrics.histogram(
+    "endstp_supabase_request_duration_seconds",
+    "Supabase HTTP call latency",
+    ("service", "table", "method"),
+)
+
+class _PoolStats:
+    """Thread-safe pool counters (in-use, waiting, reuse)"""
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.requests_total = 0
+        self.connections_opened = 0
+        self.errors_total = 0
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.requests_total += 1
+            if self.in_use > self.peak_in_use:
+                self.peak_in_use = self.in_use
+
+    def request_finished(self, failed: bool = False) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            if failed:
+                self.errors_total += 1
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests_total = self.requests_total
+            opened = self.connections_opened
+            in_use = self.in_use
+            peak = self.peak_in_use
+            errors = self.errors_total
+
+        reused = max(0, requests_total - opened)
+        return {
+            "pool_size": self.pool_size,
+            "in_use": min(in_use, self.pool_size),
+            "waiting": max(0, in_use - self.pool_size),
+            "peak_in_use": peak,
+            "requests_total": requests_total,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_total, 4) if requests_total else 0.0,
+            "errors_total": errors,
+        }
+
+
+class _InstrumentedTransport(httpx.BaseTransport):
     """
-    Supabase client döndür (ANON KEY - Frontend-like access)
-    Auth endpoint'leri için kullanılır
+    httpx transport wrapper
+    - Her request'i sayar (in-use / waiting)
+    - httpcore trace event'leri ile yeni TCP bağlantılarını yakalar
     """
+
+    def __init__(self, inner: httpx.BaseTransport, stats: _PoolStats):
+        self._inner = inner
+        self._stats = stats
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._stats.connection_opened()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        previous_trace = request.extensions.get("trace")
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._trace(event_name, info)
+            if previous_trace is not None:
+                previous_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+
+        self._stats.request_started()
+        service, table = supabase_target(request.url.path)
+        status = "error"
+        response = None
+        started = time.perf_counter()
+        try:
+            response = self._inner.handle_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stats.request_finished(failed=status == "error")
+            SUPABASE_REQUESTS.inc(service, table, request.method, status)
+            SUPABASE_LATENCY.observe(elapsed, service, table, request.method)
+            # İstek başına muhasebe (aktif request yoksa no-op)
+            record_query(
+                f"rpc:{table}" if service == "rpc" else table or service,
+                request.method,
+                rows=rows_from_content_range(response.headers.get("content-range")) if response is not None else 0,
+                nbytes=int(response.headers.get("content-length") or 0) if response is not None else 0,
+                elapsed_ms=elapsed * 1000,
+            )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+# ============================================
+# CLIENT PROVIDER
+# ============================================
+
+class SupabaseClientProvider:
+    """
+    Process-wide Supabase client provider
+
+    - Paylaşılan httpx.Client (keep-alive pool, configurable size)
+    - Admin client: JWT role kontrolü + create_client sadece bir kez
+    - User client'ları da aynı pool'u kullanır (header'lar request bazlı)
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        if pool_size is None:
+            pool_size = int(os.getenv("SUPABASE_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+        self.pool_size = max(1, pool_size)
+        self.keepalive_expiry = keepalive_expiry
+        self._inner_transport = transport
+
+        self._lock = threading.RLock()
+        self._http: Optional[httpx.Client] = None
+        self._stats = _PoolStats(self.pool_size)
+        self._admin: Optional[Client] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ----------------------------------------
+    # LIFECYCLE
+    # ----------------------------------------
+
+    def startup(self) -> None:
+        """Pool + admin client'ı önceden ısıt (fail-fast)"""
+        self.get_admin()
+        logger.info(
+            f"✅ Supabase client pool ready (pool_size={self.pool_size})"
+        )
+
+    def shutdown(self) -> None:
+        """Tüm bağlantıları kapat, client'ları bırak"""
+        with self._lock:
+            http = self._http
+            executor = self._executor
+            self._http = None
+            self._admin = None
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+        if http is not None:
+            http.close()
+            logger.info("🛑 Supabase client pool closed")
+
+    # ----------------------------------------
+    # HTTP POOL
+    # ----------------------------------------
+
+    def _get_http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http is None:
+                inner = self._inner_transport or httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                )
+                self._http = httpx.Client(
+                    transport=_InstrumentedTransport(inner, self._stats),
+                    timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                )
+            return self._http
+
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        DB çağrıları için ayrılmış thread pool
+        Boyutu HTTP pool ile aynı: fazlası zaten bağlantı beklerdi.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size,
+                    thread_name_prefix="supabase-db",
+                )
+            return self._executor
+
+    def _options(self) -> SyncClientOptions:
+        return SyncClientOptions(httpx_client=self._get_http_client())
+
+    # ----------------------------------------
+    # CLIENTS
+    # ----------------------------------------
+
+    def get_admin(self) -> Client:
+        if self._admin is not None:
+            return self._admin
+
+        with self._lock:
+            if self._admin is None:
+                url, key = _load_admin_credentials()
+                self._admin = create_client(url, key, options=self._options())
+                logger.info("✅ Supabase admin client initialized (service_role JWT)")
+            return self._admin
+
+    def new_anon(self) -> Client:
+        """
+        Anon client (auth endpoint'leri için)
+        sign_in / sign_up client'a session yazdığı için her çağrıda yeni
+        client döner; HTTP pool yine paylaşılır.
+        """
+        url, key = _load_anon_credentials()
+        return create_client(url, key, options=self._options())
+
+    def for_user(self, access_token: str) -> Client:
+        """
+        User-scoped client (RLS enforced)
+        Client nesnesi request'e özel, HTTP pool paylaşılır.
+        """
+        client = self.new_anon()
+        client.postgrest.auth(access_token)
+        return client
+
+    # ----------------------------------------
+    # METRICS
+    # ----------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        data = self._stats.snapshot()
+        data["started"] = self._http is not None
+        return data
+
+
+def _load_anon_credentials() -> tuple:
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_ANON_KEY")
-    
+
     if not url or not key:
         raise RuntimeError("❌ Supabase URL/ANON_KEY not loaded!")
-    
-    return create_client(url, key)
 
+    return url, key
 
-def get_supabase_admin() -> Client:
+
+def _load_admin_credentials() -> tuple:
     """
-    Supabase ADMIN client döndür (SERVICE ROLE KEY)
-    Backend queries için - RLS bypass, tam erişim
-    
     FAIL-FAST: Env vars yüklenmemişse crash eder
     """
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
+
     if not url:
         raise RuntimeError(
             "Sunucu yapılandırma hatası: Supabase URL bulunamadı."
         )
-    
+
     if not key:
         raise RuntimeError(
             "Sunucu yapılandırma hatası: Admin anahtarı bulunamadı."
         )
-    
+
     # Verify JWT contains service_role
     try:
         payload = jwt.decode(key, options={"verify_signature": False})
-        
+
         if payload.get('role') != 'service_role':
             raise RuntimeError(
                 f"❌ Invalid JWT role: {payload.get('role')} "
@@ -56,13 +335,35 @@ def get_supabase_admin() -> Client:
             )
     except Exception as e:
         raise RuntimeError(f"❌ JWT verification failed: {e}")
-    
-    # Create Supabase admin client
-    client = create_client(url, key)
-    
-    logger.info("✅ Supabase admin client initialized (service_role JWT)")
-    
-    return client
+
+    return url, key
+
+
+# Global instance
+client_provider = SupabaseClientProvider()
+
+
+# ============================================
+# PUBLIC API (geriye uyumlu)
+# ============================================
+
+def get_supabase() -> Client:
+    """
+    Supabase client döndür (ANON KEY - Frontend-like access)
+    Auth endpoint'leri için kullanılır
+    """
+    return client_provider.new_anon()
+
+
+def get_supabase_admin() -> Client:
+    """
+    Supabase ADMIN client döndür (SERVICE ROLE KEY)
+    Backend queries için - RLS bypass, tam erişim
+
+    Process-wide paylaşılan client: ilk çağrıda oluşturulur,
+    sonraki çağrılar aynı client + connection pool'u kullanır.
+    """
+    return client_provider.get_admin()
 
 
 def get_db():
@@ -76,17 +377,33 @@ def get_supabase_for_user(access_token: str) -> Client:
     User-specific Supabase client (RLS enforced)
     Uses user's JWT token - only accesses data user is authorized for
     """
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_ANON_KEY")
-    
-    if not url or not key:
-        raise RuntimeError("❌ Supabase URL/ANON_KEY not loaded!")
-    
-    # Create client with anon key
-    client = create_client(url, key)
-    
-    # Set JWT token for postgrest queries (RLS enforced)
-    # This adds Authorization header to all database requests
-    client.postgrest.auth(access_token)
-    
-    return client
+    return client_provider.for_user(access_token)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Senkron DB işini (query.execute, sync helper) DB executor'ında çalıştır.
+    Async handler'lar event loop'u bloklamadan bekler; contextvars taşınır.
+
+    Usage:
+        perf = await run_db(get_student_performance, student_id)
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(client_provider.executor(), call)
+
+
+async def db_execute(query: Any) -> Any:
+    """
+    PostgREST query builder'ı non-blocking execute et
+
+    Usage:
+        res = await db_execute(supabase.table("x").select("*").eq("id", i))
+    """
+    return await run_db(query.execute)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Supabase HTTP pool metrikleri (in-use, waiting, reuse ratio)"""
+    return client_provider.metrics()
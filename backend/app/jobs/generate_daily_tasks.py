@@ -1,11 +1,17 @@
 # backend/app/jobs/generate_daily_tasks.py
 from __future__ import annotations
 
+import argparse
+import json
+import logging
 import os
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, date, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Projende zaten varsa bunu kullan:
 # from app.db.session import get_supabase_admin
@@ -13,6 +19,10 @@ from typing import Any, Dict, List, Optional, Tuple
 # Bu fonksiyon projeden projeye değişebiliyor.
 # Sende "get_supabase_admin" var diye hatırlıyorum.
 from app.db.session import get_supabase_admin  # ✅ sende vardı
+from app.core.data_version import bump_student_version, bump_student_versions
+from app.core.metrics import MetricFamily, Sample, metrics
+
+logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------
 # CONFIG
@@ -22,6 +32,16 @@ DEFAULT_TASKS_PER_DAY = 5
 DEFAULT_PUBLISH_HOUR = 10  # 10:01'de publish yapan ayrı job yazacağız (sonraki adım)
 SEED_SALT = "endstp_daily_v1"
 
+# Concurrent mode (nightly run)
+DEFAULT_WORKERS = int(os.getenv("DAILY_TASKS_WORKERS", "8"))
+DEFAULT_PAGE_SIZE = int(os.getenv("DAILY_TASKS_PAGE_SIZE", "500"))
+TASK_INSERT_CHUNK = 1000
+# PostgREST db-max-rows (Supabase default 1000): aşan sonuç hatasız kesilir
+BULK_MAX_ROWS = int(os.getenv("DAILY_TASKS_BULK_MAX_ROWS", "1000"))
+# .in_() id'leri URL'e yazılır: 100 UUID ≈ 3.7 KB (proxy request-line limiti 8 KB)
+TASK_DELETE_ID_CHUNK = 100
+CHECKPOINT_DIR = Path(os.getenv("DAILY_TASKS_CHECKPOINT_DIR", "logs/checkpoints"))
+
 
 # ------------------------------------------------------------
 # DATA MODELS
@@ -284,6 +304,53 @@ def fetch_active_students(supabase) -> List[Dict[str, Any]]:
     return res.data or []
 
 
+def iter_active_student_pages(
+    supabase,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    after_id: Optional[str] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Aktif öğrencileri id sırasıyla sayfa sayfa döner (keyset pagination).
+    after_id: checkpoint'ten devam için son işlenen öğrenci id'si
+    """
+    last_id = after_id
+    while True:
+        query = (
+            supabase.table("students")
+            .select("id, full_name")
+            .eq("is_active", True)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+
+        res = query.order("id").limit(page_size).execute()
+        page = res.data or []
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        last_id = str(page[-1]["id"])
+
+
+def _candidate_from_row(r: Dict[str, Any]) -> CandidateTopic:
+    return CandidateTopic(
+        topic_id=str(r["topic_id"]),
+        subject_id=str(r["subject_id"]),
+        topic_name=str(r["topic_name"]),
+        subject_name=str(r.get("subject_name", "")),
+        retention_rate=float(r.get("retention_rate", 0)),
+        days_until_forgotten=int(r.get("days_until_forgotten", 0)),
+        difficulty_score=float(r.get("difficulty_score", 0)),
+        priority_score=float(r.get("priority_score", 0)),
+        speed_need=float(r.get("speed_need", 0)),
+        gos=float(r.get("gos", 0)),
+        dominant_reason=str(r.get("dominant_reason", "mixed")),
+    )
+
+
 def fetch_daily_candidates(supabase, student_id: str, plan_date: date) -> List[CandidateTopic]:
     """
     ✅ B adımında yazacağımız RPC:
@@ -299,32 +366,79 @@ def fetch_daily_candidates(supabase, student_id: str, plan_date: date) -> List[C
     ).execute()
 
     rows = rpc_res.data or []
-    out: List[CandidateTopic] = []
+    return [_candidate_from_row(r) for r in rows]
+
+
+def group_candidates_by_student(
+    rows: Iterable[Dict[str, Any]],
+    student_ids: List[str],
+) -> Dict[str, List[CandidateTopic]]:
+    """
+    Bulk RPC satırlarını öğrenci bazında CandidateTopic listelerine ayırır.
+    Adayı olmayan öğrenciler de boş liste ile döner (planı yine yazılır).
+    """
+    grouped: Dict[str, List[CandidateTopic]] = {sid: [] for sid in student_ids}
     for r in rows:
-        out.append(
-            CandidateTopic(
-                topic_id=str(r["topic_id"]),
-                subject_id=str(r["subject_id"]),
-                topic_name=str(r["topic_name"]),
-                subject_name=str(r.get("subject_name", "")),
-                retention_rate=float(r.get("retention_rate", 0)),
-                days_until_forgotten=int(r.get("days_until_forgotten", 0)),
-                difficulty_score=float(r.get("difficulty_score", 0)),
-                priority_score=float(r.get("priority_score", 0)),
-                speed_need=float(r.get("speed_need", 0)),
-                gos=float(r.get("gos", 0)),
-                dominant_reason=str(r.get("dominant_reason", "mixed")),
-            )
-        )
-    return out
+        sid = str(r["student_id"])
+        if sid in grouped:
+            grouped[sid].append(_candidate_from_row(r))
+    return grouped
 
 
-def upsert_daily_plan(supabase, student_id: str, plan_date: date, motivation: Dict[str, Any]) -> str:
+class CandidatesTruncated(RuntimeError):
+    """Bulk RPC sonucu max-rows sınırına dayandı; eksik öğrenci olabilir"""
+
+
+def fetch_daily_candidates_bulk(
+    supabase,
+    student_ids: List[str],
+    plan_date: date,
+    limit: int = DEFAULT_TASKS_PER_DAY,
+    max_rows: Optional[int] = None,
+) -> Dict[str, List[CandidateTopic]]:
     """
-    ✅ B adımında yazacağımız tablo:
-    student_daily_plans (id uuid, student_id uuid, plan_date date, motivation_text text, dominant_reason text, status text, created_at)
+    ✅ Migration 027:
+    rpc_get_daily_task_candidates_bulk(p_student_ids uuid[], p_date date, p_limit int)
+    Öğrenci başına en iyi `limit` adayı döner.
+    Kolonlar: student_id + rpc_get_daily_task_candidates kolonları
+
+    PostgREST max-rows sonucu sessizce keser: çağrı başına en fazla
+    (max_rows - 1) // limit id gönderilir; sonuç yine de max_rows'a ulaşırsa
+    CandidatesTruncated fırlatılır (caller per-student RPC'ye düşer, eksik
+    adayla plan/task silinmez).
     """
-    payload = {
+    if not student_ids:
+        return {}
+
+    limit = max(1, limit)
+    max_rows = max_rows or BULK_MAX_ROWS
+    ids_per_call = max(1, (max_rows - 1) // limit)
+
+    rows: List[Dict[str, Any]] = []
+    for i in range(0, len(student_ids), ids_per_call):
+        chunk = student_ids[i:i + ids_per_call]
+        rpc_res = supabase.rpc(
+            "rpc_get_daily_task_candidates_bulk",
+            {"p_student_ids": chunk, "p_date": plan_date.isoformat(), "p_limit": limit},
+        ).execute()
+        chunk_rows = rpc_res.data or []
+        if len(chunk_rows) >= max_rows:
+            raise CandidatesTruncated(
+                f"bulk candidates hit max-rows ({len(chunk_rows)} rows for {len(chunk)} students)"
+            )
+        rows.extend(chunk_rows)
+
+    return group_candidates_by_student(rows, student_ids)
+
+
+def _is_missing_rpc(error: Exception) -> bool:
+    """PostgREST: fonksiyon henüz deploy edilmemiş (PGRST202)"""
+    msg = str(error)
+    return "PGRST202" in msg or "Could not find the function" in msg
+
+
+def _plan_row(student_id: str, plan_date: date, motivation: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "student_id": student_id,
         "plan_date": plan_date.isoformat(),
         "motivation_text": motivation["text"],
@@ -333,7 +447,40 @@ def upsert_daily_plan(supabase, student_id: str, plan_date: date, motivation: Di
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
-    res = supabase.table("student_daily_plans").upsert(payload, on_conflict="student_id,plan_date").select("id").execute()
+
+def _task_rows(plan_id: str, student_id: str, plan_date: date, tasks: List[DailyTask]) -> List[Dict[str, Any]]:
+    now_iso = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "plan_id": plan_id,
+            "student_id": student_id,
+            "task_date": plan_date.isoformat(),
+            "task_type": t.task_type,
+            "topic_id": t.topic_id,
+            "subject_id": t.subject_id,
+            "topic_name": t.topic_name,
+            "source_motor": t.source_motor,
+            "priority_level": int(t.priority_level),
+            "estimated_time_minutes": int(t.estimated_time_minutes),
+            "question_count": t.question_count,
+            "status": "pending",
+            "completed_at": None,
+            "manual_completion": False,
+            "created_at": now_iso,
+            "dominant_reason": t.dominant_reason,
+        }
+        for t in tasks
+    ]
+
+
+def upsert_daily_plan(supabase, student_id: str, plan_date: date, motivation: Dict[str, Any]) -> str:
+    """
+    ✅ B adımında yazacağımız tablo:
+    student_daily_plans (id uuid, student_id uuid, plan_date date, motivation_text text, dominant_reason text, status text, created_at)
+    """
+    payload = _plan_row(student_id, plan_date, motivation)
+
+    res = supabase.table("student_daily_plans").upsert(payload, on_conflict="student_id,plan_date").execute()
     plan_id = res.data[0]["id"]
     return str(plan_id)
 
@@ -351,84 +498,372 @@ def replace_plan_tasks(supabase, plan_id: str, student_id: str, plan_date: date,
     supabase.table("student_tasks").delete().eq("student_id", student_id).eq("task_date", plan_date.isoformat()).execute()
 
     # 2) Yenileri insert
-    rows = []
-    for t in tasks:
-        rows.append(
-            {
-                "plan_id": plan_id,
-                "student_id": student_id,
-                "task_date": plan_date.isoformat(),
-                "task_type": t.task_type,
-                "topic_id": t.topic_id,
-                "subject_id": t.subject_id,
-                "topic_name": t.topic_name,
-                "source_motor": t.source_motor,
-                "priority_level": int(t.priority_level),
-                "estimated_time_minutes": int(t.estimated_time_minutes),
-                "question_count": t.question_count,
-                "status": "pending",
-                "completed_at": None,
-                "manual_completion": False,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "dominant_reason": t.dominant_reason,
-            }
-        )
-
+    rows = _task_rows(plan_id, student_id, plan_date, tasks)
     if rows:
         supabase.table("student_tasks").insert(rows).execute()
 
+    bump_student_version(student_id)
+
 
 # ------------------------------------------------------------
-# MAIN JOB
+# BATCH WRITES (çok öğrencili tek round trip)
 # ------------------------------------------------------------
 
-def generate_daily_tasks_for_date(plan_date: Optional[date] = None) -> Dict[str, Any]:
+def upsert_daily_plans_batch(
+    supabase,
+    plan_date: date,
+    motivations: Dict[str, Dict[str, Any]],
+) -> Dict[str, str]:
     """
-    CRON burayı çağıracak.
+    Bir sayfadaki tüm öğrencilerin planlarını tek upsert ile yazar.
+    Returns: {student_id: plan_id}
     """
-    supabase = get_supabase_admin()
-    plan_date = plan_date or datetime.now(timezone.utc).date()
+    if not motivations:
+        return {}
 
-    students = fetch_active_students(supabase)
+    payload = [_plan_row(sid, plan_date, m) for sid, m in motivations.items()]
+    res = supabase.table("student_daily_plans").upsert(payload, on_conflict="student_id,plan_date").execute()
 
-    summary = {
-        "date": plan_date.isoformat(),
-        "students_total": len(students),
-        "students_planned": 0,
-        "students_failed": 0,
-        "errors": [],
-    }
+    return {str(r["student_id"]): str(r["id"]) for r in (res.data or [])}
 
-    for s in students:
-        student_id = str(s["id"])
-        student_name = str(s.get("full_name") or "Öğrenci")
 
+def replace_plan_tasks_batch(
+    supabase,
+    plan_date: date,
+    plan_ids: Dict[str, str],
+    tasks_by_student: Dict[str, List[DailyTask]],
+) -> int:
+    """
+    Sayfadaki öğrencilerin o günkü task'larını chunk'lı delete + chunk'lı insert ile yeniler.
+    Returns: insert edilen task sayısı
+    """
+    student_ids = list(plan_ids.keys())
+    if not student_ids:
+        return 0
+
+    for i in range(0, len(student_ids), TASK_DELETE_ID_CHUNK):
+        chunk = student_ids[i:i + TASK_DELETE_ID_CHUNK]
+        supabase.table("student_tasks").delete().in_("student_id", chunk).eq("task_date", plan_date.isoformat()).execute()
+
+    rows: List[Dict[str, Any]] = []
+    for sid in student_ids:
+        rows.extend(_task_rows(plan_ids[sid], sid, plan_date, tasks_by_student.get(sid, [])))
+
+    for i in range(0, len(rows), TASK_INSERT_CHUNK):
+        supabase.table("student_tasks").insert(rows[i:i + TASK_INSERT_CHUNK]).execute()
+
+    bump_student_versions(student_ids)
+    return len(rows)
+
+
+# ------------------------------------------------------------
+# CHECKPOINT (crash sonrası kaldığı yerden devam)
+# ------------------------------------------------------------
+
+class JobCheckpoint:
+    """
+    JSON dosyası: son tamamlanan sayfanın son öğrenci id'si + sayaçlar.
+    Sayfa tamamen yazıldıktan sonra kaydedilir; yarım sayfa tekrar işlenir
+    (upsert + delete/insert idempotent olduğu için güvenli).
+    """
+
+    def __init__(self, plan_date: date, directory: Path = CHECKPOINT_DIR):
+        self.path = Path(directory) / f"daily_tasks_{plan_date.isoformat()}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
         try:
-            # 1) adaylar (4 motor sentezi) -> RPC
-            cands = fetch_daily_candidates(supabase, student_id, plan_date)
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
 
-            # 2) task seçimi
-            tasks = choose_tasks_from_candidates(cands, tasks_per_day=DEFAULT_TASKS_PER_DAY)
+    def save(self, state: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self.path)  # atomic
 
-            # 3) motivasyon
-            motivation = build_daily_motivation(student_name, tasks, plan_date)
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ------------------------------------------------------------
+# PROGRESS METRICS (/metrics)
+# ------------------------------------------------------------
+# Job API process'inde çalışırsa gauge'lar canlıdır; CLI/cron ayrı process
+# ise ilerleme checkpoint dosyasından okunur (collect_checkpoint_metrics).
+
+JOB_STARTED = metrics.gauge(
+    "endstp_daily_tasks_started_timestamp_seconds", "Start of the current/last run in this process"
+)
+JOB_PROGRESS = metrics.gauge(
+    "endstp_daily_tasks_progress_timestamp_seconds", "Last completed page of the current/last run"
+)
+JOB_FINISHED = metrics.gauge(
+    "endstp_daily_tasks_last_success_timestamp_seconds", "End of the last completed run"
+)
+JOB_DURATION = metrics.gauge(
+    "endstp_daily_tasks_last_duration_seconds", "Duration of the last completed run"
+)
+JOB_STUDENTS = metrics.gauge(
+    "endstp_daily_tasks_students", "Students in the current/last run", ("state",)
+)
+JOB_PAGES = metrics.gauge("endstp_daily_tasks_pages", "Pages completed in the current/last run")
+
+_PROGRESS_KEYS = (("total", "students_total"), ("planned", "students_planned"), ("failed", "students_failed"))
+
+
+def _publish_progress(summary: Dict[str, Any]) -> None:
+    for state, key in _PROGRESS_KEYS:
+        JOB_STUDENTS.set(summary[key], state)
+    JOB_PAGES.set(summary["pages"])
+    JOB_PROGRESS.set(time.time())
+
+
+def collect_checkpoint_metrics(directory: Path = CHECKPOINT_DIR) -> List[MetricFamily]:
+    """Bugünün checkpoint'i varsa (koşu sürüyor / yarım kaldı) ilerlemesi"""
+    plan_date = datetime.now(timezone.utc).date()
+    state = JobCheckpoint(plan_date, directory).load()
+    if not state:
+        return []
+    return [
+        MetricFamily(
+            "endstp_daily_tasks_checkpoint_students", "gauge",
+            "Progress of an unfinished run today (any process, from the checkpoint file)",
+            [Sample("", {"state": state_name}, int(state.get(key, 0))) for state_name, key in _PROGRESS_KEYS],
+        ),
+        MetricFamily(
+            "endstp_daily_tasks_checkpoint_pages", "gauge",
+            "Pages completed by an unfinished run today",
+            [Sample("", {}, int(state.get("pages", 0)))],
+        ),
+    ]
 
-            # 4) plan upsert
-            plan_id = upsert_daily_plan(supabase, student_id, plan_date, motivation)
 
-            # 5) tasks replace
-            replace_plan_tasks(supabase, plan_id, student_id, plan_date, tasks)
+metrics.register_collector(collect_checkpoint_metrics)
+
+
+# ------------------------------------------------------------
+# MAIN JOB
+# ------------------------------------------------------------
+
+PHASES = ("fetch_students", "fetch_candidates", "select_tasks", "write_plans", "write_tasks")
 
-            summary["students_planned"] += 1
 
+def _fetch_page_candidates(
+    supabase,
+    pool: ThreadPoolExecutor,
+    student_ids: List[str],
+    plan_date: date,
+) -> Dict[str, Any]:
+    """
+    Fallback: sayfadaki öğrencilerin adaylarını per-student RPC ile,
+    worker pool üzerinden paralel çeker (hatalar öğrenci bazında izole).
+    Returns: {student_id: List[CandidateTopic] | Exception}
+    """
+    def _one(sid: str):
+        try:
+            return fetch_daily_candidates(supabase, sid, plan_date)
+        except Exception as e:
+            return e
+
+    return dict(zip(student_ids, pool.map(_one, student_ids)))
+
+
+def _write_page_per_student(
+    supabase,
+    plan_date: date,
+    motivations: Dict[str, Dict[str, Any]],
+    tasks_by_student: Dict[str, List[DailyTask]],
+    summary: Dict[str, Any],
+) -> int:
+    """Batch yazma başarısız olursa: öğrenci bazlı yaz, hatalıları ayıkla."""
+    planned = 0
+    for sid, motivation in motivations.items():
+        try:
+            plan_id = upsert_daily_plan(supabase, sid, plan_date, motivation)
+            replace_plan_tasks(supabase, plan_id, sid, plan_date, tasks_by_student.get(sid, []))
+            planned += 1
         except Exception as e:
             summary["students_failed"] += 1
-            summary["errors"].append({"student_id": student_id, "error": str(e)})
+            summary["errors"].append({"student_id": sid, "error": str(e)})
+    return planned
+
+
+def generate_daily_tasks_for_date(
+    plan_date: Optional[date] = None,
+    workers: int = DEFAULT_WORKERS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    resume: bool = True,
+    checkpoint_dir: Path = CHECKPOINT_DIR,
+) -> Dict[str, Any]:
+    """
+    CRON burayı çağıracak.
+
+    Concurrent mode:
+    - Öğrenciler id sırasıyla page_size'lık sayfalar halinde çekilir
+    - Adaylar sayfa başına bulk RPC ile çekilir (öğrenci başına top-N, çağrılar
+      max-rows'a göre bölünür); bulk çağrı hata verirse / sonuç kesilmiş
+      olabilirse o sayfa bounded worker pool (workers) ile per-student RPC'ye düşer
+    - Plan + task yazımı sayfa başına batch (multi-student upsert/insert)
+    - Her sayfa sonrası checkpoint; resume=True ise yarım kalan koşu devam eder
+    """
+    job_start = time.perf_counter()
+    JOB_STARTED.set(time.time())
+    supabase = get_supabase_admin()
+    plan_date = plan_date or datetime.now(timezone.utc).date()
+
+    timings = {phase: 0.0 for phase in PHASES}
+    checkpoint = JobCheckpoint(plan_date, checkpoint_dir)
+    state = checkpoint.load() if resume else None
+
+    summary = {
+        "date": plan_date.isoformat(),
+        "students_total": 0,
+        "students_planned": 0,
+        "students_failed": 0,
+        "errors": [],
+        "batch_write_failures": [],
+        "pages": 0,
+        "resumed_from": None,
+    }
+    after_id: Optional[str] = None
+    bulk_candidates = True
+
+    if state and state.get("date") == plan_date.isoformat():
+        after_id = state.get("last_student_id")
+        summary["resumed_from"] = after_id
+        for key in ("students_total", "students_planned", "students_failed", "pages"):
+            summary[key] = int(state.get(key, 0))
+        for key in ("errors", "batch_write_failures"):
+            summary[key] = list(state.get(key) or [])
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pages = iter_active_student_pages(supabase, page_size=page_size, after_id=after_id)
+
+        while True:
+            t0 = time.perf_counter()
+            page = next(pages, None)
+            timings["fetch_students"] += time.perf_counter() - t0
+            if page is None:
+                break
+
+            names = {str(s["id"]): str(s.get("full_name") or "Öğrenci") for s in page}
+            student_ids = list(names.keys())
+            summary["students_total"] += len(student_ids)
+
+            # 1) adaylar (4 motor sentezi) -> bulk RPC, gerekirse per-student paralel
+            t0 = time.perf_counter()
+            cands_by_student = None
+            if bulk_candidates:
+                try:
+                    cands_by_student = fetch_daily_candidates_bulk(
+                        supabase, student_ids, plan_date, limit=DEFAULT_TASKS_PER_DAY
+                    )
+                except Exception as e:
+                    # RPC yoksa bu koşuda bir daha deneme
+                    if _is_missing_rpc(e):
+                        bulk_candidates = False
+                    else:
+                        logger.warning(
+                            f"⚠️ Bulk candidates failed (page {summary['pages'] + 1}), "
+                            f"falling back to per-student RPC: {e}"
+                        )
+            if cands_by_student is None:
+                cands_by_student = _fetch_page_candidates(supabase, pool, student_ids, plan_date)
+            timings["fetch_candidates"] += time.perf_counter() - t0
+
+            # 2-3) task seçimi + motivasyon
+            t0 = time.perf_counter()
+            tasks_by_student: Dict[str, List[DailyTask]] = {}
+            motivations: Dict[str, Dict[str, Any]] = {}
+            for sid in student_ids:
+                cands = cands_by_student.get(sid)
+                if isinstance(cands, Exception):
+                    summary["students_failed"] += 1
+                    summary["errors"].append({"student_id": sid, "error": str(cands)})
+                    continue
+                tasks = choose_tasks_from_candidates(cands, tasks_per_day=DEFAULT_TASKS_PER_DAY)
+                tasks_by_student[sid] = tasks
+                motivations[sid] = build_daily_motivation(names[sid], tasks, plan_date)
+            timings["select_tasks"] += time.perf_counter() - t0
+
+            # 4-5) plan upsert + tasks replace (batch)
+            try:
+                t0 = time.perf_counter()
+                plan_ids = upsert_daily_plans_batch(supabase, plan_date, motivations)
+                timings["write_plans"] += time.perf_counter() - t0
+
+                t0 = time.perf_counter()
+                replace_plan_tasks_batch(supabase, plan_date, plan_ids, tasks_by_student)
+                timings["write_tasks"] += time.perf_counter() - t0
+
+                summary["students_planned"] += len(plan_ids)
+                missing = [sid for sid in motivations if sid not in plan_ids]
+                for sid in missing:
+                    summary["students_failed"] += 1
+                    summary["errors"].append({"student_id": sid, "error": "plan upsert returned no row"})
+            except Exception as e:
+                logger.exception(
+                    f"❌ Daily tasks batch write failed (page {summary['pages'] + 1}), "
+                    f"falling back to per-student writes"
+                )
+                summary["batch_write_failures"].append({
+                    "page": summary["pages"] + 1,
+                    "first_student_id": student_ids[0],
+                    "error": str(e),
+                })
+                t0 = time.perf_counter()
+                summary["students_planned"] += _write_page_per_student(
+                    supabase, plan_date, motivations, tasks_by_student, summary
+                )
+                timings["write_tasks"] += time.perf_counter() - t0
+
+            summary["pages"] += 1
+            checkpoint.save({
+                "date": plan_date.isoformat(),
+                "last_student_id": student_ids[-1],
+                "students_total": summary["students_total"],
+                "students_planned": summary["students_planned"],
+                "students_failed": summary["students_failed"],
+                "pages": summary["pages"],
+                "errors": summary["errors"],
+                "batch_write_failures": summary["batch_write_failures"],
+            })
+            _publish_progress(summary)
+
+    checkpoint.clear()
+
+    summary["timings_ms"] = {phase: round(sec * 1000, 2) for phase, sec in timings.items()}
+    summary["timings_ms"]["total"] = round((time.perf_counter() - job_start) * 1000, 2)
+    summary["workers"] = max(1, workers)
+    summary["bulk_candidates"] = bulk_candidates
+    summary["page_size"] = page_size
+
+    _publish_progress(summary)
+    JOB_FINISHED.set(time.time())
+    JOB_DURATION.set(round(time.perf_counter() - job_start, 3))
 
     return summary
 
 
 if __name__ == "__main__":
-    # CLI run: python -m app.jobs.generate_daily_tasks
-    result = generate_daily_tasks_for_date()
+    # CLI run: python -m app.jobs.generate_daily_tasks [--workers 16] [--page-size 500] [--no-resume]
+    parser = argparse.ArgumentParser(description="Daily task generation job")
+    parser.add_argument("--date", type=date.fromisoformat, default=None)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    result = generate_daily_tasks_for_date(
+        plan_date=args.date,
+        workers=args.workers,
+        page_size=args.page_size,
+        resume=not args.no_resume,
+    )
     print(result)
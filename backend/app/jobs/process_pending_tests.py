@@ -0,0 +1,554 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: process_pending_tests.py
+# Role: Background worker for pending test results (per-topic motor state)
+# Created: 2026-10-18
+# Author: End.STP Team
+#
+# Golden rules:
+# - Claim batch halinde ve yarışsız (koşullu update: pending -> processing)
+# - Her (öğrenci, konu) çifti batch başına bir kez hesaplanır
+# - Hata: exponential backoff ile tekrar, MAX_ATTEMPTS sonrası "failed"
+# - Kilitli kalan claim'ler (çöken worker) lease süresi sonunda geri alınır
+# - Kuyruk derinliği + gecikme (lag) her an okunabilir
+# =============================================================================
+
+"""
+process_pending_tests.py - Pending test pipeline
+
+submit_test_result satırı processing_status="pending" yazar. Worker:
+
+    1) release_stale_claims   lease'i dolmuş "processing" satırları -> pending
+                              (deneme sayılır: backoff, limitte failed)
+    2) claim_pending_tests    en eski N pending satırı koşullu update ile alır
+    3) fetch_topic_tests      claim edilen (öğrenci, konu) çiftlerinin testleri
+    4) compute_topic_state    BS-Model (EF/interval) + difficulty + pace
+    5) student_topic_state    upsert (tek round trip)
+    6) satırlar processed / retry / failed
+    7) cache'teki aggregate güncellenir + öğrenci versiyonu (ETag) yenilenir
+
+Okuma yolu: get_student_performance cold miss'te state satırlarını lookup
+eder. PUT / DELETE /tests/{id} requeue_topic ile (öğrenci, konu) state'ini
+siler ve kalan testleri tekrar pending yapar.
+
+Çalıştırma:
+    python -m app.jobs.process_pending_tests            # sürekli
+    python -m app.jobs.process_pending_tests --once     # tek batch
+    PENDING_TESTS_WORKER=1 uvicorn app.main:app         # API process'i içinde
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.api.v1.endpoints.student.performance import TOPIC_STATE_TABLE, _build_topic_entry, apply_topic_tests
+from app.core.data_version import bump_student_versions
+from app.core.difficulty_engine_v1 import DifficultyEngineV1, DifficultyInput
+from app.core.time_engine_v1 import TimeAnalyzerV1
+from app.core.timestamps import normalize_rows, parse_utc
+from app.db.session import get_supabase_admin
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+
+DEFAULT_BATCH_SIZE = int(os.getenv("PENDING_TESTS_BATCH_SIZE", "200"))
+DEFAULT_POLL_SECONDS = float(os.getenv("PENDING_TESTS_POLL_SECONDS", "2"))
+LEASE_SECONDS = int(os.getenv("PENDING_TESTS_LEASE_SECONDS", "300"))
+MAX_ATTEMPTS = int(os.getenv("PENDING_TESTS_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = float(os.getenv("PENDING_TESTS_BACKOFF_BASE_SECONDS", "30"))
+BACKOFF_MAX_SECONDS = float(os.getenv("PENDING_TESTS_BACKOFF_MAX_SECONDS", "3600"))
+FETCH_PAGE_SIZE = 1000  # PostgREST max-rows
+RECENT_TESTS_FOR_VOLATILITY = 5
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_PROCESSED = "processed"
+STATUS_FAILED = "failed"
+
+TESTS_TABLE = "student_topic_tests"
+STATE_TABLE = TOPIC_STATE_TABLE  # get_student_performance buradan okur
+
+Pair = Tuple[str, str]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """1. hata: base, sonra 2x ... BACKOFF_MAX_SECONDS ile sınırlı"""
+    return min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+
+
+# ------------------------------------------------------------
+# QUEUE
+# ------------------------------------------------------------
+
+def release_stale_claims(supabase, now: Optional[datetime] = None) -> int:
+    """
+    Lease'i dolmuş claim'ler (çöken / takılan worker) deneme sayılır:
+    attempts + 1 ve backoff ile pending, MAX_ATTEMPTS'ta failed. Worker'ı
+    çökerten satır sonsuza kadar tekrar claim edilmez.
+    Returns: geri alınan (pending + failed) satır sayısı
+    """
+    now = now or datetime.now(timezone.utc)
+    stale = (
+        supabase.table(TESTS_TABLE)
+        .select("id, processing_attempts")
+        .eq("processing_status", STATUS_PROCESSING)
+        .lt("processing_claimed_at", _iso(now - timedelta(seconds=LEASE_SECONDS)))
+        .execute()
+    ).data or []
+    if not stale:
+        return 0
+    counts = _mark_retry(supabase, stale, "lease expired", now, only_status=STATUS_PROCESSING)
+    return counts["retried"] + counts["failed"]
+
+
+def claim_pending_tests(
+    supabase,
+    worker_id: str,
+    limit: int = DEFAULT_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    En eski `limit` pending satırı claim et.
+
+    Koşullu update (processing_status = 'pending') yarışı çözer: aynı satırı
+    seçen ikinci worker'ın update'i satırı artık eşleştirmez ve dönmez.
+    """
+    now = now or datetime.now(timezone.utc)
+    candidates = (
+        supabase.table(TESTS_TABLE)
+        .select("id")
+        .eq("processing_status", STATUS_PENDING)
+        .lte("processing_next_attempt_at", _iso(now))
+        .order("created_at")
+        .limit(limit)
+        .execute()
+    ).data or []
+    if not candidates:
+        return []
+
+    res = (
+        supabase.table(TESTS_TABLE)
+        .update({
+            "processing_status": STATUS_PROCESSING,
+            "processing_claimed_at": _iso(now),
+            "processing_worker": worker_id,
+        })
+        .in_("id", [c["id"] for c in candidates])
+        .eq("processing_status", STATUS_PENDING)
+        .execute()
+    )
+    return res.data or []
+
+
+def fetch_topic_tests(supabase, pairs: Iterable[Pair]) -> Dict[Pair, List[Dict[str, Any]]]:
+    """
+    Claim edilen çiftlerin tüm testleri (test_date DESC), sayfa sayfa.
+    student_id x topic_id IN filtresi fazlasını da getirebilir; çift dışı
+    satırlar atılır.
+    """
+    pairs = set(pairs)
+    student_ids = sorted({s for s, _ in pairs})
+    topic_ids = sorted({t for _, t in pairs})
+    grouped: Dict[Pair, List[Dict[str, Any]]] = {p: [] for p in pairs}
+
+    start = 0
+    while True:
+        page = (
+            supabase.table(TESTS_TABLE)
+            .select("*")  # _build_topic_entry ile aynı girdi (performance.py)
+            .in_("student_id", student_ids)
+            .in_("topic_id", topic_ids)
+            .order("test_date", desc=True)
+            .order("id", desc=True)
+            .range(start, start + FETCH_PAGE_SIZE - 1)
+            .execute()
+        ).data or []
+        for row in normalize_rows(page):
+            key = (row["student_id"], row["topic_id"])
+            if key in grouped:
+                grouped[key].append(row)
+        if len(page) < FETCH_PAGE_SIZE:
+            return grouped
+        start += FETCH_PAGE_SIZE
+
+
+def requeue_topic(supabase, student_id: str, topic_id: str) -> int:
+    """
+    Test güncellendi / silindi: (öğrenci, konu) state'i artık geçersiz.
+    State satırı silinir (okuma yolu tam hesaba düşer) ve çiftin testleri
+    tekrar kuyruğa girer; worker state'i yeniden yazar.
+    Returns: kuyruğa alınan test sayısı
+    """
+    supabase.table(STATE_TABLE).delete().eq("student_id", student_id).eq("topic_id", topic_id).execute()
+    res = (
+        supabase.table(TESTS_TABLE)
+        .update({
+            "is_processed": False,
+            "processing_status": STATUS_PENDING,
+            "processing_attempts": 0,
+            "processing_next_attempt_at": _iso(datetime.now(timezone.utc)),
+            "processing_error": None,
+        })
+        .eq("student_id", student_id)
+        .eq("topic_id", topic_id)
+        .execute()
+    )
+    return len(res.data or [])
+
+
+# ------------------------------------------------------------
+# MOTOR STATE
+# ------------------------------------------------------------
+
+def compute_topic_state(student_id: str, topic_id: str, topic_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Tek (öğrenci, konu) için kalıcı motor durumu
+    topic_tests: normalize edilmiş, test_date DESC
+    """
+    entry = _build_topic_entry(topic_tests)
+    bs = entry["bs_model"]
+    latest = topic_tests[0]
+    total = latest["correct_count"] + latest["wrong_count"] + latest["empty_count"]
+
+    recent = [
+        {"correct": t["correct_count"], "total": t["correct_count"] + t["wrong_count"] + t["empty_count"]}
+        for t in reversed(topic_tests[:RECENT_TESTS_FOR_VOLATILITY])
+    ]
+    difficulty = DifficultyEngineV1.calculate(DifficultyInput(
+        topic_id=str(topic_id),
+        questions_total=max(total, 1),
+        questions_correct=latest["correct_count"],
+        questions_wrong=latest["wrong_count"],
+        questions_blank=latest["empty_count"],
+        recent_tests=recent,
+    ))
+
+    success_rate = latest.get("success_rate")
+    pace = TimeAnalyzerV1.analyze(
+        total_duration=latest.get("test_duration_minutes"),
+        total_questions=total,
+        success_rate=float(success_rate) / 100 if success_rate is not None else None,
+    )
+
+    return {
+        "student_id": student_id,
+        "topic_id": topic_id,
+        "ease_factor": bs.get("next_ef"),
+        "interval_days": bs.get("next_ia"),
+        "repetitions": entry["repetitions"],
+        "bs_status": bs.get("status"),
+        "bs_model": bs,
+        "difficulty_score": difficulty.difficulty_score,
+        "difficulty_level": difficulty.difficulty_level,
+        "pace_ratio": pace.pace_ratio,
+        "time_modifier": pace.time_modifier,
+        "latest_test_id": latest["id"],
+        "latest_test_date": latest["test_date"],
+        "test_count": len(topic_tests),
+        "updated_at": _iso(datetime.now(timezone.utc)),
+    }
+
+
+# ------------------------------------------------------------
+# BATCH
+# ------------------------------------------------------------
+
+def _mark_processed(supabase, test_ids: List[str], now: datetime) -> None:
+    if not test_ids:
+        return
+    supabase.table(TESTS_TABLE).update({
+        "is_processed": True,
+        "processing_status": STATUS_PROCESSED,
+        "processed_at": _iso(now),
+        "processing_error": None,
+        "processing_worker": None,
+    }).in_("id", test_ids).execute()
+
+
+def _mark_retry(
+    supabase,
+    rows: List[Dict[str, Any]],
+    error: str,
+    now: datetime,
+    only_status: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Aynı deneme sayısındaki satırlar tek update; limit aşıldıysa failed
+    only_status: sadece hâlâ bu durumdaki satırlar (lease geri alımı, geç
+    biten worker'ın processed yazımını ezmemek için)
+    """
+    by_attempts: Dict[int, List[str]] = defaultdict(list)
+    for row in rows:
+        by_attempts[int(row.get("processing_attempts") or 0) + 1].append(row["id"])
+
+    counts = {"retried": 0, "failed": 0}
+    for attempts, ids in sorted(by_attempts.items()):
+        failed = attempts >= MAX_ATTEMPTS
+        query = supabase.table(TESTS_TABLE).update({
+            "processing_status": STATUS_FAILED if failed else STATUS_PENDING,
+            "processing_attempts": attempts,
+            "processing_next_attempt_at": _iso(now + timedelta(seconds=backoff_seconds(attempts))),
+            "processing_error": error[:500],
+            "processing_worker": None,
+        }).in_("id", ids)
+        if only_status is not None:
+            query = query.eq("processing_status", only_status)
+        res = query.execute()
+        updated = len(res.data or []) if only_status is not None else len(ids)
+        counts["failed" if failed else "retried"] += updated
+    return counts
+
+
+def process_batch(
+    supabase=None,
+    worker_id: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Tek batch: claim -> hesapla -> persist -> işaretle"""
+    supabase = supabase or get_supabase_admin()
+    worker_id = worker_id or f"inline-{uuid.uuid4().hex[:8]}"
+    t0 = time.perf_counter()
+    now = datetime.now(timezone.utc)
+
+    summary = {"claimed": 0, "processed": 0, "retried": 0, "failed": 0, "topics": 0, "released": 0}
+    summary["released"] = release_stale_claims(supabase, now)
+
+    claimed = claim_pending_tests(supabase, worker_id, batch_size, now)
+    summary["claimed"] = len(claimed)
+    if not claimed:
+        summary["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        return summary
+
+    rows_by_pair: Dict[Pair, List[Dict[str, Any]]] = defaultdict(list)
+    for row in claimed:
+        rows_by_pair[(row["student_id"], row["topic_id"])].append(row)
+
+    try:
+        tests_by_pair = fetch_topic_tests(supabase, rows_by_pair.keys())
+    except Exception as e:
+        logger.warning(f"⚠️ Pending tests fetch failed: {e}")
+        counts = _mark_retry(supabase, claimed, f"fetch: {e}", now)
+        summary.update(counts)
+        summary["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        return summary
+
+    states: List[Dict[str, Any]] = []
+    ok_rows: List[Dict[str, Any]] = []
+    errors: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    for pair, rows in rows_by_pair.items():
+        topic_tests = tests_by_pair.get(pair) or []
+        if not topic_tests:
+            # Test claim sonrası silinmiş: yapılacak hesap yok
+            ok_rows.extend(rows)
+            continue
+        try:
+            states.append(compute_topic_state(pair[0], pair[1], topic_tests))
+            ok_rows.extend(rows)
+        except Exception as e:
+            errors[f"compute: {e}"].extend(rows)
+
+    try:
+        if states:
+            supabase.table(STATE_TABLE).upsert(states, on_conflict="student_id,topic_id").execute()
+        _mark_processed(supabase, [r["id"] for r in ok_rows], now)
+    except Exception as e:
+        logger.warning(f"⚠️ Pending tests persist failed: {e}")
+        errors[f"persist: {e}"].extend(ok_rows)
+        ok_rows, states = [], []
+
+    for error, rows in errors.items():
+        counts = _mark_retry(supabase, rows, error, now)
+        summary["retried"] += counts["retried"]
+        summary["failed"] += counts["failed"]
+
+    # Cache'te aggregate'i olan öğrenciler (API dışı yazımlar dahil) güncel kalır;
+    # versiyon bump'ı ETag tutan client'ların da yeni veriyi görmesini sağlar
+    for state in states:
+        pair = (state["student_id"], state["topic_id"])
+        apply_topic_tests(pair[0], pair[1], tests_by_pair[pair])
+    bump_student_versions(state["student_id"] for state in states)
+
+    summary["processed"] = len(ok_rows)
+    summary["topics"] = len(states)
+    summary["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return summary
+
+
+# ------------------------------------------------------------
+# METRICS
+# ------------------------------------------------------------
+
+def _count(supabase, status: str) -> int:
+    res = (
+        supabase.table(TESTS_TABLE)
+        .select("id", count="exact")
+        .eq("processing_status", status)
+        .limit(1)
+        .execute()
+    )
+    return int(res.count or 0)
+
+
+def queue_stats(supabase=None, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Kuyruk derinliği (durum bazında) + en eski pending satırın gecikmesi"""
+    supabase = supabase or get_supabase_admin()
+    now = now or datetime.now(timezone.utc)
+
+    oldest = (
+        supabase.table(TESTS_TABLE)
+        .select("created_at")
+        .eq("processing_status", STATUS_PENDING)
+        .order("created_at")
+        .limit(1)
+        .execute()
+    ).data or []
+
+    lag_seconds = 0.0
+    created = parse_utc(oldest[0].get("created_at")) if oldest else None
+    if created is not None:
+        lag_seconds = max((now - created).total_seconds(), 0.0)
+
+    return {
+        "pending": _count(supabase, STATUS_PENDING),
+        "processing": _count(supabase, STATUS_PROCESSING),
+        "failed": _count(supabase, STATUS_FAILED),
+        "oldest_pending_at": oldest[0].get("created_at") if oldest else None,
+        "lag_seconds": round(lag_seconds, 1),
+    }
+
+
+# ------------------------------------------------------------
+# WORKER
+# ------------------------------------------------------------
+
+class PendingTestWorker:
+    """
+    Kuyruğu boşalana kadar batch işler, boşken poll_seconds bekler.
+    Daemon thread'de çalışır (API process'i) veya CLI'dan bloklayarak.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        client_factory: Callable[[], Any] = get_supabase_admin,
+        worker_id: Optional[str] = None,
+    ):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.client_factory = client_factory
+        self.worker_id = worker_id or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {
+            "batches": 0,
+            "processed": 0,
+            "retried": 0,
+            "failed": 0,
+            "errors": 0,
+            "last_batch_at": None,
+            "last_batch_ms": None,
+            "last_error": None,
+        }
+
+    # ---------- lifecycle ----------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="pending-tests-worker", daemon=True)
+        self._thread.start()
+        logger.info(f"✅ Pending test worker started ({self.worker_id})")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ---------- loop ----------
+    def run_once(self) -> Dict[str, Any]:
+        try:
+            summary = process_batch(self.client_factory(), self.worker_id, self.batch_size)
+        except Exception as e:
+            logger.exception("❌ Pending test batch failed")
+            with self._lock:
+                self._metrics["errors"] += 1
+                self._metrics["last_error"] = str(e)
+            return {"claimed": 0, "error": str(e)}
+
+        with self._lock:
+            m = self._metrics
+            m["batches"] += 1
+            for key in ("processed", "retried", "failed"):
+                m[key] += summary[key]
+            m["last_batch_at"] = _iso(datetime.now(timezone.utc))
+            m["last_batch_ms"] = summary["elapsed_ms"]
+        return summary
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            summary = self.run_once()
+            # Dolu batch: kuyrukta daha fazlası var, beklemeden devam
+            if summary.get("claimed", 0) < self.batch_size:
+                self._stop.wait(self.poll_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "worker_id": self.worker_id,
+                "running": self.running,
+                "batch_size": self.batch_size,
+                "poll_seconds": self.poll_seconds,
+                **self._metrics,
+            }
+
+
+# API process'i içindeki worker (PENDING_TESTS_WORKER=1 ise main.py başlatır)
+pending_test_worker = PendingTestWorker()
+
+
+def worker_enabled() -> bool:
+    return os.getenv("PENDING_TESTS_WORKER", "0").strip().lower() in ("1", "true", "yes")
+
+
+if __name__ == "__main__":
+    # CLI run: python -m app.jobs.process_pending_tests [--once] [--batch-size 200]
+    parser = argparse.ArgumentParser(description="Pending test results worker")
+    parser.add_argument("--once", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--poll-seconds", type=float, default=DEFAULT_POLL_SECONDS)
+    args = parser.parse_args()
+
+    worker = PendingTestWorker(batch_size=args.batch_size, poll_seconds=args.poll_seconds)
+    if args.once:
+        print(worker.run_once())
+        print(queue_stats())
+    else:
+        try:
+            worker.run_forever()
+        except KeyboardInterrupt:
+            print(worker.stats())
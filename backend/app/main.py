@@ -8,6 +8,7 @@ FastAPI ana uygulama - 4 Motor Sistemi + Admin Panel
 # ============================================
 
 from pathlib import Path
+import asyncio
 import os
 import time
 
@@ -28,8 +29,9 @@ assert os.getenv("SUPABASE_JWT_SECRET"), "❌ SUPABASE_JWT_SECRET not loaded"
 # 1) NOW SAFE TO IMPORT APP MODULES
 # ============================================
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.api import api_router
 from app.api.v1.student_analysis import router as student_router
@@ -68,16 +70,73 @@ app.add_middleware(
 )
 
 # ============================================
-# 4) MONITORING MIDDLEWARE
+# 3.5) LIFECYCLE (SUPABASE CLIENT POOL)
 # ============================================
 
-async def _report_slow_or_error(flag_key: str, payload: dict):
+from app.core.metrics import CONTENT_TYPE, metrics, route_label, scrape_denial
+from app.core.request_metrics import flag_metrics
+from app.db.query_accounting import query_accounting_middleware
+from app.db.session import client_provider, get_pool_metrics
+from app.jobs import generate_daily_tasks as _daily_tasks_job  # noqa: F401 (progress gauge'ları /metrics'e kaydolur)
+
+_monitoring_flush_task: "asyncio.Task | None" = None
+
+
+@app.on_event("startup")
+async def startup_supabase_pool():
+    client_provider.startup()
+
+
+@app.on_event("startup")
+async def startup_curriculum_snapshot():
+    # Referans veri (dersler, konular, ağırlıklar) process başına bir kez yüklenir
+    from app.core.curriculum import curriculum_store
+    from app.db.session import run_db
     try:
-        from app.db.session import get_supabase_admin
-        supabase = get_supabase_admin()
-        supabase.table("feature_flags").update(payload).eq("flag_key", flag_key).execute()
+        snapshot = await run_db(curriculum_store.get)
+        print(f"✅ Curriculum snapshot v{snapshot.version} loaded")
     except Exception as e:
-        print(f"Monitoring report failed: {e}")
+        print(f"⚠️  Curriculum snapshot not loaded (lazy retry on first request): {e}")
+
+
+@app.on_event("startup")
+async def startup_pending_tests_worker():
+    # Pending test pipeline (ayrı process de olabilir: python -m app.jobs.process_pending_tests)
+    from app.jobs.process_pending_tests import pending_test_worker, worker_enabled
+    if worker_enabled():
+        pending_test_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_pending_tests_worker():
+    from app.jobs.process_pending_tests import pending_test_worker
+    pending_test_worker.stop()
+
+
+@app.on_event("startup")
+async def startup_monitoring_flush():
+    # Middleware metrikleri periyodik olarak feature_flags'e yazılır
+    global _monitoring_flush_task
+    _monitoring_flush_task = asyncio.create_task(flag_metrics.run_flush_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_monitoring_flush():
+    if _monitoring_flush_task is not None:
+        _monitoring_flush_task.cancel()
+        try:
+            await _monitoring_flush_task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+@app.on_event("shutdown")
+async def shutdown_supabase_pool():
+    client_provider.shutdown()
+
+# ============================================
+# 4) MONITORING MIDDLEWARE
+# ============================================
 
 def _flag_from_path(path: str) -> str | None:
     if "/student/tasks/today" in path:
@@ -88,54 +147,44 @@ def _flag_from_path(path: str) -> str | None:
         return "test_entry"
     return None
 
+HTTP_REQUESTS = metrics.counter(
+    "endstp_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+HTTP_LATENCY = metrics.histogram(
+    "endstp_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+
+
 @app.middleware("http")
 async def monitor_response_time(request, call_next):
+    # Request path'te DB yok: flag_metrics bellekte toplar, flush task'ı yazar
     start_time = time.time()
+    flag_key = _flag_from_path(request.url.path)
     try:
         response = await call_next(request)
-        process_time = int((time.time() - start_time) * 1000)
-        response.headers["X-Process-Time"] = str(process_time)
-
-        flag_key = _flag_from_path(request.url.path)
-        if flag_key and process_time > 1000:
-            await _report_slow_or_error(
-                flag_key,
-                {
-                    "avg_response_time_ms": process_time,
-                    "last_success_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                },
-            )
-            print(f"⚠️ SLOW: {flag_key} took {process_time}ms")
-
-        return response
-
     except Exception as e:
-        process_time = int((time.time() - start_time) * 1000)
-        flag_key = _flag_from_path(request.url.path)
+        elapsed = time.time() - start_time
+        route = route_label(request.scope)
+        HTTP_REQUESTS.inc(request.method, route, "500")
+        HTTP_LATENCY.observe(elapsed, request.method, route)
         if flag_key:
-            try:
-                from app.db.session import get_supabase_admin
-                supabase = get_supabase_admin()
-                r = supabase.table("feature_flags").select("error_count, health_score").eq("flag_key", flag_key).execute()
-                current = (r.data or [{}])[0]
-                new_error_count = int(current.get("error_count", 0)) + 1
-                new_health = max(0, int(current.get("health_score", 100)) - 10)
-
-                await _report_slow_or_error(
-                    flag_key,
-                    {
-                        "error_count": new_error_count,
-                        "health_score": new_health,
-                        "last_error_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                        "last_error_message": str(e)[:500],
-                        "avg_response_time_ms": process_time,
-                    },
-                )
-            except Exception as ee:
-                print(f"Error reporting failed: {ee}")
-
+            flag_metrics.record(flag_key, int(elapsed * 1000), error=str(e))
         raise
 
+    elapsed = time.time() - start_time
+    process_time = int(elapsed * 1000)
+    response.headers["X-Process-Time"] = str(process_time)
+    route = route_label(request.scope)
+    HTTP_REQUESTS.inc(request.method, route, str(response.status_code))
+    HTTP_LATENCY.observe(elapsed, request.method, route)
+    if flag_key:
+        flag_metrics.record(flag_key, process_time)
+    return response
+
+
+# İstek başına Supabase sorgu sayısı / satır / byte; budget + N+1 uyarısı
+app.middleware("http")(query_accounting_middleware)
+
 # ============================================
 # 5) ROUTERS
 # ============================================
@@ -192,3 +241,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "motors": 4, "meta_motor": "segmentation", "admin": "enabled"}
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    return {"status": "healthy", "supabase_pool": get_pool_metrics()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: str | None = Header(None)):
+    """Prometheus scrape endpoint (Bearer METRICS_TOKEN; açık scrape için METRICS_PUBLIC=1)"""
+    status = scrape_denial(authorization)
+    if status == 503:
+        raise HTTPException(status_code=503, detail="Metrics disabled: METRICS_TOKEN not configured")
+    if status:
+        raise HTTPException(status_code=status, detail="Unauthorized")
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
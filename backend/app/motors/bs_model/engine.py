@@ -28,6 +28,8 @@ from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.core.timestamps import parse_utc
+
 from .types import (
     BSModelEngineInput,
     BSModelEngineOutput,
@@ -47,16 +49,10 @@ def _utc_now() -> datetime:
 
 
 def _parse_iso(dt_iso: Optional[str]) -> Optional[datetime]:
+    # Memoized: aynı last_test_date string'i tekrar parse edilmez
     if not dt_iso:
         return None
-    try:
-        s = dt_iso.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-    except Exception:
-        return None
+    return parse_utc(dt_iso)
 
 
 def _clamp(v: float, lo: float, hi: float) -> float:
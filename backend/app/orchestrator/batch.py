@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: backend/app/orchestrator/batch.py
+# Created: 2026-10-18
+# Phase: FAZ 4D (Orchestrator Runner - Cohort Batch Mode)
+# Author: End.STP Team
+#
+# 🌍 LOCALIZATION STATUS:
+#   [x] UTC datetime handling
+#   [ ] Multi-language support (Phase 2)
+#   [ ] Database uses _tr/_en columns
+#   [ ] API accepts Accept-Language header (Phase 2)
+#   [x] No hardcoded UI text
+#
+# 📚 RELATED DOCS:
+#   - docs/L5_ORCHESTRATION_GUIDE.md
+# =============================================================================
+
+"""
+Orchestrator Batch Runner
+
+Gece planlayıcısı tüm kohortu tek geçişte skorlasın diye:
+- Motorlar öğrenci başına çalışır (runner.collect_motor_signals, aynı hata izolasyonu)
+- Karar satırları (bs_due topic'ler) tüm öğrenciler için tek bir kolonsal tabloya dökülür
+- Urgency / priority bucket / pace bucket / risk_cluster / ranking NumPy ile vektörel
+
+Çıktı, her öğrenci için run_orchestrator ile birebir aynıdır
+(aynı karar sırası, aynı signals, aynı meta).
+
+Usage:
+    outputs = run_orchestrator_batch([inp1, inp2, ...])
+    # outputs[i] == run_orchestrator(inputs[i])  (generated_at hariç, now=None ise)
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.orchestrator.contract import (
+    OrchestratorDecision,
+    OrchestratorInput,
+    OrchestratorOutput,
+)
+from app.orchestrator.runner import (
+    _engine_name,
+    _new_meta,
+    _normalize_now,
+    _priority_score_for,
+    _reason_codes,
+    _safe_float,
+    _safe_int,
+    collect_motor_signals,
+)
+
+
+# -------------------------------------------------------------------------
+# Column helpers
+# -------------------------------------------------------------------------
+def _urgency_column(overdue: np.ndarray) -> np.ndarray:
+    # runner._urgency_from_overdue_days
+    return np.select(
+        [overdue >= 7, overdue > 0],
+        ["CRITICAL", "HIGH"],
+        default="MEDIUM",
+    )
+
+
+def _priority_bucket_column(score: np.ndarray) -> np.ndarray:
+    # runner._priority_bucket
+    return np.select(
+        [score >= 80, score >= 60, score >= 40],
+        ["P1_CRITICAL", "P2_HIGH", "P3_MEDIUM"],
+        default="P4_LOW",
+    )
+
+
+def _pace_bucket_column(pace: np.ndarray) -> np.ndarray:
+    # NaN pace (time motor item yok) -> tüm karşılaştırmalar False; maske ile None'a çevrilir
+    return np.select(
+        [pace >= 70, pace >= 40],
+        ["PACE_SLOW", "PACE_MEDIUM"],
+        default="PACE_OK",
+    )
+
+
+# -------------------------------------------------------------------------
+# Batch Runner
+# -------------------------------------------------------------------------
+def run_orchestrator_batch(
+    inputs: Sequence[OrchestratorInput],
+    now: Optional[datetime] = None,
+) -> List[OrchestratorOutput]:
+    """
+    Scores all topics of many students in one pass.
+
+    Args:
+        inputs: one OrchestratorInput per student
+        now: default "now" for inputs without inp.now (one timestamp for the cohort)
+
+    Returns:
+        OrchestratorOutput list aligned with inputs
+    """
+    cohort_now = _normalize_now(now)
+
+    nows: List[datetime] = []
+    metas: List[Dict[str, Any]] = []
+
+    # Row-oriented extraction (object attributes) -> columns
+    row_student: List[int] = []
+    row_topic: List[str] = []
+    row_bs: List[Any] = []
+    row_diff: List[Any] = []
+    col_overdue: List[int] = []
+    col_rr: List[float] = []
+    col_difficulty: List[float] = []
+    col_priority: List[float] = []
+    col_pace: List[float] = []
+
+    # =========================================================
+    # 1) MOTORS (per student) + column extraction
+    # =========================================================
+    for s_idx, inp in enumerate(inputs):
+        s_now = _normalize_now(inp.now) if inp.now is not None else cohort_now
+        meta = _new_meta()
+        nows.append(s_now)
+        metas.append(meta)
+
+        signals = collect_motor_signals(inp, s_now, meta)
+        if signals is None:
+            continue
+
+        for tid, bs_it in signals.bs_items_by_topic.items():
+            if not bool(getattr(bs_it, "bs_due", False)):
+                continue
+
+            diff_it = signals.diff_items_by_topic.get(tid)
+            time_it = signals.time_items_by_topic.get(tid)
+
+            row_student.append(s_idx)
+            row_topic.append(tid)
+            row_bs.append(bs_it)
+            row_diff.append(diff_it)
+
+            col_overdue.append(_safe_int(getattr(bs_it, "bs_overdue_days", 0), 0))
+            col_rr.append(_safe_float(getattr(bs_it, "bs_remembering_rate", 0.0), 0.0))
+            # Yuvarlama builtin round ile (np.round bit-level aynı değil)
+            col_difficulty.append(
+                round(_safe_float(getattr(diff_it, "difficulty_score", 0.0), 0.0), 2)
+                if diff_it else 0.0
+            )
+            col_priority.append(
+                _priority_score_for(
+                    signals.priority_items_by_topic.get(tid),
+                    signals.priority_fallback_scores.get(tid, 0.0),
+                )
+            )
+            col_pace.append(
+                round(_safe_float(getattr(time_it, "pace_score", 0.0), 0.0), 2)
+                if time_it is not None else np.nan
+            )
+
+    # =========================================================
+    # 2) VECTORIZED SYNTHESIS
+    # =========================================================
+    n_rows = len(row_topic)
+    student = np.asarray(row_student, dtype=np.int64)
+    overdue = np.asarray(col_overdue, dtype=np.int64)
+    rr = np.asarray(col_rr, dtype=np.float64)
+    difficulty = np.asarray(col_difficulty, dtype=np.float64)
+    priority = np.asarray(col_priority, dtype=np.float64)
+    pace = np.asarray(col_pace, dtype=np.float64)
+
+    has_pace = ~np.isnan(pace)
+
+    urgency = _urgency_column(overdue)
+    confidence = np.clip(rr / 100.0, 0.0, 1.0)
+    priority_bucket = _priority_bucket_column(priority)
+    pace_bucket = _pace_bucket_column(pace)
+    time_pressure = pace >= 70
+    risk_cluster = (difficulty >= 60) & has_pace & (pace >= 60)
+
+    # Ranking: öğrenci içinde priority_score DESC, eşitlikte motor sırası korunur
+    # (run_orchestrator'daki stable sort(reverse=True) ile aynı)
+    order = np.lexsort((np.arange(n_rows), -priority, student))
+    sorted_student = student[order]
+    group_start = np.searchsorted(sorted_student, sorted_student, side="left")
+    rank = np.arange(n_rows) - group_start + 1
+
+    # =========================================================
+    # 3) MATERIALIZE DECISIONS
+    # =========================================================
+    decisions_by_student: List[List[OrchestratorDecision]] = [[] for _ in inputs]
+
+    urgency_l = urgency.tolist()
+    confidence_l = confidence.tolist()
+    priority_l = priority.tolist()
+    priority_bucket_l = priority_bucket.tolist()
+    pace_l = pace.tolist()
+    pace_bucket_l = pace_bucket.tolist()
+    has_pace_l = has_pace.tolist()
+    time_pressure_l = time_pressure.tolist()
+    risk_cluster_l = risk_cluster.tolist()
+
+    for pos, i in enumerate(order.tolist()):
+        bs_it = row_bs[i]
+        paced = has_pace_l[i]
+
+        signals: Dict[str, Any] = {
+            "engine": _engine_name(bs_it),
+            "bs_due": True,
+            "bs_overdue_days": col_overdue[i],
+            "status": str(getattr(bs_it, "status", "NORMAL")),
+            "bs_remembering_rate": round(col_rr[i], 2),
+            "difficulty_score": col_difficulty[i],
+            "priority_score": priority_l[i],
+            "priority_bucket": priority_bucket_l[i],
+            "pace_score": pace_l[i] if paced else None,
+            "pace_bucket": pace_bucket_l[i] if paced else None,
+            "time_pressure": time_pressure_l[i] if paced else None,
+            "risk_cluster": risk_cluster_l[i],
+            "priority_rank": int(rank[pos]),
+        }
+
+        decisions_by_student[row_student[i]].append(
+            OrchestratorDecision(
+                topic_id=row_topic[i],
+                action="REVIEW",
+                urgency=urgency_l[i],
+                confidence=round(confidence_l[i], 2),
+                reasons=_reason_codes(bs_it, row_diff[i]),
+                signals=signals,
+            )
+        )
+
+    return [
+        OrchestratorOutput(
+            generated_at=nows[s_idx].isoformat(),
+            decisions=decisions_by_student[s_idx],
+            meta=metas[s_idx],
+        )
+        for s_idx in range(len(inputs))
+    ]
@@ -19,7 +19,7 @@ from __future__ import annotations
 #   - docs/L5_ORCHESTRATION_GUIDE.md
 # =============================================================================
 
-from dataclasses import fields, is_dataclass
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -134,31 +134,90 @@ def _priority_bucket(score: float) -> str:
         return "P3_MEDIUM"
     return "P4_LOW"
 
+
 # -------------------------------------------------------------------------
-# Runner
+# Per-topic extraction (shared by single + batch runner)
 # -------------------------------------------------------------------------
-def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
-    """
-    L5 Orchestrator Runner (FAZ 4D-A3)
+_PRIORITY_ATTRS = ("priority_score", "score", "priority", "priorityValue")
 
-    Rules:
-    - Contract-safe
-    - Motor-safe
-    - Never crashes
-    - If a motor fails: proceed with remaining motors (best-effort),
-      but DO NOT fabricate motor outputs; only add meta.error_* notes.
-    """
 
-    now = _normalize_now(inp.now)
+def _priority_score_for(pr_it: Any, fallback: float) -> float:
+    """Priority item'dan skor (ilk bulunan attr kazanır); yoksa fallback skoru."""
+    pr_score = None
+    for attr in _PRIORITY_ATTRS:
+        if pr_it is not None and hasattr(pr_it, attr):
+            pr_score = _safe_float(getattr(pr_it, attr), None)
+            break
+    if pr_score is None:
+        pr_score = fallback
+    return round(float(pr_score), 2)
+
+
+def _reason_codes(bs_it: Any, diff_it: Any) -> List[str]:
+    """BS + difficulty reason kodları (motor sırasıyla)."""
+    reasons: List[str] = []
+
+    try:
+        for r in getattr(bs_it, "reasons", []) or []:
+            code = getattr(r, "code", None)
+            if code:
+                reasons.append(str(code))
+    except Exception:
+        pass
+
+    if diff_it is not None:
+        try:
+            for r in getattr(diff_it, "reasons", []) or []:
+                code = getattr(r, "code", None)
+                if code:
+                    reasons.append(str(code))
+        except Exception:
+            pass
+
+    return reasons
+
+
+def _engine_name(bs_it: Any) -> str:
+    return getattr(bs_it, "meta", {}).get("engine", "bs_model") if hasattr(bs_it, "meta") else "bs_model"
+
+
+# -------------------------------------------------------------------------
+# Motor pass (shared by single + batch runner)
+# -------------------------------------------------------------------------
+@dataclass
+class MotorSignals:
+    """
+    Per-student motor outputs, keyed by topic_id.
+    Single runner ve batch runner aynı motor geçişini kullanır.
+    """
+    bs_items_by_topic: Dict[str, Any]
+    diff_items_by_topic: Dict[str, Any] = field(default_factory=dict)
+    time_items_by_topic: Dict[str, Any] = field(default_factory=dict)
+    priority_items_by_topic: Dict[str, Any] = field(default_factory=dict)
+    priority_fallback_scores: Dict[str, float] = field(default_factory=dict)
 
-    # Base maps from input topics
-    topic_map: Dict[str, Any] = {t.topic_id: t for t in inp.topics}
 
-    meta: Dict[str, Any] = {
+def _new_meta() -> Dict[str, Any]:
+    return {
         "runner_version": RUNNER_VERSION,
         "active_motors": [],
     }
 
+
+def collect_motor_signals(
+    inp: OrchestratorInput,
+    now: datetime,
+    meta: Dict[str, Any],
+) -> Optional[MotorSignals]:
+    """
+    Runs all motors for one student (best-effort).
+    Returns None if bs_model fails (no timing signal -> no decisions).
+    Motor errors are recorded into meta.error_*.
+    """
+
+    # Base maps from input topics
+    topic_map: Dict[str, Any] = {t.topic_id: t for t in inp.topics}
+
     # =========================================================
     # 1) BS MODEL (timing / due)
     # =========================================================
@@ -188,11 +247,7 @@ def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
     except Exception as e:
         meta["error_bs_model"] = str(e)
         # Without bs_model we cannot make "REVIEW" decisions (timing signal missing)
-        return OrchestratorOutput(
-            generated_at=now.isoformat(),
-            decisions=[],
-            meta=meta,
-        )
+        return None
 
     # =========================================================
     # 2) DIFFICULTY (struggle likelihood)
@@ -313,6 +368,50 @@ def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
         meta["error_priority"] = str(e)
         # continue with fallback only
 
+    return MotorSignals(
+        bs_items_by_topic=bs_items_by_topic,
+        diff_items_by_topic=diff_items_by_topic,
+        time_items_by_topic=time_items_by_topic,
+        priority_items_by_topic=priority_items_by_topic,
+        priority_fallback_scores=priority_fallback_scores,
+    )
+
+
+# -------------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------------
+def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
+    """
+    L5 Orchestrator Runner (FAZ 4D-A3)
+
+    Rules:
+    - Contract-safe
+    - Motor-safe
+    - Never crashes
+    - If a motor fails: proceed with remaining motors (best-effort),
+      but DO NOT fabricate motor outputs; only add meta.error_* notes.
+    """
+
+    now = _normalize_now(inp.now)
+    meta = _new_meta()
+
+    # =========================================================
+    # 1-3) MOTORS (bs_model, difficulty, time_pace, priority)
+    # =========================================================
+    motor_signals = collect_motor_signals(inp, now, meta)
+    if motor_signals is None:
+        return OrchestratorOutput(
+            generated_at=now.isoformat(),
+            decisions=[],
+            meta=meta,
+        )
+
+    bs_items_by_topic = motor_signals.bs_items_by_topic
+    diff_items_by_topic = motor_signals.diff_items_by_topic
+    time_items_by_topic = motor_signals.time_items_by_topic
+    priority_items_by_topic = motor_signals.priority_items_by_topic
+    priority_fallback_scores = motor_signals.priority_fallback_scores
+
     # =========================================================
     # 4) DECISION SYNTHESIS
     # =========================================================
@@ -339,17 +438,10 @@ def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
         )
 
         # Priority score
-        pr_it = priority_items_by_topic.get(tid)
-        pr_score = None
-        for attr in ("priority_score", "score", "priority", "priorityValue"):
-            if pr_it is not None and hasattr(pr_it, attr):
-                pr_score = _safe_float(getattr(pr_it, attr), None)
-                break
-
-        if pr_score is None:
-            pr_score = priority_fallback_scores.get(tid, 0.0)
-
-        pr_score = round(float(pr_score), 2)
+        pr_score = _priority_score_for(
+            priority_items_by_topic.get(tid),
+            priority_fallback_scores.get(tid, 0.0),
+        )
 
         # -------------------------
         # Time / Pace
@@ -391,31 +483,13 @@ def run_orchestrator(inp: OrchestratorInput) -> OrchestratorOutput:
         # -------------------------
         # Reasons
         # -------------------------
-        reasons: List[str] = []
-
-        try:
-            for r in getattr(bs_it, "reasons", []) or []:
-                code = getattr(r, "code", None)
-                if code:
-                    reasons.append(str(code))
-        except Exception:
-            pass
-
-        if diff_it is not None:
-            try:
-                for r in getattr(diff_it, "reasons", []) or []:
-                    code = getattr(r, "code", None)
-                    if code:
-                        reasons.append(str(code))
-            except Exception:
-                pass
+        reasons = _reason_codes(bs_it, diff_it)
 
         # -------------------------
         # Signals (single source of truth)
         # -------------------------
         signals: Dict[str, Any] = {
-            "engine": getattr(bs_it, "meta", {}).get("engine", "bs_model")
-                if hasattr(bs_it, "meta") else "bs_model",
+            "engine": _engine_name(bs_it),
             "bs_due": True,
             "bs_overdue_days": overdue_days,
             "status": str(getattr(bs_it, "status", "NORMAL")),
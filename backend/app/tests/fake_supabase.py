@@ -0,0 +1,279 @@
+"""
+In-memory Supabase fake for tests
+Minimal PostgREST-like query builder (table / rpc) with query counting
+"""
+import copy
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Request
+
+from app.db.query_accounting import record_query
+
+
+_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+}
+
+# query_accounting gerçek transport ile aynı anahtarı görsün: (HTTP method, tablo)
+_HTTP_METHODS = {"select": "GET", "insert": "POST", "upsert": "POST", "update": "PATCH", "delete": "DELETE"}
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(expr):
+        ch = expr[i]
+        if quoted and ch == "\\":
+            current.append(expr[i:i + 2])
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _parse_logic(kind: str, expr: str) -> Callable[[Dict[str, Any]], bool]:
+    terms = []
+    for term in _split_top_level(expr):
+        if term.startswith(("and(", "or(")) and term.endswith(")"):
+            inner_kind = term[: term.index("(")]
+            terms.append(_parse_logic(inner_kind, term[len(inner_kind) + 1:-1]))
+            continue
+        col, op, value = term.split(".", 2)
+        compare, value = _OPS[op], _unquote(value)
+        terms.append(
+            lambda r, col=col, compare=compare, value=value:
+            r.get(col) is not None and compare(str(r.get(col)), value)
+        )
+    combine = all if kind == "and" else any
+    return lambda r: combine(t(r) for t in terms)
+
+
+class _Query:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table_name = table
+        self.op = "select"
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.orders: List[tuple] = []
+        self.limit_n: Optional[int] = None
+        self.offset_n: int = 0
+        self.count_mode: Optional[str] = None
+        self.single_row = False
+
+    # ---------- operations ----------
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self.count_mode = count
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: Optional[str] = None, **kwargs):
+        self.op, self.payload, self.on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, data):
+        self.op, self.payload = "update", data
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    # ---------- filters ----------
+    def _add(self, fn):
+        self.filters.append(fn)
+        return self
+
+    def eq(self, col, val):
+        return self._add(lambda r: r.get(col) == val)
+
+    def neq(self, col, val):
+        return self._add(lambda r: r.get(col) != val)
+
+    def in_(self, col, vals):
+        vals = list(vals)
+        return self._add(lambda r: r.get(col) in vals)
+
+    def gt(self, col, val):
+        return self._add(lambda r: r.get(col) is not None and r.get(col) > val)
+
+    def gte(self, col, val):
+        return self._add(lambda r: r.get(col) is not None and r.get(col) >= val)
+
+    def lt(self, col, val):
+        return self._add(lambda r: r.get(col) is not None and r.get(col) < val)
+
+    def lte(self, col, val):
+        return self._add(lambda r: r.get(col) is not None and r.get(col) <= val)
+
+    def or_(self, filters: str):
+        """PostgREST or=(...) alt kümesi: col.op.value, and(...), or(...)"""
+        return self._add(_parse_logic("or", filters))
+
+    def order(self, col, desc: bool = False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def range(self, start, end):
+        self.offset_n = start
+        self.limit_n = end - start + 1
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    # ---------- execution ----------
+    def _matches(self, row):
+        return all(f(row) for f in self.filters)
+
+    def execute(self):
+        result = self._execute()
+        data = result.data
+        record_query(self.table_name, _HTTP_METHODS[self.op], rows=len(data) if isinstance(data, list) else int(data is not None))
+        return result
+
+    def _execute(self):
+        self.db.queries.append((self.table_name, self.op))
+        rows = self.db.tables.setdefault(self.table_name, [])
+
+        if self.op == "select":
+            data = [copy.deepcopy(r) for r in rows if self._matches(r)]
+            for col, desc in reversed(self.orders):
+                data.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+            total = len(data)
+            data = data[self.offset_n:]
+            if self.limit_n is not None:
+                data = data[: self.limit_n]
+            if self.single_row:
+                data = data[0] if data else None
+            return SimpleNamespace(data=data, count=total if self.count_mode else None)
+
+        if self.op == "insert":
+            new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            out = []
+            for r in new_rows:
+                r = copy.deepcopy(r)
+                r.setdefault("id", str(uuid.uuid4()))
+                rows.append(r)
+                out.append(copy.deepcopy(r))
+            return SimpleNamespace(data=out, count=None)
+
+        if self.op == "upsert":
+            new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            keys = [k.strip() for k in (self.on_conflict or "id").split(",")]
+            out = []
+            for r in new_rows:
+                existing = next(
+                    (e for e in rows if all(e.get(k) == r.get(k) for k in keys)),
+                    None,
+                )
+                if existing is not None:
+                    existing.update(copy.deepcopy(r))
+                    out.append(copy.deepcopy(existing))
+                else:
+                    r = copy.deepcopy(r)
+                    r.setdefault("id", str(uuid.uuid4()))
+                    rows.append(r)
+                    out.append(copy.deepcopy(r))
+            return SimpleNamespace(data=out, count=None)
+
+        if self.op == "update":
+            out = []
+            for r in rows:
+                if self._matches(r):
+                    r.update(copy.deepcopy(self.payload))
+                    out.append(copy.deepcopy(r))
+            return SimpleNamespace(data=out, count=None)
+
+        if self.op == "delete":
+            kept, out = [], []
+            for r in rows:
+                (out if self._matches(r) else kept).append(r)
+            self.db.tables[self.table_name] = kept
+            return SimpleNamespace(data=copy.deepcopy(out), count=None)
+
+        raise ValueError(f"Unsupported op: {self.op}")
+
+
+class _RpcCall:
+    def __init__(self, db: "FakeSupabase", name: str, params: Dict[str, Any]):
+        self.db, self.name, self.params = db, name, params
+
+    def execute(self):
+        record_query(f"rpc:{self.name}", "POST")
+        self.db.queries.append((self.name, "rpc"))
+        handler = self.db.rpc_handlers.get(self.name)
+        if handler is None:
+            raise RuntimeError(f"Could not find the function {self.name}")
+        return SimpleNamespace(data=handler(self.db, self.params), count=None)
+
+
+class FakeSupabase:
+    """
+    supabase-py Client yerine geçen in-memory fake
+
+    - tables: {table_name: [row, ...]}
+    - rpc_handlers: {fn_name: callable(db, params) -> data}
+    - queries: çalıştırılan her sorgunun (table, op) kaydı
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = copy.deepcopy(tables or {})
+        self.rpc_handlers: Dict[str, Callable] = {}
+        self.queries: List[tuple] = []
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> _RpcCall:
+        return _RpcCall(self, name, params)
+
+    def query_count(self, table: Optional[str] = None) -> int:
+        if table is None:
+            return len(self.queries)
+        return sum(1 for t, _ in self.queries if t == table)
+
+    def reset_queries(self) -> None:
+        self.queries = []
+
+
+def fake_request(path: str = "/") -> Request:
+    """Endpoint'leri doğrudan (ASGI'siz) çağıran testler için boş GET request"""
+    return Request({"type": "http", "method": "GET", "path": path, "headers": []})
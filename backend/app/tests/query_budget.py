@@ -0,0 +1,22 @@
+"""
+Query budget helper for tests
+Endpoint başına maksimum sorgu sayısını sabitler (N+1 regresyonu testte yakalanır)
+
+    from app.tests.query_budget import assert_max_queries
+
+    with assert_max_queries(3, "GET /tests"):
+        response = _get("/tests")
+
+FakeSupabase ve gerçek transport aynı sayaca (app.db.query_accounting) yazar.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.db.query_accounting import QueryStats, track_queries
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "block") -> Iterator[QueryStats]:
+    with track_queries() as stats:
+        yield stats
+    assert stats.queries <= limit, f"{label}: {stats.summary()} exceeds budget of {limit}"
@@ -0,0 +1,66 @@
+"""
+Benchmark Harness Tests
+Synthetic histories, JSON report shape, regression comparison
+"""
+import json
+
+from benchmarks import run as bench
+from benchmarks.synthetic import make_test_history, make_topic_aggregates
+
+
+class TestBenchmarkHarness:
+    """benchmarks/ smoke tests (küçük ölçek)"""
+
+    def test_synthetic_history_is_deterministic(self):
+        """Aynı seed aynı veriyi üretmeli (commit'ler arası karşılaştırma)"""
+        a = make_test_history(200, seed=1)
+        b = make_test_history(200, seed=1)
+
+        assert [r["topic_id"] for r in a] == [r["topic_id"] for r in b]
+        assert len(make_topic_aggregates(a)) == 20
+        assert a == sorted(a, key=lambda r: r["test_date"], reverse=True)
+
+    def test_suite_covers_all_cases(self, tmp_path):
+        """Tüm case'ler koşmalı, JSON'a yazılabilir olmalı"""
+        out = tmp_path / "bench.json"
+
+        code = bench.main(["--scales", "10", "--budget", "0", "--output", str(out)])
+
+        assert code == 0
+        report = json.loads(out.read_text())
+        assert {r["name"] for r in report["results"]} == set(bench.CASES)
+        for r in report["results"]:
+            assert r["scale"] == 10
+            assert r["runs"] == 1
+            assert r["min_ms"] <= r["median_ms"] <= r["max_ms"]
+        assert report["meta"]["scales"] == [10]
+
+    def test_compare_flags_regressions(self, tmp_path):
+        """Eşik üstü yavaşlama regression sayılmalı"""
+        baseline = {"results": [
+            {"name": "run_orchestrator", "scale": 10, "median_ms": 1.0},
+            {"name": "calculate_trends", "scale": 10, "median_ms": 1.0},
+        ]}
+        current = {"results": [
+            {"name": "run_orchestrator", "scale": 10, "median_ms": 1.1},
+            {"name": "calculate_trends", "scale": 10, "median_ms": 2.0},
+            {"name": "run_bs_model_engine", "scale": 10, "median_ms": 5.0},
+        ]}
+
+        rows = bench.compare_results(current, baseline, threshold=0.25)
+
+        assert {(r["name"], r["regression"]) for r in rows} == {
+            ("run_orchestrator", False),
+            ("calculate_trends", True),
+        }
+
+        base_file = tmp_path / "base.json"
+        base_file.write_text(json.dumps({"results": [
+            {"name": "calculate_trends", "scale": 10, "median_ms": 1e-9},
+        ]}))
+        code = bench.main([
+            "--scales", "10", "--cases", "calculate_trends", "--budget", "0",
+            "--output", str(tmp_path / "cur.json"),
+            "--compare", str(base_file), "--fail-on-regression",
+        ])
+        assert code == 1
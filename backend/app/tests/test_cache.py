@@ -0,0 +1,312 @@
+"""
+Cache Tests
+LRU eviction, TTL expiry, byte accounting, namespace stats
+"""
+import pytest
+
+from app.core.cache import CacheNamespace, CacheRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestCacheNamespace:
+    """Bounded LRU/TTL namespace"""
+
+    def test_hit_and_miss_counted(self, clock):
+        """Hit/miss istatistikleri tutulmalı"""
+        ns = CacheNamespace("t", max_entries=10, ttl_seconds=30, clock=clock)
+        ns.set("a", {"x": 1})
+
+        assert ns.get("a") == {"x": 1}
+        assert ns.get("b") is None
+
+        stats = ns.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_eviction(self, clock):
+        """Limit aşılınca en az kullanılan atılmalı"""
+        ns = CacheNamespace("t", max_entries=2, ttl_seconds=30, clock=clock)
+        ns.set("a", 1)
+        ns.set("b", 2)
+        ns.get("a")          # a artık en yeni
+        ns.set("c", 3)
+
+        assert "a" in ns
+        assert "b" not in ns
+        assert "c" in ns
+        assert ns.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, clock):
+        """TTL dolunca kayıt miss olmalı ve silinmeli"""
+        ns = CacheNamespace("t", max_entries=10, ttl_seconds=30, clock=clock)
+        ns.set("a", 1)
+
+        clock.now += 31
+
+        assert ns.get("a") is None
+        assert len(ns) == 0
+        assert ns.stats()["expirations"] == 1
+
+    def test_bytes_bounded(self, clock):
+        """max_bytes aşılırsa LRU sırasıyla atılmalı"""
+        ns = CacheNamespace("t", max_entries=100, ttl_seconds=30, max_bytes=300, clock=clock)
+        for i in range(10):
+            ns.set(f"k{i}", "x" * 100)
+
+        stats = ns.stats()
+        assert stats["bytes"] <= 300
+        assert stats["evictions"] > 0
+        assert "k9" in ns
+
+    def test_overwrite_keeps_byte_total(self, clock):
+        """Aynı key tekrar yazılınca byte sayacı şişmemeli"""
+        ns = CacheNamespace("t", max_entries=10, ttl_seconds=30, clock=clock)
+        ns.set("a", "x" * 100)
+        first = ns.stats()["bytes"]
+        ns.set("a", "x" * 100)
+
+        assert ns.stats()["bytes"] == first
+
+    def test_delete_prefix(self, clock):
+        """Prefix ile toplu invalidation"""
+        ns = CacheNamespace("t", max_entries=10, ttl_seconds=30, clock=clock)
+        ns.set("student_history:s1:a", 1)
+        ns.set("student_history:s1:b", 2)
+        ns.set("student_history:s2:a", 3)
+
+        assert ns.delete_prefix("student_history:s1:") == 2
+        assert len(ns) == 1
+
+
+class TestCacheRegistry:
+    """Process-wide namespace registry"""
+
+    def test_namespace_is_shared(self):
+        """Aynı isim aynı namespace'i döndürmeli"""
+        registry = CacheRegistry()
+        assert registry.namespace("a") is registry.namespace("a")
+
+    def test_stats_and_clear(self):
+        """Stats namespace bazlı, clear tek namespace'i temizlemeli"""
+        registry = CacheRegistry()
+        registry.namespace("a").set("k", 1)
+        registry.namespace("b").set("k", 2)
+
+        registry.clear("a")
+
+        stats = registry.stats()
+        assert stats["a"]["entries"] == 0
+        assert stats["b"]["entries"] == 1
+
+
+class TestCacheUsers:
+    """performance.py + ContextService aynı cache bileşenini kullanır"""
+
+    def test_student_performance_uses_cache(self, monkeypatch):
+        """İkinci çağrı DB'ye gitmemeli"""
+        from app.api.v1.endpoints.student import performance
+        from app.tests.fake_supabase import FakeSupabase
+
+        db = FakeSupabase({"student_topic_tests": []})
+        monkeypatch.setattr(performance, "get_supabase_admin", lambda: db)
+        performance.clear_cache()
+
+        performance.get_student_performance("s1")
+        cold_queries = db.query_count()
+        second = performance.get_student_performance("s1")
+
+        assert second["metadata"]["from_cache"] is True
+        assert db.query_count() == cold_queries
+        assert performance.get_cache_info()["hits"] >= 1
+
+    def test_student_history_not_shared_across_instances(self, monkeypatch):
+        """Öğrenci geçmişi request içinde memo'lanır, request'ler arası bayat kalmaz"""
+        from app.core import context_service
+        from app.tests.fake_supabase import FakeSupabase
+
+        row = {"user_id": "s1", "topic_id": "t1", "questions_correct": 8, "questions_total": 10,
+               "time_spent_seconds": 600, "entry_timestamp": "2999-01-01T10:00:00"}
+        db = FakeSupabase({"topic_test_results": [row]})
+        monkeypatch.setattr(context_service, "get_supabase_admin", lambda: db)
+
+        service = context_service.ContextService()
+        service.get_student_history("s1", "t1")
+        service.get_student_history("s1", "t1")
+        assert db.query_count() == 1
+
+        db.tables["topic_test_results"].append({**row, "questions_correct": 4})
+        result = context_service.ContextService().get_student_history("s1", "t1")
+
+        assert result["test_count"] == 2
+        assert result["avg_success_rate"] == 60.0
+
+
+class TestSharedBackend:
+    """SQLite shared tier + cross-worker invalidation"""
+
+    @staticmethod
+    def _worker(path):
+        from app.core.cache import SQLiteBackend
+        return CacheRegistry(SQLiteBackend(str(path), poll_interval=0))
+
+    def test_value_shared_between_workers(self, tmp_path):
+        """Bir worker'ın yazdığını diğeri okuyabilmeli"""
+        path = tmp_path / "cache.sqlite3"
+        a, b = self._worker(path), self._worker(path)
+
+        a.namespace("perf").set("perf_s1", {"score": 1})
+
+        assert b.namespace("perf").get("perf_s1") == {"score": 1}
+        assert b.namespace("perf").stats()["shared_hits"] == 1
+
+    def test_invalidation_reaches_other_worker(self, tmp_path):
+        """Delete tüm worker'ların yerel kopyasını düşürmeli"""
+        path = tmp_path / "cache.sqlite3"
+        a, b = self._worker(path), self._worker(path)
+        a.namespace("perf").set("perf_s1", {"score": 1})
+        assert b.namespace("perf").get("perf_s1") is not None  # b yerel kopya aldı
+
+        a.namespace("perf").delete("perf_s1")
+
+        assert b.namespace("perf").get("perf_s1") is None
+
+    def test_shared_lru_bound(self, tmp_path):
+        """Paylaşılan katman da max_entries ile sınırlı"""
+        import sqlite3
+
+        path = tmp_path / "cache.sqlite3"
+        a = self._worker(path)
+        ns = a.namespace("perf", max_entries=3)
+        for i in range(10):
+            ns.set(f"k{i}", i)
+
+        count = sqlite3.connect(str(path)).execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = 'perf'"
+        ).fetchone()[0]
+        assert count == 3
+
+    def test_hits_batch_lru_touches(self, tmp_path, monkeypatch):
+        """Cache hit yazma transaction'ı açmamalı; touch'lar toplu yazılır"""
+        import sqlite3
+
+        from app.core import cache as cache_module
+        from app.core.cache import CacheBackend, SQLiteBackend
+
+        monkeypatch.setattr(cache_module, "TOUCH_FLUSH_INTERVAL_SECONDS", 3600)
+        now = [1000.0]
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), poll_interval=0, clock=lambda: now[0])
+        backend.set("perf", "k", b"v", ttl_seconds=60, max_entries=10)
+
+        def accessed_at():
+            return sqlite3.connect(backend.path).execute(
+                "SELECT accessed_at FROM cache_entries WHERE key = 'k'"
+            ).fetchone()[0]
+
+        now[0] = 1010.0
+        for _ in range(5):
+            assert backend.get("perf", "k") == b"v"
+
+        assert accessed_at() == 1000.0
+        assert backend.stats()["pending_touches"] == 1
+        assert backend.flush_touches() == 1
+        assert accessed_at() == 1010.0
+
+        with pytest.raises(TypeError):
+            CacheBackend()
+
+    def test_file_is_private(self, tmp_path):
+        """Pickle'lı dosya 0700 dizinde, 0600 izinle açılmalı"""
+        import os
+        import stat
+
+        from app.core.cache import SQLiteBackend
+
+        path = tmp_path / "state" / "cache.sqlite3"
+        SQLiteBackend(str(path), poll_interval=0)
+
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_refuses_foreign_or_shared_files(self, tmp_path):
+        """Başkasına ait / herkesin yazabildiği yer pickle için reddedilmeli"""
+        import os
+
+        from app.core.cache import SQLiteBackend
+
+        shared_dir = tmp_path / "shared"
+        shared_dir.mkdir()
+        os.chmod(shared_dir, 0o1777)
+        with pytest.raises(PermissionError):
+            SQLiteBackend(str(shared_dir / "cache.sqlite3"), poll_interval=0)
+
+        link = tmp_path / "link.sqlite3"
+        link.symlink_to(tmp_path / "elsewhere.sqlite3")
+        with pytest.raises(PermissionError):
+            SQLiteBackend(str(link), poll_interval=0)
+
+        if os.getuid() == 0:
+            foreign = tmp_path / "foreign.sqlite3"
+            foreign.write_bytes(b"")
+            os.chown(foreign, 12345, 12345)
+            with pytest.raises(PermissionError):
+                SQLiteBackend(str(foreign), poll_interval=0)
+
+    def test_insecure_path_refuses_to_start(self, tmp_path, monkeypatch):
+        """backend_from_env güvensiz dosyada memory'ye sessizce düşmemeli"""
+        import os
+
+        from app.core.cache import backend_from_env
+
+        shared_dir = tmp_path / "shared"
+        shared_dir.mkdir()
+        os.chmod(shared_dir, 0o777)
+        monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+        monkeypatch.setenv("CACHE_SQLITE_PATH", str(shared_dir / "cache.sqlite3"))
+
+        with pytest.raises(PermissionError):
+            backend_from_env()
+
+    def test_submit_test_result_updates_everywhere(self, tmp_path, monkeypatch):
+        """Test girişi diğer worker'daki performans cache'ini de güncellemeli"""
+        import asyncio
+
+        from app.api.v1.endpoints import test_entry
+        from app.api.v1.endpoints.student import performance
+        from app.core.cache import InProcessBackend, SQLiteBackend, cache_registry
+        from app.core.test_history import TestHistory
+        from app.tests.fake_supabase import FakeSupabase
+
+        path = tmp_path / "cache.sqlite3"
+        cache_registry.configure_backend(SQLiteBackend(str(path), poll_interval=0))
+        try:
+            other = self._worker(path).namespace(performance.CACHE_NAMESPACE)
+            other.set("perf_s1", {"topic_performance": {}, "history": TestHistory.empty_history()})
+
+            db = FakeSupabase({"student_topic_tests": [], "student_tasks": []})
+            monkeypatch.setattr(test_entry, "get_supabase_admin", lambda: db)
+            monkeypatch.setattr(performance, "get_supabase_admin", lambda: db)
+
+            payload = test_entry.TestResultSubmit(
+                subject_id="math", topic_id="t1", test_date="2026-01-05T10:00",
+                correct_count=8, wrong_count=2, empty_count=2,
+            )
+            asyncio.run(test_entry.submit_test_result(payload, current_user={"id": "s1"}))
+
+            refreshed = other.get("perf_s1")
+            assert list(refreshed["topic_performance"]) == ["t1"]
+            assert len(refreshed["history"]) == 1
+        finally:
+            cache_registry.configure_backend(InProcessBackend())
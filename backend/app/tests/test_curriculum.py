@@ -0,0 +1,194 @@
+"""
+Curriculum Snapshot Tests
+O(1) indexes, version-driven atomic refresh, stale-on-failure, hot paths without DB
+"""
+import asyncio
+
+import pytest
+
+from app.api.v1.endpoints import test_entry
+from app.core import curriculum
+from app.core.context_service import ContextService
+from app.core.curriculum import CurriculumSnapshot, CurriculumStore
+from app.tests.fake_supabase import FakeSupabase
+
+
+def _tables(version=1):
+    return {
+        "curriculum_version": [{"id": 1, "version": version}],
+        "subjects": [
+            {"id": "fiz", "code": "FIZ", "name_tr": "Fizik", "icon": "⚛️", "color": "#00f", "is_active": True},
+            {"id": "mat", "code": "MAT", "name_tr": "Matematik", "icon": "📐", "color": "#f00", "is_active": True},
+            {"id": "old", "code": "OLD", "name_tr": "Eski", "is_active": False},
+        ],
+        "topics": [
+            {"id": "t2", "code": "MAT-TUREV", "subject_id": "mat", "name_tr": "Türev",
+             "difficulty_level": 7, "exam_weight": 3, "is_active": True},
+            {"id": "t1", "code": "MAT-LIMIT", "subject_id": "mat", "name_tr": "Limit",
+             "difficulty_level": 6, "exam_weight": 2, "is_active": True},
+            {"id": "t9", "code": "MAT-ESKI", "subject_id": "mat", "name_tr": "Eski", "is_active": False},
+        ],
+        "subject_exam_weights": [
+            {"id": "w1", "subject_id": "mat", "question_count": 30},
+            {"id": "w2", "subject_id": "mat", "question_count": 10},
+        ],
+        "prerequisites": [
+            {"id": "p1", "topic_id": "t2", "prerequisite_topic_id": "t1", "strength": 0.8},
+        ],
+        "exam_systems": [
+            {"id": "e1", "code": "YKS", "name_tr": "YKS", "is_active": True},
+        ],
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase(_tables())
+
+    def bump(db_, params):
+        db_.tables["curriculum_version"][0]["version"] += 1
+        return db_.tables["curriculum_version"][0]["version"]
+
+    db.rpc_handlers[curriculum.BUMP_RPC] = bump
+    monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+    curriculum.curriculum_store.reset()
+    yield db
+    curriculum.curriculum_store.reset()
+
+
+class TestCurriculumSnapshot:
+    """Index'ler + immutability"""
+
+    def test_indexes(self):
+        snap = CurriculumSnapshot(version=3, **{
+            "subjects": _tables()["subjects"],
+            "topics": _tables()["topics"],
+            "exam_weights": _tables()["subject_exam_weights"],
+            "prerequisites": _tables()["prerequisites"],
+            "exam_systems": _tables()["exam_systems"],
+        })
+
+        assert [s["id"] for s in snap.active_subjects()] == ["fiz", "mat"]
+        assert snap.subject_by_code("MAT")["name_tr"] == "Matematik"
+        assert snap.topic_by_code("MAT-LIMIT")["id"] == "t1"
+        assert snap.active_topic_ids("mat") == ["t1", "t2"]  # name_tr sıralı, pasif yok
+        assert snap.active_topic_count() == 2
+        assert snap.topic("t9")["is_active"] is False  # id lookup pasifleri de bulur
+        assert [w["question_count"] for w in snap.exam_weights("mat")] == [30, 10]
+        assert snap.prerequisites("t2") == [{"topic_id": "t1", "strength": 0.8}]
+        assert snap.exam_system_by_code("YKS")["id"] == "e1"
+        assert snap.subject_names()["old"] == "Eski"
+
+    def test_turkish_name_order(self):
+        """Ç/Ş/Ö/Ü/İ Z'den sonra değil, alfabedeki yerinde sıralanmalı"""
+        names = ["Zooloji", "Çevre", "Şiir", "Sayılar", "Ölçme", "Organik", "İstatistik", "Işık", "Ünite", "Cebir"]
+        snap = CurriculumSnapshot(version=1, subjects=[
+            {"id": name, "name_tr": name, "is_active": True} for name in names
+        ])
+
+        assert [s["name_tr"] for s in snap.active_subjects()] == [
+            "Cebir", "Çevre", "Işık", "İstatistik", "Organik", "Ölçme", "Sayılar", "Şiir", "Ünite", "Zooloji",
+        ]
+
+    def test_lookups_return_copies(self):
+        snap = CurriculumSnapshot(version=1, subjects=_tables()["subjects"], topics=_tables()["topics"])
+
+        snap.topic("t1")["name_tr"] = "X"
+        snap.active_subjects()[0]["name_tr"] = "X"
+
+        assert snap.topic("t1")["name_tr"] == "Limit"
+        assert snap.active_subjects()[0]["name_tr"] == "Fizik"
+        assert snap.active_subjects(fields=("id",)) == [{"id": "fiz"}, {"id": "mat"}]
+
+
+class TestCurriculumStore:
+    """Versiyon kontrolü, atomik refresh, hata toleransı"""
+
+    def test_pages_large_tables(self, fake_db, monkeypatch):
+        monkeypatch.setattr(curriculum, "PAGE_SIZE", 2)
+        fake_db.tables["topics"] += [
+            {"id": f"x{i}", "subject_id": "fiz", "name_tr": f"K{i:02d}", "is_active": True}
+            for i in range(5)
+        ]
+
+        snap = CurriculumStore().get()
+
+        assert len(snap.active_topic_ids("fiz")) == 5
+        assert snap.stats()["topics"] == 8
+
+    def test_reloads_only_when_version_changes(self, fake_db):
+        store = CurriculumStore(check_interval=0)
+        first = store.get()
+        fake_db.reset_queries()
+
+        assert store.get() is first
+        assert fake_db.query_count() == 1  # sadece versiyon okundu
+
+        fake_db.tables["topics"].append({"id": "t3", "subject_id": "mat", "name_tr": "İntegral"})
+        fake_db.tables["curriculum_version"][0]["version"] = 2
+
+        second = store.get()
+
+        assert second is not first
+        assert second.version == 2
+        assert "t3" in second.active_topic_ids("mat")
+        assert "t3" not in first.active_topic_ids("mat")  # eski snapshot değişmedi
+        assert store.reloads == 2
+
+    def test_failed_reload_serves_previous_snapshot(self, fake_db, monkeypatch):
+        store = CurriculumStore(check_interval=0)
+        first = store.get()
+        fake_db.tables["curriculum_version"][0]["version"] = 5
+
+        def broken(client, table):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(curriculum, "_fetch_all", broken)
+
+        assert store.get() is first
+        assert store.failures == 1
+
+        store.reset()
+        with pytest.raises(RuntimeError):
+            store.get()
+
+    def test_bump_version_reloads(self, fake_db):
+        store = curriculum.curriculum_store
+        assert store.get().version == 1
+
+        snap = curriculum.bump_curriculum_version("test")
+
+        assert snap.version == 2
+        assert store.snapshot is snap
+        assert fake_db.query_count(curriculum.BUMP_RPC) == 1
+
+
+class TestCurriculumHotPaths:
+    """Hot path'ler snapshot yüklendikten sonra DB'ye gitmez"""
+
+    def test_test_entry_endpoints(self, fake_db):
+        curriculum.curriculum_store.get()
+        fake_db.reset_queries()
+
+        subjects = asyncio.run(test_entry.get_subjects())
+        topics = asyncio.run(test_entry.get_topics_by_subject("mat"))
+
+        assert subjects[1] == {"id": "mat", "code": "MAT", "name_tr": "Matematik", "icon": "📐", "color": "#f00"}
+        assert [t["name_tr"] for t in topics] == ["Limit", "Türev"]
+        assert set(topics[0]) == set(test_entry.TOPIC_FIELDS)
+        assert fake_db.query_count() == 0
+
+    def test_context_service(self, fake_db, monkeypatch):
+        monkeypatch.setattr("app.core.context_service.get_supabase_admin", lambda: fake_db)
+        curriculum.curriculum_store.get()
+        fake_db.reset_queries()
+        service = ContextService()
+
+        context = service.get_topic_context("t2")
+
+        assert context["name"] == "Türev"
+        assert context["difficulty_baseline"] == 7.0
+        assert context["prerequisites"] == [{"topic_id": "t1", "strength": 0.8}]
+        assert service.get_prerequisites("t1") == []
+        assert service.get_topic_context("missing")["metadata"] == {"fallback": True}
+        assert fake_db.query_count() == 0
@@ -0,0 +1,94 @@
+"""
+Async DB Access Tests
+Executor-offloaded queries must not block the event loop
+"""
+import asyncio
+import contextvars
+import time
+
+from fastapi import Response
+
+from app.db.session import db_execute, run_db
+
+
+class _SlowQuery:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def execute(self):
+        time.sleep(self.seconds)
+        return "done"
+
+
+class TestNonBlockingDb:
+    """db_execute / run_db"""
+
+    def test_slow_query_does_not_block_loop(self):
+        """Yavaş query sürerken diğer coroutine'ler çalışmaya devam etmeli"""
+        async def scenario():
+            ticks = []
+
+            async def ticker():
+                for _ in range(5):
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.02)
+
+            result, _ = await asyncio.gather(db_execute(_SlowQuery(0.2)), ticker())
+            return result, ticks
+
+        result, ticks = asyncio.run(scenario())
+
+        assert result == "done"
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+
+    def test_queries_run_concurrently(self):
+        """Bağımsız query'ler paralel beklenmeli"""
+        async def scenario():
+            start = time.perf_counter()
+            await asyncio.gather(*(db_execute(_SlowQuery(0.1)) for _ in range(4)))
+            return time.perf_counter() - start
+
+        assert asyncio.run(scenario()) < 0.3
+
+    def test_context_propagates(self):
+        """contextvars executor thread'ine taşınmalı"""
+        var = contextvars.ContextVar("request_id", default=None)
+
+        async def scenario():
+            var.set("req-1")
+            return await run_db(var.get)
+
+        assert asyncio.run(scenario()) == "req-1"
+
+    def test_progress_trends_with_fake_db(self, monkeypatch):
+        """Progress trends handler async erişimle çalışmalı"""
+        import importlib
+
+        progress = importlib.import_module("app.api.v1.endpoints.progress.router")
+        from app.core import curriculum
+        from app.tests.fake_supabase import FakeSupabase, fake_request
+
+        db = FakeSupabase({
+            "student_topic_tests": [
+                {"id": "1", "student_id": "s1", "subject_id": "m", "topic_id": "t",
+                 "success_rate": 50, "test_date": "2026-01-05T10:00:00+00:00"},
+            ],
+            "subjects": [{"id": "m", "name_tr": "Matematik"}],
+        })
+        monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+        curriculum.curriculum_store.reset()
+        curriculum.curriculum_store.get()
+        db.reset_queries()
+
+        try:
+            result = asyncio.run(progress.get_progress_trends(
+                fake_request(), Response(),
+                current_user={"id": "s1"}, supabase=db, period="weekly", num_periods=4
+            ))
+        finally:
+            curriculum.curriculum_store.reset()
+
+        assert result["success"] is True
+        # Ders isimleri curriculum snapshot'tan: sadece testler okunur
+        assert db.query_count() == 1
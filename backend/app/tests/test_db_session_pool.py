@@ -0,0 +1,85 @@
+"""
+Supabase Client Pool Tests
+Shared client reuse, lifecycle and pool metrics
+"""
+import httpx
+import jwt
+import pytest
+
+from app.db.session import SupabaseClientProvider
+
+
+SERVICE_KEY = jwt.encode({"role": "service_role"}, "x" * 32, algorithm="HS256")
+ANON_KEY = jwt.encode({"role": "anon"}, "x" * 32, algorithm="HS256")
+
+
+def _mock_transport(calls: list) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=[{"id": "1"}])
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def supabase_env(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", SERVICE_KEY)
+    monkeypatch.setenv("SUPABASE_ANON_KEY", ANON_KEY)
+
+
+class TestSupabaseClientProvider:
+    """Process-wide client provider"""
+
+    def test_admin_client_is_reused(self, supabase_env):
+        """get_admin aynı client'ı döndürmeli"""
+        provider = SupabaseClientProvider(pool_size=4, transport=_mock_transport([]))
+
+        assert provider.get_admin() is provider.get_admin()
+
+    def test_invalid_role_fails_fast(self, supabase_env, monkeypatch):
+        """service_role olmayan key reddedilmeli"""
+        monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", ANON_KEY)
+        provider = SupabaseClientProvider(pool_size=4, transport=_mock_transport([]))
+
+        with pytest.raises(RuntimeError):
+            provider.get_admin()
+
+    def test_metrics_count_requests(self, supabase_env):
+        """Her query pool metriklerine yansımalı"""
+        calls = []
+        provider = SupabaseClientProvider(pool_size=4, transport=_mock_transport(calls))
+        client = provider.get_admin()
+
+        client.table("subjects").select("id").execute()
+        client.table("topics").select("id").execute()
+
+        metrics = provider.metrics()
+        assert len(calls) == 2
+        assert metrics["requests_total"] == 2
+        assert metrics["in_use"] == 0
+        assert metrics["waiting"] == 0
+        assert metrics["pool_size"] == 4
+        assert metrics["reuse_ratio"] == 1.0
+
+    def test_user_clients_share_pool_but_not_headers(self, supabase_env):
+        """User client'ları pool'u paylaşır, token'lar karışmaz"""
+        calls = []
+        provider = SupabaseClientProvider(pool_size=4, transport=_mock_transport(calls))
+
+        provider.for_user("token-a").table("tests").select("id").execute()
+        provider.for_user("token-b").table("tests").select("id").execute()
+
+        assert calls[0].headers["authorization"] == "Bearer token-a"
+        assert calls[1].headers["authorization"] == "Bearer token-b"
+        assert provider.metrics()["requests_total"] == 2
+
+    def test_shutdown_releases_clients(self, supabase_env):
+        """shutdown sonrası yeni client oluşturulmalı"""
+        provider = SupabaseClientProvider(pool_size=4, transport=_mock_transport([]))
+        first = provider.get_admin()
+
+        provider.shutdown()
+
+        assert provider.metrics()["started"] is False
+        assert provider.get_admin() is not first
@@ -0,0 +1,145 @@
+"""
+Conditional GET Tests
+Per-student data version, strong ETag, 304 without DB work
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app.api.v1.endpoints.student import dashboard
+from app.api.v1.endpoints.student import tests as tests_endpoint
+from app.core import curriculum, data_version
+from app.core.auth import get_current_user
+from app.core.data_version import bump_student_version, etag_matches, student_etag
+from app.tests.fake_supabase import FakeSupabase, fake_request
+
+
+def _test_row(test_id, student_id="s1"):
+    return {
+        "id": test_id,
+        "student_id": student_id,
+        "topic_id": "A",
+        "test_date": "2026-03-01T10:00:00+00:00",
+        "correct_count": 8,
+        "wrong_count": 2,
+        "empty_count": 0,
+        "net_score": 7.5,
+        "success_rate": 80.0,
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "subjects": [{"id": "mat", "name_tr": "Matematik"}],
+        "topics": [{"id": "A", "subject_id": "mat", "name_tr": "Limit"}],
+        "student_topic_tests": [_test_row("t1"), _test_row("t2")],
+    })
+    monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+    curriculum.curriculum_store.reset()
+    monkeypatch.setattr(dashboard, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(tests_endpoint, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(tests_endpoint, "update_topic_performance", lambda *a: True)
+    monkeypatch.setattr(tests_endpoint, "remove_test_day", lambda *a: True)
+    data_version._version_store.clear()
+    yield db
+    data_version._version_store.clear()
+    curriculum.curriculum_store.reset()
+
+
+def _get(path, headers=None):
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "s1"}
+
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers or {})
+
+    return asyncio.run(call())
+
+
+class TestEtagHelpers:
+    """ETag üretimi + If-None-Match ayrıştırma"""
+
+    def test_etag_depends_on_version_scope_and_parts(self, fake_db):
+        first = student_etag("s1", "trends", "weekly", 8)
+
+        assert first == student_etag("s1", "trends", "weekly", 8)
+        assert first != student_etag("s1", "trends", "monthly", 8)
+        assert first != student_etag("s1", "subjects")
+        assert first != student_etag("s2", "trends", "weekly", 8)
+
+        bump_student_version("s1")
+
+        assert student_etag("s1", "trends", "weekly", 8) != first
+
+    def test_if_none_match_parsing(self):
+        etag = '"abc"'
+
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('W/"abc"', etag)
+        assert etag_matches('"x", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"abcd"', etag)
+        assert not etag_matches(None, etag)
+
+
+@pytest.fixture
+def shared_backend(tmp_path):
+    """304 sadece versiyonlar worker'lar arası paylaşılıyorsa verilir"""
+    from app.core.cache import InProcessBackend, SQLiteBackend, cache_registry
+
+    cache_registry.configure_backend(SQLiteBackend(str(tmp_path / "cache.sqlite3"), poll_interval=0))
+    yield
+    cache_registry.configure_backend(InProcessBackend())
+
+
+class TestConditionalGet:
+    """Eşleşen ETag -> 304, DB'ye gidilmez; yazım -> yeni ETag"""
+
+    def test_not_modified_without_db_queries(self, fake_db, shared_backend):
+        first = _get("/tests")
+        etag = first.headers["etag"]
+
+        assert first.status_code == 200
+        assert len(first.json()["tests"]) == 2
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        fake_db.reset_queries()
+        second = _get("/tests", {"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert fake_db.query_count() == 0
+
+    def test_memory_backend_never_returns_304(self, fake_db):
+        """memory modunda bump diğer worker'lara ulaşmaz: ETag yazılır, 304 yok"""
+        etag = _get("/tests").headers["etag"]
+
+        again = _get("/tests", {"If-None-Match": etag})
+
+        assert again.status_code == 200
+        assert again.headers["etag"] == etag
+        assert len(again.json()["tests"]) == 2
+
+    def test_write_invalidates_etag(self, fake_db, shared_backend):
+        etag = _get("/tests").headers["etag"]
+
+        asyncio.run(tests_endpoint.delete_test("t2", current_user={"id": "s1"}))
+        after = _get("/tests", {"If-None-Match": etag})
+
+        assert after.status_code == 200
+        assert len(after.json()["tests"]) == 1
+        assert after.headers["etag"] != etag
+
+    def test_direct_call(self, fake_db):
+        result = asyncio.run(dashboard.get_student_tests(
+            fake_request(), Response(), limit=None, cursor=None, stream=False, current_user={"id": "s1"}
+        ))
+
+        assert len(result["tests"]) == 2
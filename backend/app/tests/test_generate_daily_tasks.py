@@ -0,0 +1,227 @@
+"""
+Daily Task Job Tests
+Concurrent pages, batched writes, checkpoint resume
+"""
+from datetime import date
+
+import pytest
+
+from app.jobs import generate_daily_tasks as job
+from app.tests.fake_supabase import FakeSupabase
+
+
+PLAN_DATE = date(2026, 3, 2)
+
+
+def _candidates(db, params):
+    if params["p_student_id"] == "s-bad":
+        raise RuntimeError("rpc failed")
+    return [
+        {
+            "topic_id": f"t{i}",
+            "subject_id": "math",
+            "topic_name": f"Konu {i}",
+            "subject_name": "Matematik",
+            "gos": 90 - i * 10,
+            "dominant_reason": "retention",
+        }
+        for i in range(6)
+    ]
+
+
+def _candidates_bulk(db, params):
+    rows = []
+    for sid in params["p_student_ids"]:
+        cands = _candidates(db, {"p_student_id": sid, "p_date": params["p_date"]})
+        for r in cands[:params.get("p_limit", 5)]:
+            rows.append({"student_id": sid, **r})
+    return rows
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "students": [
+            {"id": f"s{i:02d}", "full_name": f"Öğrenci {i}", "is_active": True}
+            for i in range(5)
+        ] + [{"id": "s99", "full_name": "Pasif", "is_active": False}],
+    })
+    db.rpc_handlers["rpc_get_daily_task_candidates"] = _candidates
+    db.rpc_handlers["rpc_get_daily_task_candidates_bulk"] = _candidates_bulk
+    monkeypatch.setattr(job, "get_supabase_admin", lambda: db)
+    return db
+
+
+class TestGenerateDailyTasks:
+    """Concurrent + batched nightly job"""
+
+    def test_plans_all_active_students(self, fake_db, tmp_path):
+        """Tüm aktif öğrenciler planlanmalı, task'lar batch yazılmalı"""
+        summary = job.generate_daily_tasks_for_date(
+            PLAN_DATE, workers=4, page_size=2, checkpoint_dir=tmp_path
+        )
+
+        assert summary["students_total"] == 5
+        assert summary["students_planned"] == 5
+        assert summary["students_failed"] == 0
+        assert summary["pages"] == 3
+        assert len(fake_db.tables["student_daily_plans"]) == 5
+        assert len(fake_db.tables["student_tasks"]) == 5 * job.DEFAULT_TASKS_PER_DAY
+
+        # Sayfa başına: 1 plan upsert + 1 delete + 1 insert
+        assert fake_db.query_count("student_daily_plans") == 3
+        assert fake_db.query_count("student_tasks") == 6
+
+        # Sayfa başına tek bulk RPC, per-student RPC yok
+        assert fake_db.query_count("rpc_get_daily_task_candidates_bulk") == 3
+        assert fake_db.query_count("rpc_get_daily_task_candidates") == 0
+
+    def test_timing_summary(self, fake_db, tmp_path):
+        """Summary faz bazlı süreleri içermeli"""
+        summary = job.generate_daily_tasks_for_date(PLAN_DATE, checkpoint_dir=tmp_path)
+
+        for phase in job.PHASES + ("total",):
+            assert phase in summary["timings_ms"]
+
+    def test_rerun_is_idempotent(self, fake_db, tmp_path):
+        """Aynı gün tekrar koşu task'ları çoğaltmamalı"""
+        job.generate_daily_tasks_for_date(PLAN_DATE, page_size=2, checkpoint_dir=tmp_path)
+        job.generate_daily_tasks_for_date(PLAN_DATE, page_size=2, checkpoint_dir=tmp_path)
+
+        assert len(fake_db.tables["student_daily_plans"]) == 5
+        assert len(fake_db.tables["student_tasks"]) == 5 * job.DEFAULT_TASKS_PER_DAY
+
+    def test_failed_student_does_not_block_page(self, fake_db, tmp_path):
+        """RPC hatası sadece o öğrenciyi etkilemeli"""
+        fake_db.tables["students"].append({"id": "s-bad", "full_name": "X", "is_active": True})
+
+        summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+
+        assert summary["students_planned"] == 5
+        assert summary["students_failed"] == 1
+        assert summary["errors"][0]["student_id"] == "s-bad"
+
+    def test_resume_from_checkpoint(self, fake_db, tmp_path):
+        """Checkpoint varsa kaldığı yerden devam etmeli"""
+        job.JobCheckpoint(PLAN_DATE, tmp_path).save({
+            "date": PLAN_DATE.isoformat(),
+            "last_student_id": "s02",
+            "students_total": 3,
+            "students_planned": 3,
+            "students_failed": 1,
+            "pages": 1,
+            "errors": [{"student_id": "s-old", "error": "timeout"}],
+        })
+
+        summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=3, checkpoint_dir=tmp_path)
+
+        planned_ids = {p["student_id"] for p in fake_db.tables["student_daily_plans"]}
+        assert planned_ids == {"s03", "s04"}
+        assert summary["resumed_from"] == "s02"
+        assert summary["students_planned"] == 5
+        assert summary["errors"] == [{"student_id": "s-old", "error": "timeout"}]
+        assert job.JobCheckpoint(PLAN_DATE, tmp_path).load() is None
+
+    def test_task_delete_ids_are_chunked(self, fake_db, tmp_path, monkeypatch):
+        """Delete .in_() filtresi URL limitini aşmamalı: id'ler chunk'lanır"""
+        monkeypatch.setattr(job, "TASK_DELETE_ID_CHUNK", 2)
+
+        job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+        job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+
+        deletes = [q for q in fake_db.queries if q == ("student_tasks", "delete")]
+        assert len(deletes) == 2 * 3
+        assert len(fake_db.tables["student_tasks"]) == 5 * job.DEFAULT_TASKS_PER_DAY
+
+    def test_batch_write_failure_is_logged_and_recorded(self, fake_db, tmp_path, monkeypatch, caplog):
+        """Batch yazma hatası sessizce yutulmamalı, per-student yazıma düşmeli"""
+        def broken_batch(*args):
+            raise RuntimeError("payload too large")
+
+        monkeypatch.setattr(job, "upsert_daily_plans_batch", broken_batch)
+
+        with caplog.at_level("ERROR", logger=job.__name__):
+            summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+
+        assert summary["students_planned"] == 5
+        assert summary["batch_write_failures"] == [
+            {"page": 1, "first_student_id": "s00", "error": "payload too large"}
+        ]
+        assert "batch write failed" in caplog.text
+
+
+class TestBulkCandidates:
+    """Set-based candidate RPC"""
+
+    def test_groups_rows_per_student(self, fake_db):
+        """Satırlar öğrenci bazında gruplanmalı, adaysızlar boş liste almalı"""
+        fake_db.rpc_handlers["rpc_get_daily_task_candidates_bulk"] = lambda db, p: [
+            {"student_id": "s01", "topic_id": "t1", "subject_id": "m", "topic_name": "A", "gos": 80},
+            {"student_id": "s00", "topic_id": "t2", "subject_id": "m", "topic_name": "B", "gos": 70},
+            {"student_id": "s01", "topic_id": "t3", "subject_id": "m", "topic_name": "C", "gos": 60},
+        ]
+
+        grouped = job.fetch_daily_candidates_bulk(fake_db, ["s00", "s01", "s02"], PLAN_DATE)
+
+        assert [c.topic_id for c in grouped["s01"]] == ["t1", "t3"]
+        assert [c.topic_id for c in grouped["s00"]] == ["t2"]
+        assert grouped["s02"] == []
+        assert isinstance(grouped["s00"][0], job.CandidateTopic)
+        assert fake_db.query_count() == 1
+
+    def test_limit_per_student_and_calls_sized_from_max_rows(self, fake_db):
+        """Öğrenci başına top-N istenir; çağrı başına id sayısı max-rows'tan"""
+        ids = [f"s{i:02d}" for i in range(5)]
+
+        grouped = job.fetch_daily_candidates_bulk(fake_db, ids, PLAN_DATE, limit=3, max_rows=7)
+
+        assert all(len(grouped[sid]) == 3 for sid in ids)
+        # (7 - 1) // 3 = 2 öğrenci / çağrı -> 3 çağrı
+        assert fake_db.query_count("rpc_get_daily_task_candidates_bulk") == 3
+
+    def test_truncated_result_raises(self, fake_db):
+        """max-rows'a dayanan sonuç kesilmiş sayılmalı"""
+        fake_db.rpc_handlers["rpc_get_daily_task_candidates_bulk"] = lambda db, p: [
+            {"student_id": "s00", "topic_id": f"t{i}", "subject_id": "m", "topic_name": "A", "gos": 50}
+            for i in range(4)
+        ]
+
+        with pytest.raises(job.CandidatesTruncated):
+            job.fetch_daily_candidates_bulk(fake_db, ["s00", "s01"], PLAN_DATE, limit=1, max_rows=4)
+
+    def test_truncated_page_falls_back_per_student(self, fake_db, tmp_path, monkeypatch):
+        """Kesilmiş bulk sonuç: per-student RPC'ye düşülür, kimse boş plan almaz"""
+        monkeypatch.setattr(job, "BULK_MAX_ROWS", 6)
+        fake_db.rpc_handlers["rpc_get_daily_task_candidates_bulk"] = lambda db, p: (
+            _candidates_bulk(db, {**p, "p_limit": 6})[:6]
+        )
+
+        summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+
+        assert summary["students_planned"] == 5
+        assert summary["bulk_candidates"] is True
+        assert len(fake_db.tables["student_tasks"]) == 5 * job.DEFAULT_TASKS_PER_DAY
+        assert fake_db.query_count("rpc_get_daily_task_candidates") == 5
+
+    def test_bulk_failure_falls_back_per_student(self, fake_db, tmp_path, caplog):
+        """Bulk hata verirse sayfa per-student RPC ile işlenmeli"""
+        fake_db.tables["students"].append({"id": "s-bad", "full_name": "X", "is_active": True})
+
+        with caplog.at_level("WARNING", logger=job.__name__):
+            summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=10, checkpoint_dir=tmp_path)
+
+        assert summary["students_planned"] == 5
+        assert summary["students_failed"] == 1
+        assert summary["bulk_candidates"] is True
+        assert fake_db.query_count("rpc_get_daily_task_candidates") == 6
+        assert "Bulk candidates failed" in caplog.text
+
+    def test_missing_bulk_rpc_disables_it_for_run(self, fake_db, tmp_path):
+        """RPC deploy edilmemişse sonraki sayfalarda denenmemeli"""
+        del fake_db.rpc_handlers["rpc_get_daily_task_candidates_bulk"]
+
+        summary = job.generate_daily_tasks_for_date(PLAN_DATE, page_size=2, checkpoint_dir=tmp_path)
+
+        assert summary["students_planned"] == 5
+        assert summary["bulk_candidates"] is False
+        assert fake_db.query_count("rpc_get_daily_task_candidates_bulk") == 1
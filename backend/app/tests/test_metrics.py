@@ -0,0 +1,192 @@
+"""
+Prometheus Metrics Tests
+Exposition format, route templates, Supabase per-table calls, collectors
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI
+
+from app.core.cache import collect_cache_metrics, get_cache
+from app.core.metrics import (
+    MetricsRegistry,
+    _Metric,
+    collect_process,
+    render_families,
+    route_label,
+    scrape_denial,
+    supabase_target,
+)
+from app.core.motor_metrics import MotorPerformanceStats
+from app.db.session import SUPABASE_REQUESTS, SupabaseClientProvider
+from app.jobs.generate_daily_tasks import collect_checkpoint_metrics
+
+
+def _lines(registry: MetricsRegistry):
+    return registry.render().splitlines()
+
+
+class TestExposition:
+    def test_counter_gauge_histogram(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("app_requests_total", "Requests", ("route",))
+        latency = registry.histogram("app_latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+        registry.gauge("app_up", "Up").set(1)
+
+        requests.inc("/a")
+        requests.inc("/a")
+        latency.observe(0.05, "/a")
+        latency.observe(0.5, "/a")
+        latency.observe(3, "/a")
+
+        lines = _lines(registry)
+        assert "# TYPE app_requests_total counter" in lines
+        assert 'app_requests_total{route="/a"} 2' in lines
+        assert 'app_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'app_latency_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'app_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'app_latency_seconds_count{route="/a"} 3' in lines
+        assert "app_up 1" in lines
+
+    def test_same_name_returns_same_metric(self):
+        registry = MetricsRegistry()
+        assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X")
+
+    def test_metric_base_is_abstract(self):
+        with pytest.raises(TypeError):
+            _Metric("x", "x")
+
+    def test_label_escaping_and_failing_collector(self):
+        registry = MetricsRegistry()
+        registry.counter("c_total", "C", ("v",)).inc('a"b\\c')
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+        text = registry.render()
+
+        assert 'c_total{v="a\\"b\\\\c"} 1' in text
+        assert 'endstp_metrics_collector_errors{collector="broken"} 1' in text
+
+    def test_failing_collectors_share_one_family(self):
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        def also_broken():
+            raise ValueError("bang")
+
+        registry.register_collector(broken)
+        registry.register_collector(also_broken)
+        lines = _lines(registry)
+
+        assert lines.count("# TYPE endstp_metrics_collector_errors gauge") == 1
+        assert sum(1 for l in lines if l.startswith("# HELP endstp_metrics_collector_errors")) == 1
+        assert 'endstp_metrics_collector_errors{collector="broken"} 1' in lines
+        assert 'endstp_metrics_collector_errors{collector="also_broken"} 1' in lines
+
+    def test_scrape_requires_token_unless_public(self, monkeypatch):
+        monkeypatch.delenv("METRICS_TOKEN", raising=False)
+        monkeypatch.delenv("METRICS_PUBLIC", raising=False)
+        assert scrape_denial(None) == 503
+
+        monkeypatch.setenv("METRICS_PUBLIC", "1")
+        assert scrape_denial(None) is None
+
+        monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+        assert scrape_denial(None) == 401
+        assert scrape_denial("Bearer wrong") == 401
+        assert scrape_denial("Bearer s3cret") is None
+
+    def test_process_memory(self):
+        names = {f.name for f in collect_process()}
+        assert {"process_resident_memory_bytes", "process_max_resident_memory_bytes"} <= names
+
+
+class TestLabels:
+    def test_route_template_not_raw_path(self):
+        app = FastAPI()
+        seen = []
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: str):
+            return {"id": item_id}
+
+        @app.middleware("http")
+        async def capture(request, call_next):
+            response = await call_next(request)
+            seen.append(route_label(request.scope))
+            return response
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.get("/items/42")
+                await client.get("/nope")
+
+        asyncio.run(run())
+        assert seen == ["/items/{item_id}", "unmatched"]
+
+    @pytest.mark.parametrize("path,expected", [
+        ("/rest/v1/student_tasks", ("rest", "student_tasks")),
+        ("/rest/v1/rpc/rpc_submit_test_result", ("rpc", "rpc_submit_test_result")),
+        ("/auth/v1/user", ("auth", "")),
+    ])
+    def test_supabase_target(self, path, expected):
+        assert supabase_target(path) == expected
+
+
+class TestSources:
+    def test_supabase_calls_per_table(self, monkeypatch):
+        key = jwt.encode({"role": "service_role"}, "x" * 32, algorithm="HS256")
+        monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+        monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", key)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+        client = SupabaseClientProvider(pool_size=2, transport=transport).get_admin()
+        before = SUPABASE_REQUESTS.value("rest", "metrics_probe", "GET", "200")
+
+        client.table("metrics_probe").select("id").execute()
+        client.table("metrics_probe").select("id").execute()
+
+        assert SUPABASE_REQUESTS.value("rest", "metrics_probe", "GET", "200") == before + 2
+
+    def test_cache_collector(self):
+        cache = get_cache("metrics_probe_cache", max_entries=10, ttl_seconds=60)
+        cache.set("k", 1)
+        cache.get("k")
+        cache.get("missing")
+
+        text = render_families(collect_cache_metrics())
+        assert 'endstp_cache_hits_total{namespace="metrics_probe_cache"} 1' in text
+        assert 'endstp_cache_hit_ratio{namespace="metrics_probe_cache"} 0.5' in text
+
+    def test_motor_histogram_in_seconds(self):
+        stats = MotorPerformanceStats()
+        stats.record("difficulty", "v1", "free", 3.0, success=True, fallback_used=True)
+
+        text = render_families(stats.metric_families())
+        labels = 'motor_type="difficulty",version="v1",tier="free"'
+        assert f'endstp_motor_execution_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        assert f'endstp_motor_execution_seconds_bucket{{{labels},le="0.0025"}} 0' in text
+        assert f"endstp_motor_fallback_total{{{labels}}} 1" in text
+
+    def test_daily_job_checkpoint_progress(self, tmp_path):
+        assert collect_checkpoint_metrics(tmp_path) == []
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        (tmp_path / f"daily_tasks_{today}.json").write_text(json.dumps({
+            "date": today, "last_student_id": "s9",
+            "students_total": 1000, "students_planned": 990, "students_failed": 10, "pages": 2,
+        }))
+
+        text = render_families(collect_checkpoint_metrics(tmp_path))
+        assert 'endstp_daily_tasks_checkpoint_students{state="planned"} 990' in text
+        assert "endstp_daily_tasks_checkpoint_pages 2" in text
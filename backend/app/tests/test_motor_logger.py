@@ -0,0 +1,151 @@
+"""
+Motor Activity Logger Tests
+Bounded queue + drop counting, size/time rotation, gzip segments, streaming reader
+"""
+import gzip
+import os
+
+import pytest
+
+from app.core import motor_logger as motor_logger_module
+from app.core.motor_logger import MotorActivityLogger, aggregate_motor_log, list_segments
+
+
+def _log(writer, n, motor="difficulty", version="v1", fallback=False):
+    for i in range(n):
+        writer.log_execution(
+            motor_type=motor, version=version, user_tier="free", features_used=1,
+            execution_time_ms=10.0 + i, fallback_used=fallback,
+        )
+
+
+@pytest.fixture
+def writer(tmp_path):
+    w = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=10_000_000, rotate_seconds=3600)
+    yield w
+    w.close()
+
+
+class TestWriter:
+    def test_log_execution_does_no_io(self, writer, tmp_path):
+        _log(writer, 5)
+
+        assert not writer.log_file.exists()  # flusher henüz çalışmadı
+        writer.flush()
+        assert len(writer.log_file.read_text().splitlines()) == 5
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        w = MotorActivityLogger(log_dir=tmp_path, queue_size=3, flush_seconds=60)
+        _log(w, 5)
+        w.close()
+
+        assert w.stats()["dropped"] == 2
+        assert w.stats()["written"] == 3
+
+    def test_size_rotation_with_gzip(self, tmp_path):
+        w = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=1, compress="gzip")
+        for _ in range(3):
+            _log(w, 2)
+            w.flush()
+        w.close()
+
+        segments = list_segments(tmp_path, include_active=False)
+        assert [p.name.endswith(".log.gz") for p in segments] == [True, True]
+        with gzip.open(segments[0], "rt") as f:
+            assert len(f.read().splitlines()) == 2
+        assert w.stats()["rotations"] == 2
+
+    def test_time_rotation_and_retention(self, tmp_path):
+        w = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, rotate_seconds=0, max_segments=2)
+        for _ in range(4):
+            _log(w, 1)
+            w.flush()
+        w.close()
+
+        assert len(list_segments(tmp_path, include_active=False)) == 2
+
+
+class TestMultiWorker:
+    """uvicorn --workers N: her worker kendi dosyasını yazar / rotate eder"""
+
+    def test_workers_rotate_independently(self, tmp_path, monkeypatch):
+        a = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=1)
+        b = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=10_000_000)
+        monkeypatch.setattr(motor_logger_module, "_pid_alive", lambda pid: True)
+
+        monkeypatch.setattr(os, "getpid", lambda: 1001)
+        _log(a, 2)
+        a.flush()
+        monkeypatch.setattr(os, "getpid", lambda: 1002)
+        _log(b, 3)
+        b.flush()
+        monkeypatch.setattr(os, "getpid", lambda: 1001)
+        _log(a, 1)
+        a.flush()  # a rotate eder; b'nin açık dosyasına dokunmaz
+        monkeypatch.setattr(os, "getpid", lambda: 1002)
+        _log(b, 1)
+        b.flush()
+
+        assert (tmp_path / "motor_activity-1002.log").read_text().count("\n") == 4
+        assert aggregate_motor_log(tmp_path)["total"] == 7
+        a._close_file()
+        b._close_file()
+
+    def test_dead_worker_file_is_sealed(self, tmp_path, monkeypatch):
+        orphan = tmp_path / "motor_activity-999999.log"
+        orphan.write_text('{"motor_type": "difficulty"}\n')
+        monkeypatch.setattr(motor_logger_module, "_pid_alive", lambda pid: False)
+
+        w = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=1)
+        _log(w, 1)
+        w.flush()
+        _log(w, 1)
+        w.close()
+
+        assert not orphan.exists()
+        assert aggregate_motor_log(tmp_path)["total"] == 3
+
+
+class TestReader:
+    def test_aggregates_across_plain_and_gzip_segments(self, tmp_path):
+        w = MotorActivityLogger(log_dir=tmp_path, flush_seconds=60, max_bytes=1, compress="gzip")
+        _log(w, 3, version="v1")
+        w.flush()
+        _log(w, 2, version="v2", fallback=True)
+        w.close()
+
+        report = aggregate_motor_log(tmp_path, recent=2)
+
+        assert report["total"] == 5
+        difficulty = report["by_motor"]["difficulty"]
+        assert difficulty["v1"] == 3
+        assert difficulty["v2"] == 2
+        assert difficulty["fallback"] == 2
+        assert difficulty["avg_time_ms"] == pytest.approx((10 + 11 + 12 + 10 + 11) / 5)
+        assert report["by_tier"] == {"free": 5}
+        assert [e["version"] for e in report["recent"]] == ["v2", "v2"]
+
+    def test_recent_is_by_timestamp_across_worker_files(self, tmp_path, monkeypatch):
+        """Aktif dosyalar pid sırasıyla okunur; recent/last zaman sırasına göre"""
+        monkeypatch.setattr(motor_logger_module, "_pid_alive", lambda pid: True)
+        (tmp_path / "motor_activity-1001.log").write_text(
+            '{"timestamp": "2026-10-18T10:00:00", "version": "a1"}\n'
+            '{"timestamp": "2026-10-18T10:00:03", "version": "a2"}\n'
+        )
+        (tmp_path / "motor_activity-1002.log").write_text(
+            '{"timestamp": "2026-10-18T09:59:59", "version": "b1"}\n'
+            '{"timestamp": "2026-10-18T10:00:02", "version": "b2"}\n'
+        )
+
+        report = aggregate_motor_log(tmp_path, recent=2)
+
+        assert report["first_timestamp"] == "2026-10-18T09:59:59"
+        assert report["last_timestamp"] == "2026-10-18T10:00:03"
+        assert [e["version"] for e in report["recent"]] == ["b2", "a2"]
+
+    def test_since_filter(self, writer, tmp_path):
+        _log(writer, 2)
+        writer.flush()
+
+        assert aggregate_motor_log(tmp_path, since="9999")["total"] == 0
+        assert aggregate_motor_log(tmp_path, since="2000")["total"] == 2
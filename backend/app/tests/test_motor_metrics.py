@@ -0,0 +1,99 @@
+"""
+Motor Performance Stats Tests
+Ring buffer, windowed histograms (1m / 1h / 24h), MotorRegistry + endpoint
+"""
+import asyncio
+
+import pytest
+
+from app.api.v1.endpoints import motors
+from app.core.motor_metrics import MotorPerformanceStats
+from app.core.motor_registry import MotorRegistry, MotorType, MotorVersion, SubscriptionTier
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestMotorPerformanceStats:
+    def test_percentiles_and_rates(self, clock):
+        stats = MotorPerformanceStats(clock=clock)
+        for ms in [0.8] * 50 + [4.0] * 45 + [40.0] * 4 + [900.0]:
+            stats.record("difficulty", "v2", "premium", ms, success=True)
+        stats.record("difficulty", "v1", "premium", 2.0, success=True, fallback_used=True)
+        stats.record("difficulty", "v1", "premium", 2.0, success=False)
+
+        rows = {(r["version"], r["tier"]): r for r in stats.summary()}
+        v2 = rows[("v2", "premium")]
+        assert v2["requests"] == 100
+        assert v2["p50_ms"] == 1
+        assert v2["p95_ms"] == 5
+        assert v2["p99_ms"] == 50
+        assert v2["max_ms"] == 900.0
+        v1 = rows[("v1", "premium")]
+        assert v1["success_rate"] == 50.0
+        assert v1["fallback_rate"] == 50.0
+
+    def test_windows_expire_by_slot(self, clock):
+        stats = MotorPerformanceStats(clock=clock)
+        stats.record("time", "v1", "free", 3.0, success=True)
+        clock.now += 120
+        stats.record("time", "v1", "free", 3.0, success=True)
+
+        assert stats.by_motor("1m")["time"]["requests"] == 1
+        assert stats.by_motor("1h")["time"]["requests"] == 2
+
+        clock.now += 2 * 3600
+        assert stats.by_motor("1h") == {}
+        assert stats.by_motor("24h")["time"]["requests"] == 2
+
+        clock.now += 25 * 3600
+        assert stats.by_motor("24h") == {}
+        assert stats.by_motor()["time"]["requests"] == 2
+
+    def test_ring_buffer_fixed_size(self, clock):
+        stats = MotorPerformanceStats(recent_capacity=5, clock=clock)
+        for i in range(12):
+            stats.record("priority", "v1", "free", float(i), success=True)
+
+        assert len(stats.recent) == 5
+        assert stats.recent[0]["execution_time_ms"] == 7.0
+        assert stats.total == 12
+
+    def test_unknown_window(self, clock):
+        with pytest.raises(ValueError):
+            MotorPerformanceStats(clock=clock).summary("5m")
+
+
+class TestRegistryEndpoint:
+    def test_log_performance_served_by_endpoint(self, monkeypatch):
+        registry = MotorRegistry()
+        monkeypatch.setattr(motors, "motor_registry", registry)
+
+        assert asyncio.run(motors.get_motor_performance()) == {"message": "No performance data yet"}
+
+        registry.log_performance(MotorType.BS_MODEL, MotorVersion.V2, 12.5, True, SubscriptionTier.PREMIUM)
+        registry.log_performance(
+            MotorType.BS_MODEL, MotorVersion.V1, 3.0, True, SubscriptionTier.PREMIUM, fallback_used=True
+        )
+        result = asyncio.run(motors.get_motor_performance())
+
+        bs = result["stats_by_motor"]["bs_model"]
+        assert result["total_logs"] == 2
+        assert (bs["v1_requests"], bs["v2_requests"]) == (1, 1)
+        assert bs["fallback_rate"] == 50.0
+        assert set(result["windows"]) == {"1m", "1h", "24h"}
+        assert [r["version"] for r in result["windows"]["1h"]] == ["v1", "v2"]
+        assert registry.performance_log[-1]["fallback_used"] is True
+
+        one = asyncio.run(motors.get_motor_performance(window="1m"))
+        assert list(one["windows"]) == ["1m"]
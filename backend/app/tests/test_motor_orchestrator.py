@@ -0,0 +1,160 @@
+"""
+Motor Orchestrator Tests
+Concurrent motors, per-motor timeout + fallback, timings in metadata
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core import motor_orchestrator
+from app.core.motor_orchestrator import MotorOrchestrator
+from app.core.motor_registry import MotorConfig, MotorVersion, motor_registry
+
+
+TEST_DATA = {"correct": 8, "wrong": 2, "blank": 2, "total": 12, "duration_minutes": 15}
+
+
+class FakeWrapper:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+
+    def _run(self, name):
+        time.sleep(self.delays.get(name, 0.0))
+        return {"data": {"motor": name}, "meta": {"motor_version": "v1", "fallback_used": False}}
+
+    def calculate_difficulty(self, input_data, student_id, tier):
+        return self._run("difficulty")
+
+    def calculate_bs_model(self, input_data, student_id, topic_id, tier):
+        return self._run("bs_model")
+
+    def calculate_time(self, student_id, topic_id, tier):
+        return self._run("time")
+
+    def calculate_priority(self, student_id, topic_id, test_date, tier):
+        if self.delays.get("priority") == "boom":
+            raise RuntimeError("priority exploded")
+        return self._run("priority")
+
+
+class FakeContext:
+    def get_topic_context(self, topic_id):
+        return {"archetype": "mixed", "prerequisites": []}
+
+
+@pytest.fixture
+def budget_ms(monkeypatch):
+    """Tüm motorlar için timeout_ms ayarlanabilir config"""
+    budget = {"ms": 5000}
+
+    def fake_config(motor_type, user_tier, user_id=None):
+        return MotorConfig(motor_type, MotorVersion.V1, ["basic"], timeout_ms=budget["ms"])
+
+    monkeypatch.setattr(motor_registry, "get_motor_config", fake_config)
+    return budget
+
+
+def _wait_pool_idle(timeout=2.0):
+    """Önceki testlerin terk edilmiş motor thread'leri bitsin"""
+    deadline = time.perf_counter() + timeout
+    while motor_orchestrator._pool_load.snapshot()["in_flight"] and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+
+def _analyze(wrapper):
+    orchestrator = MotorOrchestrator(wrapper, FakeContext())
+    return asyncio.run(orchestrator.analyze_topic_test("s1", "t1", "MAT", TEST_DATA, "free"))
+
+
+class TestMotorOrchestrator:
+    """analyze_topic_test"""
+
+    def test_motors_run_concurrently(self, budget_ms):
+        """4 motor paralel çalışmalı (toplam süre ~ en yavaş motor)"""
+        delays = {m: 0.1 for m in ("difficulty", "bs_model", "time", "priority")}
+
+        start = time.perf_counter()
+        result = _analyze(FakeWrapper(delays))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.3
+        assert result["metadata"]["motors_succeeded"] == 4
+        assert set(result) == {"difficulty", "bs_model", "time", "priority", "metadata"}
+
+    def test_timings_in_metadata(self, budget_ms):
+        """Motor bazlı süreler metadata'da olmalı"""
+        result = _analyze(FakeWrapper({"bs_model": 0.05}))
+
+        timings = result["metadata"]["motor_timings_ms"]
+        assert set(timings) == {"difficulty", "bs_model", "time", "priority"}
+        assert timings["bs_model"] >= 50
+
+    def test_timeout_returns_fallback(self, budget_ms):
+        """Bütçeyi aşan motor fallback sonucu ile dönmeli"""
+        budget_ms["ms"] = 50
+
+        start = time.perf_counter()
+        result = _analyze(FakeWrapper({"time": 0.5}))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.4
+        assert result["time"]["meta"]["fallback_used"] is True
+        assert result["time"]["meta"]["fallback_reason"] == "timeout"
+        assert result["metadata"]["timeouts"] == ["time"]
+        assert result["metadata"]["motors_succeeded"] == 3
+
+    def test_error_is_isolated(self, budget_ms):
+        """Hata veren motor diğerlerini etkilememeli"""
+        result = _analyze(FakeWrapper({"priority": "boom"}))
+
+        assert "priority" not in result
+        assert result["metadata"]["motors_failed"] == 1
+        assert result["metadata"]["errors"][0]["motor"] == "priority"
+
+    def test_saturated_pool_skips_motors(self, budget_ms, monkeypatch):
+        """Pool doluysa motor kuyruğa girmez, hemen fallback döner"""
+        _wait_pool_idle()
+        monkeypatch.setattr(motor_orchestrator, "MOTOR_POOL_MAX_IN_FLIGHT", 0)
+
+        start = time.perf_counter()
+        result = _analyze(FakeWrapper({m: 0.5 for m in ("difficulty", "bs_model", "time", "priority")}))
+
+        assert time.perf_counter() - start < 0.2
+        assert result["metadata"]["pool_saturated"] == ["difficulty", "bs_model", "time", "priority"]
+        assert result["bs_model"]["meta"]["fallback_reason"] == "pool_saturated"
+        rejected = {tuple(x.labels.values()): x.value for x in motor_orchestrator.MOTOR_REJECTED.collect().samples}
+        assert rejected[("time",)] >= 1
+        assert motor_orchestrator._pool_load.snapshot()["in_flight"] == 0
+
+    def test_timed_out_motor_holds_its_slot(self, budget_ms):
+        """Timeout'a düşen motor thread'i bitene kadar in-flight sayılır"""
+        _wait_pool_idle()
+        budget_ms["ms"] = 20
+
+        _analyze(FakeWrapper({"time": 0.2}))
+
+        assert motor_orchestrator._pool_load.snapshot()["in_flight"] == 1
+        time.sleep(0.3)
+        assert motor_orchestrator._pool_load.snapshot() == {"in_flight": 0, "running": 0, "queued": 0}
+
+    def test_pool_metrics(self, budget_ms):
+        from app.core.metrics import metrics
+
+        budget_ms["ms"] = 20
+        _analyze(FakeWrapper({"time": 0.1}))
+        _wait_pool_idle()
+
+        text = metrics.render()
+        assert 'endstp_motor_timeouts_total{motor="time"}' in text
+        assert "endstp_motor_pool_queue_depth 0" in text
+        assert "endstp_motor_pool_threads 16" in text
+
+    def test_fallback_builders(self):
+        """Her motor için nötr fallback üretilebilmeli"""
+        from app.core.motor_wrapper import UserTier
+
+        for name in ("difficulty", "bs_model", "time", "priority"):
+            fb = motor_orchestrator._fallback_result(name, "t1", UserTier.FREE, TEST_DATA, "timeout")
+            assert fb["meta"]["fallback_used"] is True
+            assert fb["data"] is not None
@@ -0,0 +1,168 @@
+"""
+Orchestrator Batch Runner Tests
+Columnar cohort pass must match run_orchestrator decision-for-decision
+"""
+import random
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.orchestrator import runner
+from app.orchestrator.batch import run_orchestrator_batch
+from app.orchestrator.contract import OrchestratorInput, OrchestratorTopicInput
+from app.orchestrator.runner import run_orchestrator
+
+
+NOW = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+
+
+def _rng(topic):
+    # Motor çıktıları topic'e göre deterministik (iki runner aynı değeri görsün)
+    return random.Random(f"{topic.topic_id}|{topic.topic_name}")
+
+
+def _codes(*codes):
+    return [SimpleNamespace(code=c) for c in codes]
+
+
+def fake_bs(payload):
+    items = []
+    for t in payload.topics:
+        r = _rng(t)
+        overdue = r.choice([0, 0, 1, 3, 7, 12])
+        items.append(SimpleNamespace(
+            topic_id=t.topic_id,
+            bs_due=r.random() < 0.8,
+            bs_overdue_days=overdue,
+            bs_remembering_rate=r.uniform(-5, 110),
+            status=r.choice(["NEW", "NORMAL", "RESET"]),
+            reasons=_codes("BS_DUE", "BS_OVERDUE" if overdue else ""),
+            meta={"engine": "bs-fake"},
+        ))
+    return SimpleNamespace(items=items)
+
+
+def fake_difficulty(payload):
+    items = []
+    for t in payload.topics:
+        r = _rng(t)
+        r.random()
+        if r.random() < 0.1:
+            continue  # item yok -> difficulty 0.0
+        items.append(SimpleNamespace(
+            topic_id=t.topic_id,
+            difficulty_score=round(r.uniform(0, 100), 2),
+            reasons=_codes("LOW_SUCCESS"),
+        ))
+    return SimpleNamespace(items=items)
+
+
+def fake_time(payload):
+    items = []
+    for t in payload.topics:
+        r = _rng(t)
+        r.random(), r.random()
+        if r.random() < 0.2:
+            continue  # pace yok -> pace_bucket None
+        items.append(SimpleNamespace(
+            topic_id=t.topic_id,
+            pace_score=r.choice([0.0, 39.99, 40.0, 60.0, 69.99, 70.0, r.uniform(0, 100)]),
+        ))
+    return SimpleNamespace(items=items)
+
+
+def fake_priority(payload):
+    items = []
+    for t in payload.topics:
+        r = _rng(t)
+        r.random(), r.random(), r.random()
+        if r.random() < 0.15:
+            continue  # item yok -> fallback score
+        # Eşit skorlar: stable sıralama da birebir olmalı
+        items.append(SimpleNamespace(
+            topic_id=t.topic_id,
+            score=r.choice([40.0, 60.0, 80.0, 55.5, r.uniform(0, 100)]),
+        ))
+    return SimpleNamespace(items=items)
+
+
+@pytest.fixture
+def fake_motors(monkeypatch):
+    monkeypatch.setattr(runner, "run_bs_model_engine", fake_bs)
+    monkeypatch.setattr(runner, "run_difficulty_engine", fake_difficulty)
+    monkeypatch.setattr(runner, "run_time_pace_engine", fake_time)
+    monkeypatch.setattr(runner, "run_priority_engine", fake_priority)
+
+
+def _cohort(n_students, seed=7):
+    r = random.Random(seed)
+    inputs = []
+    for s in range(n_students):
+        topics = [
+            OrchestratorTopicInput(
+                topic_id=f"t{r.randint(0, 40)}",  # öğrenciler arası ortak id'ler
+                subject_name="Matematik",
+                topic_name=f"Konu {s}-{k}",
+            )
+            for k in range(r.randint(0, 15))
+        ]
+        inputs.append(OrchestratorInput(student_id=f"s{s}", topics=topics, now=NOW))
+    return inputs
+
+
+def _assert_same(batch_out, single_out):
+    assert batch_out.generated_at == single_out.generated_at
+    assert batch_out.meta == single_out.meta
+    assert [d.topic_id for d in batch_out.decisions] == [d.topic_id for d in single_out.decisions]
+    assert batch_out.decisions == single_out.decisions
+
+
+class TestOrchestratorBatch:
+    """Vectorized cohort pass"""
+
+    def test_matches_single_runner_on_random_cohort(self, fake_motors):
+        """Her öğrenci için run_orchestrator ile birebir aynı çıktı"""
+        inputs = _cohort(60)
+
+        outputs = run_orchestrator_batch(inputs)
+
+        assert len(outputs) == len(inputs)
+        assert sum(len(o.decisions) for o in outputs) > 100
+        for inp, out in zip(inputs, outputs):
+            _assert_same(out, run_orchestrator(inp))
+
+    def test_matches_single_runner_with_real_motors(self):
+        """Gerçek motorlarla da aynı sonuç"""
+        inputs = _cohort(10, seed=3)
+
+        for inp, out in zip(inputs, run_orchestrator_batch(inputs)):
+            _assert_same(out, run_orchestrator(inp))
+
+    def test_ranks_are_per_student(self, fake_motors):
+        """priority_rank her öğrencide 1'den başlar, skor DESC"""
+        for out in run_orchestrator_batch(_cohort(20)):
+            ranks = [d.signals["priority_rank"] for d in out.decisions]
+            scores = [d.signals["priority_score"] for d in out.decisions]
+            assert ranks == list(range(1, len(ranks) + 1))
+            assert scores == sorted(scores, reverse=True)
+
+    def test_motor_failure_isolated_per_student(self, fake_motors, monkeypatch):
+        """bs_model bir öğrencide patlarsa sadece o öğrenci boş döner"""
+        def flaky_bs(payload):
+            if any(t.topic_name.startswith("Konu 1-") for t in payload.topics):
+                raise RuntimeError("bs exploded")
+            return fake_bs(payload)
+
+        monkeypatch.setattr(runner, "run_bs_model_engine", flaky_bs)
+        inputs = _cohort(5)
+
+        outputs = run_orchestrator_batch(inputs)
+
+        assert outputs[1].decisions == []
+        assert outputs[1].meta["error_bs_model"] == "bs exploded"
+        for inp, out in zip(inputs, outputs):
+            _assert_same(out, run_orchestrator(inp))
+
+    def test_empty_cohort(self):
+        assert run_orchestrator_batch([]) == []
@@ -0,0 +1,282 @@
+"""
+Pending Test Pipeline Tests
+Batch claim, per-topic motor state, retry with backoff, queue depth / lag
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.jobs import process_pending_tests as pipeline
+from app.jobs.process_pending_tests import PendingTestWorker, process_batch, queue_stats
+from app.tests.fake_supabase import FakeSupabase
+
+NOW = datetime.now(timezone.utc)
+
+
+def _test(test_id, student_id, topic_id, days_ago, status="pending", correct=8, duration=15):
+    created = (NOW - timedelta(days=days_ago)).isoformat()
+    return {
+        "id": test_id,
+        "student_id": student_id,
+        "topic_id": topic_id,
+        "test_date": created,
+        "created_at": created,
+        "correct_count": correct,
+        "wrong_count": 12 - correct,
+        "empty_count": 0,
+        "success_rate": round(correct / 12 * 100, 2),
+        "test_duration_minutes": duration,
+        "is_processed": status == "processed",
+        "processing_status": status,
+        "processing_attempts": 0,
+        "processing_next_attempt_at": created,
+    }
+
+
+@pytest.fixture
+def fake_db():
+    return FakeSupabase({
+        "student_topic_tests": [
+            _test("a1", "s1", "A", 9, status="processed"),
+            _test("a2", "s1", "A", 3),
+            _test("a3", "s1", "A", 1),
+            _test("b1", "s1", "B", 2, correct=3),
+            _test("c1", "s2", "A", 1),
+        ],
+        "student_topic_state": [],
+    })
+
+
+def _rows(db, status):
+    return sorted(r["id"] for r in db.tables["student_topic_tests"] if r["processing_status"] == status)
+
+
+class TestProcessBatch:
+    """claim -> hesapla -> upsert -> processed"""
+
+    def test_processes_pending_and_persists_state(self, fake_db):
+        summary = process_batch(fake_db, "w1", batch_size=10)
+
+        assert summary["claimed"] == 4
+        assert summary["processed"] == 4
+        assert summary["topics"] == 3  # (s1,A) iki pending test, tek hesap
+        assert _rows(fake_db, "pending") == []
+        assert all(r["is_processed"] for r in fake_db.tables["student_topic_tests"])
+
+        states = {(s["student_id"], s["topic_id"]): s for s in fake_db.tables["student_topic_state"]}
+        s1a = states[("s1", "A")]
+        assert s1a["test_count"] == 3  # processed eski test de hesaba girer
+        assert s1a["repetitions"] == 3
+        assert s1a["latest_test_id"] == "a3"
+        assert s1a["ease_factor"] == s1a["bs_model"]["next_ef"]
+        assert states[("s1", "B")]["difficulty_score"] > s1a["difficulty_score"]
+        assert states[("s2", "A")]["pace_ratio"] > 0
+
+    def test_round_trips_independent_of_batch_size(self, fake_db):
+        process_batch(fake_db, "w1", batch_size=10)
+
+        # release + select + claim + fetch + upsert + processed
+        assert fake_db.query_count() == 6
+
+    def test_batch_size_and_oldest_first(self, fake_db):
+        summary = process_batch(fake_db, "w1", batch_size=2)
+
+        assert summary["claimed"] == 2
+        assert _rows(fake_db, "pending") == ["a3", "c1"]
+
+    def test_claimed_rows_not_taken_twice(self, fake_db):
+        first = pipeline.claim_pending_tests(fake_db, "w1", 2)
+        second = pipeline.claim_pending_tests(fake_db, "w2", 10)
+
+        assert {r["id"] for r in first} == {"a2", "b1"}
+        assert {r["id"] for r in second} == {"a3", "c1"}
+
+    def test_stale_claims_released(self, fake_db):
+        pipeline.claim_pending_tests(fake_db, "w1", 10, now=NOW - timedelta(hours=1))
+
+        summary = process_batch(fake_db, "w2", batch_size=10)
+
+        # Lease kaybı bir deneme sayılır: backoff ile pending (hemen tekrar claim yok)
+        assert summary["released"] == 4
+        assert summary["processed"] == 0
+        assert _rows(fake_db, "pending") == ["a2", "a3", "b1", "c1"]
+        released = next(r for r in fake_db.tables["student_topic_tests"] if r["id"] == "a2")
+        assert released["processing_attempts"] == 1
+        assert released["processing_error"] == "lease expired"
+        assert released["processing_next_attempt_at"] > NOW.isoformat()
+
+    def test_row_that_keeps_crashing_the_worker_fails(self, fake_db, monkeypatch):
+        """Her seferinde lease'i düşüren satır MAX_ATTEMPTS'ta failed olur"""
+        monkeypatch.setattr(pipeline, "MAX_ATTEMPTS", 2)
+        for row in fake_db.tables["student_topic_tests"]:
+            if row["id"] == "b1":
+                row["processing_attempts"] = 1
+
+        pipeline.claim_pending_tests(fake_db, "w1", 10, now=NOW - timedelta(hours=1))
+        pipeline.release_stale_claims(fake_db, NOW)
+
+        assert _rows(fake_db, "failed") == ["b1"]
+
+    def test_release_does_not_override_finished_rows(self, fake_db):
+        """Geç biten worker processed yazdıysa lease geri alımı onu ezmez"""
+        stale = [{"id": "a2", "processing_attempts": 0}]
+        for row in fake_db.tables["student_topic_tests"]:
+            if row["id"] == "a2":
+                row["processing_status"] = "processed"
+
+        counts = pipeline._mark_retry(fake_db, stale, "lease expired", NOW, only_status="processing")
+
+        assert counts == {"retried": 0, "failed": 0}
+        assert "a2" in _rows(fake_db, "processed")
+
+
+class TestStateReadPath:
+    """get_student_performance state'i lookup eder; PUT/DELETE requeue eder"""
+
+    @pytest.fixture
+    def perf(self, fake_db, monkeypatch):
+        from app.api.v1.endpoints.student import performance
+        from app.api.v1.endpoints.student import tests as tests_endpoint
+
+        monkeypatch.setattr(performance, "get_supabase_admin", lambda: fake_db)
+        monkeypatch.setattr(tests_endpoint, "get_supabase_admin", lambda: fake_db)
+        monkeypatch.setattr(tests_endpoint, "refresh_streak_state", lambda *a: None)
+        performance.clear_cache()
+        yield performance
+        performance.clear_cache()
+
+    def test_cold_read_uses_persisted_state(self, fake_db, perf, monkeypatch):
+        process_batch(fake_db, "w1", batch_size=10)
+        expected = perf.get_student_performance("s1", use_cache=False)["topic_performance"]
+
+        def no_compute(topic_tests):
+            raise AssertionError("BS-Model should not be recomputed")
+
+        monkeypatch.setattr(perf, "_build_topic_entry", no_compute)
+        result = perf.get_student_performance("s1", use_cache=False)
+
+        assert result["metadata"]["topic_state_hits"] == 2
+        assert result["topic_performance"] == expected
+
+    def test_stale_state_is_recomputed(self, fake_db, perf):
+        process_batch(fake_db, "w1", batch_size=10)
+        fake_db.tables["student_topic_tests"].append(_test("a4", "s1", "A", 0))
+
+        result = perf.get_student_performance("s1", use_cache=False)
+
+        assert result["metadata"]["topic_state_hits"] == 1  # sadece B
+        assert result["topic_performance"]["A"]["repetitions"] == 4
+
+    def test_put_and_delete_requeue_topic(self, fake_db, perf):
+        import asyncio
+
+        from app.api.v1.endpoints.student import tests as tests_endpoint
+
+        process_batch(fake_db, "w1", batch_size=10)
+        asyncio.run(tests_endpoint.update_test(
+            "a2", {"correct_count": 2, "wrong_count": 10, "test_date": NOW.isoformat()},
+            current_user={"id": "s1"},
+        ))
+
+        pairs = {(s["student_id"], s["topic_id"]) for s in fake_db.tables["student_topic_state"]}
+        assert ("s1", "A") not in pairs
+        assert _rows(fake_db, "pending") == ["a1", "a2", "a3"]
+
+        asyncio.run(tests_endpoint.delete_test("b1", current_user={"id": "s1"}))
+        pairs = {(s["student_id"], s["topic_id"]) for s in fake_db.tables["student_topic_state"]}
+        assert pairs == {("s2", "A")}
+
+        summary = process_batch(fake_db, "w1", batch_size=10)
+        assert summary["topics"] == 1
+        state = next(s for s in fake_db.tables["student_topic_state"] if s["topic_id"] == "A" and s["student_id"] == "s1")
+        assert state["test_count"] == 3
+
+    def test_lookup_read_skips_test_rows(self, fake_db, perf):
+        """Güncel state: probe + state, test satırı okunmaz; history lazy"""
+        process_batch(fake_db, "w1", batch_size=10)
+        expected = perf.get_student_performance("s1", use_cache=False)
+        perf.clear_cache()
+        fake_db.reset_queries()
+
+        result = perf.get_student_performance("s1", include_history=False)
+
+        assert result["topic_performance"].keys() == expected["topic_performance"].keys()
+        assert result["topic_performance"]["A"]["bs_model"] == expected["topic_performance"]["A"]["bs_model"]
+        assert result["history"] is None
+        # state select + tek probe (limit 1)
+        assert fake_db.queries == [("student_topic_state", "select"), ("student_topic_tests", "select")]
+
+        fake_db.reset_queries()
+        with_history = perf.get_student_performance("s1")
+        assert with_history["metadata"]["from_cache"] is True
+        assert len(with_history["history"]) == len(expected["history"]) == 4
+        assert fake_db.query_count() == 1
+
+    def test_batch_bumps_student_version(self, fake_db):
+        from app.core.data_version import get_student_version
+
+        before = {sid: get_student_version(sid) for sid in ("s1", "s2")}
+        process_batch(fake_db, "w1", batch_size=10)
+
+        assert all(get_student_version(sid) != token for sid, token in before.items())
+
+
+class TestRetry:
+    """Hata: backoff ile pending, limit sonrası failed"""
+
+    def test_compute_error_backoff_then_failed(self, fake_db, monkeypatch):
+        def broken(student_id, topic_id, topic_tests):
+            if topic_id == "B":
+                raise ValueError("bad row")
+            return original(student_id, topic_id, topic_tests)
+
+        original = pipeline.compute_topic_state
+        monkeypatch.setattr(pipeline, "compute_topic_state", broken)
+
+        summary = process_batch(fake_db, "w1", batch_size=10)
+
+        assert summary["processed"] == 3
+        assert summary["retried"] == 1
+        b1 = next(r for r in fake_db.tables["student_topic_tests"] if r["id"] == "b1")
+        assert b1["processing_status"] == "pending"
+        assert b1["processing_attempts"] == 1
+        assert b1["processing_error"] == "compute: bad row"
+        assert b1["processing_next_attempt_at"] > NOW.isoformat()  # backoff: hemen tekrar alınmaz
+        assert process_batch(fake_db, "w1", batch_size=10)["claimed"] == 0
+
+        b1["processing_attempts"] = pipeline.MAX_ATTEMPTS - 1
+        b1["processing_next_attempt_at"] = NOW.isoformat()
+        summary = process_batch(fake_db, "w1", batch_size=10)
+
+        assert summary["failed"] == 1
+        assert _rows(fake_db, "failed") == ["b1"]
+
+    def test_backoff_is_exponential_and_capped(self):
+        assert pipeline.backoff_seconds(1) == pipeline.BACKOFF_BASE_SECONDS
+        assert pipeline.backoff_seconds(3) == pipeline.BACKOFF_BASE_SECONDS * 4
+        assert pipeline.backoff_seconds(50) == pipeline.BACKOFF_MAX_SECONDS
+
+
+class TestQueueMetrics:
+    def test_depth_and_lag(self, fake_db):
+        stats = queue_stats(fake_db, now=NOW)
+
+        assert stats["pending"] == 4
+        assert stats["processing"] == 0
+        assert stats["lag_seconds"] == pytest.approx(3 * 86400, abs=1)
+
+        process_batch(fake_db, "w1", batch_size=10)
+
+        assert queue_stats(fake_db)["pending"] == 0
+        assert queue_stats(fake_db)["lag_seconds"] == 0.0
+
+    def test_worker_metrics(self, fake_db):
+        worker = PendingTestWorker(batch_size=3, client_factory=lambda: fake_db)
+
+        worker.run_once()
+        worker.run_once()
+        stats = worker.stats()
+
+        assert stats["batches"] == 2
+        assert stats["processed"] == 4
+        assert stats["running"] is False
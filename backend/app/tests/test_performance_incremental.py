@@ -0,0 +1,120 @@
+"""
+Incremental Topic Performance Tests
+Write-through on submit / PUT / DELETE recomputes only the changed topic
+"""
+import asyncio
+
+import pytest
+
+from app.api.v1.endpoints.student import performance
+from app.api.v1.endpoints.student import tests as tests_endpoint
+from app.tests.fake_supabase import FakeSupabase
+
+
+def _test(test_id, topic_id, day, correct=8, wrong=2, empty=2):
+    return {
+        "id": test_id,
+        "student_id": "s1",
+        "topic_id": topic_id,
+        "test_date": f"2026-01-{day:02d}T10:00:00+00:00",
+        "correct_count": correct,
+        "wrong_count": wrong,
+        "empty_count": empty,
+        "success_rate": round(correct / 12 * 100, 2),
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "student_topic_tests": [
+            _test("a1", "A", 1),
+            _test("a2", "A", 4),
+            _test("b1", "B", 2),
+            _test("c1", "C", 3),
+        ],
+    })
+    monkeypatch.setattr(performance, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(tests_endpoint, "get_supabase_admin", lambda: db)
+    performance.clear_cache()
+    yield db
+    performance.clear_cache()
+
+
+def _full_recompute(student_id="s1"):
+    return performance.get_student_performance(student_id, use_cache=False)
+
+
+class TestIncrementalPerformance:
+    """Write-through topic aggregate"""
+
+    def test_update_reads_only_changed_topic(self, fake_db, monkeypatch):
+        """Sadece değişen topic yeniden hesaplanmalı"""
+        performance.get_student_performance("s1")
+        fake_db.tables["student_topic_tests"].append(_test("b2", "B", 5, correct=11, wrong=1, empty=0))
+
+        calls = []
+        original = performance._build_topic_entry
+        monkeypatch.setattr(
+            performance, "_build_topic_entry",
+            lambda tt: calls.append(tt[0]["topic_id"]) or original(tt),
+        )
+        fake_db.reset_queries()
+
+        assert performance.update_topic_performance("s1", "B") is True
+
+        assert calls == ["B"]
+        assert fake_db.query_count("student_topic_tests") == 1
+
+    def test_incremental_matches_full_recompute(self, fake_db):
+        """Incremental sonuç tam hesapla aynı olmalı"""
+        performance.get_student_performance("s1")
+        fake_db.tables["student_topic_tests"].append(_test("b2", "B", 5, correct=11, wrong=1, empty=0))
+
+        performance.update_topic_performance("s1", "B")
+        cached = performance.get_student_performance("s1")
+        full = _full_recompute()
+
+        assert cached["metadata"]["from_cache"] is True
+        assert cached["topic_performance"] == full["topic_performance"]
+        assert cached["history"].ids.tolist() == full["history"].ids.tolist()
+
+    def test_put_updates_aggregate(self, fake_db):
+        """PUT /tests/{id} topic entry'sini güncellemeli"""
+        performance.get_student_performance("s1")
+
+        asyncio.run(tests_endpoint.update_test(
+            "a2",
+            {"test_date": "2026-01-04T10:00:00+00:00", "correct_count": 3, "wrong_count": 9, "empty_count": 0},
+            current_user={"id": "s1"},
+        ))
+
+        cached = performance.get_student_performance("s1")
+        assert cached["topic_performance"] == _full_recompute()["topic_performance"]
+
+    def test_delete_last_test_removes_topic(self, fake_db):
+        """Topic'in son testi silinince entry kalkmalı"""
+        performance.get_student_performance("s1")
+
+        asyncio.run(tests_endpoint.delete_test("c1", current_user={"id": "s1"}))
+
+        cached = performance.get_student_performance("s1")
+        assert "C" not in cached["topic_performance"]
+        assert "c1" not in cached["history"].ids.tolist()
+
+    def test_no_aggregate_is_noop(self, fake_db):
+        """Cache'te aggregate yoksa DB'ye gidilmemeli"""
+        assert performance.update_topic_performance("s1", "A") is False
+        assert fake_db.query_count() == 0
+
+    def test_long_ttl_only_with_shared_backend(self, tmp_path):
+        """memory modunda diğer worker'lar write-through'u görmez -> kısa TTL"""
+        from app.core.cache import InProcessBackend, SQLiteBackend, cache_registry
+
+        assert performance._cache_ttl() == performance.CACHE_TTL_SECONDS == 30
+
+        cache_registry.configure_backend(SQLiteBackend(str(tmp_path / "cache.sqlite3"), poll_interval=0))
+        try:
+            assert performance._cache_ttl() == performance.SHARED_CACHE_TTL_SECONDS
+        finally:
+            cache_registry.configure_backend(InProcessBackend())
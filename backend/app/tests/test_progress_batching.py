@@ -0,0 +1,120 @@
+"""
+Progress Batched Fetch Tests
+Subject breakdown / prediction: fixed round trips regardless of subject count
+(reference data served from the curriculum snapshot)
+"""
+import asyncio
+import importlib
+
+import pytest
+from fastapi import Response
+
+from app.core import curriculum
+from app.tests.fake_supabase import FakeSupabase, fake_request
+
+
+progress = importlib.import_module("app.api.v1.endpoints.progress.router")
+
+USER = {"id": "s1"}
+
+
+def _tables(n_subjects):
+    subjects, topics, weights, tests = [], [], [], []
+    for i in range(n_subjects):
+        sid = f"sub-{i}"
+        subjects.append({"id": sid, "code": f"S{i}", "name_tr": f"Ders {i}", "is_active": True})
+        for j in range(3):
+            topics.append({"id": f"{sid}-t{j}", "subject_id": sid, "is_active": True})
+        topics.append({"id": f"{sid}-old", "subject_id": sid, "is_active": False})
+        weights.append({"id": f"{sid}-w0", "subject_id": sid, "question_count": 10 * (i + 1)})
+        weights.append({"id": f"{sid}-w1", "subject_id": sid, "question_count": 5})
+        for k in range(i % 4):
+            tests.append({
+                "id": f"{sid}-x{k}",
+                "student_id": "s1",
+                "subject_id": sid,
+                "topic_id": f"{sid}-t{k % 3}",
+                "success_rate": 40.0 + 10 * k,
+                "test_date": f"2026-02-{k + 1:02d}T10:00:00+00:00",
+                "created_at": f"2026-02-{k + 1:02d}T10:00:00+00:00",
+            })
+    # Konusu olmayan ders listelenmez
+    subjects.append({"id": "empty", "code": "E", "name_tr": "Boş", "is_active": True})
+    return {
+        "subjects": subjects,
+        "topics": topics,
+        "subject_exam_weights": weights,
+        "student_topic_tests": tests,
+    }
+
+
+@pytest.fixture
+def make_db(monkeypatch):
+    """FakeSupabase + üzerinden yüklenmiş curriculum snapshot (sorgu sayacı sıfır)"""
+    def factory(tables):
+        db = FakeSupabase(tables)
+        monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+        curriculum.curriculum_store.reset()
+        curriculum.curriculum_store.get()
+        db.reset_queries()
+        return db
+
+    yield factory
+    curriculum.curriculum_store.reset()
+
+
+def _subject_progress(db):
+    return asyncio.run(progress.get_subject_progress(fake_request(), Response(), current_user=USER, supabase=db))
+
+
+def _prediction(db):
+    return asyncio.run(progress.get_forgetting_prediction(fake_request(), Response(), current_user=USER, supabase=db))
+
+
+class TestProgressBatching:
+    """N+1 yok: sorgu sayısı ders sayısından bağımsız"""
+
+    @pytest.mark.parametrize("n_subjects", [2, 25])
+    def test_subject_progress_fixed_round_trips(self, make_db, n_subjects):
+        db = make_db(_tables(n_subjects))
+
+        result = _subject_progress(db)
+
+        assert len(result["data"]) == n_subjects
+        # Referans veri snapshot'tan: sadece öğrencinin testleri okunur
+        assert db.query_count() == 1
+        assert db.query_count("student_topic_tests") == 1
+
+    def test_subject_progress_values_per_subject(self, make_db):
+        db = make_db(_tables(3))
+
+        rows = {r["subject_id"]: r for r in _subject_progress(db)["data"]}
+
+        assert "empty" not in rows
+        assert rows["sub-2"]["topics_total"] == 3  # pasif konu sayılmaz
+        assert rows["sub-2"]["total_exam_questions"] == 35
+        assert rows["sub-0"]["exam_weight_multiplier"] == 0.5
+        assert rows["sub-2"]["test_count"] == 2
+        assert rows["sub-2"]["last_test_date"] == "2026-02-02T10:00:00+00:00"
+
+    def test_missing_weights_fall_back_to_baseline(self, make_db):
+        tables = _tables(2)
+        tables["subject_exam_weights"] = []
+        db = make_db(tables)
+
+        rows = _subject_progress(db)["data"]
+
+        assert {r["exam_weight_multiplier"] for r in rows} == {1.0}
+        assert {r["total_exam_questions"] for r in rows} == {0}
+
+    @pytest.mark.parametrize("n_subjects", [3, 30])
+    def test_prediction_names_without_subject_queries(self, make_db, n_subjects):
+        db = make_db(_tables(n_subjects))
+
+        data = _prediction(db)["data"]
+
+        assert db.query_count() == 1
+        assert data["predictions"]
+        for subject_id, prediction in data["predictions"].items():
+            assert prediction["subject_name"] == f"Ders {subject_id.split('-')[1]}"
+        assert data["steepest_decline"]["subject_name"].startswith("Ders ")
@@ -0,0 +1,187 @@
+"""
+Query Accounting Tests
+Per-request query counts, N+1 warnings, debug headers, test budgets
+"""
+import asyncio
+
+import httpx
+import jwt
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints.student import dashboard
+from app.core import curriculum, data_version
+from app.core.auth import get_current_user
+from app.db import query_accounting
+from app.db.query_accounting import (
+    QueryStats,
+    check_budget,
+    query_accounting_middleware,
+    rows_from_content_range,
+    set_route_budget,
+    track_queries,
+)
+from app.db.session import SupabaseClientProvider
+from app.tests.fake_supabase import FakeSupabase
+from app.tests.query_budget import assert_max_queries
+
+
+def _test_row(test_id, student_id="s1"):
+    return {
+        "id": test_id,
+        "student_id": student_id,
+        "topic_id": "A",
+        "test_date": f"2026-03-0{test_id[-1]}T10:00:00+00:00",
+        "correct_count": 8,
+        "wrong_count": 2,
+        "empty_count": 0,
+        "net_score": 7.5,
+        "success_rate": 80.0,
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "subjects": [{"id": "mat", "name_tr": "Matematik"}],
+        "topics": [{"id": "A", "subject_id": "mat", "name_tr": "Limit"}],
+        "student_topic_tests": [_test_row("t1"), _test_row("t2"), _test_row("t3")],
+    })
+    monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+    curriculum.curriculum_store.reset()
+    monkeypatch.setattr(dashboard, "get_supabase_admin", lambda: db)
+    data_version._version_store.clear()
+    yield db
+    data_version._version_store.clear()
+    curriculum.curriculum_store.reset()
+
+
+def _run(app, path):
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(call())
+
+
+def _dashboard_app():
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "s1"}
+    return app
+
+
+class TestQueryStats:
+    def test_counts_fake_supabase_queries_and_rows(self, fake_db):
+        with track_queries() as outer:
+            fake_db.table("student_topic_tests").select("*").eq("student_id", "s1").execute()
+            with track_queries() as inner:
+                fake_db.table("topics").select("*").execute()
+
+        assert inner.queries == 1 and inner.rows == 1
+        assert outer.queries == 2 and outer.rows == 4
+        assert outer.targets[("GET", "student_topic_tests")] == 1
+
+    def test_no_recording_outside_request(self, fake_db):
+        assert query_accounting.current_query_stats() is None
+        fake_db.table("topics").select("*").execute()  # no-op, hata yok
+
+    @pytest.mark.parametrize("value,expected", [
+        ("0-24/*", 25),
+        ("10-19/120", 10),
+        ("*/0", 0),
+        (None, 0),
+        ("garbage", 0),
+    ])
+    def test_rows_from_content_range(self, value, expected):
+        assert rows_from_content_range(value) == expected
+
+
+class TestBudget:
+    def test_repeated_query_flagged_as_n_plus_one(self):
+        stats = QueryStats()
+        for _ in range(query_accounting.REPEAT_THRESHOLD):
+            stats.add("topics", "GET", 1, 0, 0.5)
+        stats.add("subjects", "GET", 1, 0, 0.5)
+
+        warnings = check_budget(stats, "GET", "/probe/n-plus-one")
+
+        assert warnings == [
+            f"possible N+1: GET /probe/n-plus-one GET topics x{query_accounting.REPEAT_THRESHOLD}"
+        ]
+
+    def test_route_budget_override(self):
+        stats = QueryStats()
+        stats.add("topics", "GET", 0, 0, 0.0)
+        stats.add("subjects", "GET", 0, 0, 0.0)
+
+        assert check_budget(stats, "GET", "/probe/budget") == []
+        set_route_budget("/probe/budget", 1)
+        assert check_budget(stats, "GET", "/probe/budget") == [
+            "query budget exceeded: GET /probe/budget 2 > 1"
+        ]
+
+    def test_assert_max_queries_fails_over_limit(self, fake_db):
+        with pytest.raises(AssertionError, match="exceeds budget of 1"):
+            with assert_max_queries(1, "probe"):
+                fake_db.table("topics").select("*").execute()
+                fake_db.table("subjects").select("*").execute()
+
+
+class TestMiddleware:
+    def test_debug_headers_and_metrics(self, fake_db, monkeypatch):
+        monkeypatch.setattr(query_accounting, "DEBUG_HEADERS", True)
+        app = _dashboard_app()
+        app.middleware("http")(query_accounting_middleware)
+        before = query_accounting.REQUEST_QUERIES.count("GET", "/tests")
+
+        response = _run(app, "/tests")
+
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Queries"]) >= 1
+        assert int(response.headers["X-DB-Rows"]) >= 3
+        assert "X-DB-Time-Ms" in response.headers
+        assert query_accounting.REQUEST_QUERIES.count("GET", "/tests") == before + 1
+
+    def test_headers_hidden_by_default(self, fake_db, monkeypatch):
+        monkeypatch.setattr(query_accounting, "DEBUG_HEADERS", False)
+        app = _dashboard_app()
+        app.middleware("http")(query_accounting_middleware)
+
+        response = _run(app, "/tests")
+
+        assert "X-DB-Queries" not in response.headers
+
+    def test_tests_endpoint_query_budget(self, fake_db):
+        app = _dashboard_app()
+        _run(app, "/tests")  # müfredat cache'i ısınsın
+
+        # Sıcak cache: sadece test sayfası
+        with assert_max_queries(1, "GET /tests") as stats:
+            response = _run(app, "/tests")
+
+        assert response.status_code == 200
+        assert len(response.json()["tests"]) == 3
+        assert stats.repeated() == []
+
+
+class TestTransport:
+    def test_real_transport_records_rows_and_bytes(self, monkeypatch):
+        key = jwt.encode({"role": "service_role"}, "x" * 32, algorithm="HS256")
+        monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+        monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", key)
+        transport = httpx.MockTransport(lambda request: httpx.Response(
+            200, json=[{"id": 1}, {"id": 2}], headers={"Content-Range": "0-1/*"},
+        ))
+        client = SupabaseClientProvider(pool_size=2, transport=transport).get_admin()
+
+        with track_queries() as stats:
+            client.table("accounting_probe").select("id").execute()
+            client.rpc("rpc_probe", {}).execute()
+
+        assert stats.queries == 2
+        assert stats.rows == 4
+        assert stats.bytes > 0
+        assert stats.targets[("GET", "accounting_probe")] == 1
+        assert stats.targets[("POST", "rpc:rpc_probe")] == 1
@@ -0,0 +1,223 @@
+"""
+Rate Limiter Tests
+Sliding window per student + route, shared SQLite backend, 429 + Retry-After
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core import rate_limit as rl
+from app.core.auth import get_current_user
+from app.core.rate_limit import (
+    InProcessRateLimitBackend,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+    rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSlidingWindow:
+    """Pencere kayar: eski istekler düştükçe yer açılır"""
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_limit_and_slide(self, kind, tmp_path):
+        clock = FakeClock()
+        backend = (
+            InProcessRateLimitBackend(clock=clock)
+            if kind == "memory"
+            else SQLiteRateLimitBackend(str(tmp_path / "rl.sqlite3"), clock=clock)
+        )
+
+        assert [backend.hit("k", 3, 5).allowed for _ in range(3)] == [True, True, True]
+        blocked = backend.hit("k", 3, 5)
+        assert not blocked.allowed
+        assert blocked.retry_after == pytest.approx(5.0)
+
+        clock.now += 2
+        assert backend.hit("other", 3, 5).allowed  # anahtarlar bağımsız
+        assert not backend.hit("k", 3, 5).allowed
+
+        clock.now += 3.01  # ilk 3 istek pencereden çıktı
+        result = backend.hit("k", 3, 5)
+        assert result.allowed
+        assert result.remaining == 2
+
+    def test_memory_keys_bounded(self):
+        backend = InProcessRateLimitBackend(max_keys=2, clock=FakeClock())
+        for key in ("a", "b", "c"):
+            backend.hit(key, 1, 60)
+
+        assert backend.stats()["keys"] == 2
+        assert backend.hit("a", 1, 60).allowed  # en eski anahtar atıldı
+
+    def test_sqlite_shared_between_workers(self, tmp_path):
+        path = str(tmp_path / "rl.sqlite3")
+        worker_a = RateLimiter(SQLiteRateLimitBackend(path))
+        worker_b = RateLimiter(SQLiteRateLimitBackend(path))
+        for limiter in (worker_a, worker_b):
+            limiter.register("test_submit", 3, 5)
+
+        results = [
+            worker_a.check("test_submit", "s1").allowed,
+            worker_b.check("test_submit", "s1").allowed,
+            worker_a.check("test_submit", "s1").allowed,
+            worker_b.check("test_submit", "s1").allowed,
+        ]
+
+        assert results == [True, True, True, False]
+        assert worker_b.stats()["rules"]["test_submit"]["blocked"] == 1
+
+
+    def test_purge_keeps_other_workers_longer_windows(self, tmp_path):
+        """5 sn'lik kural gören worker'ın purge'ü 60 sn'lik kayıtları silmemeli"""
+        path = str(tmp_path / "rl.sqlite3")
+        clock = FakeClock()
+        feedback_worker = SQLiteRateLimitBackend(path, clock=clock)
+        submit_worker = SQLiteRateLimitBackend(path, clock=clock)
+
+        assert all(feedback_worker.hit("support_feedback_submit:s1", 5, 60).allowed for _ in range(5))
+        assert not feedback_worker.hit("support_feedback_submit:s1", 5, 60).allowed
+
+        clock.now += 2 * rl.SQLITE_PURGE_INTERVAL_SECONDS / 3
+        submit_worker.hit("test_submit:s2", 3, 5)  # purge tetiklenir
+
+        assert not feedback_worker.hit("support_feedback_submit:s1", 5, 60).allowed
+
+    def test_legacy_table_gets_expiry_column(self, tmp_path):
+        import sqlite3
+
+        path = str(tmp_path / "rl.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE rate_limit_hits (key TEXT NOT NULL, ts REAL NOT NULL)")
+        conn.execute("INSERT INTO rate_limit_hits VALUES ('k', 1000.0)")
+        conn.commit()
+
+        backend = SQLiteRateLimitBackend(path, clock=FakeClock(1001.0))
+
+        assert backend.hit("k", 1, 60).allowed is False
+
+    def test_backend_is_abstract(self):
+        with pytest.raises(TypeError):
+            rl.RateLimitBackend()
+
+
+class TestRateLimiter:
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_FEEDBACK_SUBMIT", "2/30")
+        limiter = RateLimiter()
+
+        assert limiter.register("feedback_submit", 10, 60) == (2, 30.0)
+
+    def test_backend_failure_fails_open(self):
+        class Broken(InProcessRateLimitBackend):
+            def hit(self, key, limit, window_seconds):
+                raise RuntimeError("disk full")
+
+        limiter = RateLimiter(Broken())
+        limiter.register("r", 1, 60)
+
+        assert limiter.check("r", "s1").allowed
+        assert limiter.check("r", "s1").allowed
+        assert limiter.stats()["rules"]["r"]["errors"] == 2
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_reset_rule_keeps_other_rules(self, kind, tmp_path):
+        backend = (
+            InProcessRateLimitBackend(clock=FakeClock())
+            if kind == "memory"
+            else SQLiteRateLimitBackend(str(tmp_path / "rl.sqlite3"), clock=FakeClock())
+        )
+        limiter = RateLimiter(backend)
+        limiter.register("a", 1, 60)
+        limiter.register("ab", 1, 60)
+        for rule in ("a", "ab"):
+            limiter.check(rule, "s1")
+
+        limiter.reset(rule="a")
+
+        assert limiter.check("a", "s1").allowed
+        assert not limiter.check("ab", "s1").allowed  # "a:" prefix'i "ab:"'yi kapsamaz
+        with pytest.raises(ValueError):
+            limiter.reset(subject="s1")
+
+
+class TestRateLimitDependency:
+    """Route dependency: öğrenci başına 429 + Retry-After"""
+
+    @pytest.fixture
+    def app(self, monkeypatch):
+        monkeypatch.setattr(rl.rate_limiter, "backend", InProcessRateLimitBackend())
+        app = FastAPI()
+        user = {"id": "s1"}
+
+        @app.post("/submit", dependencies=[Depends(rl.rate_limit("unit_submit", limit=2, window_seconds=60))])
+        async def submit():
+            return {"ok": True}
+
+        app.dependency_overrides[get_current_user] = lambda: dict(user)
+        app.state.user = user
+        return app
+
+    def _post(self, app):
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/submit")
+
+        return asyncio.run(call())
+
+    def test_429_per_student(self, app):
+        codes = [self._post(app).status_code for _ in range(3)]
+        blocked = self._post(app)
+
+        assert codes == [200, 200, 429]
+        assert int(blocked.headers["retry-after"]) == 60
+
+        app.state.user["id"] = "s2"
+        assert self._post(app).status_code == 200
+
+    def test_sqlite_check_runs_off_the_event_loop(self, app, tmp_path, monkeypatch):
+        """SQLite BEGIN IMMEDIATE event loop thread'inde çalışmamalı"""
+        import threading
+
+        backend = SQLiteRateLimitBackend(str(tmp_path / "rl.sqlite3"))
+        threads = []
+        original_hit = backend.hit
+
+        def recording_hit(*args):
+            threads.append(threading.get_ident())
+            return original_hit(*args)
+
+        monkeypatch.setattr(backend, "hit", recording_hit)
+        monkeypatch.setattr(rl.rate_limiter, "backend", backend)
+
+        async def call():
+            loop_thread = threading.get_ident()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/submit")
+            return loop_thread, response
+
+        loop_thread, response = asyncio.run(call())
+
+        assert response.status_code == 200
+        assert threads and loop_thread not in threads
+
+    def test_write_endpoints_registered(self):
+        from app.api.v1.endpoints import feedback, test_entry  # noqa: F401
+        from app.api.v1.endpoints.student import support_feedback  # noqa: F401
+
+        rules = rate_limiter.stats()["rules"]
+
+        assert {"test_submit", "feedback_submit", "support_feedback_submit"} <= set(rules)
+        assert (rules["test_submit"]["limit"], rules["test_submit"]["window_seconds"]) == (3, 5.0)
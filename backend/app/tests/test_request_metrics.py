@@ -0,0 +1,112 @@
+"""
+Monitoring Aggregator Tests
+In-memory per-flag histogram, batched flush to feature_flags, no DB on record()
+"""
+import pytest
+
+from app.core.request_metrics import APPLY_RPC, FlagMetricsAggregator, LatencyHistogram
+from app.tests.fake_supabase import FakeSupabase
+
+
+def _apply_rpc(db, params):
+    """rpc_apply_flag_metrics (migration 033) davranışı"""
+    for delta in params["p_deltas"]:
+        for flag in db.tables["feature_flags"]:
+            if flag["flag_key"] == delta["flag_key"]:
+                flag["error_count"] += delta["error_delta"]
+                flag["health_score"] = max(0, flag["health_score"] - delta["health_penalty"])
+                flag["avg_response_time_ms"] = delta["avg_response_time_ms"]
+                flag["p95_response_time_ms"] = delta["p95_response_time_ms"]
+    return len(params["p_deltas"])
+
+
+@pytest.fixture
+def fake_db():
+    db = FakeSupabase({
+        "feature_flags": [
+            {"flag_key": "test_entry", "error_count": 2, "health_score": 100},
+            {"flag_key": "daily_tasks", "error_count": 0, "health_score": 100},
+        ],
+    })
+    db.rpc_handlers[APPLY_RPC] = _apply_rpc
+    return db
+
+
+def _flag(db, key):
+    return next(f for f in db.tables["feature_flags"] if f["flag_key"] == key)
+
+
+class TestHistogram:
+    def test_mean_and_p95(self):
+        h = LatencyHistogram()
+        for ms in [10] * 90 + [700] * 9 + [3000]:
+            h.observe(ms)
+
+        assert h.count == 100
+        assert h.mean() == round((900 + 6300 + 3000) / 100)
+        assert h.percentile(0.5) == 25  # bucket üst sınırı
+        assert h.percentile(0.95) == 1000
+        assert h.percentile(1.0) == 3000
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(0.95) is None
+
+
+class TestFlush:
+    def test_record_never_touches_db(self, fake_db):
+        metrics = FlagMetricsAggregator()
+        for _ in range(50):
+            metrics.record("test_entry", 120)
+
+        assert fake_db.queries == []
+        assert metrics.stats()["pending"]["test_entry"]["requests"] == 50
+
+    def test_one_rpc_per_flush_with_atomic_counters(self, fake_db):
+        metrics = FlagMetricsAggregator()
+        metrics.record("test_entry", 80)
+        metrics.record("test_entry", 1500, error="boom")
+        metrics.record("test_entry", 90, error="boom")
+        metrics.record("daily_tasks", 40)
+
+        assert metrics.flush(fake_db) == 2
+
+        assert fake_db.queries == [(APPLY_RPC, "rpc")]
+        flag = _flag(fake_db, "test_entry")
+        assert flag["error_count"] == 4
+        assert flag["health_score"] == 80
+        assert flag["p95_response_time_ms"] == 1500
+        assert _flag(fake_db, "daily_tasks")["error_count"] == 0
+        assert metrics.stats()["pending"] == {}
+        assert metrics.flush(fake_db) == 0  # boş pencere: DB yok
+        assert len(fake_db.queries) == 1
+
+    def test_failed_flush_keeps_deltas(self, fake_db):
+        def broken(db, params):
+            raise RuntimeError("connection reset")
+
+        metrics = FlagMetricsAggregator()
+        metrics.record("test_entry", 50, error="x")
+        fake_db.rpc_handlers[APPLY_RPC] = broken
+
+        assert metrics.flush(fake_db) == 0
+        metrics.record("test_entry", 60, error="y")
+
+        fake_db.rpc_handlers[APPLY_RPC] = _apply_rpc
+        assert metrics.flush(fake_db) == 1
+        assert _flag(fake_db, "test_entry")["error_count"] == 4
+        assert metrics.stats()["flush_errors"] == 1
+
+    def test_missing_rpc_falls_back_to_update(self, fake_db):
+        del fake_db.rpc_handlers[APPLY_RPC]
+        metrics = FlagMetricsAggregator()
+        metrics.record("test_entry", 50, error="x")
+        metrics.record("daily_tasks", 30)
+
+        assert metrics.flush(fake_db) == 2
+
+        flag = _flag(fake_db, "test_entry")
+        assert flag["error_count"] == 3
+        assert flag["health_score"] == 90
+        assert flag["last_error_message"] == "x"
+        assert _flag(fake_db, "daily_tasks")["avg_response_time_ms"] == 30
+        assert fake_db.query_count("feature_flags") == 3  # select + update, update
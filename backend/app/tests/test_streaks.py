@@ -0,0 +1,182 @@
+"""
+Streak Engine Tests
+O(n) current/longest streak, incremental counters, persisted state write-through
+"""
+import asyncio
+import random
+
+import pytest
+
+from app.api.v1.endpoints.student import streaks
+from app.api.v1.endpoints.student import tests as tests_endpoint
+from app.api.v1.endpoints.student.streaks import StreakState
+from app.core.timestamps import day_to_date, epoch_day
+from app.tests.fake_supabase import FakeSupabase
+
+TODAY = epoch_day("2026-03-10T12:00:00+00:00")
+
+
+def _brute_force(days, today):
+    """Eski yöntem: bugünden geriye gün gün + tüm seriler"""
+    present = set(days)
+    current, day = 0, today
+    while day in present:
+        current += 1
+        day -= 1
+    longest = 0
+    for d in present:
+        length = 1
+        while d + length in present:
+            length += 1
+        longest = max(longest, length)
+    return current, longest
+
+
+def _test(test_id, day, student_id="s1"):
+    return {
+        "id": test_id,
+        "student_id": student_id,
+        "topic_id": "A",
+        "test_date": f"{day_to_date(day).isoformat()}T10:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "student_topic_tests": [
+            _test("t1", TODAY - 3),
+            _test("t2", TODAY - 2),
+            _test("t3", TODAY - 1),
+            _test("t4", TODAY - 1),
+            _test("t5", TODAY - 10),
+        ],
+    })
+    monkeypatch.setattr(streaks, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(tests_endpoint, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(tests_endpoint, "update_topic_performance", lambda *a: True)
+    streaks.clear_streak_cache()
+    yield db
+    streaks.clear_streak_cache()
+
+
+class TestStreakEngine:
+    """Saf hesap: current / longest / milestone"""
+
+    def test_current_and_real_longest(self):
+        days = [TODAY, TODAY, TODAY - 1, TODAY - 2, TODAY - 4] + list(range(TODAY - 40, TODAY - 20))
+        summary = StreakState.from_days("s1", days).summary(TODAY)
+
+        assert summary["current_streak"] == 3
+        assert summary["longest_streak"] == 20
+        assert summary["streak_status"] == "active"
+        assert summary["last_study_date"] == str(day_to_date(TODAY))
+        assert summary["next_milestone"] == 7
+
+    def test_broken_streak_keeps_last_study_date(self):
+        summary = StreakState.from_days("s1", [TODAY - 3, TODAY - 2]).summary(TODAY)
+
+        assert summary["current_streak"] == 0
+        assert summary["longest_streak"] == 2
+        assert summary["streak_status"] == "broken"
+        assert summary["last_study_date"] == str(day_to_date(TODAY - 2))
+        assert StreakState.from_days("s1", []).summary(TODAY)["last_study_date"] == ""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            days = [TODAY - rng.randint(0, 60) for _ in range(rng.randint(0, 80))]
+            state = StreakState.from_days("s1", days)
+            for today in (TODAY, TODAY - 5, TODAY + 1):
+                current, longest = _brute_force(days, today)
+                assert state.current(today) == current
+                assert max(state.longest, current) == longest
+
+    def test_incremental_add_remove_matches_full_rebuild(self):
+        """add/remove dizisi her adımda tam hesapla aynı olmalı"""
+        rng = random.Random(11)
+        state = StreakState.from_days("s1", [])
+        days = []
+        for _ in range(400):
+            if days and rng.random() < 0.3:
+                day = days.pop(rng.randrange(len(days)))
+                state.remove(day)
+            else:
+                # çoğunlukla ileri tarih (O(1) yol), arada geçmişe ekleme
+                base = max(days) if days else TODAY
+                day = base + rng.choice([0, 1, 1, 2]) if rng.random() < 0.8 else base - rng.randint(1, 30)
+                days.append(day)
+                state.add(day)
+
+            full = StreakState.from_days("s1", days)
+            assert (state.last_day, state.run_start, state.longest, state.test_count) == (
+                full.last_day, full.run_start, full.longest, full.test_count,
+            )
+
+    def test_row_roundtrip(self):
+        state = StreakState.from_days("s1", [TODAY, TODAY - 1, TODAY - 1])
+        clone = StreakState.from_row(state.to_row())
+
+        assert clone.day_counts == state.day_counts
+        assert clone.summary(TODAY) == state.summary(TODAY)
+
+
+class TestStreakStore:
+    """cache -> student_streaks -> rebuild, write-through hook'ları"""
+
+    def test_persisted_state_read_without_test_scan(self, fake_db):
+        state = streaks.get_streak_state("s1")
+        assert state.summary(TODAY - 1)["current_streak"] == 3
+        assert len(fake_db.tables["student_streaks"]) == 1
+
+        streaks.clear_streak_cache()  # yeni worker
+        fake_db.reset_queries()
+
+        again = streaks.get_streak_state("s1")
+
+        assert again.longest == 3
+        assert fake_db.query_count("student_topic_tests") == 0
+        assert fake_db.query_count("student_streaks") == 1
+
+    def test_stale_state_rebuilt_from_rows(self, fake_db):
+        """Hook dışı yazım: test sayısı tutmazsa fetch edilen satırlardan kurulur"""
+        streaks.get_streak_state("s1")
+        rows = fake_db.tables["student_topic_tests"] + [_test("t6", TODAY)]
+
+        state = streaks.get_streak_state("s1", rows)
+
+        assert state.test_count == 6
+        assert state.current(TODAY) == 4
+
+    def test_submit_and_delete_write_through(self, fake_db):
+        streaks.get_streak_state("s1")
+        fake_db.reset_queries()
+
+        assert streaks.record_test_day("s1", f"{day_to_date(TODAY).isoformat()}T08:00:00Z") is True
+        assert fake_db.query_count("student_topic_tests") == 0
+        assert streaks.get_streak_state("s1").current(TODAY) == 4
+
+        result = asyncio.run(tests_endpoint.delete_test("t2", current_user={"id": "s1"}))
+
+        assert result == {"success": True}
+        state = streaks.get_streak_state("s1")
+        assert state.current(TODAY) == 2
+        assert state.longest == 2
+        persisted = StreakState.from_row(fake_db.tables["student_streaks"][0])
+        assert persisted.test_count == 5
+
+    def test_concurrent_submits_do_not_lose_days(self, fake_db):
+        """Paralel write-through: cache'teki nesne yerinde değişmemeli, sayım kaybolmamalı"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        before = streaks.get_streak_state("s1")
+        date = f"{day_to_date(TODAY).isoformat()}T08:00:00Z"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: streaks.record_test_day("s1", date), range(40)))
+
+        assert all(results)
+        assert before.test_count == 5  # okuyucunun elindeki state değişmedi
+        state = streaks.get_streak_state("s1")
+        assert state.test_count == 45
+        assert state.day_counts[TODAY] == before.day_counts.get(TODAY, 0) + 40
@@ -0,0 +1,125 @@
+"""
+Test Submission Tests
+One transactional RPC (idempotency key + task auto-complete), sequential fallback
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import test_entry
+from app.tests.fake_supabase import FakeSupabase
+
+TODAY = datetime.now(timezone.utc).date().isoformat()
+
+
+def _rpc_submit(db, params):
+    """rpc_submit_test_result (migration 031) davranışı"""
+    record, key = params["p_test"], params["p_idempotency_key"]
+    tests = db.tables.setdefault("student_topic_tests", [])
+
+    same_key = [t for t in tests if t["student_id"] == record["student_id"] and t.get("idempotency_key") == key]
+    if same_key:
+        task = next((t for t in db.tables["student_tasks"] if t.get("test_result_id") == same_key[0]["id"]), None)
+        return {"status": "duplicate", "test": same_key[0], "task": task}
+
+    if any(
+        t["student_id"] == record["student_id"]
+        and t["topic_id"] == record["topic_id"]
+        and t["test_date"] == record["test_date"]
+        for t in tests
+    ):
+        return {"status": "exists", "test": None, "task": None}
+
+    test = dict(record, id=f"test-{len(tests) + 1}", idempotency_key=key)
+    tests.append(test)
+
+    task = next((
+        t for t in db.tables["student_tasks"]
+        if t["student_id"] == record["student_id"] and t["task_date"] == params["p_task_date"]
+        and t["topic_id"] == record["topic_id"] and t["status"] == "pending"
+    ), None)
+    if task is not None:
+        task.update(status="completed", manual_completion=False, test_result_id=test["id"])
+    return {"status": "created", "test": test, "task": task}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "student_topic_tests": [],
+        "student_tasks": [
+            {"id": "task-1", "student_id": "s1", "task_date": TODAY, "topic_id": "A",
+             "topic_name": "Limit", "status": "pending"},
+        ],
+    })
+    db.rpc_handlers[test_entry.SUBMIT_RPC] = _rpc_submit
+    monkeypatch.setattr(test_entry, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(test_entry, "update_topic_performance", lambda *a: True)
+    monkeypatch.setattr(test_entry, "record_test_day", lambda *a: True)
+    monkeypatch.setattr(test_entry, "_submit_rpc_unavailable_until", 0.0)
+    yield db
+
+
+def _submit(topic_id="A", key=None, test_date="2026-03-01T10:00:00+00:00"):
+    payload = test_entry.TestResultSubmit(
+        subject_id="mat", topic_id=topic_id, test_date=test_date,
+        correct_count=8, wrong_count=4, empty_count=0,
+    )
+    return asyncio.run(test_entry.submit_test_result(
+        payload, current_user={"id": "s1"}, idempotency_key=key
+    ))
+
+
+class TestTransactionalSubmit:
+    """Tek RPC: duplicate + insert + görev tamamlama"""
+
+    def test_single_round_trip_with_task_auto_complete(self, fake_db):
+        result = _submit()
+
+        assert fake_db.queries == [(test_entry.SUBMIT_RPC, "rpc")]
+        assert result["test_id"] == "test-1"
+        assert result["net_score"] == 7.0
+        assert result["task_auto_completed"] is True
+        assert result["completed_task"] == {"task_id": "task-1", "task_name": "Limit"}
+        assert fake_db.tables["student_tasks"][0]["status"] == "completed"
+
+    def test_client_key_replay_returns_first_result(self, fake_db):
+        first = _submit(key="abc")
+        again = _submit(key="abc")
+
+        assert again["test_id"] == first["test_id"]
+        assert again["duplicate"] is True
+        assert again["completed_task"] == first["completed_task"]
+        assert len(fake_db.tables["student_topic_tests"]) == 1
+
+    @pytest.mark.parametrize("second_key", [None, "other"])
+    def test_same_topic_and_date_is_409(self, fake_db, second_key):
+        _submit(key="abc" if second_key is None else None)
+
+        with pytest.raises(HTTPException) as exc:
+            _submit(key=second_key)
+
+        assert exc.value.status_code == 409
+        assert len(fake_db.tables["student_topic_tests"]) == 1
+
+
+class TestSequentialFallback:
+    """RPC deploy edilmemişse eski sıralı yol, tekrar denemeden önce bekler"""
+
+    def test_missing_rpc_falls_back_once(self, fake_db):
+        del fake_db.rpc_handlers[test_entry.SUBMIT_RPC]
+
+        first = _submit()
+        fake_db.reset_queries()
+        second = _submit(topic_id="B")
+
+        assert first["task_auto_completed"] is True
+        assert first["test_id"] == fake_db.tables["student_topic_tests"][0]["id"]
+        assert second["task_auto_completed"] is False
+        assert fake_db.query_count(test_entry.SUBMIT_RPC) == 0  # retry penceresi
+
+        with pytest.raises(HTTPException) as exc:
+            _submit()
+        assert exc.value.status_code == 409
@@ -0,0 +1,152 @@
+"""
+TestHistory Tests
+Columnar per-student history: compact dtypes, window/topic slicing, aggregations
+"""
+import asyncio
+import pickle
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from fastapi import Response
+
+from app.api.v1.endpoints.progress.calculators import calculate_trends
+from app.api.v1.endpoints.student import dashboard, tasks
+from app.core.test_history import TestHistory
+from app.core.timestamps import day_to_date, epoch_day
+from app.tests.fake_supabase import fake_request
+from benchmarks.synthetic import make_test_history
+
+
+def _row(test_id, topic, day, success=50.0, subject="math", correct=5, wrong=3, empty=2):
+    return {
+        "id": test_id,
+        "student_id": "s1",
+        "topic_id": topic,
+        "subject_id": subject,
+        "test_date": f"2026-01-{day:02d}T10:00:00+00:00",
+        "correct_count": correct,
+        "wrong_count": wrong,
+        "empty_count": empty,
+        "success_rate": success,
+        "net_score": correct - wrong / 4,
+    }
+
+
+ROWS = [
+    _row("a3", "A", 9, success=70.0),
+    _row("b1", "B", 5, success=33.33, subject="phys"),
+    _row("a2", "A", 5, success=60.0),
+    _row("a1", "A", 1, success=40.0),
+]
+
+
+class TestTestHistory:
+    """Columnar build + slicing"""
+
+    def test_build_sorts_and_uses_compact_dtypes(self):
+        """ASC timestamp sırası (eşit anda fetch sırası), compact dtype'lar"""
+        h = TestHistory.from_rows(ROWS)
+
+        assert h.ids.tolist() == ["a1", "b1", "a2", "a3"]
+        assert h.correct.dtype == np.int8
+        assert h.success.dtype == np.float32
+        assert h.topic_ids == ("A", "B")
+        assert h.topic_id_column() == ["A", "B", "A", "A"]
+        assert day_to_date(h.day[0]) == date(2026, 1, 1)
+        assert h.success_values().tolist() == [40.0, 33.33, 60.0, 70.0]
+
+    def test_counts_widen_past_int8(self):
+        """127 üstü soru sayısı int16'ya genişlemeli (taşma yok)"""
+        h = TestHistory.from_rows([_row("x", "A", 1, correct=150)])
+        assert h.correct.dtype == np.int16
+        assert int(h.correct[0]) == 150
+
+    def test_window_and_topic_slicing(self):
+        h = TestHistory.from_rows(ROWS)
+
+        window = h.window(datetime(2026, 1, 5, tzinfo=timezone.utc), date(2026, 1, 9))
+        assert window.ids.tolist() == ["b1", "a2"]
+        assert h.since(date(2026, 1, 6)).ids.tolist() == ["a3"]
+        assert h.for_topic("A").ids.tolist() == ["a1", "a2", "a3"]
+        assert h.without_topic("A").ids.tolist() == ["b1"]
+        assert len(h.for_topic("missing")) == 0
+        assert h.for_topic("A").latest_date() == datetime(2026, 1, 9, 10, tzinfo=timezone.utc)
+
+    def test_merge_recodes_vocab(self):
+        """Topic splice: without_topic + merge"""
+        h = TestHistory.from_rows(ROWS)
+        fresh = TestHistory.from_rows([_row("c1", "C", 7, subject="chem"), _row("b9", "B", 2)])
+
+        merged = h.without_topic("B").merge(fresh)
+
+        assert merged.ids.tolist() == ["a1", "b9", "a2", "c1", "a3"]
+        assert merged.topic_id_column() == ["A", "B", "A", "C", "A"]
+        assert merged.subject_id_column()[3] == "chem"
+
+    def test_skips_unparseable_dates_and_pickles(self):
+        h = TestHistory.from_rows(ROWS + [{"id": "bad", "test_date": "not-a-date"}])
+        assert len(h) == 4
+
+        clone = pickle.loads(pickle.dumps(h))
+        assert clone.ids.tolist() == h.ids.tolist()
+        assert clone.topic_ids == h.topic_ids
+
+    def test_memory_order_of_magnitude_smaller(self):
+        """Ağır öğrenci: kolonsal history dict listesinin >=10x altında"""
+        rows = make_test_history(5000, seed=3)
+        dict_bytes = sum(
+            sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values())
+            for r in rows
+        )
+
+        assert TestHistory.from_rows(rows).nbytes * 10 < dict_bytes
+
+
+class TestHistoryConsumers:
+    """Dashboard, streak ve trend hesapları history üzerinden"""
+
+    def test_dashboard_windows(self, monkeypatch):
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**_row("w1", "A", 1, success=80.0), "test_date": (now - timedelta(days=1)).isoformat()},
+            {**_row("w2", "A", 1, success=61.0), "test_date": (now - timedelta(days=6)).isoformat()},
+            {**_row("m1", "A", 1, success=10.0), "test_date": (now - timedelta(days=20)).isoformat()},
+            {**_row("o1", "A", 1, success=10.0), "test_date": (now - timedelta(days=90)).isoformat()},
+        ]
+        perf = {
+            "topic_performance": {},
+            "history": TestHistory.from_rows(rows),
+            "projection": None,
+            "metadata": {},
+        }
+        monkeypatch.setattr(dashboard, "get_student_performance", lambda **kw: perf)
+
+        result = asyncio.run(dashboard.get_student_dashboard(fake_request(), Response(), current_user={"id": "s1"}))
+
+        assert result["weekly"] == {"tests": 2, "average_success": 70}
+        assert result["monthly"] == {"tests": 3}
+
+    def test_streak_from_study_days(self):
+        today = datetime.now(timezone.utc).replace(hour=12)
+        rows = [
+            {**_row(f"t{i}", "A", 1), "test_date": (today - timedelta(days=d)).isoformat()}
+            for i, d in enumerate([0, 0, 1, 2, 4])
+        ]
+
+        streak = tasks.calculate_streak(TestHistory.from_rows(rows), "UTC")
+
+        assert streak.current_streak == 3
+        assert streak.last_study_date == str(today.date())
+
+    def test_trends_accepts_history(self):
+        """calculate_trends: list ve TestHistory aynı sonucu vermeli"""
+        rows = make_test_history(500, seed=9)
+        rows.reverse()  # router test_date ASC okur
+
+        from_list = calculate_trends(rows, "weekly", 8, {})
+        from_history = calculate_trends(TestHistory.from_rows(rows), "weekly", 8, {})
+
+        assert from_list == from_history
+        assert any(v is not None for v in from_list["overall_trend"])
+        assert epoch_day(date(1970, 1, 2)) == 1
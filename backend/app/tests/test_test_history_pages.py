@@ -0,0 +1,136 @@
+"""
+Test History Pagination Tests
+Keyset cursor on (test_date, id), NDJSON stream, names from curriculum snapshot
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+
+from app.api.v1.endpoints.student import dashboard
+from app.core import curriculum
+from app.core.auth import get_current_user
+from app.core.keyset import decode_cursor, encode_cursor
+from app.tests.fake_supabase import FakeSupabase, fake_request
+
+
+def _rows():
+    rows = []
+    for i in range(23):
+        # Aynı test_date'e düşen çok sayıda test: sıralama id ile stabil kalmalı
+        day = 1 + i // 5
+        rows.append({
+            "id": f"x{i:02d}",
+            "student_id": "s1",
+            "topic_id": "t1" if i % 2 else "t2",
+            "test_date": f"2026-03-{day:02d}T10:00:00+00:00",
+            "correct_count": 5,
+            "wrong_count": 4,
+            "empty_count": 1,
+            "net_score": 4,
+            "success_rate": 50,
+        })
+    rows.append(dict(rows[0], id="other", student_id="s2"))
+    return rows
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeSupabase({
+        "subjects": [{"id": "mat", "name_tr": "Matematik"}],
+        "topics": [
+            {"id": "t1", "subject_id": "mat", "name_tr": "Limit"},
+            {"id": "t2", "subject_id": "mat", "name_tr": "Türev"},
+        ],
+        "student_topic_tests": _rows(),
+    })
+    monkeypatch.setattr(dashboard, "get_supabase_admin", lambda: db)
+    monkeypatch.setattr(curriculum, "get_supabase_admin", lambda: db)
+    curriculum.curriculum_store.reset()
+    curriculum.curriculum_store.get()
+    db.reset_queries()
+    yield db
+    curriculum.curriculum_store.reset()
+
+
+def _expected_ids():
+    rows = [r for r in _rows() if r["student_id"] == "s1"]
+    rows.sort(key=lambda r: (r["test_date"], r["id"]), reverse=True)
+    return [r["id"] for r in rows]
+
+
+def _page(limit=None, cursor=None):
+    return asyncio.run(dashboard.get_student_tests(
+        fake_request(), Response(), limit=limit, cursor=cursor, stream=False, current_user={"id": "s1"}
+    ))
+
+
+class TestKeysetCursor:
+    def test_roundtrip_and_invalid(self):
+        cursor = encode_cursor("2026-03-01T10:00:00+00:00", "x01")
+
+        assert decode_cursor(cursor) == ("2026-03-01T10:00:00+00:00", "x01")
+        for bad in ("???", encode_cursor("a", None), "bm90LWpzb24"):
+            with pytest.raises(ValueError):
+                decode_cursor(bad)
+
+
+class TestTestHistoryPages:
+    """Keyset sayfalar: tekrar/atlama yok, derinlikten bağımsız tek sorgu"""
+
+    def test_pages_cover_history_in_order(self, fake_db):
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = _page(limit=4, cursor=cursor)
+            ids += [t["id"] for t in page["tests"]]
+            pages += 1
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            cursor = page["next_cursor"]
+
+        assert ids == _expected_ids()
+        assert pages == 6
+        assert fake_db.query_count() == pages  # sayfa başına tek sorgu
+        assert fake_db.query_count("topics") == 0  # adlar snapshot'tan
+
+    def test_names_from_snapshot(self, fake_db):
+        first = _page(limit=1)["tests"][0]
+
+        assert first["id"] == "x22"
+        assert first["topic"] == {"name_tr": "Türev"}
+        assert first["subject"] == {"name_tr": "Matematik"}
+
+    def test_full_list_pages_internally(self, fake_db, monkeypatch):
+        """limit yok: eski sözleşme, ama PostgREST max-rows'a takılmadan"""
+        monkeypatch.setattr(dashboard, "TESTS_FETCH_PAGE_SIZE", 5)
+
+        result = _page()
+
+        assert set(result) == {"tests"}
+        assert [t["id"] for t in result["tests"]] == _expected_ids()
+
+    def test_invalid_cursor_is_400(self, fake_db):
+        with pytest.raises(HTTPException) as exc:
+            _page(limit=5, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+
+    def test_ndjson_stream(self, fake_db, monkeypatch):
+        monkeypatch.setattr(dashboard, "TESTS_FETCH_PAGE_SIZE", 7)
+        app = FastAPI()
+        app.include_router(dashboard.router)
+        app.dependency_overrides[get_current_user] = lambda: {"id": "s1"}
+
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/tests", headers={"Accept": "application/x-ndjson"})
+
+        res = asyncio.run(call())
+        lines = [json.loads(line) for line in res.text.splitlines()]
+
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        assert "etag" in res.headers
+        assert [t["id"] for t in lines] == _expected_ids()
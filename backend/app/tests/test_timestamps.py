@@ -0,0 +1,111 @@
+"""
+Timestamp Normalization Tests
+Single-pass row normalization, memoized parser, pre-parsed consumers
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.api.v1.endpoints.progress.helpers import to_utc_date
+from app.api.v1.endpoints.student import performance
+from app.api.v1.endpoints.student.utils import calculate_remembering_rate
+from app.core import timestamps
+from app.core.timestamps import epoch_day, normalize_rows, parse_utc, row_day, row_utc
+from app.motors.bs_model.engine import _parse_iso
+
+
+class TestParser:
+    """Memoized UTC parser"""
+
+    def test_parses_variants_to_utc(self):
+        expected = datetime(2026, 1, 4, 21, 30, tzinfo=timezone.utc)
+
+        assert parse_utc("2026-01-05T00:30:00+03:00") == expected
+        assert parse_utc("2026-01-04T21:30:00Z") == expected
+        assert parse_utc("2026-01-04T21:30:00") == expected  # naive = UTC
+        assert parse_utc(date(2026, 1, 4)) == datetime(2026, 1, 4, tzinfo=timezone.utc)
+        assert parse_utc("garbage") is None
+        assert parse_utc(None) is None
+
+    def test_repeated_strings_hit_cache(self):
+        value = "2026-02-11T08:15:42.123456+00:00"
+        parse_utc(value)
+        before = timestamps.parser_cache_info()["hits"]
+
+        for _ in range(20):
+            parse_utc(value)
+
+        assert timestamps.parser_cache_info()["hits"] - before == 20
+
+    def test_epoch_day(self):
+        assert epoch_day(date(1970, 1, 2)) == 1
+        assert epoch_day("1970-01-02T23:59:59+00:00") == 1
+        assert epoch_day("1970-01-03T01:00:00+03:00") == 1  # UTC'de 2 Ocak
+
+
+class TestNormalizeRows:
+    """Fetch anında tek geçiş"""
+
+    def test_adds_utc_and_day_fields(self):
+        rows = normalize_rows([
+            {"id": "a", "test_date": "2026-01-05T10:00:00+00:00"},
+            {"id": "b", "test_date": None},
+        ])
+
+        assert rows[0]["test_date_utc"] == datetime(2026, 1, 5, 10, tzinfo=timezone.utc)
+        assert rows[0]["test_date_day"] == epoch_day(date(2026, 1, 5))
+        assert rows[1]["test_date_utc"] is None and rows[1]["test_date_day"] is None
+
+    def test_consumers_read_pre_parsed_fields(self):
+        """row_utc / row_day normalize edilmiş alanı okur, string'i değil"""
+        marker = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        row = {"test_date": "2026-01-05T10:00:00+00:00", "test_date_utc": marker, "test_date_day": 7}
+
+        assert row_utc(row) is marker
+        assert row_day(row) == 7
+        # Normalize edilmemiş satır: parser'a düşer
+        assert row_day({"test_date": "1970-01-08T00:00:00Z"}) == 7
+
+
+class TestConsumers:
+    """to_utc_date, bs_model._parse_iso, remembering rate, performance gap"""
+
+    def test_to_utc_date(self):
+        assert to_utc_date("2025-12-24T01:22:11+03:00") == date(2025, 12, 23)
+        assert to_utc_date("2025-12-24") == date(2025, 12, 24)
+        with pytest.raises(ValueError):
+            to_utc_date("not-a-date")
+
+    def test_bs_parse_iso(self):
+        assert _parse_iso("2026-01-05T10:00:00Z") == datetime(2026, 1, 5, 10, tzinfo=timezone.utc)
+        assert _parse_iso("") is None
+
+    def test_remembering_rate_uses_pre_parsed_date(self):
+        now = datetime.now(timezone.utc)
+        row = {"test_date": "1999-01-01T00:00:00+00:00", "success_rate": 80}
+        normalize_rows([row])
+        row["test_date_utc"] = now - timedelta(days=2)  # pre-parsed alan kazanır
+
+        assert calculate_remembering_rate([row]) == 72
+
+    def test_performance_gap_from_epoch_days(self, monkeypatch):
+        """Gap = UTC epoch-day farkı (saat farkı değil)"""
+        seen = {}
+        original = performance.BSModelV1.calculate
+
+        def spy(bs_input):
+            seen["gap"] = bs_input.actual_gap
+            return original(bs_input)
+
+        monkeypatch.setattr(performance.BSModelV1, "calculate", staticmethod(spy))
+        tests = normalize_rows([
+            {"test_date": "2026-01-10T00:30:00+00:00", "correct_count": 8,
+             "wrong_count": 2, "empty_count": 0},
+            {"test_date": "2026-01-03T23:30:00+00:00", "correct_count": 5,
+             "wrong_count": 5, "empty_count": 0},
+        ])
+
+        entry = performance._build_topic_entry(tests)
+
+        assert entry["repetitions"] == 2
+        assert seen["gap"] == 7
@@ -0,0 +1,7 @@
+"""
+End.STP benchmark harness (motors, orchestrator, hot endpoints)
+
+Usage:
+    cd backend
+    python -m benchmarks.run --scales 10,1000,100000
+"""
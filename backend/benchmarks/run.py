@@ -0,0 +1,354 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: backend/benchmarks/run.py
+# Created: 2026-10-18
+# Phase: Performance (Benchmark Harness)
+# Author: End.STP Team
+#
+# 🌍 LOCALIZATION STATUS:
+#   [x] UTC datetime handling
+#   [x] No hardcoded UI text
+# =============================================================================
+
+"""
+Benchmark Runner
+
+Kapsam:
+- Motorlar: run_bs_model_engine, run_difficulty_engine, run_time_pace_engine, run_priority_engine
+- Orchestrator: run_orchestrator
+- Endpoint çekirdekleri: get_student_performance (mock Supabase), calculate_trends
+
+Her case sentetik geçmişin (10 / 1k / 100k test) üzerinde ölçülür;
+sonuçlar JSON yazılır, önceki bir JSON ile karşılaştırılabilir.
+
+Usage:
+    cd backend
+    python -m benchmarks.run                                  # 10,1000,100000
+    python -m benchmarks.run --scales 10,1000 --output out.json
+    python -m benchmarks.run --compare benchmarks/results/abc123.json --fail-on-regression
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.synthetic import (
+    BENCH_STUDENT_ID,
+    make_test_history,
+    make_topic_aggregates,
+)
+
+DEFAULT_SCALES = (10, 1_000, 100_000)
+DEFAULT_BUDGET_SECONDS = 2.0
+DEFAULT_MAX_RUNS = 50
+DEFAULT_REGRESSION_THRESHOLD = 0.25  # median %25 yavaşlama = regression
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# case_name -> setup(tests, aggregates, now) -> zero-arg callable
+CaseSetup = Callable[[List[Dict[str, Any]], List[Dict[str, Any]], datetime], Callable[[], Any]]
+
+
+# =============================================================================
+# 🧪 CASES
+# =============================================================================
+
+def _pick(row: Dict[str, Any], cls: Any) -> Dict[str, Any]:
+    names = cls.__dataclass_fields__.keys()
+    return {k: v for k, v in row.items() if k in names}
+
+
+def _setup_bs_model(tests, aggregates, now):
+    from app.motors.bs_model.engine import run_bs_model_engine
+    from app.motors.bs_model.types import BSModelEngineInput, BSModelTopicInput
+
+    payload = BSModelEngineInput(
+        topics=[BSModelTopicInput(**_pick(a, BSModelTopicInput)) for a in aggregates],
+        now=now,
+    )
+    return lambda: run_bs_model_engine(payload)
+
+
+def _setup_difficulty(tests, aggregates, now):
+    from app.motors.difficulty.engine import run_difficulty_engine
+    from app.motors.difficulty.types import DifficultyEngineInput, DifficultyTopicInput
+
+    payload = DifficultyEngineInput(
+        topics=[DifficultyTopicInput(**_pick(a, DifficultyTopicInput)) for a in aggregates],
+        now=now,
+    )
+    return lambda: run_difficulty_engine(payload)
+
+
+def _setup_time_pace(tests, aggregates, now):
+    from app.motors.time_pace.engine import run_time_pace_engine
+    from app.motors.time_pace.types import TimePaceEngineInput, TimePaceTopicInput
+
+    payload = TimePaceEngineInput(
+        topics=[TimePaceTopicInput(**_pick(a, TimePaceTopicInput)) for a in aggregates],
+        now=now,
+    )
+    return lambda: run_time_pace_engine(payload)
+
+
+def _setup_priority(tests, aggregates, now):
+    from app.motors.priority.engine import run_priority_engine
+    from app.motors.priority.types import PriorityEngineInput, PriorityTopicInput
+
+    payload = PriorityEngineInput(
+        topics=[PriorityTopicInput(**_pick(a, PriorityTopicInput)) for a in aggregates],
+        now=now,
+    )
+    return lambda: run_priority_engine(payload)
+
+
+def _setup_orchestrator(tests, aggregates, now):
+    from app.orchestrator.contract import OrchestratorInput, OrchestratorTopicInput
+    from app.orchestrator.runner import run_orchestrator
+
+    inp = OrchestratorInput(
+        student_id=BENCH_STUDENT_ID,
+        topics=[OrchestratorTopicInput(**_pick(a, OrchestratorTopicInput)) for a in aggregates],
+        now=now,
+    )
+    return lambda: run_orchestrator(inp)
+
+
+def _setup_student_performance(tests, aggregates, now):
+    from app.api.v1.endpoints.student.performance import get_student_performance
+    from app.tests.fake_supabase import FakeSupabase
+
+    db = FakeSupabase({"student_topic_tests": tests})
+
+    def call():
+        # Cache devre dışı: her koşu DB fetch + BS hesap yolunu ölçer
+        with _patched_supabase(db):
+            return get_student_performance(BENCH_STUDENT_ID, use_cache=False)
+
+    return call
+
+
+def _setup_trends(tests, aggregates, now):
+    from app.api.v1.endpoints.progress.calculators import calculate_trends
+
+    subjects = {t["subject_id"]: t["subject_id"] for t in tests}
+    return lambda: calculate_trends(tests, period="weekly", num_periods=8, subjects=subjects)
+
+
+CASES: Dict[str, CaseSetup] = {
+    "run_bs_model_engine": _setup_bs_model,
+    "run_difficulty_engine": _setup_difficulty,
+    "run_time_pace_engine": _setup_time_pace,
+    "run_priority_engine": _setup_priority,
+    "run_orchestrator": _setup_orchestrator,
+    "get_student_performance": _setup_student_performance,
+    "calculate_trends": _setup_trends,
+}
+
+
+@contextmanager
+def _patched_supabase(db: Any) -> Iterator[None]:
+    from app.api.v1.endpoints.student import performance
+
+    original = performance.get_supabase_admin
+    performance.get_supabase_admin = lambda: db
+    try:
+        yield
+    finally:
+        performance.get_supabase_admin = original
+
+
+# =============================================================================
+# ⏱️ MEASUREMENT
+# =============================================================================
+
+def measure(
+    fn: Callable[[], Any],
+    budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+    max_runs: int = DEFAULT_MAX_RUNS,
+) -> Dict[str, Any]:
+    """
+    fn'i bütçe dolana kadar (en az 1, en çok max_runs kez) koşturur.
+    Returns: runs, min/median/mean/max ms
+    """
+    timings: List[float] = []
+    started = time.perf_counter()
+
+    while len(timings) < max_runs:
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+        if time.perf_counter() - started >= budget_seconds:
+            break
+
+    return {
+        "runs": len(timings),
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "max_ms": round(max(timings), 4),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    cases: Optional[Sequence[str]] = None,
+    budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+    max_runs: int = DEFAULT_MAX_RUNS,
+    seed: int = 42,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """
+    Tüm case'leri her ölçekte koşturur.
+    Returns: {"meta": {...}, "results": [{"name", "scale", "topics", "runs", "*_ms"}]}
+    """
+    selected = list(cases or CASES.keys())
+    unknown = [c for c in selected if c not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+
+    # Aynı "now" tüm case'lerde: due/overdue hesapları koşudan koşuya değişmesin
+    now = datetime.now(timezone.utc)
+    results: List[Dict[str, Any]] = []
+
+    for scale in scales:
+        tests = make_test_history(scale, seed=seed, now=now)
+        aggregates = make_topic_aggregates(tests)
+
+        for name in selected:
+            fn = CASES[name](tests, aggregates, now)
+            stats = measure(fn, budget_seconds=budget_seconds, max_runs=max_runs)
+            row = {"name": name, "scale": scale, "topics": len(aggregates), **stats}
+            results.append(row)
+            if verbose:
+                print(
+                    f"  {name:<26} {scale:>7} tests  "
+                    f"median {stats['median_ms']:>10.3f}ms  ({stats['runs']} runs)"
+                )
+
+    return {
+        "meta": {
+            "created_at": now.isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "scales": list(scales),
+            "budget_seconds": budget_seconds,
+        },
+        "results": results,
+    }
+
+
+# =============================================================================
+# 📊 COMPARE
+# =============================================================================
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    (name, scale) bazında median karşılaştırması.
+    Returns: her eşleşen case için ratio + regression flag
+    """
+    base_index = {(r["name"], r["scale"]): r for r in baseline.get("results", [])}
+    rows: List[Dict[str, Any]] = []
+
+    for r in current.get("results", []):
+        base = base_index.get((r["name"], r["scale"]))
+        if not base or not base.get("median_ms"):
+            continue
+        ratio = r["median_ms"] / base["median_ms"]
+        rows.append({
+            "name": r["name"],
+            "scale": r["scale"],
+            "baseline_ms": base["median_ms"],
+            "current_ms": r["median_ms"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        })
+
+    return rows
+
+
+# =============================================================================
+# 🚀 CLI
+# =============================================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End.STP benchmark suite")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma separated test counts (default: 10,1000,100000)")
+    parser.add_argument("--cases", default=None,
+                        help=f"Comma separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Time budget per case in seconds")
+    parser.add_argument("--max-runs", type=int, default=DEFAULT_MAX_RUNS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None,
+                        help="JSON output path (default: benchmarks/results/<git-commit>.json)")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    cases = [c.strip() for c in args.cases.split(",")] if args.cases else None
+
+    print(f"🏁 Benchmarks: scales={scales}")
+    report = run_suite(
+        scales=scales,
+        cases=cases,
+        budget_seconds=args.budget,
+        max_runs=args.max_runs,
+        seed=args.seed,
+        verbose=True,
+    )
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['meta']['git_commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"💾 Results: {output}")
+
+    if not args.compare:
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text())
+    rows = compare_results(report, baseline, threshold=args.threshold)
+    regressions = [r for r in rows if r["regression"]]
+
+    print(f"📊 Compared with {args.compare} (threshold +{args.threshold:.0%})")
+    for r in rows:
+        flag = "❌" if r["regression"] else "✅"
+        print(f"  {flag} {r['name']:<26} {r['scale']:>7}  "
+              f"{r['baseline_ms']:.3f}ms -> {r['current_ms']:.3f}ms (x{r['ratio']})")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# =============================================================================
+# GLOBAL-FIRST COMPLIANCE HEADER
+# =============================================================================
+# File: backend/benchmarks/synthetic.py
+# Created: 2026-10-18
+# Phase: Performance (Benchmark Harness)
+# Author: End.STP Team
+#
+# 🌍 LOCALIZATION STATUS:
+#   [x] UTC datetime handling
+#   [x] No hardcoded UI text
+# =============================================================================
+
+"""
+Synthetic student histories for benchmarks
+
+- Seeded RNG -> aynı seed, aynı veri (commit'ler arası karşılaştırılabilir)
+- student_topic_tests satır şekli (performance / progress endpoint'lerinin okuduğu kolonlar)
+- Motor girdileri için topic bazlı aggregate'ler
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+BENCH_STUDENT_ID = "bench-student"
+SUBJECT_COUNT = 8
+TESTS_PER_TOPIC = 10
+HISTORY_DAYS = 120
+
+
+def topic_count_for(n_tests: int) -> int:
+    return max(1, n_tests // TESTS_PER_TOPIC)
+
+
+def make_test_history(
+    n_tests: int,
+    seed: int = 42,
+    now: Optional[datetime] = None,
+    student_id: str = BENCH_STUDENT_ID,
+) -> List[Dict[str, Any]]:
+    """
+    n_tests adet student_topic_tests satırı üretir (test_date DESC sıralı).
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    n_topics = topic_count_for(n_tests)
+
+    rows: List[Dict[str, Any]] = []
+    for i in range(n_tests):
+        topic_idx = rng.randrange(n_topics)
+        total = rng.choice([10, 12, 15, 20, 25])
+        correct = rng.randint(0, total)
+        wrong = rng.randint(0, total - correct)
+        empty = total - correct - wrong
+        test_date = now - timedelta(
+            days=rng.randint(0, HISTORY_DAYS),
+            minutes=rng.randint(0, 1439),
+        )
+
+        rows.append({
+            "id": f"test-{i}",
+            "student_id": student_id,
+            "topic_id": f"topic-{topic_idx}",
+            "subject_id": f"subject-{topic_idx % SUBJECT_COUNT}",
+            "test_date": test_date.isoformat(),
+            "total_questions": total,
+            "correct_count": correct,
+            "wrong_count": wrong,
+            "empty_count": empty,
+            "net_score": round(correct - wrong / 4, 2),
+            "success_rate": round(correct / total * 100, 2),
+            "duration_minutes": rng.randint(5, 60),
+            "difficulty": rng.choice([None, 1, 2, 3, 4, 5]),
+            "ef": rng.choice([None, 1.3, 1.8, 2.2, 2.5]),
+            "interval_days": rng.choice([None, 1, 3, 7, 14, 30]),
+        })
+
+    rows.sort(key=lambda r: r["test_date"], reverse=True)
+    return rows
+
+
+def make_topic_aggregates(tests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Testleri topic bazında özetler (motor TopicInput alanları).
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for t in tests:
+        groups[t["topic_id"]].append(t)
+
+    aggregates: List[Dict[str, Any]] = []
+    for topic_id, topic_tests in groups.items():
+        total_q = sum(t["total_questions"] for t in topic_tests) or 1
+        correct = sum(t["correct_count"] for t in topic_tests)
+        wrong = sum(t["wrong_count"] for t in topic_tests)
+        empty = sum(t["empty_count"] for t in topic_tests)
+        seconds = sum(t["duration_minutes"] * 60 for t in topic_tests)
+
+        rates = [t["success_rate"] for t in topic_tests]  # DESC sıralı
+        if len(rates) >= 2 and rates[0] > rates[-1] + 5:
+            trend = "improving"
+        elif len(rates) >= 2 and rates[0] < rates[-1] - 5:
+            trend = "declining"
+        else:
+            trend = "stable"
+
+        aggregates.append({
+            "topic_id": topic_id,
+            "topic_name": f"Konu {topic_id}",
+            "subject_name": topic_tests[0]["subject_id"],
+            "success_rate": round(correct / total_q * 100, 2),
+            "wrong_rate": round(wrong / total_q * 100, 2),
+            "blank_rate": round(empty / total_q * 100, 2),
+            "test_count": len(topic_tests),
+            "avg_time_sec": round(seconds / total_q, 2),
+            "last_test_date": topic_tests[0]["test_date"],
+            "trend": trend,
+            # BS-Model: son test + state
+            "correct": topic_tests[0]["correct_count"],
+            "incorrect": topic_tests[0]["wrong_count"],
+            "blank": topic_tests[0]["empty_count"],
+            "total": topic_tests[0]["total_questions"],
+            "difficulty": topic_tests[0]["difficulty"] or 3,
+            "current_ef": topic_tests[0]["ef"],
+            "current_ia": topic_tests[0]["interval_days"],
+            "repetitions": len(topic_tests),
+        })
+
+    return aggregates
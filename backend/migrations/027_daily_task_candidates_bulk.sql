@@ -0,0 +1,89 @@
+-- ============================================
+-- MIGRATION 027: Daily Task Candidates (BULK)
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) Set-based variant of rpc_get_daily_task_candidates
+-- 2) One call per student page instead of one call per student
+-- 3) Rows carry student_id; backend groups them into CandidateTopic lists
+-- 4) Only the top p_limit candidates per student are returned, so a page
+--    stays under PostgREST's max-rows cap (Supabase default 1000)
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- Per-student RPC stays as the single source of scoring logic:
+-- - rpc_get_daily_task_candidates(p_student_id, p_date) (unchanged)
+--
+-- Bulk RPC joins it LATERALly over the page of ids, so the nightly job
+-- (app/jobs/generate_daily_tasks.py) makes 1 round trip per page.
+-- Result is ordered by student_id, gos DESC so the client can stream/group.
+--
+-- max-rows truncates silently (no error). The backend sends at most
+-- (max_rows - 1) / p_limit ids per call and treats a result that reaches
+-- max_rows as truncated (falls back to the per-student RPC).
+-- ============================================
+
+DROP FUNCTION IF EXISTS rpc_get_daily_task_candidates_bulk(UUID[], DATE);
+
+CREATE OR REPLACE FUNCTION rpc_get_daily_task_candidates_bulk(
+    p_student_ids UUID[],
+    p_date DATE,
+    p_limit INT DEFAULT 5
+) RETURNS TABLE (
+    student_id UUID,
+    topic_id UUID,
+    subject_id UUID,
+    topic_name TEXT,
+    subject_name TEXT,
+    retention_rate NUMERIC,
+    days_until_forgotten INT,
+    difficulty_score NUMERIC,
+    priority_score NUMERIC,
+    speed_need NUMERIC,
+    gos NUMERIC,
+    dominant_reason TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        ranked.student_id,
+        ranked.topic_id,
+        ranked.subject_id,
+        ranked.topic_name,
+        ranked.subject_name,
+        ranked.retention_rate,
+        ranked.days_until_forgotten,
+        ranked.difficulty_score,
+        ranked.priority_score,
+        ranked.speed_need,
+        ranked.gos,
+        ranked.dominant_reason
+    FROM (
+        SELECT
+            s.sid                             AS student_id,
+            c.topic_id::UUID                  AS topic_id,
+            c.subject_id::UUID                AS subject_id,
+            c.topic_name::TEXT                AS topic_name,
+            c.subject_name::TEXT              AS subject_name,
+            c.retention_rate::NUMERIC         AS retention_rate,
+            c.days_until_forgotten::INT       AS days_until_forgotten,
+            c.difficulty_score::NUMERIC       AS difficulty_score,
+            c.priority_score::NUMERIC         AS priority_score,
+            c.speed_need::NUMERIC             AS speed_need,
+            c.gos::NUMERIC                    AS gos,
+            c.dominant_reason::TEXT           AS dominant_reason,
+            row_number() OVER (PARTITION BY s.sid ORDER BY c.gos DESC) AS rn
+        FROM unnest(p_student_ids) AS s(sid)
+        CROSS JOIN LATERAL rpc_get_daily_task_candidates(s.sid, p_date) AS c
+    ) AS ranked
+    WHERE ranked.rn <= GREATEST(p_limit, 1)
+    ORDER BY ranked.student_id, ranked.gos DESC;
+$$;
+
+COMMENT ON FUNCTION rpc_get_daily_task_candidates_bulk(UUID[], DATE, INT) IS
+    'Top p_limit daily task candidates per student for a batch of students';
+
+-- Backend service_role çağırır
+GRANT EXECUTE ON FUNCTION rpc_get_daily_task_candidates_bulk(UUID[], DATE, INT) TO service_role;
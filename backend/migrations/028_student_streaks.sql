@@ -0,0 +1,41 @@
+-- ============================================
+-- MIGRATION 028: Student Streaks (persisted counters)
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) One row per student with study-day counts and streak counters
+-- 2) Written through on test submit / update / delete
+-- 3) /todays-tasks reads streaks without scanning the test history
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- Days are UTC epoch-days (1970-01-01 = 0), same as the backend
+-- (app/core/timestamps.py).
+--
+-- day_counts: {"<epoch_day>": <test_count>} so a delete only clears a day
+-- when its last test is removed.
+-- last_study_day / run_start_day: the most recent run of consecutive days.
+-- test_count: consistency check against the fetched test rows; a mismatch
+-- makes the backend rebuild the row (app/api/v1/endpoints/student/streaks.py).
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS student_streaks (
+    student_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+    day_counts JSONB NOT NULL DEFAULT '{}'::jsonb,
+    last_study_day INT,
+    run_start_day INT,
+    longest_streak INT NOT NULL DEFAULT 0,
+    test_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE student_streaks IS
+    'Per-student study streak counters (write-through from test endpoints)';
+
+ALTER TABLE student_streaks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Students read own streaks" ON student_streaks;
+CREATE POLICY "Students read own streaks"
+    ON student_streaks FOR SELECT
+    USING (auth.uid() = student_id);
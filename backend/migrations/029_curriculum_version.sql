@@ -0,0 +1,76 @@
+-- ============================================
+-- MIGRATION 029: Curriculum Version Counter
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) Single-row version counter for curriculum reference data
+-- 2) rpc_bump_curriculum_version for admin write endpoints
+-- 3) Statement-level triggers bump the version on any write to the
+--    snapshot tables (SQL editor / migrations included)
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- The backend keeps one in-memory snapshot per process
+-- (app/core/curriculum.py) built from:
+--   subjects, topics, subject_exam_weights, prerequisites, exam_systems
+-- Each worker reads curriculum_version at most every
+-- CURRICULUM_VERSION_CHECK_SECONDS and reloads when it changed.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS curriculum_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 1,
+    reason TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO curriculum_version (id, version)
+VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE curriculum_version IS
+    'Curriculum snapshot version (bumped on reference-data writes)';
+
+CREATE OR REPLACE FUNCTION rpc_bump_curriculum_version(
+    p_reason TEXT DEFAULT NULL
+) RETURNS BIGINT
+LANGUAGE sql
+AS $$
+    UPDATE curriculum_version
+    SET version = version + 1,
+        reason = p_reason,
+        updated_at = NOW()
+    WHERE id = 1
+    RETURNING version;
+$$;
+
+CREATE OR REPLACE FUNCTION trg_bump_curriculum_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM rpc_bump_curriculum_version(TG_TABLE_NAME || ':' || lower(TG_OP));
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'subjects', 'topics', 'subject_exam_weights', 'prerequisites', 'exam_systems'
+    ] LOOP
+        IF to_regclass('public.' || t) IS NOT NULL THEN
+            EXECUTE format('DROP TRIGGER IF EXISTS bump_curriculum_version ON public.%I', t);
+            EXECUTE format(
+                'CREATE TRIGGER bump_curriculum_version
+                 AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.%I
+                 FOR EACH STATEMENT EXECUTE FUNCTION trg_bump_curriculum_version()',
+                t
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
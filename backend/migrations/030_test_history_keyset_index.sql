@@ -0,0 +1,32 @@
+-- ============================================
+-- MIGRATION 030: Test History Keyset Index
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) Index for GET /student/tests keyset pagination
+-- 2) ORDER BY test_date DESC, id DESC + cursor seek without offset scans
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- The backend pages with
+--   WHERE student_id = $1
+--     AND (test_date < $2 OR (test_date = $2 AND id < $3))
+--   ORDER BY test_date DESC, id DESC
+--   LIMIT n
+-- (app/core/keyset.py). Every page is an index range scan regardless of
+-- how deep the cursor is.
+-- Topic / subject names come from the curriculum snapshot, not a join.
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_student_topic_tests_history
+    ON student_topic_tests (student_id, test_date DESC, id DESC);
+
+-- ============================================
+-- VERIFY
+-- ============================================
+-- EXPLAIN SELECT id, test_date FROM student_topic_tests
+--  WHERE student_id = '<uuid>'
+--    AND (test_date < now() OR (test_date = now() AND id < '<uuid>'))
+--  ORDER BY test_date DESC, id DESC LIMIT 50;
+-- -> Index Scan using idx_student_topic_tests_history
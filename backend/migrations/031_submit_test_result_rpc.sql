@@ -0,0 +1,163 @@
+-- ============================================
+-- MIGRATION 031: Transactional Test Submission
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) idempotency_key on student_topic_tests (unique per student)
+-- 2) rpc_submit_test_result: duplicate check + insert + task auto-complete
+--    in one transaction / one round trip
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- POST /api/v1/test-results (app/api/v1/endpoints/test_entry.py) used to do
+-- select (duplicate) -> insert -> select (pending task) -> update (task).
+-- The duplicate select and the insert raced; two fast submits could both
+-- pass the check.
+--
+-- Keys:
+-- - "client:<Idempotency-Key header>"  retry of the same request
+-- - "auto:<topic_id>@<test_date>"       no header; same topic + date
+-- Both checks run under a transaction-scoped advisory lock on
+-- (student, topic, test_date): two submits for the same topic + date,
+-- whatever their keys, are serialized, so the second one sees the first
+-- one's row ("duplicate" or "exists") instead of inserting again.
+-- The unique index still backs the client key: a concurrent insert with the
+-- same key on another topic/date hits ON CONFLICT DO NOTHING.
+-- (A unique index on (student_id, topic_id, test_date) is not used:
+-- rows entered before this migration may already repeat that triple.)
+--
+-- Result:
+--   {"status": "created" | "duplicate" | "exists",
+--    "test": <student_topic_tests row>, "task": <student_tasks row | null>}
+-- "exists": same topic + test_date was entered before this migration
+-- (rows without a key) or with another client key.
+-- ============================================
+
+ALTER TABLE student_topic_tests
+    ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_student_topic_tests_idempotency
+    ON student_topic_tests (student_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_student_topic_tests_topic_date
+    ON student_topic_tests (student_id, topic_id, test_date);
+
+CREATE OR REPLACE FUNCTION rpc_submit_test_result(
+    p_test JSONB,
+    p_idempotency_key TEXT,
+    p_task_date DATE
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_in student_topic_tests;
+    v_test student_topic_tests;
+    v_task student_tasks;
+BEGIN
+    v_in := jsonb_populate_record(NULL::student_topic_tests, p_test);
+
+    -- Aynı öğrenci + konu + tarih için check + insert seri çalışır
+    -- (lock transaction sonunda bırakılır)
+    PERFORM pg_advisory_xact_lock(
+        hashtextextended(
+            v_in.student_id::TEXT || ':' || v_in.topic_id::TEXT || '@' || v_in.test_date::TEXT,
+            31
+        )
+    );
+
+    -- Aynı istek tekrarı: ilk sonucu döndür
+    SELECT * INTO v_test
+    FROM student_topic_tests
+    WHERE student_id = v_in.student_id
+      AND idempotency_key = p_idempotency_key;
+
+    IF FOUND THEN
+        SELECT * INTO v_task
+        FROM student_tasks
+        WHERE test_result_id = v_test.id
+        LIMIT 1;
+
+        RETURN jsonb_build_object(
+            'status', 'duplicate',
+            'test', to_jsonb(v_test),
+            'task', CASE WHEN v_task.id IS NULL THEN NULL ELSE to_jsonb(v_task) END
+        );
+    END IF;
+
+    -- Aynı konu + tarih başka anahtarla (veya migration öncesi) girilmiş
+    IF EXISTS (
+        SELECT 1 FROM student_topic_tests
+        WHERE student_id = v_in.student_id
+          AND topic_id = v_in.topic_id
+          AND test_date = v_in.test_date
+    ) THEN
+        RETURN jsonb_build_object('status', 'exists', 'test', NULL, 'task', NULL);
+    END IF;
+
+    INSERT INTO student_topic_tests (
+        student_id, subject_id, topic_id, test_date,
+        correct_count, wrong_count, empty_count,
+        net_score, success_rate, test_duration_minutes,
+        is_processed, processing_status, test_source, question_type,
+        created_via, api_version, request_id, created_at,
+        idempotency_key
+    ) VALUES (
+        v_in.student_id, v_in.subject_id, v_in.topic_id, v_in.test_date,
+        v_in.correct_count, v_in.wrong_count, v_in.empty_count,
+        v_in.net_score, v_in.success_rate, v_in.test_duration_minutes,
+        v_in.is_processed, v_in.processing_status, v_in.test_source, v_in.question_type,
+        v_in.created_via, v_in.api_version, v_in.request_id, COALESCE(v_in.created_at, NOW()),
+        p_idempotency_key
+    )
+    ON CONFLICT (student_id, idempotency_key) WHERE idempotency_key IS NOT NULL
+    DO NOTHING
+    RETURNING * INTO v_test;
+
+    IF v_test.id IS NULL THEN
+        -- Eşzamanlı aynı anahtar: diğer transaction kazandı
+        SELECT * INTO v_test
+        FROM student_topic_tests
+        WHERE student_id = v_in.student_id
+          AND idempotency_key = p_idempotency_key;
+
+        SELECT * INTO v_task
+        FROM student_tasks
+        WHERE test_result_id = v_test.id
+        LIMIT 1;
+
+        RETURN jsonb_build_object(
+            'status', 'duplicate',
+            'test', to_jsonb(v_test),
+            'task', CASE WHEN v_task.id IS NULL THEN NULL ELSE to_jsonb(v_task) END
+        );
+    END IF;
+
+    -- Bugünün bu konudaki pending görevi (auto_complete_task_if_exists ile aynı kural)
+    UPDATE student_tasks
+    SET status = 'completed',
+        completed_at = NOW(),
+        manual_completion = FALSE,
+        test_result_id = v_test.id
+    WHERE id = (
+        SELECT id FROM student_tasks
+        WHERE student_id = v_test.student_id
+          AND task_date = p_task_date
+          AND topic_id = v_test.topic_id
+          AND status = 'pending'
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING * INTO v_task;
+
+    RETURN jsonb_build_object(
+        'status', 'created',
+        'test', to_jsonb(v_test),
+        'task', CASE WHEN v_task.id IS NULL THEN NULL ELSE to_jsonb(v_task) END
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION rpc_submit_test_result(JSONB, TEXT, DATE) IS
+    'Idempotent test submission + task auto-complete (1 round trip)';
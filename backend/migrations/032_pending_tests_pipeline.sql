@@ -0,0 +1,76 @@
+-- ============================================
+-- MIGRATION 032: Pending Test Pipeline
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- 1) Claim / retry columns on student_topic_tests
+-- 2) student_topic_state: persisted per-topic motor state
+--    (BS-Model EF/interval, difficulty, pace)
+-- 3) Partial indexes for the queue scan and lease recovery
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- POST /test-results writes rows with processing_status = 'pending'.
+-- app/jobs/process_pending_tests.py consumes them:
+--   pending -> processing (conditional UPDATE ... WHERE status = 'pending',
+--              so two workers never claim the same row)
+--   processing -> processed (state upserted)
+--   processing -> pending   (error; processing_next_attempt_at = backoff)
+--   processing -> failed    (after PENDING_TESTS_MAX_ATTEMPTS)
+-- Claims older than PENDING_TESTS_LEASE_SECONDS go back to pending.
+--
+-- processing_next_attempt_at defaults to NOW() so a new row is due
+-- immediately and the claim filter needs no NULL branch.
+-- ============================================
+
+ALTER TABLE student_topic_tests
+    ADD COLUMN IF NOT EXISTS processing_attempts INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS processing_next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS processing_claimed_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS processing_worker TEXT,
+    ADD COLUMN IF NOT EXISTS processing_error TEXT,
+    ADD COLUMN IF NOT EXISTS processed_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_student_topic_tests_pending
+    ON student_topic_tests (processing_next_attempt_at, created_at)
+    WHERE processing_status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_student_topic_tests_processing
+    ON student_topic_tests (processing_claimed_at)
+    WHERE processing_status = 'processing';
+
+CREATE TABLE IF NOT EXISTS student_topic_state (
+    student_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    topic_id UUID NOT NULL,
+    ease_factor NUMERIC(4,2),
+    interval_days INT,
+    repetitions INT NOT NULL DEFAULT 0,
+    bs_status TEXT,
+    bs_model JSONB NOT NULL DEFAULT '{}'::jsonb,
+    difficulty_score NUMERIC(5,2),
+    difficulty_level TEXT,
+    pace_ratio NUMERIC(6,3),
+    time_modifier NUMERIC(4,2),
+    latest_test_id UUID,
+    latest_test_date TIMESTAMPTZ,
+    test_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (student_id, topic_id)
+);
+
+COMMENT ON TABLE student_topic_state IS
+    'Per-topic motor state written by the pending test worker';
+
+ALTER TABLE student_topic_state ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Students read own topic state" ON student_topic_state;
+CREATE POLICY "Students read own topic state"
+    ON student_topic_state FOR SELECT
+    USING (auth.uid() = student_id);
+
+-- ============================================
+-- VERIFY
+-- ============================================
+-- SELECT processing_status, COUNT(*), MIN(created_at)
+--   FROM student_topic_tests GROUP BY processing_status;
@@ -0,0 +1,62 @@
+-- ============================================
+-- MIGRATION 033: Batched Feature Flag Metrics
+-- Date: 2026-10-18
+-- Version: 1.0
+-- Description:
+-- rpc_apply_flag_metrics: apply one flush window of response-time
+-- middleware metrics to feature_flags in a single round trip
+-- ============================================
+
+-- ============================================
+-- ARCHITECTURE NOTE:
+-- main.monitor_response_time used to update feature_flags inline for every
+-- slow request and did select -> update on error_count / health_score
+-- (lost updates under concurrency). Now app/core/request_metrics.py
+-- aggregates in memory and flushes every MONITORING_FLUSH_SECONDS.
+--
+-- p_deltas: [{"flag_key", "requests", "error_delta", "health_penalty",
+--             "avg_response_time_ms", "p95_response_time_ms",
+--             "error_rate_percent", "last_success_at", "last_error_at",
+--             "last_error_message"}, ...]
+-- Counters are incremented in SQL (atomic across workers);
+-- avg / p95 / error_rate are the values of the flushed window.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION rpc_apply_flag_metrics(p_deltas JSONB)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_updated INT;
+BEGIN
+    UPDATE feature_flags f
+    SET error_count = COALESCE(f.error_count, 0) + d.error_delta,
+        health_score = GREATEST(0, COALESCE(f.health_score, 100) - d.health_penalty),
+        avg_response_time_ms = COALESCE(d.avg_response_time_ms, f.avg_response_time_ms),
+        p95_response_time_ms = COALESCE(d.p95_response_time_ms, f.p95_response_time_ms),
+        error_rate_percent = d.error_rate_percent,
+        last_success_at = COALESCE(d.last_success_at, f.last_success_at),
+        last_error_at = COALESCE(d.last_error_at, f.last_error_at),
+        last_error_message = COALESCE(d.last_error_message, f.last_error_message),
+        updated_at = NOW()
+    FROM jsonb_to_recordset(p_deltas) AS d(
+        flag_key TEXT,
+        requests INT,
+        error_delta INT,
+        health_penalty INT,
+        avg_response_time_ms INT,
+        p95_response_time_ms INT,
+        error_rate_percent NUMERIC,
+        last_success_at TIMESTAMPTZ,
+        last_error_at TIMESTAMPTZ,
+        last_error_message TEXT
+    )
+    WHERE f.flag_key = d.flag_key;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+COMMENT ON FUNCTION rpc_apply_flag_metrics(JSONB) IS
+    'Batched response-time / error deltas from the monitoring aggregator';